@@ -0,0 +1,123 @@
+"""
+Benchmark of cache requests.
+
+Reads name, automation id, enabled state and bounds of every row of a grid
+through a fake backend whose every native property access costs a fixed
+latency, standing in for the cross-process round trip of UIA or AT-SPI:
+
+- live: BaseElement property access, one or more round trips per property
+- generic: the default BaseBackend.prefetch, one round trip per property
+- batched: one round trip per request, as a UIA CacheRequest with
+  FindAllBuildCache
+
+Usage:
+    python benchmarks/bench_cache_request.py [--rows N] [--latency SECONDS]
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+from unittest.mock import Mock
+
+from pyui_automation.backends.base_backend import BaseBackend
+from pyui_automation.elements import BaseElement, CacheRequest
+from pyui_automation.elements.cache_request import read_properties
+
+REQUEST = CacheRequest(('name', 'automation_id', 'is_enabled', 'bounding_rectangle'))
+
+
+def round_trip(latency: float) -> None:
+    """Busy-wait for the latency; time.sleep is too coarse for microseconds"""
+    end = time.perf_counter() + latency
+    while time.perf_counter() < end:
+        pass
+
+
+class Rect:
+    left, top, right, bottom = 0, 0, 120, 24
+
+
+class Row:
+    """Grid row whose properties each cost one round trip"""
+
+    latency = 0.0
+    round_trips = 0
+
+    def __init__(self, index: int) -> None:
+        self._index = index
+        self.children: List["Row"] = []
+
+    def _read(self, value: Any) -> Any:
+        Row.round_trips += 1
+        round_trip(Row.latency)
+        return value
+
+    CurrentName = property(lambda self: self._read(f"Row {self._index}"))
+    CurrentAutomationId = property(lambda self: self._read(f"row{self._index}"))
+    CurrentIsEnabled = property(lambda self: self._read(True))
+    CurrentBoundingRectangle = property(lambda self: self._read(Rect()))
+
+
+class GenericBackend:
+    """Backend with the default per-property prefetch"""
+
+    get_child_elements = BaseBackend.get_child_elements
+    prefetch = BaseBackend.prefetch
+
+
+class BatchedBackend(GenericBackend):
+    """Backend answering a whole request in one round trip"""
+
+    def prefetch(self, element: Any, request: CacheRequest) -> List[Tuple[Any, Dict[str, Any]]]:
+        Row.round_trips += 1
+        round_trip(Row.latency)
+        latency, Row.latency = Row.latency, 0.0
+        trips = Row.round_trips
+        try:
+            return [(row, read_properties(row, request.properties)) for row in element.children]
+        finally:
+            Row.latency = latency
+            Row.round_trips = trips
+
+
+def read_live(grid: Row, session: Any) -> None:
+    for row in grid.children:
+        element = BaseElement(row, session)
+        element.name, element.automation_id, element.is_enabled(), element.rect
+
+
+def read_cached(grid: Row, session: Any) -> None:
+    for element in BaseElement(grid, session).get_children(REQUEST):
+        for prop in REQUEST.properties:
+            element.get_cached(prop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=2000, help="rows in the grid")
+    parser.add_argument("--latency", type=float, default=50e-6, help="seconds per round trip")
+    args = parser.parse_args()
+
+    grid = Row(-1)
+    grid.children = [Row(i) for i in range(args.rows)]
+    Row.latency = args.latency
+
+    header = f"{'mode':>8} {'round trips':>12} {'ms':>9} {'us/row':>8}"
+    print(header)
+    print("-" * len(header))
+    for mode, backend, read in (
+        ("live", GenericBackend(), read_live),
+        ("generic", GenericBackend(), read_cached),
+        ("batched", BatchedBackend(), read_cached),
+    ):
+        session = Mock()
+        session.backend = backend
+        Row.round_trips = 0
+        start = time.perf_counter()
+        read(grid, session)
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>8} {Row.round_trips:>12} {elapsed * 1000:>9.1f} {elapsed / args.rows * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
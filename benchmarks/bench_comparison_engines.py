@@ -0,0 +1,74 @@
+"""
+Benchmark of the image comparison engines.
+
+Reports the throughput (megapixels per second) of every registered engine on
+synthetic screenshots of several sizes, together with the previous float64
+RMSE implementation of ``VisualTester._calculate_similarity`` as a reference.
+SSIM is measured both untiled and in bands to show the cost of bounded memory.
+
+Usage:
+    python benchmarks/bench_comparison_engines.py [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Tuple
+
+import cv2
+import numpy as np
+
+from pyui_automation.utils.comparison import available_engines, compare, ssim_similarity
+
+SCREEN_SIZES = [(1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def legacy_rmse(img1: Any, img2: Any) -> float:
+    """Pre-engine RMSE similarity with float64 copies of the full frame"""
+    diff = cv2.absdiff(img1, img2).astype(np.float64)
+    mse = float(np.sum(np.power(diff, 2)) / diff.size)
+    return 1.0 - np.sqrt(mse) / 255.0
+
+
+def make_pair(width: int, height: int, seed: int = 0) -> Tuple[Any, Any]:
+    """Create a BGR screen and a copy with a changed panel"""
+    rng = np.random.default_rng(seed)
+    screen = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 3)
+    changed = screen.copy()
+    changed[height // 4:height // 2, width // 4:width // 2] = 255
+    return screen, changed
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of several runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    header = f"{'screen':>11} {'algorithm':>16} {'ms':>9} {'MP/s':>9} {'score':>8}"
+    print(header)
+    print("-" * len(header))
+    for width, height in SCREEN_SIZES:
+        screen, changed = make_pair(width, height)
+        megapixels = width * height / 1e6
+        cases = [("legacy-rmse", lambda: legacy_rmse(screen, changed))]
+        cases += [(name, lambda name=name: compare(screen, changed, name)) for name in available_engines()]
+        cases += [
+            ("ssim-untiled", lambda: ssim_similarity(screen, changed, tile_rows=0)),
+            ("ssim-tiled-256", lambda: ssim_similarity(screen, changed, tile_rows=256)),
+        ]
+        for label, func in cases:
+            elapsed = best_time(func, args.repeat)
+            print(f"{width}x{height:<6} {label:>16} {elapsed * 1000:9.1f} {megapixels / elapsed:9.1f} {func():8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of screenshot saving.
+
+Measures the time a test thread spends saving a burst of screenshots with
+synchronous save_image and with AsyncImageWriter (submit only, and until
+flushed), for PNG at several qualities and JPEG. Screens are synthetic UI-like
+frames: flat panels with text-like noise.
+
+Usage:
+    python benchmarks/bench_image_writer.py [--count N] [--workers N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List
+
+import numpy as np
+
+from pyui_automation.utils.image import save_image
+from pyui_automation.utils.image_writer import AsyncImageWriter, encode_params
+
+SCREEN_SIZES = [(1920, 1080), (3840, 2160)]
+CODECS = [("png", 90), ("png", 50), ("jpg", 90)]
+
+
+def make_screens(width: int, height: int, count: int, seed: int = 0) -> List[Any]:
+    """Create UI-like BGR screens: flat panels with small high-contrast detail"""
+    rng = np.random.default_rng(seed)
+    screens = []
+    for _ in range(count):
+        screen = np.full((height, width, 3), 240, dtype=np.uint8)
+        for x, y in rng.integers(0, min(width, height) - 300, (12, 2)):
+            screen[y:y + 250, x:x + 300] = rng.integers(0, 255, 3, dtype=np.uint8)
+        detail = rng.random((height, width)) < 0.02
+        screen[detail] = 0
+        screens.append(screen)
+    return screens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=8, help="screenshots per burst")
+    parser.add_argument("--workers", type=int, default=2, help="writer threads")
+    args = parser.parse_args()
+
+    header = f"{'screen':>11} {'codec':>7} {'sync ms':>9} {'submit ms':>10} {'flushed ms':>11}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        for width, height in SCREEN_SIZES:
+            screens = make_screens(width, height, args.count)
+            for format, quality in CODECS:
+                params = encode_params(format, quality)
+                start = time.perf_counter()
+                for index, screen in enumerate(screens):
+                    save_image(screen, root / f"sync_{index}.{format}", params)
+                sync_time = time.perf_counter() - start
+
+                writer = AsyncImageWriter(format, quality, workers=args.workers, max_pending=args.count)
+                start = time.perf_counter()
+                for index, screen in enumerate(screens):
+                    writer.submit(screen, root / f"async_{index}")
+                submit_time = time.perf_counter() - start
+                writer.flush()
+                flushed_time = time.perf_counter() - start
+                writer.close()
+                print(
+                    f"{width}x{height:<6} {format}:{quality:<3} {sync_time / args.count * 1000:9.1f} "
+                    f"{submit_time / args.count * 1000:10.1f} {flushed_time / args.count * 1000:11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of Linux screen capture conversion.
+
+Compares the previous conversion of an XImage buffer (PIL ``frombytes`` with
+the BGRX raw mode followed by ``np.array``) with the zero-copy BGR view of
+``ximage_to_array``, with and without a contiguous copy, on synthetic buffers.
+When an X display is available (e.g. under ``xvfb-run``), full-screen
+captures through GetImage and through the MIT-SHM grabber are timed as well.
+
+Usage:
+    python benchmarks/bench_linux_capture.py [--repeat N]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Callable
+
+import numpy as np
+from PIL import Image
+
+from pyui_automation.backends.linux import LinuxBackend, XShmGrabber, ximage_to_array
+
+SCREEN_SIZES = [(1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def legacy_convert(data: bytes, width: int, height: int) -> Any:
+    """Pre-change conversion: PIL decode of BGRX into RGB, then a numpy copy"""
+    return np.array(Image.frombytes("RGB", (width, height), data, "raw", "BGRX"))
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of several runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    header = f"{'screen':>11} {'conversion':>18} {'ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for width, height in SCREEN_SIZES:
+        data = np.random.default_rng(0).integers(0, 255, width * height * 4, dtype=np.uint8).tobytes()
+        cases = [
+            ("pil+np.array", lambda: legacy_convert(data, width, height)),
+            ("frombuffer view", lambda: ximage_to_array(data, width, height, copy=False)),
+            ("frombuffer copy", lambda: ximage_to_array(data, width, height)),
+        ]
+        for label, func in cases:
+            print(f"{width}x{height:<6} {label:>18} {best_time(func, args.repeat) * 1000:9.2f}")
+
+    if not os.environ.get("DISPLAY"):
+        print("\nDISPLAY is not set; skipping live X server capture")
+        return
+    from Xlib import display
+
+    backend = object.__new__(LinuxBackend)
+    backend.display = display.Display()
+    geometry = backend.display.screen().root.get_geometry()
+    width, height = geometry.width, geometry.height
+    print(f"\nlive capture {width}x{height}")
+    cases = [
+        ("getimage view", lambda: backend.capture_screen_region(0, 0, width, height, copy=False)),
+        ("getimage copy", lambda: backend.capture_screen_region(0, 0, width, height)),
+    ]
+    grabber = XShmGrabber.create()
+    if grabber is None:
+        print("MIT-SHM is not available")
+    else:
+        cases += [
+            ("shm grab (view)", grabber.grab),
+            ("shm capture (copy)", lambda: grabber.capture(0, 0, width, height)),
+        ]
+    for label, func in cases:
+        elapsed = best_time(func, args.repeat)
+        print(f"{label:>18} {elapsed * 1000:9.2f} ms {1 / elapsed:8.1f} fps")
+    if grabber is not None:
+        grabber.close()
+
+
+if __name__ == "__main__":
+    main()
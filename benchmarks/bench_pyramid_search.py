@@ -0,0 +1,83 @@
+"""
+Benchmark of the coarse-to-fine (pyramid) template search.
+
+Compares the exhaustive full-resolution ``cv2.matchTemplate`` search with
+``pyui_automation.utils.matching.pyramid_match_template`` at several pyramid
+depths on synthetic screenshots, and checks that both report the same best
+match.
+
+Usage:
+    python benchmarks/bench_pyramid_search.py [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Tuple
+
+import cv2
+import numpy as np
+
+from pyui_automation.utils.matching import pyramid_match_template
+
+SCREEN_SIZES = [(1920, 1080), (3840, 2160), (7680, 2160)]
+PYRAMID_LEVELS = [2, 3]
+TEMPLATE_SIZE = (96, 64)
+
+
+def make_scene(width: int, height: int, seed: int = 0) -> Tuple[Any, Any, Tuple[int, int]]:
+    """Create a smooth grayscale screen and a template cut from a random location"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (height, width), dtype=np.uint8)
+    screen = cv2.normalize(cv2.GaussianBlur(noise, (0, 0), 4), None, 0, 255, cv2.NORM_MINMAX)
+    tw, th = TEMPLATE_SIZE
+    x = int(rng.integers(0, width - tw))
+    y = int(rng.integers(0, height - th))
+    return screen, screen[y:y + th, x:x + tw].copy(), (x, y)
+
+
+def exhaustive(screen: Any, template: Any) -> Tuple[Tuple[int, int], float]:
+    """Full-resolution search for the best match"""
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return (int(max_loc[0]), int(max_loc[1])), float(max_val)
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of several runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    header = f"{'screen':>11} {'mode':>12} {'ms':>9} {'speedup':>8} {'location':>12} {'score':>6} {'same':>5}"
+    print(header)
+    print("-" * len(header))
+    for width, height in SCREEN_SIZES:
+        screen, template, _ = make_scene(width, height)
+        base_time = best_time(lambda: exhaustive(screen, template), args.repeat)
+        base_loc, base_score = exhaustive(screen, template)
+        print(f"{width}x{height:<6} {'exhaustive':>12} {base_time * 1000:9.1f} {'1.0x':>8} "
+              f"{str(base_loc):>12} {base_score:6.3f} {'-':>5}")
+        for levels in PYRAMID_LEVELS:
+            elapsed = best_time(lambda: pyramid_match_template(screen, template, 0.8, levels), args.repeat)
+            matches = pyramid_match_template(screen, template, 0.8, levels)
+            if len(matches):
+                loc = (int(matches['x'][0]), int(matches['y'][0]))
+                score = float(matches['score'][0])
+            else:
+                loc, score = (-1, -1), 0.0
+            same = abs(loc[0] - base_loc[0]) <= 1 and abs(loc[1] - base_loc[1]) <= 1
+            print(f"{width}x{height:<6} {'pyramid 1/' + str(1 << levels):>12} {elapsed * 1000:9.1f} "
+                  f"{base_time / elapsed:7.1f}x {str(loc):>12} {score:6.3f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark of the vectorized template matching engine.
+
+Compares the previous per-point implementation of ``find_template`` (tuple per
+above-threshold pixel, Python sort and distance-based suppression) with
+``pyui_automation.utils.matching.match_template`` on synthetic screenshots of
+several sizes and match densities.
+
+Usage:
+    python benchmarks/bench_template_matching.py [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+from pyui_automation.utils.matching import match_template
+
+SCREEN_SIZES = [(1280, 720), (1920, 1080), (3840, 2160)]
+# (label, threshold) - on a smooth screen lower thresholds leave many more pixels above it
+DENSITIES = [("sparse", 0.9), ("medium", 0.8), ("dense", 0.6), ("flood", 0.4)]
+TEMPLATE_SIZE = 24
+PLANTED_COPIES = 20
+
+
+def legacy_find(image: Any, template: Any, threshold: float) -> List[Tuple[int, int, float]]:
+    """Pre-engine implementation of the peak extraction and suppression"""
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    locations = np.where(result >= threshold)
+    points = list(zip(*locations[::-1]))
+    if not points:
+        return []
+    h, w = template.shape[:2]
+    matches = [(x, y, float(result[y, x])) for x, y in points]
+    matches.sort(key=lambda m: m[2], reverse=True)
+
+    ordered = sorted((x, y) for x, y, _ in matches)
+    kept = [ordered[0]]
+    for x, y in ordered[1:]:
+        prev_x, prev_y = kept[-1]
+        if ((x - prev_x) ** 2 + (y - prev_y) ** 2) ** 0.5 > w * 0.5:
+            kept.append((x, y))
+    kept_set = set(kept)
+    return [(x + w // 2, y + h // 2, s) for x, y, s in matches if (x, y) in kept_set]
+
+
+def engine_find(image: Any, template: Any, threshold: float) -> Any:
+    """Vectorized engine"""
+    return match_template(image, template, threshold)
+
+
+def make_scene(width: int, height: int, seed: int = 0) -> Tuple[Any, Any]:
+    """Create a smooth grayscale screen with planted copies of a patch cut from it"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (height, width), dtype=np.uint8)
+    screen = cv2.normalize(cv2.GaussianBlur(noise, (0, 0), 6), None, 0, 255, cv2.NORM_MINMAX)
+    template = screen[100:100 + TEMPLATE_SIZE, 100:100 + TEMPLATE_SIZE].copy()
+    for _ in range(PLANTED_COPIES):
+        x = int(rng.integers(0, width - TEMPLATE_SIZE))
+        y = int(rng.integers(0, height - TEMPLATE_SIZE))
+        screen[y:y + TEMPLATE_SIZE, x:x + TEMPLATE_SIZE] = template
+    return screen, template
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of several runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    header = f"{'screen':>11} {'density':>8} {'points':>8} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8} {'matches':>8}"
+    print(header)
+    print("-" * len(header))
+    for width, height in SCREEN_SIZES:
+        screen, template = make_scene(width, height)
+        response = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        for label, threshold in DENSITIES:
+            points = int(np.count_nonzero(response >= threshold))
+            legacy = best_time(lambda: legacy_find(screen, template, threshold), args.repeat)
+            engine = best_time(lambda: engine_find(screen, template, threshold), args.repeat)
+            found = len(engine_find(screen, template, threshold))
+            print(f"{width}x{height:<6} {label:>8} {points:8d} {legacy * 1000:10.1f} {engine * 1000:10.1f} "
+                  f"{legacy / engine:7.1f}x {found:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark of the XPath engine.
+
+Builds a synthetic tree (windows of nested panes, each level with a few
+buttons and edits) behind a fake backend whose every prefetch costs a fixed
+latency, standing in for the cross-process round trip of UIA or AT-SPI, and
+measures:
+
+- compile: parsing an expression each time vs the LRU of compiled queries
+- snapshot: queries answered from a TreeSnapshot (capture not included)
+- live: the same queries on the live tree, all matches and the first match
+  with lazy child expansion
+
+Usage:
+    python benchmarks/bench_xpath.py [--depth N] [--fanout N] [--latency SECONDS]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from pyui_automation.backends.base_backend import BaseBackend
+from pyui_automation.elements import CacheRequest
+from pyui_automation.locators.snapshot import TreeSnapshot, read_node_attributes
+from pyui_automation.locators.xpath import LiveView, SnapshotView, XPathQuery, compile_xpath
+
+QUERIES = (
+    "//Button[@Name='Button 3.1']",
+    "//Window[@AutomationId='window2']//Edit[@Name='Edit 4.0']",
+    "//Pane[last()]/Button[1]",
+    "//*[@ClassName='Pane5' and contains(@Name, '.1')]",
+)
+
+
+def round_trip(latency: float) -> None:
+    """Busy-wait for the latency; time.sleep is too coarse for microseconds"""
+    end = time.perf_counter() + latency
+    while time.perf_counter() < end:
+        pass
+
+
+class Node:
+    """Synthetic element"""
+
+    def __init__(self, name: str, control_type: str, automation_id: str = "", class_name: str = "") -> None:
+        self.name = name
+        self.control_type = control_type
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.children: List["Node"] = []
+
+
+def make_tree(windows: int, depth: int, fanout: int) -> Tuple[Node, int]:
+    """Desktop with windows of nested panes; returns the root and the node count"""
+    count = 1
+    root = Node("Desktop", "desktop frame")
+
+    def fill(parent: Node, level: int) -> None:
+        nonlocal count
+        for i in range(fanout):
+            parent.children.append(Node(f"Button {level}.{i}", "button"))
+            parent.children.append(Node(f"Edit {level}.{i}", "edit"))
+            count += 2
+        if level < depth:
+            for i in range(fanout):
+                pane = Node(f"Pane {level}.{i}", "pane", class_name=f"Pane{level}")
+                parent.children.append(pane)
+                count += 1
+                fill(pane, level + 1)
+
+    for w in range(windows):
+        window = Node(f"Window {w}", "window", automation_id=f"window{w}")
+        root.children.append(window)
+        count += 1
+        fill(window, 1)
+    return root, count
+
+
+class Backend:
+    """Backend with the generic prefetch, one round trip per call"""
+
+    get_child_elements = BaseBackend.get_child_elements
+    latency = 0.0
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+
+    def prefetch(self, element: Any, request: CacheRequest) -> List[Tuple[Any, Dict[str, Any]]]:
+        self.round_trips += 1
+        round_trip(self.latency)
+        return BaseBackend.prefetch(self, element, request)
+
+
+def timed(action: Callable[[], Any], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--windows", type=int, default=3, help="top-level windows")
+    parser.add_argument("--depth", type=int, default=6, help="pane nesting depth")
+    parser.add_argument("--fanout", type=int, default=3, help="buttons, edits and panes per level")
+    parser.add_argument("--latency", type=float, default=20e-6, help="seconds per prefetch round trip")
+    args = parser.parse_args()
+
+    root, count = make_tree(args.windows, args.depth, args.fanout)
+    snapshot = TreeSnapshot(root, read_node_attributes)
+    print(f"{count} nodes, snapshot captured in {snapshot.capture_time * 1000:.1f} ms\n")
+
+    repeat = 2000
+    parse = timed(lambda: [XPathQuery(q) for q in QUERIES], repeat) / len(QUERIES)
+    cached = timed(lambda: [compile_xpath(q) for q in QUERIES], repeat) / len(QUERIES)
+    print(f"compile: parse {parse * 1e6:.1f} us, cached {cached * 1e6:.2f} us per expression\n")
+
+    header = f"{'query':<58} {'found':>6} {'snapshot ms':>12} {'live ms':>9} {'trips':>6} {'first ms':>9} {'trips':>6}"
+    print(header)
+    print("-" * len(header))
+    backend = Backend()
+    for expression in QUERIES:
+        query = compile_xpath(expression)
+        found = len(query.evaluate(SnapshotView(snapshot)))
+        on_snapshot = timed(lambda: query.evaluate(SnapshotView(snapshot)), 20)
+
+        Backend.latency = args.latency
+        backend.round_trips = 0
+        live = timed(lambda: query.evaluate(LiveView(backend, root, query.properties)))
+        live_trips = backend.round_trips
+        backend.round_trips = 0
+        first = timed(lambda: query.evaluate(LiveView(backend, root, query.properties), limit=1))
+        first_trips = backend.round_trips
+        Backend.latency = 0.0
+
+        print(f"{expression:<58} {found:>6} {on_snapshot * 1000:>12.2f} {live * 1000:>9.1f} {live_trips:>6} "
+              f"{first * 1000:>9.1f} {first_trips:>6}")
+
+
+if __name__ == "__main__":
+    main()
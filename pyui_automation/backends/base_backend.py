@@ -1,6 +1,6 @@
 # Python imports
 from abc import abstractmethod
-from typing import Optional, List, Any, Tuple, Union
+from typing import Optional, List, Any, Dict, Hashable, Sequence, Tuple, Union
 import numpy as np
 from pathlib import Path
 from logging import getLogger
@@ -9,6 +9,8 @@ from numpy.typing import NDArray
 # Local imports
 from ..core.interfaces import IBackend
 from ..locators.interfaces import IBackendForLocator
+from ..locators.snapshot import node_children, node_key, read_node_attributes
+from ..elements.cache_request import CacheRequest, read_properties
 
 
 class BaseBackend(IBackend, IBackendForLocator):
@@ -160,6 +162,65 @@ class BaseBackend(IBackend, IBackendForLocator):
         """Find elements recursively by property - to be implemented by subclasses"""
         raise NotImplementedError("_find_elements_recursive must be implemented by subclasses")
 
+    def read_tree_node(self, element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+        """
+        Read the snapshot properties and the children of an element.
+
+        Used by TreeSnapshot to walk the tree once. The default probes common
+        attribute names; backends override it with their native properties.
+
+        Args:
+            element: Native element
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], Sequence[Any]]: Values of name, role,
+            automation_id, class_name and description, and the child elements
+        """
+        return read_node_attributes(element)
+
+    def tree_node_key(self, element: Any) -> Hashable:
+        """
+        Key identifying an element across wrapper objects.
+
+        Used by TreeSnapshot.index_of to find elements obtained separately
+        from the snapshot walk. The default uses the UIA runtime id or the
+        AT-SPI object path when present, otherwise the wrapper's identity.
+        """
+        return node_key(element)
+
+    def get_child_elements(self, element: Any) -> List[Any]:
+        """Direct children of a native element; backends override it with their tree walker"""
+        return node_children(element)
+
+    def prefetch(self, element: Any, request: CacheRequest) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Read the properties of a cache request for every node in its scope.
+
+        The default walks the scope with get_child_elements and reads each
+        property with the generic reader; backends override it with a batched
+        native read.
+
+        Args:
+            element: Native element the scope is relative to
+            request: Properties and scope to fetch
+
+        Returns:
+            List[Tuple[Any, Dict[str, Any]]]: Native element and property values
+            of each node, in document order
+        """
+        if request.scope == 'element':
+            nodes = [element]
+        elif request.scope == 'children':
+            nodes = self.get_child_elements(element)
+        else:
+            nodes = []
+            stack = [element]
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                stack.extend(reversed(self.get_child_elements(node)))
+        return [(node, read_properties(node, request.properties)) for node in nodes]
+
     def find_element_by_text(self, text: str) -> Optional[Any]:
         """Find element by text - to be implemented by subclasses"""
         raise NotImplementedError("find_element_by_text must be implemented by subclasses")
@@ -2,9 +2,12 @@
 # Python libraries
 import sys
 import platform
-from typing import Optional, List, Tuple, Any, Union
+import ctypes
+import ctypes.util
+import threading
+from typing import Optional, List, Dict, Sequence, Tuple, Any, Union, Callable
+import cv2
 import numpy as np
-from PIL import Image
 import subprocess
 
 # Linux-specific libraries
@@ -23,18 +26,402 @@ except ImportError:
 
 # Local libraries
 from .base_backend import BaseBackend
+from ..elements.cache_request import CacheRequest, rectangle
+
+# Bytes per pixel of a 24/32-bit ZPixmap XImage (B, G, R, padding)
+XIMAGE_PIXEL_BYTES = 4
+
+
+def ximage_to_array(data: Any, width: int, height: int, copy: bool = True) -> np.ndarray:
+    """
+    Convert the pixel data of a ZPixmap XImage to a BGR array.
+
+    The buffer is viewed as rows of BGRX pixels (rows may be padded), and the
+    BGR channels are selected as a strided view of it. The copy is made with
+    cvtColor, which drops the padding byte several times faster than a numpy
+    copy of the strided view; with copy=False the view itself is returned.
+
+    Args:
+        data: XImage pixel buffer (bytes or any buffer object)
+        width: Image width in pixels
+        height: Image height in pixels
+        copy: Return an owned C-contiguous array; False returns a zero-copy
+            view of the buffer, read-only if data is bytes
+
+    Returns:
+        np.ndarray: (height, width, 3) uint8 BGR image
+
+    Raises:
+        ValueError: If the buffer is too small for 32 bits per pixel
+    """
+    pixels = np.frombuffer(data, dtype=np.uint8)
+    row_bytes = pixels.size // height if height else 0
+    if row_bytes < width * XIMAGE_PIXEL_BYTES:
+        raise ValueError(f"XImage buffer of {pixels.size} bytes is not {width}x{height} at 32 bits per pixel")
+    rows = pixels[:row_bytes * height].reshape(height, row_bytes)
+    bgrx = rows[:, :width * XIMAGE_PIXEL_BYTES].reshape(height, width, XIMAGE_PIXEL_BYTES)
+    return cv2.cvtColor(bgrx, cv2.COLOR_BGRA2BGR) if copy else bgrx[..., :3]
+
+
+class _XImage(ctypes.Structure):
+    """Leading fields of Xlib's XImage (the function table that follows is not used)"""
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    """Xlib's XShmSegmentInfo"""
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+# X11 and System V IPC constants
+_ZPIXMAP = 2
+_ALL_PLANES = 0xffffffff
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+# Set by the error handler; Xlib's default handler would exit the process instead
+_x_error_seen = threading.Event()
+# The error handler is process-wide, so only one checked request runs at a time
+_x_error_lock = threading.Lock()
+
+
+@_X_ERROR_HANDLER
+def _record_x_error(_display: Any, _event: Any) -> int:
+    _x_error_seen.set()
+    return 0
+
+
+class XShmGrabber:
+    """
+    Screen grabber using the MIT-SHM extension.
+
+    Keeps one shared-memory segment sized to the screen, attached to both this
+    process and the X server. XShmGetImage makes the server copy the screen
+    straight into it, with no image data on the X socket, and the frame is a
+    NumPy view of the segment. Talks to libX11/libXext through ctypes, as
+    python-xlib does not implement MIT-SHM.
+    """
+
+    def __init__(self, display_name: Optional[str] = None) -> None:
+        """
+        Connect to the X server and attach the shared-memory segment.
+
+        Args:
+            display_name: X display (e.g. ":99"); None uses $DISPLAY
+
+        Raises:
+            RuntimeError: If libX11/libXext are missing, the display cannot be
+                opened, MIT-SHM is unavailable (e.g. a remote display) or the
+                screen is not 32 bits per pixel
+        """
+        self._lock = threading.RLock()
+        self._display = None
+        self._image = None
+        # Region-sized XImage over the same segment, kept for repeated captures of one size
+        self._region_image = None
+        self._region_size = (0, 0)
+        self._info = _XShmSegmentInfo(shmid=-1)
+        self._x11, self._xext, self._libc = self._load_libraries()
+        try:
+            self._attach(display_name)
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def create(cls, display_name: Optional[str] = None) -> Optional["XShmGrabber"]:
+        """Create a grabber, or return None if shared-memory capture is not available"""
+        try:
+            return cls(display_name)
+        except (RuntimeError, OSError, AttributeError):
+            return None
+
+    @staticmethod
+    def _load_libraries() -> Tuple[Any, Any, Any]:
+        """Load libX11, libXext and libc and declare the functions used"""
+        paths = [ctypes.util.find_library(name) for name in ("X11", "Xext", "c")]
+        if not all(paths):
+            raise RuntimeError("libX11, libXext or libc not found")
+        x11, xext, libc = (ctypes.CDLL(path) for path in paths)
+        void_p, c_int, c_uint, c_ulong = ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong
+        signatures = [
+            (x11.XOpenDisplay, [ctypes.c_char_p], void_p),
+            (x11.XCloseDisplay, [void_p], c_int),
+            (x11.XDefaultScreen, [void_p], c_int),
+            (x11.XRootWindow, [void_p, c_int], c_ulong),
+            (x11.XDefaultVisual, [void_p, c_int], void_p),
+            (x11.XDefaultDepth, [void_p, c_int], c_int),
+            (x11.XDisplayWidth, [void_p, c_int], c_int),
+            (x11.XDisplayHeight, [void_p, c_int], c_int),
+            (x11.XSync, [void_p, c_int], c_int),
+            (x11.XGetGeometry, [void_p, c_ulong, ctypes.POINTER(c_ulong), ctypes.POINTER(c_int), ctypes.POINTER(c_int),
+                                ctypes.POINTER(c_uint), ctypes.POINTER(c_uint), ctypes.POINTER(c_uint),
+                                ctypes.POINTER(c_uint)], c_int),
+            (x11.XFree, [void_p], c_int),
+            (x11.XSetErrorHandler, [void_p], void_p),
+            (xext.XShmQueryExtension, [void_p], c_int),
+            (xext.XShmCreateImage, [void_p, void_p, c_uint, c_int, void_p, ctypes.POINTER(_XShmSegmentInfo), c_uint, c_uint],
+             ctypes.POINTER(_XImage)),
+            (xext.XShmAttach, [void_p, ctypes.POINTER(_XShmSegmentInfo)], c_int),
+            (xext.XShmDetach, [void_p, ctypes.POINTER(_XShmSegmentInfo)], c_int),
+            (xext.XShmGetImage, [void_p, c_ulong, ctypes.POINTER(_XImage), c_int, c_int, c_ulong], c_int),
+            (libc.shmget, [c_int, ctypes.c_size_t, c_int], c_int),
+            (libc.shmat, [c_int, void_p, c_int], void_p),
+            (libc.shmdt, [void_p], c_int),
+            (libc.shmctl, [c_int, c_int, void_p], c_int),
+        ]
+        for func, argtypes, restype in signatures:
+            func.argtypes = argtypes
+            func.restype = restype
+        return x11, xext, libc
+
+    def _attach(self, display_name: Optional[str]) -> None:
+        """Open the display, create the shared image and attach it to the server"""
+        x11, xext, libc = self._x11, self._xext, self._libc
+        self._display = x11.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise RuntimeError("Cannot open X display")
+        if not xext.XShmQueryExtension(self._display):
+            raise RuntimeError("MIT-SHM extension is not available")
+        screen = x11.XDefaultScreen(self._display)
+        self._root = x11.XRootWindow(self._display, screen)
+        self._visual = x11.XDefaultVisual(self._display, screen)
+        self._depth = x11.XDefaultDepth(self._display, screen)
+        self.width = x11.XDisplayWidth(self._display, screen)
+        self.height = x11.XDisplayHeight(self._display, screen)
+        self._image = self._create_image(self.width, self.height)
+        image = self._image.contents
+        if image.bits_per_pixel != 32:
+            raise RuntimeError(f"Unsupported screen format: {image.bits_per_pixel} bits per pixel")
+
+        size = image.bytes_per_line * image.height
+        self._info.shmid = libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if self._info.shmid < 0:
+            raise RuntimeError("shmget failed")
+        address = libc.shmat(self._info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            raise RuntimeError("shmat failed")
+        self._info.shmaddr = address
+        self._info.readOnly = 0
+        image.data = address
+
+        # XShmAttach has no reply, so XSync is needed to see its errors
+        attached = self._checked(lambda: xext.XShmAttach(self._display, ctypes.byref(self._info)), sync=True)
+        # Marked for removal now, so the segment is freed once both sides detach
+        libc.shmctl(self._info.shmid, _IPC_RMID, None)
+        if not attached:
+            self._info.shmseg = 0
+            raise RuntimeError("XShmAttach failed (is the X server remote?)")
+
+        self._segment = np.frombuffer((ctypes.c_ubyte * size).from_address(address), dtype=np.uint8)
+        self._frame = self._view(image)
+
+    def _checked(self, request: Callable[[], int], sync: bool = False) -> bool:
+        """
+        Run an X request under the recording error handler.
+
+        Errors are recorded instead of reaching Xlib's default handler, which
+        would exit the process, and the previous handler is put back afterwards.
+
+        Args:
+            request: Call issuing the request; returns the Xlib status
+            sync: XSync before restoring the handler, for requests without a
+                reply whose errors would otherwise arrive later
+
+        Returns:
+            bool: True if the request succeeded and the server reported no error
+        """
+        x11 = self._x11
+        with _x_error_lock:
+            _x_error_seen.clear()
+            previous = x11.XSetErrorHandler(ctypes.cast(_record_x_error, ctypes.c_void_p))
+            try:
+                status = request()
+                if sync:
+                    x11.XSync(self._display, 0)
+            finally:
+                x11.XSetErrorHandler(previous)
+            return bool(status) and not _x_error_seen.is_set()
+
+    def _capture_limits(self) -> Tuple[int, int]:
+        """
+        Largest capturable size: the current root size, bounded by the segment.
+
+        The root is queried on every capture, so a resolution change since the
+        segment was created cannot turn into a BadMatch.
+
+        Raises:
+            RuntimeError: If the root geometry cannot be read
+        """
+        root, x, y = ctypes.c_ulong(), ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = (ctypes.c_uint() for _ in range(4))
+        args = [ctypes.byref(value) for value in (root, x, y, width, height, border, depth)]
+        if not self._checked(lambda: self._x11.XGetGeometry(self._display, self._root, *args)):
+            raise RuntimeError("XGetGeometry failed")
+        return min(width.value, self.width), min(height.value, self.height)
+
+    def _image_for(self, width: int, height: int) -> Any:
+        """Screen-sized XImage or the cached region XImage of a size; the caller holds the lock"""
+        if (width, height) == (self.width, self.height):
+            return self._image
+        if self._region_size != (width, height):
+            self._free_region_image()
+            self._region_image = self._create_image(width, height)
+            self._region_size = (width, height)
+        return self._region_image
+
+    def _get_image(self, image: Any, x: int, y: int) -> None:
+        """
+        XShmGetImage into an XImage over the segment; the caller holds the lock.
+
+        XShmGetImage waits for its reply, so its errors reach the recording
+        handler before it returns and no XSync is needed.
+
+        Raises:
+            RuntimeError: If the server rejects the request
+        """
+        if not self._checked(lambda: self._xext.XShmGetImage(self._display, self._root, image, x, y, _ALL_PLANES)):
+            raise RuntimeError("XShmGetImage failed")
+
+    def _create_image(self, width: int, height: int) -> Any:
+        """XImage of a given size over the shared segment (the segment is sized to the screen)"""
+        image = self._xext.XShmCreateImage(
+            self._display, self._visual, self._depth, _ZPIXMAP, None, ctypes.byref(self._info), width, height
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage failed")
+        image.contents.data = self._info.shmaddr
+        return image
+
+    def _view(self, image: _XImage) -> np.ndarray:
+        """(height, width, 4) BGRX view of the segment as laid out by an XImage"""
+        rows = self._segment[:image.bytes_per_line * image.height].reshape(image.height, image.bytes_per_line)
+        return rows[:, :image.width * XIMAGE_PIXEL_BYTES].reshape(image.height, image.width, XIMAGE_PIXEL_BYTES)
+
+    def grab(self) -> np.ndarray:
+        """
+        Capture the whole screen into the shared segment.
+
+        If the screen shrank since the grabber was created, only the current
+        screen is captured; if it grew, only the part the segment can hold.
+
+        Returns:
+            np.ndarray: (height, width, 4) BGRX view of the segment; it is
+            overwritten by the next grab or capture, so copy what must be kept
+
+        Raises:
+            RuntimeError: If the grabber is closed or the capture fails
+        """
+        with self._lock:
+            if self._image is None or self._info.shmseg == 0:
+                raise RuntimeError("XShmGrabber is closed")
+            image = self._image_for(*self._capture_limits())
+            self._get_image(image, 0, 0)
+            return self._frame if image is self._image else self._view(image.contents)
+
+    def capture(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        """
+        Capture a screen region as an independent BGR array.
+
+        The server copies only the region, into the start of the segment,
+        through an XImage of the region's size.
+
+        Args:
+            x: X coordinate of the region
+            y: Y coordinate of the region
+            width: Width of the region
+            height: Height of the region
+
+        Returns:
+            Optional[np.ndarray]: Contiguous BGR image, or None if the region
+            is not inside the current screen (and the segment)
+
+        Raises:
+            RuntimeError: If the grabber is closed or the capture fails
+        """
+        if x < 0 or y < 0 or width <= 0 or height <= 0:
+            return None
+        with self._lock:
+            if self._image is None or self._info.shmseg == 0:
+                raise RuntimeError("XShmGrabber is closed")
+            max_width, max_height = self._capture_limits()
+            if x + width > max_width or y + height > max_height:
+                return None
+            image = self._image_for(width, height)
+            self._get_image(image, x, y)
+            return cv2.cvtColor(self._view(image.contents), cv2.COLOR_BGRA2BGR)
+
+    def _free_region_image(self) -> None:
+        """Release the region XImage structure; the caller holds the lock"""
+        if self._region_image:
+            self._x11.XFree(self._region_image)
+        self._region_image = None
+        self._region_size = (0, 0)
+
+    def close(self) -> None:
+        """Detach and free the shared segment and close the display"""
+        with self._lock:
+            if self._display and self._info.shmseg:
+                self._xext.XShmDetach(self._display, ctypes.byref(self._info))
+                self._x11.XSync(self._display, 0)
+            self._info.shmseg = 0
+            self._free_region_image()
+            if self._info.shmaddr:
+                self._libc.shmdt(self._info.shmaddr)
+                self._info.shmaddr = None
+            if self._image:
+                # XFree releases only the structure; XDestroyImage would free() the shared data
+                self._x11.XFree(self._image)
+                self._image = None
+            if self._display:
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
 
 
 class LinuxBackend(BaseBackend):
     """Linux-specific implementation using AT-SPI2"""
 
-    def __init__(self) -> None:
+    # Shared-memory grabber, set up by initialize() when MIT-SHM is available
+    _shm: Optional[XShmGrabber] = None
+
+    def __init__(self, use_shm: bool = True) -> None:
         """
         Initialize the Linux UI Automation backend.
 
         This method creates a connection to the X server, gets the screen
         dimensions, and starts the AT-SPI registry.
 
+        Args:
+            use_shm: Capture through the MIT-SHM extension when the X server
+                supports it; otherwise every capture is a GetImage round trip
+
         Raises:
             RuntimeError: If initialization fails due to any reason.
         """
@@ -50,6 +437,7 @@ class LinuxBackend(BaseBackend):
         self.registry = None
         self._current_app = None
         self._ocr_languages = []
+        self._use_shm = use_shm
         # Инициализация будет выполнена в initialize()
 
     def initialize(self) -> None:
@@ -59,6 +447,8 @@ class LinuxBackend(BaseBackend):
             self.screen = self.display.screen()
             self.registry = pyatspi.Registry
             self.registry.start()
+            if self._use_shm:
+                self._shm = XShmGrabber.create()
             self._initialized = True
             self._logger.info("Linux UI Automation backend initialized successfully")
         except Exception as e:
@@ -79,6 +469,98 @@ class LinuxBackend(BaseBackend):
         """
         return self._current_app
 
+    @property
+    def root(self) -> Any:
+        """
+        Get the root element.
+
+        Returns:
+            The AT-SPI desktop accessible
+        """
+        return pyatspi.Registry.getDesktop(0)
+
+    def read_tree_node(self, element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+        """
+        Read the snapshot properties and the children of an AT-SPI accessible.
+
+        The automation id and class come from the object attributes that
+        toolkits export ("id" / "accessible-id" and "class").
+
+        Args:
+            element: AT-SPI accessible
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], Sequence[Any]]: Properties and children
+        """
+        attributes = self._object_attributes(element)
+        properties = {
+            'name': element.name,
+            'role': element.getRoleName(),
+            'automation_id': attributes.get('id') or attributes.get('accessible-id'),
+            'class_name': attributes.get('class'),
+            'description': element.description,
+        }
+        return properties, self.get_child_elements(element)
+
+    @staticmethod
+    def _object_attributes(element: Any) -> Dict[str, str]:
+        """Object attributes of an accessible as a dict (AT-SPI returns "key:value" strings)"""
+        attributes = {}
+        for attribute in element.getAttributes() or []:
+            key, _, value = attribute.partition(':')
+            attributes[key] = value
+        return attributes
+
+    def get_child_elements(self, element: Any) -> List[Any]:
+        """Direct children of an AT-SPI accessible"""
+        children = [element.getChildAtIndex(i) for i in range(element.childCount)]
+        return [child for child in children if child is not None]
+
+    def prefetch(self, element: Any, request: CacheRequest) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Read the properties of a cache request for every node in its scope.
+
+        AT-SPI has no cache requests, so they are emulated by reading each
+        source of properties once per node instead of once per property:
+        one getAttributes() for the automation id and class, one getState()
+        for enabled and showing, and one getExtents() for the bounds.
+
+        Args:
+            element: AT-SPI accessible the scope is relative to
+            request: Properties and scope to fetch
+
+        Returns:
+            List[Tuple[Any, Dict[str, Any]]]: Accessible and property values of
+            each node, in document order
+        """
+        wanted = set(request.properties)
+        results = []
+        for node, _ in super().prefetch(element, CacheRequest((), request.scope)):
+            values: Dict[str, Any] = {}
+            try:
+                if 'name' in wanted:
+                    values['name'] = node.name
+                if 'description' in wanted:
+                    values['description'] = node.description
+                if wanted & {'control_type', 'role'}:
+                    values['control_type'] = values['role'] = node.getRoleName()
+                if wanted & {'automation_id', 'class_name'}:
+                    attributes = self._object_attributes(node)
+                    values['automation_id'] = attributes.get('id') or attributes.get('accessible-id')
+                    values['class_name'] = attributes.get('class')
+                if wanted & {'is_enabled', 'is_offscreen'}:
+                    states = node.getState()
+                    values['is_enabled'] = bool(states.contains(pyatspi.STATE_ENABLED))
+                    values['is_offscreen'] = not states.contains(pyatspi.STATE_SHOWING)
+                if 'bounding_rectangle' in wanted:
+                    values['bounding_rectangle'] = rectangle(
+                        node.queryComponent().getExtents(pyatspi.DESKTOP_COORDS)
+                    )
+            except Exception as e:
+                self._logger.debug(f"Failed to prefetch accessible properties: {e}")
+            results.append((node, {prop: values.get(prop) for prop in request.properties}))
+        return results
+
     def get_active_window(self) -> Optional[Any]:
         """
         Get the currently active window
@@ -94,29 +576,44 @@ class LinuxBackend(BaseBackend):
                 return app.id
         return None
 
-    def capture_screen_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+    def capture_screen_region(
+        self, x: int, y: int, width: int, height: int, copy: bool = True
+    ) -> Optional[np.ndarray]:
         """
         Capture screenshot of specific screen region
 
+        With MIT-SHM the screen is read from the shared segment and the region
+        is returned as an independent BGR array (the segment is reused by the
+        next capture). Otherwise the GetImage XImage buffer is converted with
+        ximage_to_array; copy=False skips the copy and returns a read-only BGR
+        view of it, for callers that only read the pixels.
+
         Args:
             x: X coordinate of the region
             y: Y coordinate of the region
             width: Width of the region
             height: Height of the region
+            copy: Return an owned array; False allows a read-only view
 
         Returns:
-            Screenshot of the region as numpy array if successful, None otherwise
+            Screenshot of the region as BGR numpy array if successful, None otherwise
         """
         try:
             if width <= 0 or height <= 0:
                 return None
+            if self._shm is not None:
+                try:
+                    image = self._shm.capture(x, y, width, height)
+                except (RuntimeError, OSError):
+                    image = None
+                if image is not None:
+                    return image
             if X is None:
                 return None
-                
+
             root = self.display.screen().root
             raw = root.get_image(x, y, width, height, X.ZPixmap, 0xffffffff)
-            image = Image.frombytes("RGB", (width, height), raw.data, "raw", "BGRX")
-            return np.array(image)
+            return ximage_to_array(raw.data, width, height, copy)
         except Exception:
             return None
 
@@ -403,6 +900,9 @@ class LinuxBackend(BaseBackend):
 
     def cleanup(self) -> None:
         """Clean up resources"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
         if hasattr(self, 'display'):
             self.display.close()
         self.registry.stop()
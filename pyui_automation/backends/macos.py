@@ -1,6 +1,6 @@
 # type: ignore
 # Python libraries
-from typing import Optional, List, Tuple, Union, Any
+from typing import Optional, List, Dict, Hashable, Sequence, Tuple, Union, Any
 import numpy as np
 from PIL import Image
 import platform
@@ -449,6 +449,33 @@ class MacOSBackend(BaseBackend):
         except Exception:
             return None
 
+    def read_tree_node(self, element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+        """
+        Read the snapshot properties and the children of an AX element.
+
+        Args:
+            element: AX UI element
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], Sequence[Any]]: Properties and children
+        """
+        properties = {
+            'name': self._get_attribute(element, 'AXTitle'),
+            'role': self._get_attribute(element, 'AXRole'),
+            'automation_id': self._get_attribute(element, 'AXIdentifier'),
+            'class_name': self._get_attribute(element, 'AXSubrole'),
+            'description': self._get_attribute(element, 'AXDescription'),
+        }
+        return properties, self.get_child_elements(element)
+
+    def tree_node_key(self, element: Any) -> Hashable:
+        """The AX element itself: AXUIElementRefs hash and compare with CFHash/CFEqual"""
+        return element
+
+    def get_child_elements(self, element: Any) -> List[Any]:
+        """Direct children of an AX element"""
+        return list(self._get_attribute(element, 'AXChildren') or [])
+
     def _set_attribute(self, element: Any, attribute: str, value: Any) -> bool:
         """
         Set attribute value on element
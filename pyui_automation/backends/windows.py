@@ -1,5 +1,5 @@
 # Windows API
-from typing import Any, Optional, Union, List, Tuple, Dict
+from typing import Any, Optional, Union, List, Tuple, Dict, Hashable, Sequence
 
 from numpy.typing import NDArray
 try:
@@ -30,10 +30,24 @@ from logging import getLogger
 # Local imports
 from ..elements.base_element import BaseElement
 from .base_backend import BaseBackend
+from ..elements.cache_request import CacheRequest, rectangle
 
 
 UIAutomationClient = None
 
+# Cache request properties: UIA property id and the Cached* accessor of its value
+_UIA_CACHED_PROPERTIES = {
+    'name': (UIAClient.UIA_NamePropertyId, 'CachedName'),
+    'automation_id': (UIAClient.UIA_AutomationIdPropertyId, 'CachedAutomationId'),
+    'class_name': (UIAClient.UIA_ClassNamePropertyId, 'CachedClassName'),
+    'control_type': (UIAClient.UIA_ControlTypePropertyId, 'CachedControlType'),
+    'role': (UIAClient.UIA_LocalizedControlTypePropertyId, 'CachedLocalizedControlType'),
+    'description': (UIAClient.UIA_HelpTextPropertyId, 'CachedHelpText'),
+    'is_enabled': (UIAClient.UIA_IsEnabledPropertyId, 'CachedIsEnabled'),
+    'is_offscreen': (UIAClient.UIA_IsOffscreenPropertyId, 'CachedIsOffscreen'),
+    'bounding_rectangle': (UIAClient.UIA_BoundingRectanglePropertyId, 'CachedBoundingRectangle'),
+}
+
 
 class WindowsBackend(BaseBackend):
     """Windows UI Automation backend"""
@@ -71,6 +85,84 @@ class WindowsBackend(BaseBackend):
         """
         return self._root
 
+    def read_tree_node(self, element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+        """
+        Read the snapshot properties and the children of a UI Automation element.
+
+        Children are enumerated with the control view walker, so the snapshot
+        matches what FindFirst/FindAll see in the control view.
+
+        Args:
+            element: IUIAutomationElement
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], Sequence[Any]]: Properties and children
+        """
+        properties = {
+            'name': element.CurrentName,
+            'role': element.CurrentLocalizedControlType or str(element.CurrentControlType),
+            'automation_id': element.CurrentAutomationId,
+            'class_name': element.CurrentClassName,
+            'description': element.CurrentHelpText,
+        }
+        return properties, self.get_child_elements(element)
+
+    def tree_node_key(self, element: Any) -> Hashable:
+        """Runtime id of a UI Automation element, unique while the element exists"""
+        runtime_id = tuple(element.GetRuntimeId() or ())
+        return ('runtime_id', runtime_id) if runtime_id else ('id', id(element))
+
+    def get_child_elements(self, element: Any) -> List[Any]:
+        """Direct children of a UI Automation element in the control view"""
+        walker = self.automation.ControlViewWalker
+        children = []
+        child = walker.GetFirstChildElement(element)
+        while child:
+            children.append(child)
+            child = walker.GetNextSiblingElement(child)
+        return children
+
+    def prefetch(self, element: Any, request: CacheRequest) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Read the properties of a cache request for every node in its scope.
+
+        Builds a native IUIAutomationCacheRequest, so UI Automation returns all
+        requested properties of all nodes in one cross-process call
+        (BuildUpdatedCache for the element, FindAllBuildCache otherwise) and the
+        values are read from the Cached* accessors without further calls.
+        The request's view selects the control view (as the ControlViewWalker
+        of read_tree_node) or the raw view (as GetChildren).
+
+        Args:
+            element: IUIAutomationElement the scope is relative to
+            request: Properties and scope to fetch
+
+        Returns:
+            List[Tuple[Any, Dict[str, Any]]]: Element and property values of
+            each node, in document order
+        """
+        cache = self.automation.CreateCacheRequest()
+        for prop in request.properties:
+            cache.AddProperty(_UIA_CACHED_PROPERTIES[prop][0])
+        if request.view == 'raw':
+            view = self.automation.RawViewCondition
+        else:
+            view = self.automation.ControlViewCondition
+        cache.TreeFilter = view
+        if request.scope == 'element':
+            nodes = [element.BuildUpdatedCache(cache)]
+        else:
+            scope = UIAClient.TreeScope_Children if request.scope == 'children' else UIAClient.TreeScope_Subtree
+            found = element.FindAllBuildCache(scope, view, cache)
+            nodes = [found.GetElement(i) for i in range(found.Length)] if found else []
+        results = []
+        for node in nodes:
+            values = {prop: getattr(node, _UIA_CACHED_PROPERTIES[prop][1]) for prop in request.properties}
+            if 'bounding_rectangle' in values:
+                values['bounding_rectangle'] = rectangle(values['bounding_rectangle'])
+            results.append((node, values))
+        return results
+
     def initialize(self) -> None:
         """Initialize Windows UI Automation backend"""
         try:
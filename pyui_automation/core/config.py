@@ -5,6 +5,8 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List, Union
 from pathlib import Path
 
+from ..utils.comparison import available_engines
+
 
 @dataclass
 class AutomationConfig:
@@ -13,6 +15,8 @@ class AutomationConfig:
     # Screenshot settings
     screenshot_format: str = "png"
     screenshot_quality: int = 90
+    # Seconds a full-screen capture is shared between capture requests; 0 disables
+    screenshot_cache_ttl: float = 0.05
     _screenshot_dir: Optional[Path] = field(init=False, default=None)
 
     # Visual testing settings
@@ -124,7 +128,7 @@ class AutomationConfig:
         if self.screenshot_format not in valid_screenshot_formats:
             raise ValueError(f"Invalid screenshot format. Must be one of: {valid_screenshot_formats}")
 
-        valid_visual_algorithms = ["ssim", "mse", "hash"]
+        valid_visual_algorithms = available_engines()
         if self.visual_algorithm not in valid_visual_algorithms:
             raise ValueError(f"Invalid visual algorithm. Must be one of: {valid_visual_algorithms}")
 
@@ -9,12 +9,13 @@ Responsible for:
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Union, Tuple, TYPE_CHECKING
+from typing import Optional, Union, Tuple, Dict, Sequence, TYPE_CHECKING
 from pathlib import Path
 import numpy as np
 
 if TYPE_CHECKING:
     from ...elements.base_element import BaseElement
+    from ...utils.matching import TemplateMatchResult
 
 
 class IVisualTestingService(ABC):
@@ -36,7 +37,7 @@ class IVisualTestingService(ABC):
         pass
     
     @abstractmethod
-    def verify_visual(self, name: str, element: Optional["BaseElement"] = None) -> Tuple[bool, float]:
+    def verify_visual(self, name: str, element: Optional["BaseElement"] = None, tiered: bool = True) -> Tuple[bool, float]:
         """Verify visual state against baseline"""
         pass
     
@@ -66,12 +67,22 @@ class IVisualTestingService(ABC):
         pass
     
     @abstractmethod
-    def find_all_elements(self, template: np.ndarray, threshold: float = 0.8) -> list:
+    def load_templates(self, template_dir: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None, pyramid_levels: Sequence[int] = ()) -> int:
+        """Load a directory of templates so they can be found by name"""
+        pass
+    
+    @abstractmethod
+    def find_all_elements(self, template: Union[np.ndarray, str], threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> list:
         """Find all elements matching template"""
         pass
     
     @abstractmethod
-    def wait_for_image(self, template: np.ndarray, timeout: float = 10) -> bool:
+    def find_templates_batch(self, templates: Union[Dict[str, np.ndarray], Sequence[str]], threshold: float = 0.8, element: Optional["BaseElement"] = None, max_workers: Optional[int] = None, roi: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, "TemplateMatchResult"]:
+        """Find several templates in a single capture"""
+        pass
+    
+    @abstractmethod
+    def wait_for_image(self, template: Union[np.ndarray, str], timeout: float = 10, threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> bool:
         """Wait for image to appear"""
         pass
     
@@ -5,9 +5,10 @@ Responsible for:
 - Finding elements using locator strategies
 - Finding elements by various criteria
 - Element search with timeouts
+- Tree snapshots answering repeated searches in process
 """
 
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Optional, List, TYPE_CHECKING
 from logging import getLogger
 
 if TYPE_CHECKING:
@@ -18,6 +19,7 @@ if TYPE_CHECKING:
 # Local imports
 from ...elements.base_element import BaseElement
 from ...locators.base import LocatorStrategy
+from ...locators.snapshot import DEFAULT_MAX_AGE, TreeSnapshot
 from ..interfaces.ielement_discovery_service import IElementDiscoveryService
 
 
@@ -30,6 +32,37 @@ class ElementDiscoveryService(IElementDiscoveryService):
         self._session = session
         self._logger = getLogger(__name__)
     
+    def snapshot_tree(
+        self,
+        root: Optional[Any] = None,
+        max_depth: Optional[int] = None,
+        max_age: float = DEFAULT_MAX_AGE
+    ) -> TreeSnapshot:
+        """
+        Read the element tree once; later searches are answered from the snapshot.
+
+        Args:
+            root: Native element to snapshot below; defaults to the backend root
+            max_depth: Deepest level read below root; None reads everything
+            max_age: Seconds before the snapshot is refreshed on use
+
+        Returns:
+            TreeSnapshot: The snapshot used by the locator
+        """
+        snapshot = self._locator.snapshot(root, max_depth, max_age)
+        self._logger.debug(f"Tree snapshot of {len(snapshot)} elements read in {snapshot.capture_time:.3f}s")
+        return snapshot
+
+    def invalidate_snapshot(self) -> None:
+        """Refresh the tree snapshot, if any, before the next search"""
+        snapshot = getattr(self._locator, 'current_snapshot', None)
+        if snapshot is not None:
+            snapshot.invalidate()
+
+    def clear_snapshot(self) -> None:
+        """Search the live tree again"""
+        self._locator.clear_snapshot()
+    
     def find_element(self, strategy: LocatorStrategy) -> Optional[BaseElement]:
         """Find element using locator strategy"""
         try:
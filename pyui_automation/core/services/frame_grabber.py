@@ -0,0 +1,250 @@
+"""
+Frame Grabber - continuous background screen capture.
+
+Captures the screen at a fixed rate on a background thread into a ring of
+preallocated NumPy arrays, so waits, visual checks and OCR read recent frames
+instead of each paying for a capture. Memory is bounded by ring_size frames.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+DEFAULT_FPS = 30.0
+DEFAULT_RING_SIZE = 8
+
+
+@dataclass
+class Frame:
+    """
+    A captured frame; times are time.monotonic() values.
+
+    timestamp is taken after the capture and started before it, so the screen
+    shown may be from any moment in between.
+    """
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    started: float
+
+
+class FrameGrabber:
+    """Background capture loop writing into a fixed ring of frame buffers"""
+
+    def __init__(
+        self,
+        capture: Callable[[], Optional[np.ndarray]],
+        fps: float = DEFAULT_FPS,
+        ring_size: int = DEFAULT_RING_SIZE
+    ) -> None:
+        """
+        Initialize the grabber; capturing starts with start().
+
+        Args:
+            capture: Function returning the current screen (e.g. the backend's
+                capture_screenshot), or None on failure
+            fps: Target capture rate in frames per second
+            ring_size: Number of frames kept; older frames are overwritten
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        if ring_size < 2:
+            raise ValueError("ring_size must be at least 2")
+        self._capture = capture
+        self.fps = fps
+        self.ring_size = ring_size
+        self._logger = getLogger(__name__)
+        self._ring: List[np.ndarray] = []
+        self._seqs = np.zeros(ring_size, dtype=np.int64)
+        self._timestamps = np.zeros(ring_size, dtype=np.float64)
+        self._started = np.zeros(ring_size, dtype=np.float64)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.errors = 0
+
+    def start(self) -> "FrameGrabber":
+        """Start the capture thread; does nothing if it is already running"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="frame-grabber", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """Stop the capture thread; captured frames stay readable"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            self._condition.notify_all()
+
+    @property
+    def running(self) -> bool:
+        """Whether the capture thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest frame; 0 before the first frame"""
+        return self._seq
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the ring buffers"""
+        return sum(buffer.nbytes for buffer in self._ring)
+
+    def latest_frame(self, copy: bool = True) -> Optional[Frame]:
+        """
+        Get the newest frame.
+
+        Args:
+            copy: Return a copy of the image. Without it the image is a view of
+                a ring buffer that is overwritten after ring_size more frames.
+
+        Returns:
+            Optional[Frame]: The newest frame, or None before the first capture
+            and while the ring is reallocated after a resolution change
+        """
+        with self._condition:
+            slot = self._newest_slot()
+            if slot is None:
+                return None
+            return self._frame(slot, copy)
+
+    def frame_at(self, timestamp: float, copy: bool = True) -> Optional[Frame]:
+        """
+        Get the frame showing the screen at a moment.
+
+        Args:
+            timestamp: time.monotonic() value
+            copy: Return a copy of the image (see latest_frame)
+
+        Returns:
+            Optional[Frame]: The newest frame captured at or before the timestamp,
+            or None if that frame has already been overwritten
+        """
+        with self._condition:
+            valid = self._valid_slots()
+            candidates = valid[self._timestamps[valid] <= timestamp]
+            if candidates.size == 0:
+                return None
+            return self._frame(int(candidates[np.argmax(self._seqs[candidates])]), copy)
+
+    def frames_since(self, seq: int, copy: bool = True) -> List[Frame]:
+        """
+        Get the frames captured after a sequence number that are still in the ring.
+
+        Args:
+            seq: Sequence number of the last frame already seen (0 for all)
+            copy: Return copies of the images (see latest_frame)
+
+        Returns:
+            List[Frame]: Frames oldest first; frames already overwritten are skipped
+        """
+        with self._condition:
+            valid = self._valid_slots()
+            slots = valid[self._seqs[valid] > seq]
+            slots = slots[np.argsort(self._seqs[slots])]
+            return [self._frame(int(slot), copy) for slot in slots]
+
+    def wait_for_frame(self, after_seq: int = 0, timeout: Optional[float] = None, copy: bool = True) -> Optional[Frame]:
+        """
+        Wait for a frame newer than a sequence number.
+
+        Args:
+            after_seq: Sequence number of the last frame already seen
+            timeout: Maximum time to wait in seconds; None waits until stopped
+            copy: Return a copy of the image (see latest_frame)
+
+        Returns:
+            Optional[Frame]: The newest frame, or None on timeout or when stopped
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: (self._seq > after_seq and self._newest_slot() is not None) or self._stop.is_set(), timeout
+            )
+            slot = self._newest_slot()
+            if self._seq <= after_seq or slot is None:
+                return None
+            return self._frame(slot, copy)
+
+    def _newest_slot(self) -> Optional[int]:
+        """
+        Ring slot of the newest frame; the caller holds the condition.
+
+        None before the first frame and after a resolution change until the
+        first frame of the new size is stored: the sequence number carries on
+        across the reallocation, but the old frames are gone.
+        """
+        slot = self._seq % self.ring_size
+        if self._seq == 0 or self._seqs[slot] != self._seq:
+            return None
+        return slot
+
+    def _valid_slots(self) -> np.ndarray:
+        """Indices of ring slots holding a frame; the caller holds the condition"""
+        return np.flatnonzero(self._seqs > 0)
+
+    def _frame(self, slot: int, copy: bool) -> Frame:
+        """Frame in a ring slot; the caller holds the condition"""
+        image = self._ring[slot]
+        return Frame(
+            int(self._seqs[slot]), float(self._timestamps[slot]), image.copy() if copy else image,
+            float(self._started[slot])
+        )
+
+    def _store(self, image: np.ndarray, started: float, timestamp: float) -> None:
+        """
+        Copy a captured image into the next ring slot.
+
+        The slot is withdrawn from readers while it is written, so the copy
+        runs without holding the lock and copies taken by readers are never
+        torn. Views (copy=False) are not protected: a view is overwritten in
+        place when its slot is reused ring_size frames later, possibly while
+        the holder is still reading it.
+        """
+        with self._condition:
+            if not self._ring or self._ring[0].shape != image.shape or self._ring[0].dtype != image.dtype:
+                # First frame or a resolution change: (re)allocate the whole ring
+                self._ring = [np.empty(image.shape, dtype=image.dtype) for _ in range(self.ring_size)]
+                self._seqs[:] = 0
+            seq = self._seq + 1
+            slot = seq % self.ring_size
+            self._seqs[slot] = 0
+            buffer = self._ring[slot]
+        np.copyto(buffer, image)
+        with self._condition:
+            self._seqs[slot] = seq
+            self._timestamps[slot] = timestamp
+            self._started[slot] = started
+            self._seq = seq
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Capture loop: one frame per period, skipping ticks when capture is slower"""
+        period = 1.0 / self.fps
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                started = time.monotonic()
+                image = self._capture()
+                if image is not None:
+                    self._store(image, started, time.monotonic())
+            except Exception as e:
+                self.errors += 1
+                self._logger.debug(f"Frame capture failed: {e}")
+            next_tick = max(next_tick + period, time.monotonic())
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    def __enter__(self) -> "FrameGrabber":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -48,6 +48,15 @@ class InputService(IInputService):
                 raise RuntimeError("Session backend is not available for mouse input")
             self._mouse = Mouse(backend)  # type: ignore
         return self._mouse
+
+    def _screen_changed(self) -> None:
+        """Drop cached screenshots and tree snapshots, which input may have made stale"""
+        screenshot_service = getattr(self._session, 'screenshot_service', None)
+        if screenshot_service is not None:
+            screenshot_service.invalidate_cache()
+        element_discovery = getattr(self._session, 'element_discovery', None)
+        if element_discovery is not None:
+            element_discovery.invalidate_snapshot()
     
     def press_key(self, key: str) -> None:
         """Press a key"""
@@ -57,6 +66,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to press key {key}: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def press_keys(self, *keys: str) -> None:
         """Press multiple keys"""
@@ -66,6 +77,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to press keys {keys}: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def type_text(self, text: str, interval: Optional[float] = None) -> None:
         """Type text with optional interval between characters"""
@@ -75,6 +88,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to type text: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_move(self, x: int, y: int) -> None:
         """Move mouse to coordinates"""
@@ -84,6 +99,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to move mouse to ({x}, {y}): {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_click(self, x: int, y: int, button: str = "left") -> None:
         """Click mouse at coordinates"""
@@ -93,6 +110,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to click mouse at ({x}, {y}): {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_double_click(self, x: int, y: int) -> None:
         """Double click mouse at coordinates"""
@@ -102,6 +121,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to double click mouse at ({x}, {y}): {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_right_click(self, x: int, y: int) -> None:
         """Right click mouse at coordinates"""
@@ -111,6 +132,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to right click mouse at ({x}, {y}): {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_drag_and_drop(self, start_x: int, start_y: int, end_x: int, end_y: int) -> None:
         """Drag and drop from start to end coordinates"""
@@ -120,6 +143,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to drag and drop: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def mouse_scroll(self, x: int, y: int, direction: str = "down", amount: int = 1) -> None:
         """Scroll mouse at coordinates"""
@@ -129,6 +154,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to scroll mouse: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def hotkey(self, *keys: str) -> None:
         """Press hotkey combination"""
@@ -138,6 +165,8 @@ class InputService(IInputService):
         except Exception as e:
             self._logger.error(f"Failed to press hotkey {'+'.join(keys)}: {e}")
             raise
+        finally:
+            self._screen_changed()
     
     def copy(self) -> None:
         """Copy selected text"""
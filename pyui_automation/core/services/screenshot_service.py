@@ -3,11 +3,14 @@ Screenshot Service - handles all screenshot operations.
 
 Responsible for:
 - Taking screenshots of screen and elements
-- Saving screenshots to files
+- Saving screenshots to files on a background writer
+- Serving captures from an optional background frame grabber
+- Sharing recent full-screen captures between capture requests
 - Screenshot utilities
 """
 
-from typing import Optional, Union, TYPE_CHECKING
+import time
+from typing import Optional, Tuple, Union, TYPE_CHECKING
 from pathlib import Path
 import numpy as np
 from logging import getLogger
@@ -18,24 +21,142 @@ if TYPE_CHECKING:
 
 # Local imports
 from ...elements.base_element import BaseElement
-from ...utils import save_image, ensure_dir
+from ...utils import AsyncImageWriter
 from ..interfaces.iscreenshot_service import IScreenshotService
+from .frame_grabber import DEFAULT_FPS, DEFAULT_RING_SIZE, FrameGrabber
+
+# Seconds a full-screen capture is shared between capture requests
+DEFAULT_CACHE_TTL = 0.05
 
 
 class ScreenshotService(IScreenshotService):
     """Service for screenshot operations"""
-    
-    def __init__(self, backend: 'BaseBackend', session: 'AutomationSession'):
+
+    # Longest wait for a grabbed frame captured after the last invalidation
+    FIRST_FRAME_TIMEOUT = 1.0
+
+    def __init__(
+        self,
+        backend: 'BaseBackend',
+        session: 'AutomationSession',
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        image_format: str = "png",
+        image_quality: int = 90
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            backend: Backend performing the captures
+            session: Owning session
+            cache_ttl: Seconds a full-screen capture is reused for further
+                screenshots and for regions inside it; 0 disables the cache
+            image_format: Format of saved screenshots whose path has no extension
+            image_quality: Quality of saved screenshots from 0 to 100
+        """
         self._backend = backend
         self._session = session
         self._logger = getLogger(__name__)
-    
+        self._frame_grabber: Optional[FrameGrabber] = None
+        self.cache_ttl = cache_ttl
+        self._cached_frame: Optional[Tuple[float, np.ndarray]] = None
+        self._invalidated_at = 0.0
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self._writer: Optional[AsyncImageWriter] = None
+
+    def start_frame_grabber(self, fps: float = DEFAULT_FPS, ring_size: int = DEFAULT_RING_SIZE) -> FrameGrabber:
+        """
+        Start continuous background capture.
+
+        While it runs, screenshots and region/element captures are served from
+        the newest grabbed frame (at most 1 / fps seconds old) instead of
+        capturing on demand.
+
+        Args:
+            fps: Capture rate in frames per second
+            ring_size: Number of frames kept in memory
+
+        Returns:
+            FrameGrabber: The running grabber, for latest_frame/frame_at/frames_since
+        """
+        self.stop_frame_grabber()
+        self._frame_grabber = FrameGrabber(self._backend.capture_screenshot, fps, ring_size).start()
+        self._logger.debug(f"Frame grabber started at {fps} fps with {ring_size} frames")
+        return self._frame_grabber
+
+    def stop_frame_grabber(self) -> None:
+        """Stop continuous background capture; captures go to the backend again"""
+        if self._frame_grabber is not None:
+            self._frame_grabber.stop()
+            self._frame_grabber = None
+
+    @property
+    def frame_grabber(self) -> Optional[FrameGrabber]:
+        """The running frame grabber, if any"""
+        return self._frame_grabber
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop cached screenshots after something may have changed the screen.
+
+        Called by InputService after every input action. Grabbed frames
+        captured before this call are no longer served either.
+        """
+        self._cached_frame = None
+        self._invalidated_at = time.monotonic()
+
+    def _current_frame(self) -> Optional[np.ndarray]:
+        """
+        View of a full frame that may be served instead of a new capture.
+
+        That is the newest grabbed frame whose capture started after the last
+        invalidation (waiting up to FIRST_FRAME_TIMEOUT for one) while a
+        grabber runs, otherwise the cached frame while it is younger than
+        cache_ttl.
+        """
+        grabber = self._frame_grabber
+        if grabber is not None and grabber.running:
+            frame = grabber.latest_frame(copy=False)
+            deadline = time.monotonic() + self.FIRST_FRAME_TIMEOUT
+            while frame is None or frame.started <= self._invalidated_at:
+                frame = grabber.wait_for_frame(frame.seq if frame else 0, deadline - time.monotonic(), copy=False)
+                if frame is None:
+                    return None
+            return frame.image
+        cached = self._cached_frame
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+
+    def _capture_frame(self) -> Optional[np.ndarray]:
+        """Capture a full frame from the backend and cache it"""
+        started = time.monotonic()
+        frame = self._backend.capture_screenshot()
+        if frame is not None and self.cache_ttl > 0 and started > self._invalidated_at:
+            self._cached_frame = (started, frame)
+        return frame
+
+    def _cached_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        """Copy of a region sliced from the current frame, or None if no frame covers it"""
+        frame = self._current_frame()
+        if frame is None:
+            return None
+        frame_height, frame_width = frame.shape[:2]
+        if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > frame_width or y + height > frame_height:
+            return None
+        return frame[y:y + height, x:x + width].copy()
+
     def take_screenshot(self, save_path: Optional[Path] = None) -> np.ndarray:
         """Take screenshot of entire screen"""
         try:
-            screenshot = self._backend.capture_screenshot()
-            if screenshot is None:
+            frame = self._current_frame()
+            if frame is None:
+                frame = self._capture_frame()
+            if frame is None:
                 raise RuntimeError("Failed to capture screenshot")
+            # The frame stays cached, so callers get their own copy
+            screenshot = frame.copy()
             
             if save_path:
                 self._save_image(screenshot, save_path)
@@ -54,9 +175,11 @@ class ScreenshotService(IScreenshotService):
         """Capture screenshot of specific element"""
         try:
             rect = element.rect
-            screenshot = self._backend.capture_screen_region(
-                rect['x'], rect['y'], rect['width'], rect['height']
-            )
+            screenshot = self._cached_region(rect['x'], rect['y'], rect['width'], rect['height'])
+            if screenshot is None:
+                screenshot = self._backend.capture_screen_region(
+                    rect['x'], rect['y'], rect['width'], rect['height']
+                )
             if screenshot is None:
                 raise RuntimeError("Failed to capture element screenshot")
             
@@ -69,7 +192,9 @@ class ScreenshotService(IScreenshotService):
     def capture_screen_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
         """Capture screenshot of specific screen region"""
         try:
-            screenshot = self._backend.capture_screen_region(x, y, width, height)
+            screenshot = self._cached_region(x, y, width, height)
+            if screenshot is None:
+                screenshot = self._backend.capture_screen_region(x, y, width, height)
             if screenshot is None:
                 raise RuntimeError("Failed to capture screen region")
             
@@ -80,23 +205,44 @@ class ScreenshotService(IScreenshotService):
             raise
     
     def save_screenshot(self, image: np.ndarray, path: Union[str, Path]) -> None:
-        """Save screenshot to file"""
+        """
+        Save screenshot to file in the background.
+
+        The image is copied and encoded on the writer threads; call flush() to
+        wait for the file. The configured format is appended to paths without
+        an extension.
+        """
         try:
             self._save_image(image, path)
-            self._logger.debug(f"Screenshot saved to {path}")
+            self._logger.debug(f"Screenshot queued for {path}")
         except Exception as e:
             self._logger.error(f"Failed to save screenshot: {e}")
             raise
     
     def _save_image(self, image: np.ndarray, path: Union[str, Path]) -> None:
-        """Save image to file"""
-        try:
-            path = Path(path)
-            ensure_dir(path.parent)
-            save_image(image, path)
-        except Exception as e:
-            self._logger.error(f"Failed to save image: {e}")
-            raise
+        """Queue an image for the background writer"""
+        if self._writer is None:
+            self._writer = AsyncImageWriter(self.image_format, self.image_quality)
+        self._writer.submit(image, path)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued screenshot is written.
+
+        Args:
+            timeout: Maximum time to wait in seconds; None waits indefinitely
+
+        Returns:
+            bool: True if no screenshot is pending anymore
+        """
+        return self._writer is None or self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Stop the frame grabber and write the queued screenshots"""
+        self.stop_frame_grabber()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
     
     def get_screen_size(self) -> tuple[int, int]:
         """Get screen dimensions"""
@@ -8,7 +8,7 @@ Responsible for:
 - Visual testing reports
 """
 
-from typing import Optional, Union, Tuple, Any, TYPE_CHECKING
+from typing import Optional, Union, Tuple, Any, Dict, Sequence, TYPE_CHECKING
 from pathlib import Path
 import numpy as np
 from logging import getLogger
@@ -19,6 +19,8 @@ if TYPE_CHECKING:
 
 from ...elements.base_element import BaseElement
 from ...utils.image import load_image, save_image, compare_images
+from ...utils.matching import TemplateMatchResult, match_template, match_templates_batch, to_grayscale
+from ...utils.template_store import TemplateStore, preprocess_template
 from ...utils.file import ensure_dir
 from ..interfaces.ivisual_testing_service import IVisualTestingService
 
@@ -33,36 +35,66 @@ class VisualTestingService(IVisualTestingService):
         self._baseline_dir: Optional[Path] = None
         self._threshold: float = 0.95
         self._visual_tester: Optional[Any] = None
+        self._template_store: Optional[TemplateStore] = None
     
     def init_visual_testing(self, baseline_dir: Union[str, Path], threshold: float = 0.95) -> None:
         """Initialize visual testing"""
         try:
-            from .visual import VisualTester
+            from ..visual import VisualTester
             self._baseline_dir = Path(baseline_dir)
             self._threshold = threshold
-            self._visual_tester = VisualTester(self._baseline_dir)
+            self._visual_tester = VisualTester(self._baseline_dir, threshold, algorithm=self._visual_algorithm())
             self._logger.info(f"Visual testing initialized with baseline dir: {baseline_dir}")
         except Exception as e:
             self._logger.error(f"Failed to initialize visual testing: {e}")
             raise
     
+    def _visual_algorithm(self) -> str:
+        """Comparison engine selected by AutomationConfig.visual_algorithm"""
+        algorithm = getattr(getattr(self._session, "config", None), "visual_algorithm", None)
+        return algorithm if isinstance(algorithm, str) else "mse"
+    
     def configure_visual_testing(self, baseline_dir: Union[str, Path], threshold: float = 0.95) -> None:
         """Configure visual testing (alias for init_visual_testing)"""
         self.init_visual_testing(baseline_dir, threshold)
     
+    def load_templates(self, template_dir: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None, pyramid_levels: Sequence[int] = ()) -> int:
+        """Load a directory of templates so they can be found by name"""
+        try:
+            self._template_store = TemplateStore(template_dir, cache_dir, pyramid_levels)
+            self._logger.info(f"Loaded {len(self._template_store)} templates from {template_dir}")
+            return len(self._template_store)
+        except Exception as e:
+            self._logger.error(f"Failed to load templates: {e}")
+            raise
+    
+    @property
+    def template_store(self) -> Optional[TemplateStore]:
+        """Template store used to resolve templates by name"""
+        return self._template_store
+    
+    def _resolve_template_gray(self, template: Union[np.ndarray, str]) -> np.ndarray:
+        """Get the matching-ready grayscale template, looking names up in the template store"""
+        if isinstance(template, str):
+            if self._template_store is None:
+                raise ValueError("Templates not loaded; call load_templates() to find templates by name")
+            return self._template_store.gray(template)
+        return preprocess_template(template)
+    
     def capture_baseline(self, name: str, element: Optional[BaseElement] = None) -> bool:
         """Capture visual baseline"""
         try:
-            if self._visual_tester:
-                result = self._visual_tester.capture_baseline(name, element)
-                return bool(result)
-            
-            # Fallback implementation
             if element:
                 screenshot = element.capture_screenshot()
             else:
                 screenshot = self._session.screenshot_service.take_screenshot()
             
+            if self._visual_tester:
+                if screenshot is None:
+                    return False
+                return bool(self._visual_tester.capture_baseline(name, screenshot))
+            
+            # Fallback implementation
             if screenshot is not None and self._baseline_dir is not None:
                 baseline_path = self._baseline_dir / f"{name}.png"
                 ensure_dir(baseline_path.parent)
@@ -75,15 +107,28 @@ class VisualTestingService(IVisualTestingService):
             self._logger.error(f"Failed to capture baseline: {e}")
             return False
     
-    def verify_visual(self, name: str, element: Optional[BaseElement] = None) -> Tuple[bool, float]:
-        """Verify visual state against baseline"""
+    def verify_visual(self, name: str, element: Optional[BaseElement] = None, tiered: bool = True) -> Tuple[bool, float]:
+        """
+        Verify visual state against baseline.
+
+        With tiered verification the stored perceptual hash and thumbnail checksum
+        of the baseline are checked first; the full pixel comparison only runs
+        when they are inconclusive.
+        """
         try:
             if self._visual_tester:
-                result = self._visual_tester.verify_visual(name, element)
-                if isinstance(result, tuple) and len(result) == 2:
-                    return result
+                if element:
+                    current_image = element.capture_screenshot()
                 else:
+                    current_image = self._session.screenshot_service.take_screenshot()
+                if current_image is None:
                     return False, 0.0
+                result = self._visual_tester.verify(name, current_image, tiered=tiered)
+                self._logger.info(
+                    f"Visual verification {name}: similarity={result['similarity']:.3f}, "
+                    f"match={result['match']}, tier={result['tier']}"
+                )
+                return bool(result['match']), float(result['similarity'])
             
             # Fallback implementation
             if self._baseline_dir is None:
@@ -105,7 +150,7 @@ class VisualTestingService(IVisualTestingService):
                 return False, 0.0
             
             if baseline_image is not None and current_image is not None:
-                similarity = compare_images(baseline_image, current_image)
+                similarity = compare_images(baseline_image, current_image, algorithm=self._visual_algorithm())
             else:
                 similarity = 0.0
             is_match = similarity >= self._threshold
@@ -175,24 +220,68 @@ class VisualTestingService(IVisualTestingService):
         except Exception as e:
             self._logger.error(f"Failed to generate diff report: {e}")
     
-    def find_all_elements(self, template: np.ndarray, threshold: float = 0.8) -> list:
-        """Find all elements matching template"""
+    def _capture(self, element: Optional[BaseElement] = None, roi: Optional[Tuple[int, int, int, int]] = None) -> Tuple[Optional[np.ndarray], Tuple[int, int]]:
+        """Capture the image to search in and the offset of its origin on screen"""
+        if roi is not None:
+            x, y, width, height = roi
+            return self._session.screenshot_service.capture_screen_region(x, y, width, height), (x, y)
+        if element:
+            return element.capture_screenshot(), (0, 0)
+        return self._session.screenshot_service.take_screenshot(), (0, 0)
+    
+    def find_all_elements(self, template: Union[np.ndarray, str], threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> list:
+        """Find all elements matching template, optionally only inside a screen region (x, y, width, height)"""
         try:
-            # This is a placeholder implementation
-            # In a real scenario, you would use template matching
-            self._logger.warning("find_all_elements not implemented")
-            return []
+            template_gray = self._resolve_template_gray(template)
+            screenshot, offset = self._capture(roi=roi)
+            if screenshot is None:
+                return []
+            matches = match_template(to_grayscale(screenshot), template_gray, threshold, offset=offset)
+            return [
+                {"location": (int(x), int(y)), "confidence": float(score)}
+                for x, y, score in zip(matches['x'], matches['y'], matches['score'])
+            ]
         except Exception as e:
             self._logger.error(f"Failed to find elements: {e}")
             return []
     
-    def wait_for_image(self, template: np.ndarray, timeout: float = 10) -> bool:
-        """Wait for image to appear"""
+    def find_templates_batch(
+        self,
+        templates: Union[Dict[str, np.ndarray], Sequence[str]],
+        threshold: float = 0.8,
+        element: Optional[BaseElement] = None,
+        max_workers: Optional[int] = None,
+        roi: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, TemplateMatchResult]:
+        """Find several templates (images keyed by name, or stored template names) in a single capture"""
         try:
-            # This is a placeholder implementation
-            # In a real scenario, you would use template matching with timeout
-            self._logger.warning("wait_for_image not implemented")
-            return False
+            if not isinstance(templates, dict):
+                templates = {name: self._resolve_template_gray(name) for name in templates}
+            screenshot, offset = self._capture(element, roi)
+            if screenshot is None:
+                self._logger.warning("Failed to capture screen for batch template search")
+                return {}
+
+            results = match_templates_batch(screenshot, templates, threshold, max_workers=max_workers, offset=offset)
+            found = sum(1 for result in results.values() if result.found)
+            self._logger.debug(f"Batch template search: {found}/{len(results)} templates found")
+            return results
+        except Exception as e:
+            self._logger.error(f"Failed to find templates: {e}")
+            return {}
+    
+    def wait_for_image(self, template: Union[np.ndarray, str], timeout: float = 10, threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """Wait for image to appear, optionally polling only a screen region (x, y, width, height)"""
+        try:
+            template_gray = self._resolve_template_gray(template)
+            start_time = time.time()
+            while True:
+                screenshot, _ = self._capture(roi=roi)
+                if screenshot is not None and len(match_template(to_grayscale(screenshot), template_gray, threshold, max_matches=1)):
+                    return True
+                if time.time() - start_time >= timeout:
+                    return False
+                time.sleep(0.1)
         except Exception as e:
             self._logger.error(f"Failed to wait for image: {e}")
             return False
@@ -235,7 +324,7 @@ class VisualTestingService(IVisualTestingService):
             if baseline_img is None or current_img is None:
                 return {"match": False, "similarity": 0.0, "differences": []}
             
-            similarity = compare_images(baseline_img, current_img)
+            similarity = compare_images(baseline_img, current_img, algorithm=self._visual_algorithm())
             is_match = similarity >= self._threshold
             
             return {
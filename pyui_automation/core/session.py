@@ -18,6 +18,7 @@ from ..elements.base_element import BaseElement
 from .wait import ElementWaits
 from .config import AutomationConfig
 from ..locators.base import LocatorStrategy
+from ..locators.snapshot import TreeSnapshot
 from .services.element_discovery_service import ElementDiscoveryService
 from .services.screenshot_service import ScreenshotService
 from .services.performance_monitor import PerformanceMonitor
@@ -71,7 +72,10 @@ class AutomationSession:
         
         # Initialize services
         self._element_discovery_service = ElementDiscoveryService(backend, locator, self)
-        self._screenshot_service = ScreenshotService(backend, self)
+        self._screenshot_service = ScreenshotService(
+            backend, self, self._config.screenshot_cache_ttl,
+            self._config.screenshot_format, self._config.screenshot_quality
+        )
         self._performance_monitor = PerformanceMonitor(None)  # Pass None instead of backend
         self._performance_analyzer = PerformanceAnalyzer()
         self._performance_tester = PerformanceTester()
@@ -111,6 +115,10 @@ class AutomationSession:
         """Find element with timeout"""
         return self._element_discovery_service.find_element_with_timeout(strategy, timeout)
     
+    def snapshot_tree(self, root: Optional[Any] = None, max_depth: Optional[int] = None) -> TreeSnapshot:
+        """Read the element tree once; later searches are answered from the snapshot"""
+        return self._element_discovery_service.snapshot_tree(root, max_depth)
+    
     def find_element_by_object_name(self, object_name: str, timeout: float = 0) -> Optional[BaseElement]:
         """Find element by object name"""
         return self._element_discovery_service.find_element_by_object_name(object_name, timeout)
@@ -219,9 +227,9 @@ class AutomationSession:
         """Capture visual baseline"""
         return self._visual_testing_service.capture_baseline(name, element)
     
-    def verify_visual(self, name: str, element: Optional[BaseElement] = None) -> Tuple[bool, float]:
+    def verify_visual(self, name: str, element: Optional[BaseElement] = None, tiered: bool = True) -> Tuple[bool, float]:
         """Verify visual state against baseline"""
-        return self._visual_testing_service.verify_visual(name, element)
+        return self._visual_testing_service.verify_visual(name, element, tiered)
     
     def compare_visual(self, name: str, element: Optional[BaseElement] = None) -> Tuple[bool, float]:
         """Compare visual state"""
@@ -243,13 +251,21 @@ class AutomationSession:
         """Generate difference report between two images"""
         self._visual_testing_service.generate_diff_report(img1, img2, output_path)
     
-    def find_all_elements(self, template: np.ndarray, threshold: float = 0.8) -> List[Any]:
+    def load_templates(self, template_dir: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None, pyramid_levels: Tuple[int, ...] = ()) -> int:
+        """Load a directory of templates so they can be found by name"""
+        return self._visual_testing_service.load_templates(template_dir, cache_dir, pyramid_levels)
+    
+    def find_all_elements(self, template: Union[np.ndarray, str], threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> List[Any]:
         """Find all elements matching template"""
-        return self._visual_testing_service.find_all_elements(template, threshold)
+        return self._visual_testing_service.find_all_elements(template, threshold, roi)
+    
+    def find_templates_batch(self, templates: Union[Dict[str, np.ndarray], List[str]], threshold: float = 0.8, element: Optional[BaseElement] = None, max_workers: Optional[int] = None, roi: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, Any]:
+        """Find several templates in a single capture"""
+        return self._visual_testing_service.find_templates_batch(templates, threshold, element, max_workers, roi)
     
-    def wait_for_image(self, template: np.ndarray, timeout: float = 10) -> bool:
+    def wait_for_image(self, template: Union[np.ndarray, str], timeout: float = 10, threshold: float = 0.8, roi: Optional[Tuple[int, int, int, int]] = None) -> bool:
         """Wait for image to appear"""
-        return self._visual_testing_service.wait_for_image(template, timeout)
+        return self._visual_testing_service.wait_for_image(template, timeout, threshold, roi)
     
     def highlight_differences(self, img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
         """Highlight differences between two images"""
@@ -461,7 +477,10 @@ class AutomationSession:
         try:
             if self._performance_monitor:
                 self._performance_monitor.stop_performance_monitoring()
-            
+
+            # Stops the frame grabber and writes queued screenshots
+            self._screenshot_service.close()
+
             if self.backend:
                 self.backend.cleanup()
             
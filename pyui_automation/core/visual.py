@@ -5,14 +5,60 @@ Visual testing utilities for UI automation.
 import cv2
 import numpy as np
 from numpy.typing import NDArray
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+import os
+import threading
 import time
+from ..utils.baseline_cache import DEFAULT_CACHE_BYTES, BaselineCache
+from ..utils.baseline_store import BaselineStore
+from ..utils.comparison import get_engine, phash_similarity, rmse_similarity, rmse_similarity_from_diff
+from ..utils.diff_regions import DEFAULT_MAX_REGIONS, DEFAULT_TILE_SIZE, REGION_DTYPE, find_diff_regions
+from ..utils.hash_index import HASH_BITS, PerceptualHashIndex, image_fingerprint
 from ..utils.image import crop_image
+from ..utils.matching import (
+    TemplateMatchResult, changed_tiles, dirty_regions, empty_matches, match_template,
+    match_templates_batch, pyramid_match_template
+)
+from ..utils.template_store import TemplateStore
+from .visual_report import StreamingVisualReport
 
 # Type aliases
 ImageArray = NDArray[Any]
+# A template image or the name of a template in a TemplateStore
+TemplateLike = Union[ImageArray, str]
+# Screen region as (x, y, width, height)
+Region = Tuple[int, int, int, int]
+
+
+def _regions_to_dicts(regions: NDArray[Any]) -> List[Dict[str, Any]]:
+    """Convert a structured difference-region array into location/size/area dictionaries"""
+    return [
+        {"location": (int(x), int(y)), "size": (int(w), int(h)), "area": float(pixels)}
+        for x, y, w, h, pixels in zip(regions['x'], regions['y'], regions['width'], regions['height'], regions['pixels'])
+    ]
+
+
+def _matches_to_dicts(matches: NDArray[Any]) -> List[Dict[str, Any]]:
+    """Convert a structured match array into location/confidence dictionaries"""
+    return [
+        {"location": (int(x), int(y)), "confidence": float(score)}
+        for x, y, score in zip(matches['x'], matches['y'], matches['score'])
+    ]
+
+
+def _best_pyramid_location(
+    screen: ImageArray, template: ImageArray, threshold: float, levels: int
+) -> Optional[Tuple[int, int]]:
+    """Return the top-left corner of the best coarse-to-fine match, if any"""
+    matches = pyramid_match_template(screen, template, threshold, levels)
+    if len(matches) == 0:
+        return None
+    return (int(matches['x'][0]), int(matches['y'][0]))
 
 
 @dataclass
@@ -27,16 +73,40 @@ class VisualDifference:
 class VisualMatcher:
     """Handles visual matching and comparison of UI elements"""
 
-    def __init__(self, element: Any, similarity_threshold: float = 0.95):
+    def __init__(self, element: Any, similarity_threshold: float = 0.95, template_store: Optional[TemplateStore] = None):
         """
         Initialize visual matcher with a UI element.
 
         Args:
             element: UI element to perform visual matching on
             similarity_threshold: Threshold for similarity matching (0-1)
+            template_store: Store used to resolve templates passed by name
         """
         self.element = element
         self.similarity_threshold = similarity_threshold
+        self.template_store = template_store
+
+    def _resolve_template(self, template: TemplateLike) -> ImageArray:
+        """Return the template image, looking names up in the template store"""
+        if isinstance(template, str):
+            if self.template_store is None:
+                raise ValueError("A template store is required to find templates by name")
+            return self.template_store.image(template)
+        return template
+
+    def _capture(self, roi: Optional[Region] = None) -> Tuple[Optional[ImageArray], Tuple[int, int]]:
+        """
+        Capture the image to search in.
+
+        Without a region the element is captured and coordinates stay relative
+        to it. With a region only that part of the screen is captured, and the
+        returned offset translates match coordinates back to screen space.
+        """
+        if roi is None:
+            return self.element.capture_screenshot(), (0, 0)
+        x, y, width, height = roi
+        image = self.element.session.screenshot_service.capture_screen_region(x, y, width, height)
+        return image, (x, y)
 
     def find_element_in_image(self, screen_image: ImageArray) -> Optional[Tuple[int, int]]:
         """
@@ -73,17 +143,8 @@ class VisualMatcher:
         if element_image is None:
             return []
             
-        result = cv2.matchTemplate(screen_image, element_image, cv2.TM_CCOEFF_NORMED)
-        locations = np.where(result >= self.similarity_threshold)
-        matches = []
-        
-        for pt in zip(*locations[::-1]):
-            matches.append({
-                "location": pt,
-                "confidence": float(result[pt[1], pt[0]])
-            })
-        
-        return matches
+        matches = match_template(screen_image, element_image, self.similarity_threshold)
+        return _matches_to_dicts(matches)
 
     def compare_images(self, img1: Any, img2: Any, resize: bool = False, roi: Optional[Tuple[int, int, int, int]] = None) -> float:
         """
@@ -119,66 +180,148 @@ class VisualMatcher:
         
         return float(similarity)
 
-    def find_element(self, template: ImageArray) -> Optional[Tuple[int, int]]:
+    def find_element(self, template: TemplateLike, pyramid_levels: int = 0, roi: Optional[Region] = None) -> Optional[Tuple[int, int]]:
         """
         Find element in screen using template matching.
 
         Args:
-            template: Template image to find
+            template: Template image to find, or its name in the template store
+            pyramid_levels: Search coarse-to-fine starting at 1 / 2**pyramid_levels scale
+                (0 searches the full-resolution screen exhaustively)
+            roi: Screen region (x, y, width, height) known to contain the template;
+                only this region is captured and searched
 
         Returns:
-            Tuple of (x, y) coordinates if found, None otherwise
+            Tuple of (x, y) coordinates if found, None otherwise. With a region the
+            coordinates are in screen space.
         """
-        screen = self.element.capture_screenshot()
+        template = self._resolve_template(template)
+        screen, (ox, oy) = self._capture(roi)
+        if screen is None or template.shape[0] > screen.shape[0] or template.shape[1] > screen.shape[1]:
+            return None
+        if pyramid_levels > 0:
+            location = _best_pyramid_location(screen, template, self.similarity_threshold, pyramid_levels)
+            return (location[0] + ox, location[1] + oy) if location is not None else None
         result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
         
         if max_val >= self.similarity_threshold:
-            return (int(max_loc[0]), int(max_loc[1]))
+            return (int(max_loc[0]) + ox, int(max_loc[1]) + oy)
         return None
 
-    def find_all_elements(self, template: ImageArray, threshold: float = 0.8) -> List[Dict[str, Any]]:
+    def find_all_elements(self, template: TemplateLike, threshold: float = 0.8, roi: Optional[Region] = None) -> List[Dict[str, Any]]:
         """
         Find all occurrences of a template in the screen.
 
         Args:
-            template: Template image to search for
+            template: Template image to search for, or its name in the template store
             threshold: Matching threshold
+            roi: Screen region (x, y, width, height) to capture and search instead
+                of the whole element; locations are then in screen space
 
         Returns:
             List of dictionaries containing location and confidence of matches
         """
-        screen = self.element.capture_screenshot()
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-        locations = np.where(result >= threshold)
-        matches = []
-        
-        for pt in zip(*locations[::-1]):
-            matches.append({
-                "location": pt,
-                "confidence": result[pt[1], pt[0]]
-            })
-        
-        return matches
+        template = self._resolve_template(template)
+        screen, offset = self._capture(roi)
+        if screen is None:
+            return []
+        matches = match_template(screen, template, threshold, offset=offset)
+        return _matches_to_dicts(matches)
+
+    def find_templates_batch(
+        self,
+        templates: Union[Dict[str, ImageArray], Sequence[str]],
+        threshold: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        roi: Optional[Region] = None
+    ) -> Dict[str, TemplateMatchResult]:
+        """
+        Find several templates in one screen capture.
+
+        The screen is captured and converted to grayscale once, then the
+        templates are matched in parallel.
+
+        Args:
+            templates: Template images keyed by name, or names of templates in the
+                template store (their precomputed grayscale forms are used)
+            threshold: Matching threshold (defaults to the similarity threshold)
+            max_workers: Number of matching threads (defaults to the CPU count)
+            roi: Screen region (x, y, width, height) to capture and search instead
+                of the whole element; locations are then in screen space
 
-    def wait_for_image(self, template: ImageArray, timeout: float = 10) -> bool:
+        Returns:
+            Results keyed by template name, each with its matches and matching time
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+        if not isinstance(templates, dict):
+            if self.template_store is None:
+                raise ValueError("A template store is required to find templates by name")
+            templates = {name: self.template_store.gray(name) for name in templates}
+        screen, offset = self._capture(roi)
+        if screen is None:
+            return {name: TemplateMatchResult(name, empty_matches(), 0.0) for name in templates}
+        return match_templates_batch(screen, templates, threshold, max_workers=max_workers, offset=offset)
+
+    def wait_for_image(
+        self,
+        template: TemplateLike,
+        timeout: float = 10,
+        roi: Optional[Region] = None,
+        incremental: bool = False,
+        tile_size: int = 32
+    ) -> bool:
         """
         Wait for image to appear on screen.
 
         Args:
-            template: Template image to wait for
+            template: Template image to wait for, or its name in the template store
             timeout: Maximum time to wait in seconds
+            roi: Screen region (x, y, width, height) to poll instead of the whole element
+            incremental: Keep the previous frame and re-match only the tiles that
+                changed since it (expanded by the template size); unchanged
+                placements cannot start matching, so the result is the same
+            tile_size: Tile side in pixels for the incremental frame difference
 
         Returns:
             True if image was found within timeout
         """
+        template = self._resolve_template(template)
+        if incremental:
+            return self._wait_for_image_incremental(template, timeout, roi, tile_size)
         start_time = time.time()
         while time.time() - start_time < timeout:
-            if self.find_element(template) is not None:
+            if self.find_element(template, roi=roi) is not None:
                 return True
             time.sleep(0.1)
         return False
 
+    def _wait_for_image_incremental(
+        self, template: ImageArray, timeout: float, roi: Optional[Region], tile_size: int
+    ) -> bool:
+        """Poll for a template, matching only screen regions that changed between frames"""
+        th, tw = template.shape[:2]
+        previous: Optional[ImageArray] = None
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            screen, _ = self._capture(roi)
+            if screen is not None and screen.shape[0] >= th and screen.shape[1] >= tw:
+                if previous is None or previous.shape != screen.shape or previous.dtype != screen.dtype:
+                    regions = [(0, 0, screen.shape[1], screen.shape[0])]
+                else:
+                    tiles = changed_tiles(previous, screen, tile_size)
+                    regions = dirty_regions(tiles, tile_size, (tw, th), (screen.shape[1], screen.shape[0]))
+                for x, y, width, height in regions:
+                    if width < tw or height < th:
+                        continue
+                    result = cv2.matchTemplate(screen[y:y + height, x:x + width], template, cv2.TM_CCOEFF_NORMED)
+                    if cv2.minMaxLoc(result)[1] >= self.similarity_threshold:
+                        return True
+                previous = screen
+            time.sleep(0.1)
+        return False
+
     def verify_visual_state(self, baseline: ImageArray) -> float:
         """
         Verify current visual state against baseline.
@@ -252,19 +395,57 @@ class VisualMatcher:
 class VisualTester:
     """Handles visual testing and comparison of UI elements"""
 
-    def __init__(self, baseline_dir: Union[str, Path], threshold: float = 0.95) -> None:
+    # Number of image shapes whose comparison buffers are kept per thread
+    MAX_BUFFER_SHAPES = 4
+    # With the hash engine, perceptual hashes this many bits apart fail
+    # verification without a pixel diff when that is below the threshold
+    HASH_REJECT_DISTANCE = 16
+    # Bits by which the index hash (taken from the thumbnail) may differ from
+    # the hash engine's (taken from the full image)
+    HASH_TIER_SLACK = 4
+    # Difference regions: tile side, smallest reported region and cap on the region count
+    DIFF_TILE_SIZE = DEFAULT_TILE_SIZE
+    MIN_DIFF_PIXELS = 25
+    MAX_DIFF_REGIONS = DEFAULT_MAX_REGIONS
+
+    def __init__(
+        self,
+        baseline_dir: Union[str, Path],
+        threshold: float = 0.95,
+        algorithm: str = "mse",
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        cache_dir: Optional[Union[str, Path]] = None,
+        store: Optional[BaselineStore] = None
+    ) -> None:
         """
         Initialize visual tester with baseline directory.
 
         Args:
             baseline_dir: Directory to store baseline images
             threshold: Similarity threshold (0-1)
+            algorithm: Comparison engine used for similarity scores
+                (see ``utils.comparison.available_engines``)
+            cache_bytes: Memory budget of the LRU cache of decoded baselines
+            cache_dir: Directory for decoded ``.npy`` copies of baselines, reloaded
+                memory-mapped instead of decoding the PNG again. None disables it.
+            store: Content-addressed store that new baselines are written to and
+                read from; baselines missing from it are still read as PNG files
+                from baseline_dir. None stores baselines as PNG files only.
+
+        Raises:
+            ValueError: If the algorithm is not a registered comparison engine
         """
         self.baseline_dir = Path(baseline_dir)
         self.baseline_dir.mkdir(parents=True, exist_ok=True)
-        self._baseline_cache: Dict[str, ImageArray] = {}
+        self._baseline_cache = BaselineCache(cache_bytes, cache_dir)
+        self.store = store
         self.similarity_threshold = threshold
         self.threshold = threshold  # Alias for compatibility
+        self._engine = get_engine(algorithm)
+        self.algorithm = algorithm
+        # Per-thread comparison buffers keyed by image shape and dtype
+        self._buffers = threading.local()
+        self._hash_index: Optional[PerceptualHashIndex] = None
 
     def capture_baseline(self, name: str, image: Any) -> bool:
         """
@@ -287,14 +468,19 @@ class VisualTester:
         # Гарантируем расширение .png
         if not name.endswith('.png'):
             name = f"{name}.png"
-        filepath = self.baseline_dir / name
-        cv2.imwrite(str(filepath), image)
-        self._baseline_cache[name] = image
+        if self.store is not None:
+            digest = self.store.put(name[:-len('.png')], image)
+            self._baseline_cache.put(self._store_cache_key(digest), image)
+        else:
+            cv2.imwrite(str(self.baseline_dir / name), image)
+            self._baseline_cache.put(name, image)
+        if self._hash_index is not None:
+            self._hash_index.add(name[:-len('.png')], image)
         return True
 
     def read_baseline(self, name: str) -> ImageArray:
         """
-        Read baseline image from the baseline directory.
+        Read baseline image from the store or the baseline directory.
 
         Args:
             name: Name of the baseline image to read
@@ -308,21 +494,77 @@ class VisualTester:
         """
         if not name.endswith('.png'):
             name = f"{name}.png"
-        baseline_path = self.baseline_dir / name
+        stem = name[:-len('.png')]
+        digest = self.store.digest_of(stem) if self.store is not None else None
+        if digest is not None:
+            # Keyed by content, so a baseline replaced in the store is never served stale
+            key = self._store_cache_key(digest)
+            baseline = self._baseline_cache.get(key)
+            if baseline is None:
+                baseline = self.store.get(stem)
+                self._baseline_cache.put(key, baseline)
+            return baseline
 
+        baseline_path = self.baseline_dir / name
         if not baseline_path.exists():
             raise FileNotFoundError(f"Baseline image not found: {name}")
 
-        if name in self._baseline_cache:
-            return self._baseline_cache[name]
-
-        baseline = cv2.imread(str(baseline_path))
+        baseline = self._baseline_cache.load(name, baseline_path)
         if baseline is None:
             raise ValueError(f"Failed to load baseline image: {name}")
-
-        self._baseline_cache[name] = baseline
         return baseline
 
+    @staticmethod
+    def _store_cache_key(digest: str) -> str:
+        """Baseline cache key of a store blob; cannot collide with the file names used for PNG baselines"""
+        return f"store:{digest}"
+
+    @property
+    def hash_index(self) -> PerceptualHashIndex:
+        """Perceptual-hash index of the baseline directory and store, built (or loaded) on first use"""
+        if self._hash_index is None:
+            self._hash_index = PerceptualHashIndex(self.baseline_dir, store=self.store)
+        return self._hash_index
+
+    def find_similar_baselines(self, image: Any, max_distance: int = 10, limit: Optional[int] = 5) -> List[Tuple[str, int]]:
+        """
+        Find the baselines an image looks like, without comparing pixels.
+
+        Args:
+            image: Image to look up
+            max_distance: Largest Hamming distance between 64-bit perceptual hashes
+            limit: Maximum number of results
+
+        Returns:
+            List of (baseline name, distance) pairs, closest first
+        """
+        if image is None or not isinstance(image, np.ndarray) or image.size == 0:
+            raise ValueError("Invalid image data")
+        return self.hash_index.nearest(image, max_distance, limit)
+
+    def is_unchanged(self, name: str, image: Any, max_distance: int = 0) -> bool:
+        """
+        Check via the hash index whether an image looks the same as a baseline.
+
+        Args:
+            name: Name of the baseline
+            image: Current image
+            max_distance: Largest Hamming distance still treated as unchanged
+
+        Returns:
+            bool: True if the perceptual hashes are within the distance
+        """
+        if image is None or not isinstance(image, np.ndarray) or image.size == 0:
+            raise ValueError("Invalid image data")
+        if name.endswith('.png'):
+            name = name[:-len('.png')]
+        return self.hash_index.is_unchanged(name, image, max_distance)
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Baseline cache hits, misses, evictions, disk hits and memory use"""
+        return self._baseline_cache.stats()
+
     def _calculate_similarity(self, img1: ImageArray, img2: ImageArray) -> float:
         """
         Calculate similarity score between two images.
@@ -340,26 +582,7 @@ class VisualTester:
                 img1 = img1.astype(np.uint8)
                 img2 = img2.astype(np.uint8)
 
-            # Calculate absolute difference
-            diff = cv2.absdiff(img1, img2)
-            
-            # Calculate mean squared error for each channel
-            diff_float = diff.astype(np.float64)
-            diff_squared = np.power(diff_float, 2).astype(np.float64)
-            try:
-                # Simple mean calculation
-                mse = float(np.sum(diff_squared) / diff_squared.size)
-            except Exception:
-                mse = 0.0
-            
-            # Calculate RMSE and normalize to 0-1 range
-            rmse = np.sqrt(mse)
-            max_rmse = 255.0  # Maximum possible RMSE for 8-bit images
-            
-            # Convert to similarity score (inverse of normalized RMSE)
-            similarity = 1.0 - (rmse / max_rmse)
-            
-            return float(similarity)
+            return float(self._engine(img1, img2))
 
         except Exception as e:
             raise RuntimeError(f"Failed to calculate similarity: {str(e)}")
@@ -404,18 +627,207 @@ class VisualTester:
         except (FileNotFoundError, ValueError):
             return False, 1.0
 
-    def compare(self, current: Any, baseline: Any, resize: bool = False, roi: Optional[tuple] = None) -> Dict[str, Any]:
+    def _comparison_buffers(self, shape: Tuple[int, ...], dtype: Any) -> Tuple[ImageArray, ImageArray, ImageArray]:
+        """
+        Get reusable difference, grayscale and mask buffers for an image shape.
+
+        Buffers are per thread, so concurrent comparisons never share them, and
+        only the most recently used shapes are kept.
+        """
+        cache = getattr(self._buffers, "cache", None)
+        if cache is None:
+            cache = self._buffers.cache = OrderedDict()
+        key = (shape, np.dtype(dtype).str)
+        buffers = cache.get(key)
+        if buffers is None:
+            buffers = (
+                np.empty(shape, dtype=dtype),
+                np.empty(shape[:2], dtype=np.uint8),
+                np.empty(shape[:2], dtype=np.uint8),
+            )
+            cache[key] = buffers
+            while len(cache) > self.MAX_BUFFER_SHAPES:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return buffers
+
+    def verify(self, name: str, current: Any, tiered: bool = True) -> Dict[str, Any]:
+        """
+        Verify an image against a baseline, trying the hash index first.
+
+        The fast tier compares the perceptual hash and thumbnail checksum stored
+        in the hash index: both equal is a pass. With the hash engine, whose
+        similarity is the share of equal hash bits, hashes more than
+        HASH_REJECT_DISTANCE bits apart are a failure when even a similarity
+        HASH_TIER_SLACK bits better would be below the threshold. Anything
+        else, or a baseline missing from the index, falls back to the full
+        comparison with the configured engine.
+
+        Args:
+            name: Name of the baseline
+            current: Current image
+            tiered: Try the hash tier before loading the baseline
+
+        Returns:
+            Dictionary as returned by compare, plus 'tier' ("hash" or "full")
+        """
+        if current is None or not isinstance(current, np.ndarray) or current.size == 0:
+            raise ValueError("Invalid image data")
+        if tiered:
+            stem = name[:-len('.png')] if name.endswith('.png') else name
+            stored = self.hash_index.fingerprint_of(stem)
+            if stored is not None:
+                value, checksum = image_fingerprint(current)
+                distance = int(np.bitwise_count(np.bitwise_xor(value, stored[0])))
+                if distance == 0 and checksum == stored[1]:
+                    return {
+                        'match': True,
+                        'similarity': 1.0,
+                        'differences': [],
+                        'regions': np.empty(0, dtype=REGION_DTYPE),
+                        'regions_dropped': 0,
+                        'diff_image': None,
+                        'tier': 'hash'
+                    }
+                if self._hash_reject_is_conclusive(distance):
+                    return {
+                        'match': False,
+                        'similarity': 1.0 - distance / HASH_BITS,
+                        'differences': [],
+                        'regions': np.empty(0, dtype=REGION_DTYPE),
+                        'regions_dropped': 0,
+                        'diff_image': None,
+                        'tier': 'hash'
+                    }
+        result = self.compare(current, self.read_baseline(name))
+        result['tier'] = 'full'
+        return result
+
+    def _hash_reject_is_conclusive(self, distance: int) -> bool:
+        """Whether a hash distance fails verification whatever the full comparison finds"""
+        if self._engine is not phash_similarity or distance <= self.HASH_REJECT_DISTANCE:
+            return False
+        best_case = 1.0 - max(0, distance - self.HASH_TIER_SLACK) / HASH_BITS
+        return best_case < self.similarity_threshold
+
+    def _verify_one(self, name: str, current: Any, report: Optional[StreamingVisualReport] = None) -> Dict[str, Any]:
+        """
+        Load one baseline and compare an image with it, capturing errors in the result.
+
+        The result is added to the report, with thumbnails of the images when
+        the comparison failed.
+        """
+        start = time.perf_counter()
+        baseline = None
+        try:
+            baseline = self.read_baseline(name)
+            result = self.compare(current, baseline)
+            outcome = {
+                'name': name,
+                'match': bool(result['match']),
+                'similarity': result['similarity'],
+                'differences': result['differences'],
+                'regions': result['regions'],
+                'error': None,
+                'elapsed': time.perf_counter() - start
+            }
+        except (FileNotFoundError, ValueError, RuntimeError) as e:
+            outcome = {
+                'name': name,
+                'match': False,
+                'similarity': 0.0,
+                'differences': [],
+                'regions': np.empty(0, dtype=REGION_DTYPE),
+                'error': str(e),
+                'elapsed': time.perf_counter() - start
+            }
+        if report is not None:
+            if outcome['match'] or outcome['error']:
+                report.add(outcome)
+            else:
+                report.add(outcome, current, baseline)
+        return outcome
+
+    def verify_many(
+        self,
+        items: Iterable[Tuple[str, Any]],
+        workers: Optional[int] = None,
+        report_name: Optional[str] = "verify_many",
+        output_dir: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Verify many images against their baselines in parallel.
+
+        Baselines are loaded and compared on a thread pool (decoding and the
+        OpenCV kernels release the GIL, and comparison buffers are per thread).
+        At most two items per worker are in flight, so only that many current
+        images and baselines are held in memory at a time besides the cache.
+        Results are streamed into the report as they complete (see
+        StreamingVisualReport); its HTML index is rendered once at the end.
+
+        Args:
+            items: (baseline name, current image) pairs; may be a lazy iterable
+            workers: Number of worker threads (defaults to the CPU count)
+            report_name: Name of the report (``<name>.jsonl``, thumbnails of
+                failures and ``<name>_report.html``); None skips the report
+            output_dir: Directory for the report. If None, uses baseline directory.
+
+        Yields:
+            Dict with name, match, similarity, differences, regions, error and
+            elapsed seconds for each item, in completion order
+        """
+        workers = workers or os.cpu_count() or 1
+        pending_items = iter(items)
+        start = time.perf_counter()
+        report = None
+        if report_name:
+            report = StreamingVisualReport(output_dir if output_dir is not None else self.baseline_dir, report_name)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="baseline-verify") as executor:
+                def submit(batch: Iterable[Tuple[str, Any]]) -> List[Future]:
+                    return [executor.submit(self._verify_one, name, image, report) for name, image in batch]
+
+                pending = set(submit(islice(pending_items, 2 * workers)))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    pending.update(submit(islice(pending_items, len(done))))
+                    for future in done:
+                        yield future.result()
+        finally:
+            if report is not None:
+                report.close(time.perf_counter() - start)
+
+    def compare(
+        self,
+        current: Any,
+        baseline: Any,
+        resize: bool = False,
+        roi: Optional[tuple] = None,
+        diff_image: bool = False
+    ) -> Dict[str, Any]:
         """
         Compare two images and return similarity score and match status.
 
+        The absolute difference, its grayscale form and the difference mask are
+        written into reusable buffers; the mse score and the difference regions
+        are computed from them without further full-frame temporaries. Regions
+        are groups of adjacent changed tiles (see ``utils.diff_regions``), at
+        most MAX_DIFF_REGIONS of them, largest first.
+
         Args:
             current: Current image to compare
             baseline: Baseline image to compare
             resize: Whether to resize images if they have different dimensions
             roi: Region of interest as (x, y, w, h)
+            diff_image: Also build the visualization with differences painted red
 
         Returns:
-            Dictionary containing match status, similarity score, and differences
+            Dictionary containing match status, similarity score, differences
+            (location/size/area dicts), regions (the same as a REGION_DTYPE
+            array), regions_dropped (regions beyond the cap) and the diff image
+            (None unless requested)
 
         Raises:
             ValueError: If images are invalid or have incompatible sizes when resize=False
@@ -449,39 +861,40 @@ class VisualTester:
             if resize and current.shape != baseline.shape:
                 baseline = cv2.resize(baseline, (current.shape[1], current.shape[0]))
 
+            diff, diff_gray, thresh = self._comparison_buffers(current.shape, current.dtype)
+            cv2.absdiff(current, baseline, dst=diff)
+
             # Calculate similarity
-            similarity = self._calculate_similarity(current, baseline)
+            if self._engine is rmse_similarity:
+                similarity = rmse_similarity_from_diff(diff)
+            else:
+                similarity = self._calculate_similarity(current, baseline)
 
             # Find differences
-            diff = cv2.absdiff(current, baseline)
-            diff_gray = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
-            _, thresh = cv2.threshold(diff_gray, 30, 255, cv2.THRESH_BINARY)
-            contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            # Create list of differences
-            differences = []
-            min_diff_area = 25  # Minimum area to consider a difference significant
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area >= min_diff_area:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    differences.append({
-                        'location': (x, y),
-                        'size': (w, h),
-                        'area': area
-                    })
-
-            # Create difference visualization
-            diff_image = current.copy()
-            diff_mask = diff > 30
-            red_color = np.array([0, 0, 255], dtype=np.uint8)
-            # Use proper boolean indexing
-            if len(diff_image.shape) == 3 and diff_image.shape[2] >= 3:
-                mask_2d = diff_mask.any(axis=2)
-                # Используем более явный способ присваивания
-                diff_image = diff_image.astype(np.uint8)
-                for i in range(3):  # RGB каналы
-                    diff_image[:, :, i] = np.where(mask_2d, red_color[i], diff_image[:, :, i])
+            if diff.ndim == 2:
+                diff_gray = diff
+            else:
+                code = cv2.COLOR_BGRA2GRAY if diff.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+                cv2.cvtColor(diff, code, dst=diff_gray)
+            cv2.threshold(diff_gray, 30, 1, cv2.THRESH_BINARY, dst=thresh)
+
+            if cv2.countNonZero(thresh):
+                found = find_diff_regions(thresh, self.DIFF_TILE_SIZE, self.MIN_DIFF_PIXELS, self.MAX_DIFF_REGIONS)
+                regions, dropped = found.regions, found.dropped
+            else:
+                regions, dropped = np.empty(0, dtype=REGION_DTYPE), 0
+            differences = _regions_to_dicts(regions)
+
+            # Create difference visualization only on request
+            visualization = None
+            if diff_image:
+                visualization = current.astype(np.uint8, copy=True)
+                if visualization.ndim == 3 and visualization.shape[2] >= 3:
+                    # Saturating channel sum of the per-channel mask marks pixels changed in any channel
+                    channel_mask = cv2.threshold(diff, 30, 255, cv2.THRESH_BINARY)[1]
+                    changed = cv2.transform(channel_mask, np.ones((1, diff.shape[2]), dtype=np.float32))
+                    pixels = visualization.reshape(-1, visualization.shape[2])
+                    pixels[np.flatnonzero(changed), :3] = (0, 0, 255)
 
             # Determine match
             is_match = self._evaluate_match(similarity, differences, self.similarity_threshold)
@@ -490,7 +903,9 @@ class VisualTester:
                 'match': is_match,
                 'similarity': similarity,
                 'differences': differences,
-                'diff_image': diff_image
+                'regions': regions,
+                'regions_dropped': dropped,
+                'diff_image': visualization
             }
 
         except Exception as e:
@@ -571,6 +986,19 @@ class VisualTester:
             raise ValueError("Threshold must be between 0 and 1")
         self.similarity_threshold = threshold
 
+    def set_algorithm(self, algorithm: str) -> None:
+        """
+        Set the comparison engine used for similarity scores.
+
+        Args:
+            algorithm: Registered comparison engine name
+
+        Raises:
+            ValueError: If the algorithm is not registered
+        """
+        self._engine = get_engine(algorithm)
+        self.algorithm = algorithm
+
     def generate_report(self, differences: List[VisualDifference], name: str, output_dir: Optional[str] = None) -> None:
         """
         Generate visual comparison report.
@@ -605,8 +1033,8 @@ class VisualTester:
         
         report_path.write_text("\n".join(html_content))
 
-    def find_element(self, template: ImageArray) -> Optional[Tuple[int, int]]:
-        """Find element in baseline_dir images using template matching"""
+    def find_element(self, template: ImageArray, pyramid_levels: int = 0) -> Optional[Tuple[int, int]]:
+        """Find element in baseline_dir images using template matching (coarse-to-fine if pyramid_levels > 0)"""
         import glob
         import cv2
         files = list(glob.glob(str(self.baseline_dir / '*.png')))
@@ -618,6 +1046,8 @@ class VisualTester:
         # Явное приведение типов для совместимости с cv2
         img_array = np.asarray(img, dtype=np.uint8)
         template_array = np.asarray(template, dtype=np.uint8)
+        if pyramid_levels > 0:
+            return _best_pyramid_location(img_array, template_array, 0.8, pyramid_levels)
         res = cv2.matchTemplate(img_array, template_array, cv2.TM_CCOEFF_NORMED)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
         if max_val > 0.8:
@@ -0,0 +1,299 @@
+"""
+Streaming visual test report.
+
+Results are appended to a JSON-lines file as they arrive, and thumbnails of
+failed screens with their differences are encoded and written on a background
+thread, so a suite never waits for report I/O and never holds full-size images
+for the report. A compact static HTML index is rendered once, from the
+JSON-lines file, when the report is closed.
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+# Widest thumbnail written for a result
+THUMBNAIL_WIDTH = 320
+# Results waiting for the writer before add() blocks
+QUEUE_SIZE = 64
+# Seconds between writer liveness checks while add() waits for queue space
+PUT_POLL_INTERVAL = 0.5
+# Gain applied to thumbnail differences so small changes stay visible
+DIFF_GAIN = 4
+
+_STOP = object()
+# Characters replaced in image file names derived from baseline names
+_UNSAFE_CHARS = re.compile(r"[^\w.-]+")
+
+
+def _thumbnail(image: NDArray[Any], width: int) -> NDArray[np.uint8]:
+    """Downscale an image to at most the given width as 8-bit BGR"""
+    if image.dtype != np.uint8:
+        image = cv2.convertScaleAbs(image)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    elif image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    height, current_width = image.shape[:2]
+    if current_width <= width:
+        return image.copy()
+    size = (width, max(1, round(height * width / current_width)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+class StreamingVisualReport:
+    """Incremental visual test report with a background image writer"""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        name: str = "visual",
+        thumbnail_width: int = THUMBNAIL_WIDTH,
+        queue_size: int = QUEUE_SIZE
+    ) -> None:
+        """
+        Start a report; any previous report of the same name is replaced.
+
+        Writes ``<name>.jsonl``, thumbnails under ``<name>_images/`` and, on
+        close, ``<name>_report.html`` into the output directory.
+
+        Args:
+            output_dir: Directory for the report files
+            name: Report name
+            thumbnail_width: Widest thumbnail written for a result
+            queue_size: Results waiting for the writer thread before add() blocks
+        """
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.thumbnail_width = thumbnail_width
+        self.jsonl_path = self.output_dir / f"{name}.jsonl"
+        self.index_path = self.output_dir / f"{name}_report.html"
+        self.image_dir = self.output_dir / f"{name}_images"
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+
+        self.counts = {'compared': 0, 'passed': 0, 'failed': 0, 'errors': 0}
+        self.write_errors = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._file = open(self.jsonl_path, "w", encoding="utf-8")
+        self._writer = threading.Thread(target=self._run, name=f"visual-report-{name}", daemon=True)
+        self._writer.start()
+
+    def add(
+        self,
+        result: Dict[str, Any],
+        current: Optional[NDArray[Any]] = None,
+        baseline: Optional[NDArray[Any]] = None
+    ) -> None:
+        """
+        Add one comparison result; safe to call from several threads.
+
+        Only thumbnails of the images are kept, so the caller may reuse or
+        modify the arrays as soon as this returns.
+
+        Args:
+            result: Result dict with name, match and similarity, plus optional
+                differences, regions, error, elapsed and tier
+            current: Current image; its thumbnail is written if given
+            baseline: Baseline image; with current, a difference thumbnail is written
+
+        Raises:
+            RuntimeError: If the report is closed
+            Exception: The error that stopped the writer thread, e.g. OSError on a full disk
+        """
+        if self._closed:
+            raise RuntimeError("Report is closed")
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        thumbs = None
+        if current is not None:
+            current_thumb = _thumbnail(current, self.thumbnail_width)
+            thumbs = (
+                current_thumb,
+                _thumbnail(baseline, self.thumbnail_width) if baseline is not None else None,
+                current_thumb.shape[1] / current.shape[1]
+            )
+        self._put((sequence, self._record(result), thumbs))
+
+    def close(self, elapsed: Optional[float] = None) -> Path:
+        """
+        Wait for pending writes and render the HTML index.
+
+        Args:
+            elapsed: Wall-clock time of the run shown in the summary; defaults
+                to the time since the report was started
+
+        Returns:
+            Path: Path of the HTML index
+
+        Raises:
+            Exception: The error that stopped the writer thread; no index is rendered
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                self._put(_STOP)
+            except Exception:
+                pass  # the writer is gone already; its error is raised below
+            self._writer.join()
+            self._file.close()
+            if self._error is None:
+                self._render_index(time.perf_counter() - self._started if elapsed is None else elapsed)
+        if self._error is not None:
+            raise self._error
+        return self.index_path
+
+    @property
+    def summary(self) -> str:
+        """One-line summary of the results written so far"""
+        counts = self.counts
+        return f"{counts['compared']} compared, {counts['passed']} passed, {counts['failed']} failed, {counts['errors']} errors"
+
+    def __enter__(self) -> "StreamingVisualReport":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        try:
+            self.close()
+        except Exception:
+            # Do not mask the exception leaving the block, which is usually the same writer error
+            if exc_type is None:
+                raise
+
+    def _put(self, item: Any) -> None:
+        """Queue an item for the writer, raising its error instead of blocking on a dead thread"""
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._queue.put(item, timeout=PUT_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if not self._writer.is_alive():
+                    raise self._error or RuntimeError("Report writer thread stopped")
+
+    @staticmethod
+    def _record(result: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-serializable summary of a result; differences are reduced to their boxes"""
+        record = {
+            'name': str(result['name']),
+            'match': bool(result['match']),
+            'similarity': float(result['similarity']),
+            'error': result.get('error'),
+        }
+        regions = result.get('regions')
+        if regions is not None:
+            record['regions'] = np.stack(
+                [regions['x'], regions['y'], regions['width'], regions['height']], axis=1
+            ).tolist()
+        elif result.get('differences'):
+            record['regions'] = [[*diff['location'], *diff['size']] for diff in result['differences']]
+        else:
+            record['regions'] = []
+        for key in ('elapsed', 'tier'):
+            if result.get(key) is not None:
+                record[key] = result[key]
+        return record
+
+    def _run(self) -> None:
+        """Writer thread: encode thumbnails and append records until stopped or failed"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                sequence, record, thumbs = item
+                if thumbs is not None:
+                    record.update(self._write_images(sequence, record, *thumbs))
+                self._file.write(json.dumps(record) + "\n")
+                status = 'passed' if record['match'] else ('errors' if record['error'] else 'failed')
+                self.counts['compared'] += 1
+                self.counts[status] += 1
+                if self._queue.empty():
+                    self._file.flush()
+            except Exception as e:
+                # Kept for add() and close() to raise; a silent exit would leave them blocked
+                self._error = e
+                break
+
+    def _write_images(
+        self,
+        sequence: int,
+        record: Dict[str, Any],
+        current: NDArray[np.uint8],
+        baseline: Optional[NDArray[np.uint8]],
+        scale: float
+    ) -> Dict[str, str]:
+        """
+        Write the current and difference thumbnails of one result; failures only skip the images.
+
+        Difference regions are drawn on the difference thumbnail, scaled from
+        full-size coordinates by the thumbnail scale.
+        """
+        stem = f"{sequence:06d}_{_UNSAFE_CHARS.sub('_', record['name'])}"
+        images: List[Tuple[str, NDArray[np.uint8]]] = [('thumbnail', current)]
+        if baseline is not None and baseline.shape == current.shape:
+            diff = cv2.convertScaleAbs(cv2.absdiff(current, baseline), alpha=DIFF_GAIN)
+            for x, y, w, h in record['regions']:
+                top_left = (int(x * scale), int(y * scale))
+                bottom_right = (int((x + w) * scale), int((y + h) * scale))
+                cv2.rectangle(diff, top_left, bottom_right, (0, 0, 255), 1)
+            images.append(('diff', diff))
+        paths = {}
+        for key, image in images:
+            path = self.image_dir / f"{stem}_{key}.jpg"
+            try:
+                if not cv2.imwrite(str(path), image, [cv2.IMWRITE_JPEG_QUALITY, 85]):
+                    raise OSError(f"Failed to write {path}")
+                paths[key] = path.relative_to(self.output_dir).as_posix()
+            except (OSError, cv2.error):
+                self.write_errors += 1
+        return paths
+
+    def _render_index(self, elapsed: float) -> None:
+        """Render the static HTML index from the JSON-lines file, failures first"""
+        with open(self.jsonl_path, "r", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        records.sort(key=lambda r: (r['match'], r['name']))
+
+        rows = []
+        for record in records:
+            status = "passed" if record['match'] else ("error" if record['error'] else "failed")
+            images = "".join(
+                f'<a href="{escape(record[key])}"><img src="{escape(record[key])}" loading="lazy"></a>'
+                for key in ('thumbnail', 'diff') if key in record
+            )
+            rows.append(
+                f'<tr class="{status}"><td>{escape(record["name"])}</td><td>{status}</td>'
+                f'<td>{record["similarity"]:.4f}</td><td>{len(record["regions"])}</td>'
+                f'<td>{escape(record["error"] or "")}</td><td>{images}</td></tr>'
+            )
+        html_content = [
+            "<html><head><meta charset=\"utf-8\"><style>",
+            "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px}",
+            ".failed td,.error td{background:#fdd}img{margin-right:4px}",
+            "</style></head><body>",
+            "<h1>Visual Verification Report</h1>",
+            f"<p>{self.summary} in {elapsed:.2f}s</p>",
+            f'<p><a href="{escape(self.jsonl_path.name)}">{escape(self.jsonl_path.name)}</a></p>',
+            "<table>",
+            "<tr><th>Baseline</th><th>Status</th><th>Similarity</th><th>Differences</th><th>Error</th><th>Images</th></tr>",
+            *rows,
+            "</table>",
+            "</body></html>",
+        ]
+        self.index_path.write_text("\n".join(html_content), encoding="utf-8")
@@ -6,6 +6,7 @@ from .properties import (
     OptionalStringProperty, PropertyDefinition, ELEMENT_PROPERTIES
 )
 from .element_finder import ElementFinder
+from .cache_request import CacheRequest
 
 __all__ = [
     "BaseElement",
@@ -17,5 +18,6 @@ __all__ = [
     "OptionalStringProperty", 
     "PropertyDefinition", 
     "ELEMENT_PROPERTIES",
-    "ElementFinder"
+    "ElementFinder",
+    "CacheRequest"
 ]
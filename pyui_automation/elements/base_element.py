@@ -18,6 +18,7 @@ from .interaction_service import ElementInteractionService
 from .wait_service import ElementWaitService
 from .search_service import ElementSearchService
 from .state_service import ElementStateService
+from .cache_request import CacheRequest
 from ..core.interfaces import IElement
 
 
@@ -33,13 +34,19 @@ class BaseElement(IElement):
     - Delegating state management to ElementStateService
     """
     
-    def __init__(self, native_element: Any, session: 'AutomationSession') -> None:
+    def __init__(
+        self,
+        native_element: Any,
+        session: 'AutomationSession',
+        cached: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Initialize a BaseElement instance.
 
         Args:
             native_element (Any): The native element representation for the current platform.
             session (AutomationSession): The automation session associated with this UI element.
+            cached (Optional[Dict[str, Any]]): Prefetched property values (see CacheRequest).
         """
         self._element = native_element
         self._session = session
@@ -53,6 +60,13 @@ class BaseElement(IElement):
         
         # Initialize properties for compatibility with tests
         self._properties: Dict[str, Any] = {}
+        # Prefetched property values, served only by get_cached(); other accessors read live
+        self._cache: Dict[str, Any] = dict(cached) if cached else {}
+
+    def _wrap(self, element: 'BaseElement') -> 'BaseElement':
+        """Wrap an element found by a service, keeping its prefetched values"""
+        cached = element._cache if isinstance(element, BaseElement) else None
+        return BaseElement(element.native_element, self._session, cached)
 
     @property
     def native_element(self) -> Any:
@@ -74,6 +88,53 @@ class BaseElement(IElement):
         """
         return self._session
 
+    @property
+    def cached_properties(self) -> Dict[str, Any]:
+        """
+        Get the prefetched property values.
+
+        Returns:
+            Dict[str, Any]: Values by property name; empty if nothing was prefetched.
+        """
+        return dict(self._cache)
+
+    def get_cached(self, name: str) -> Any:
+        """
+        Get a prefetched property value, like UIA's Cached* accessors.
+
+        The regular accessors (name, is_enabled(), rect, ...) always read the
+        live value, so waits and state checks see changes; this returns the
+        value as it was when the cache was built.
+
+        Args:
+            name (str): Property name (see CacheRequest).
+
+        Returns:
+            Any: The prefetched value.
+
+        Raises:
+            KeyError: If the property was not prefetched.
+        """
+        return self._cache[name.lower()]
+
+    def build_cache(self, request: CacheRequest) -> 'BaseElement':
+        """
+        Prefetch properties of this element in one backend call.
+
+        Args:
+            request (CacheRequest): The properties to fetch; its scope is ignored.
+
+        Returns:
+            BaseElement: This element.
+        """
+        for _, values in self._session.backend.prefetch(self._element, request.with_scope('element'))[:1]:
+            self._cache.update(values)
+        return self
+
+    def clear_cache(self) -> None:
+        """Drop prefetched values."""
+        self._cache.clear()
+
     @property
     def control_type(self) -> str:
         """
@@ -563,15 +624,18 @@ class BaseElement(IElement):
         parent = self._search_service.get_parent(self)
         return BaseElement(parent.native_element, self._session) if parent else None
 
-    def get_children(self) -> List['IElement']:
+    def get_children(self, cache_request: Optional[CacheRequest] = None) -> List['IElement']:
         """
         Get children - delegated to search service.
 
+        Args:
+            cache_request (Optional[CacheRequest]): Properties to prefetch for the children.
+
         Returns:
             List[BaseElement]: The children elements.
         """
-        children = self._search_service.get_children(self)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        children = self._search_service.get_children(self, cache_request)
+        return [self._wrap(child) for child in children]
 
     def find_child_by_property(self, property_name: str, expected_value: str) -> Optional['IElement']:
         """
@@ -585,7 +649,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_property(self, property_name, expected_value)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_property(self, property_name: str, expected_value: str) -> List['IElement']:
         """
@@ -599,7 +663,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_property(self, property_name, expected_value)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_child_by_text(self, text: str, exact_match: bool = True) -> Optional['IElement']:
         """
@@ -613,7 +677,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_text(self, text, exact_match)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_text(self, text: str, exact_match: bool = True) -> List['IElement']:
         """
@@ -627,7 +691,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_text(self, text, exact_match)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_child_by_name(self, name: str, exact_match: bool = True) -> Optional['IElement']:
         """
@@ -641,7 +705,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_name(self, name, exact_match)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_name(self, name: str, exact_match: bool = True) -> List['IElement']:
         """
@@ -655,7 +719,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_name(self, name, exact_match)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_child_by_control_type(self, control_type: str) -> Optional['IElement']:
         """
@@ -668,7 +732,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_control_type(self, control_type)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_control_type(self, control_type: str) -> List['IElement']:
         """
@@ -681,7 +745,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_control_type(self, control_type)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_child_by_automation_id(self, automation_id: str) -> Optional['IElement']:
         """
@@ -694,7 +758,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_automation_id(self, automation_id)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_automation_id(self, automation_id: str) -> List['IElement']:
         """
@@ -707,7 +771,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_automation_id(self, automation_id)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_visible_children(self) -> List['IElement']:
         """
@@ -717,7 +781,7 @@ class BaseElement(IElement):
             List[BaseElement]: The visible children elements.
         """
         children = self._search_service.find_visible_children(self)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_enabled_children(self) -> List['IElement']:
         """
@@ -727,7 +791,7 @@ class BaseElement(IElement):
             List[BaseElement]: The enabled children elements.
         """
         children = self._search_service.find_enabled_children(self)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     def find_child_by_predicate(self, predicate: Callable[['IElement'], bool]) -> Optional['IElement']:
         """
@@ -740,7 +804,7 @@ class BaseElement(IElement):
             Optional[IElement]: The child element, or None if no child is found.
         """
         child = self._search_service.find_child_by_predicate(self, predicate)
-        return BaseElement(child.native_element, self._session) if child else None
+        return self._wrap(child) if child else None
 
     def find_children_by_predicate(self, predicate: Callable[['IElement'], bool]) -> List['IElement']:
         """
@@ -753,7 +817,7 @@ class BaseElement(IElement):
             List[BaseElement]: The children elements.
         """
         children = self._search_service.find_children_by_predicate(self, predicate)
-        return [BaseElement(child.native_element, self._session) for child in children]
+        return [self._wrap(child) for child in children]
 
     # State operations - delegated to state service
     def check(self) -> None:
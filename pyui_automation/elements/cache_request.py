@@ -0,0 +1,137 @@
+"""
+Cache requests - batched property prefetch.
+
+Modelled on UI Automation's CacheRequest: a search declares once which
+properties it will read and over which scope, the backend fetches all of them
+for every node in one pass (one COM call on Windows, grouped AT-SPI reads on
+Linux), and the resulting BaseElements answer get_cached() from their cache
+instead of making one IPC round trip per property access.
+
+Cached values are a picture of the moment they were fetched; build_cache()
+on an element or a new prefetch refreshes them. As with UIA's Cached* and
+Current* accessors, only get_cached() serves them: name, is_enabled() and the
+other regular accessors always read live, so waits see state changes.
+
+control_type is the value CurrentControlType returns (a UIA control type id
+on Windows), while role is the role name the locators and snapshots match
+against (the localized control type on Windows, the AT-SPI role name).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Properties a cache request can prefetch; the keys BaseElement reads its cache by
+CACHEABLE_PROPERTIES = (
+    'name',
+    'automation_id',
+    'class_name',
+    'control_type',
+    'role',
+    'description',
+    'is_enabled',
+    'is_offscreen',
+    'bounding_rectangle',
+)
+
+# Nodes a request covers, as UIA TreeScope: the element itself, its direct
+# children, or the element and all its descendants
+SCOPES = ('element', 'children', 'subtree')
+
+# Tree views a request walks, as UIA TreeFilter: the control view the locators
+# and snapshots use, or the raw view of GetChildren. Backends with a single
+# view ignore it.
+VIEWS = ('control', 'raw')
+
+# Attribute and getter names probed by the generic readers (this one and the
+# snapshot's read_node_attributes), most specific first
+_ATTRIBUTE_NAMES: Dict[str, Tuple[str, ...]] = {
+    'name': ('CurrentName', 'name', 'Name'),
+    'automation_id': ('CurrentAutomationId', 'automation_id', 'AutomationId', 'id'),
+    'class_name': ('CurrentClassName', 'class_name', 'ClassName'),
+    'control_type': ('CurrentControlType', 'control_type', 'getRoleName'),
+    'role': ('CurrentLocalizedControlType', 'getRoleName', 'role', 'control_type', 'CurrentControlType'),
+    'description': ('CurrentHelpText', 'description', 'Description'),
+    'is_enabled': ('CurrentIsEnabled', 'is_enabled', 'isEnabled'),
+    'is_offscreen': ('CurrentIsOffscreen', 'is_offscreen'),
+    'bounding_rectangle': ('CurrentBoundingRectangle', 'bounding_rectangle', 'getBounds'),
+}
+
+
+@dataclass(frozen=True)
+class CacheRequest:
+    """Properties to prefetch and the scope and tree view of nodes to prefetch them for"""
+    properties: Tuple[str, ...] = CACHEABLE_PROPERTIES
+    scope: str = 'children'
+    view: str = 'control'
+
+    def __post_init__(self) -> None:
+        properties = tuple(dict.fromkeys(self.properties))
+        unknown = [prop for prop in properties if prop not in CACHEABLE_PROPERTIES]
+        if unknown:
+            raise ValueError(f"Properties cannot be cached: {', '.join(unknown)}")
+        if self.scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+        if self.view not in VIEWS:
+            raise ValueError(f"view must be one of {', '.join(VIEWS)}")
+        object.__setattr__(self, 'properties', properties)
+
+    def with_scope(self, scope: str) -> "CacheRequest":
+        """Same properties over another scope"""
+        return self if scope == self.scope else CacheRequest(self.properties, scope, self.view)
+
+    def with_view(self, view: str) -> "CacheRequest":
+        """Same properties and scope over another tree view"""
+        return self if view == self.view else CacheRequest(self.properties, self.scope, view)
+
+
+def rectangle(value: Any) -> Optional[Dict[str, int]]:
+    """
+    Normalize a bounding rectangle to a dict with x, y, width and height.
+
+    Accepts UIA RECTs (left, top, right, bottom), objects with x, y, width and
+    height (AT-SPI extents) and such dicts.
+    """
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return {key: int(value.get(key, 0)) for key in ('x', 'y', 'width', 'height')}
+    if hasattr(value, 'left'):
+        return {
+            'x': int(value.left),
+            'y': int(value.top),
+            'width': int(value.right - value.left),
+            'height': int(value.bottom - value.top),
+        }
+    return {'x': int(value.x), 'y': int(value.y), 'width': int(value.width), 'height': int(value.height)}
+
+
+def read_properties(element: Any, properties: Sequence[str]) -> Dict[str, Any]:
+    """
+    Generic property reader probing common attribute and getter names.
+
+    Used by backends without a native batched read. Properties the element
+    does not expose are cached as None.
+
+    Args:
+        element: Native element
+        properties: Names from CACHEABLE_PROPERTIES
+
+    Returns:
+        Dict[str, Any]: Value of each requested property
+    """
+    values: Dict[str, Any] = {}
+    for prop in properties:
+        value = None
+        for name in _ATTRIBUTE_NAMES[prop]:
+            value = getattr(element, name, None)
+            if callable(value):
+                try:
+                    value = value()
+                except Exception:
+                    value = None
+            if value is not None:
+                break
+        if prop == 'bounding_rectangle':
+            value = rectangle(value)
+        values[prop] = value
+    return values
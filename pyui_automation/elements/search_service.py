@@ -11,10 +11,21 @@ from typing import Optional, List, TYPE_CHECKING, Callable
 from logging import getLogger
 
 # Local imports
+from .cache_request import CacheRequest
+
 if TYPE_CHECKING:
     from .base_element import BaseElement
     from ..core.session import AutomationSession
 
+# Properties the child searches compare, prefetched with the children in one call.
+# The searches compare the cached values (get_cached); the returned elements keep
+# reading live through their regular accessors.
+_NAME_REQUEST = CacheRequest(('name',))
+_CONTROL_TYPE_REQUEST = CacheRequest(('control_type',))
+_AUTOMATION_ID_REQUEST = CacheRequest(('automation_id',))
+_VISIBLE_REQUEST = CacheRequest(('is_offscreen',))
+_ENABLED_REQUEST = CacheRequest(('is_enabled',))
+
 
 class ElementSearchService:
     """Service for element search operations"""
@@ -36,6 +47,7 @@ class ElementSearchService:
         Args:
             element (BaseElement): The element to get the parent of.
         """
+        from .base_element import BaseElement
         try:
             native_parent = element.native_element.GetParent()
             if native_parent:
@@ -45,14 +57,25 @@ class ElementSearchService:
             self._logger.error(f"Failed to get parent element: {e}")
             return None
     
-    def get_children(self, element: "BaseElement") -> List["BaseElement"]:
+    def get_children(self, element: "BaseElement", cache_request: Optional[CacheRequest] = None) -> List["BaseElement"]:
         """
         Get all child elements.
 
+        With a cache request the backend reads the children together with the
+        requested properties in one batched call, and the children serve those
+        values through get_cached(). Both walk the raw view (see CacheRequest).
+
         Args:
             element (BaseElement): The element to get the children of.
+            cache_request (Optional[CacheRequest]): Properties to prefetch for the children.
         """
+        from .base_element import BaseElement
         try:
+            if cache_request is not None:
+                prefetched = self._session.backend.prefetch(
+                    element.native_element, cache_request.with_scope('children').with_view('raw')
+                )
+                return [BaseElement(child, self._session, values) for child, values in prefetched]
             native_children = element.native_element.GetChildren()
             return [BaseElement(child, self._session) for child in native_children]
         except Exception as e:
@@ -104,9 +127,9 @@ class ElementSearchService:
             exact_match (bool): Whether to use exact match.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _NAME_REQUEST)
             for child in children:
-                child_text = child.text
+                child_text = child.get_cached('name') or ""
                 if exact_match and child_text == text:
                     return child
                 elif not exact_match and text in child_text:
@@ -126,11 +149,11 @@ class ElementSearchService:
             exact_match (bool): Whether to use exact match.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _NAME_REQUEST)
             if exact_match:
-                return [child for child in children if child.text == text]
+                return [child for child in children if (child.get_cached('name') or "") == text]
             else:
-                return [child for child in children if text in child.text]
+                return [child for child in children if text in (child.get_cached('name') or "")]
         except Exception as e:
             self._logger.error(f"Failed to find children by text: {e}")
             return []
@@ -145,9 +168,9 @@ class ElementSearchService:
             exact_match (bool): Whether to use exact match.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _NAME_REQUEST)
             for child in children:
-                child_name = child.name
+                child_name = child.get_cached('name') or ""
                 if exact_match and child_name == name:
                     return child
                 elif not exact_match and name in child_name:
@@ -167,11 +190,11 @@ class ElementSearchService:
             exact_match (bool): Whether to use exact match.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _NAME_REQUEST)
             if exact_match:
-                return [child for child in children if child.name == name]
+                return [child for child in children if (child.get_cached('name') or "") == name]
             else:
-                return [child for child in children if name in child.name]
+                return [child for child in children if name in (child.get_cached('name') or "")]
         except Exception as e:
             self._logger.error(f"Failed to find children by name: {e}")
             return []
@@ -185,9 +208,9 @@ class ElementSearchService:
             control_type (str): The control type to find the child by.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _CONTROL_TYPE_REQUEST)
             for child in children:
-                if child.control_type == control_type:
+                if (child.get_cached('control_type') or "unknown") == control_type:
                     return child
             return None
         except Exception as e:
@@ -203,8 +226,8 @@ class ElementSearchService:
             control_type (str): The control type to find the children by.
         """
         try:
-            children = self.get_children(element)
-            return [child for child in children if child.control_type == control_type]
+            children = self.get_children(element, _CONTROL_TYPE_REQUEST)
+            return [child for child in children if (child.get_cached('control_type') or "unknown") == control_type]
         except Exception as e:
             self._logger.error(f"Failed to find children by control type: {e}")
             return []
@@ -218,9 +241,9 @@ class ElementSearchService:
             automation_id (str): The automation ID to find the child by.
         """
         try:
-            children = self.get_children(element)
+            children = self.get_children(element, _AUTOMATION_ID_REQUEST)
             for child in children:
-                if child.automation_id == automation_id:
+                if (child.get_cached('automation_id') or "") == automation_id:
                     return child
             return None
         except Exception as e:
@@ -236,8 +259,8 @@ class ElementSearchService:
             automation_id (str): The automation ID to find the children by.
         """
         try:
-            children = self.get_children(element)
-            return [child for child in children if child.automation_id == automation_id]
+            children = self.get_children(element, _AUTOMATION_ID_REQUEST)
+            return [child for child in children if (child.get_cached('automation_id') or "") == automation_id]
         except Exception as e:
             self._logger.error(f"Failed to find children by automation ID: {e}")
             return []
@@ -250,8 +273,8 @@ class ElementSearchService:
             element (BaseElement): The element to find the children in.
         """
         try:
-            children = self.get_children(element)
-            return [child for child in children if child.is_displayed()]
+            children = self.get_children(element, _VISIBLE_REQUEST)
+            return [child for child in children if not child.get_cached('is_offscreen')]
         except Exception as e:
             self._logger.error(f"Failed to find visible children: {e}")
             return []
@@ -264,8 +287,8 @@ class ElementSearchService:
             element (BaseElement): The element to find the children in.
         """
         try:
-            children = self.get_children(element)
-            return [child for child in children if child.is_enabled()]
+            children = self.get_children(element, _ENABLED_REQUEST)
+            return [child for child in children if child.get_cached('is_enabled')]
         except Exception as e:
             self._logger.error(f"Failed to find enabled children: {e}")
             return []
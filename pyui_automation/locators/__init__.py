@@ -7,6 +7,7 @@ This module provides platform-specific element locators and search strategies.
 from .base import (
     BaseLocator,
     LocatorStrategy,
+    SearchScope,
     ByName,
     ByClassName,
     ByAutomationId,
@@ -22,8 +23,15 @@ from .base import (
     ByAXRole,
     ByAXDescription,
     ByAXValue,
+    CompoundStrategy,
+    ByAll,
+    ByAny,
+    ByChain,
 )
 
+from .snapshot import TreeSnapshot
+from .xpath import XPathError, XPathQuery, compile_xpath
+
 from .interfaces import (
     IBackendForLocator,
     ILocator,
@@ -38,6 +46,11 @@ __all__ = [
     # Base classes
     "BaseLocator",
     "LocatorStrategy",
+    "SearchScope",
+    "TreeSnapshot",
+    "XPathQuery",
+    "XPathError",
+    "compile_xpath",
     
     # Interfaces
     "IBackendForLocator",
@@ -67,4 +80,10 @@ __all__ = [
     "ByAXDescription",
     "ByAXValue",
     "MacOSLocator",
+    
+    # Compound strategies
+    "CompoundStrategy",
+    "ByAll",
+    "ByAny",
+    "ByChain",
 ]
@@ -6,11 +6,51 @@ and defines various search strategies.
 """
 
 from abc import abstractmethod
-from typing import Optional, List, Any
+from collections import deque
+from copy import copy
+from typing import Optional, List, Any, Callable, Deque, Dict, Sequence, Tuple, Union
 from dataclasses import dataclass
 import time
 
+import numpy as np
+
 from .interfaces import IBackendForLocator, ILocator, ILocatorStrategy
+from .snapshot import (
+    CACHE_PROPERTIES, DEFAULT_MAX_AGE, DEFAULT_MAX_NODES, INDEXED_PROPERTIES, TreeSnapshot, node_key,
+    read_node_attributes
+)
+from .xpath import LiveView, SnapshotView, compile_xpath
+from ..elements.cache_request import CacheRequest
+
+# Search orders of a scoped search
+SEARCH_ORDERS = ('dfs', 'bfs')
+
+
+@dataclass(frozen=True)
+class SearchScope:
+    """
+    Part of the tree a strategy is searched in.
+
+    root: Element whose descendants are searched (a native element or a
+        BaseElement); None searches from the backend root
+    max_depth: Deepest level searched below root (1 = direct children);
+        None searches the whole subtree
+    order: 'dfs' finds matches in document order, 'bfs' nearest levels first
+    max_results: Matches after which find_elements stops; find_element
+        always stops at the first match
+    """
+    root: Optional[Any] = None
+    max_depth: Optional[int] = None
+    order: str = 'dfs'
+    max_results: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.order not in SEARCH_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(SEARCH_ORDERS)}")
+        if self.max_depth is not None and self.max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        if self.max_results is not None and self.max_results < 1:
+            raise ValueError("max_results must be at least 1")
 
 
 @dataclass
@@ -21,6 +61,7 @@ class LocatorStrategy(ILocatorStrategy):
     """
     _value: str
     _timeout: Optional[float] = None
+    _scope: Optional[SearchScope] = None
 
     @property
     def value(self) -> str:
@@ -32,6 +73,36 @@ class LocatorStrategy(ILocatorStrategy):
         """Get strategy timeout"""
         return self._timeout
 
+    @property
+    def scope(self) -> Optional[SearchScope]:
+        """Get strategy search scope; None searches the whole tree"""
+        return self._scope
+
+    def within(
+        self,
+        root: Optional[Any] = None,
+        max_depth: Optional[int] = None,
+        order: str = 'dfs',
+        max_results: Optional[int] = None
+    ) -> "LocatorStrategy":
+        """
+        Copy of the strategy restricted to a search scope.
+
+        Example: ``ByName("OK").within(dialog, max_depth=3, order='bfs')``
+
+        Args:
+            root: Element whose descendants are searched; None for the backend root
+            max_depth: Deepest level searched below root; None for no limit
+            order: 'dfs' (document order) or 'bfs' (nearest levels first)
+            max_results: Matches after which find_elements stops
+
+        Returns:
+            LocatorStrategy: The scoped strategy
+        """
+        scoped = copy(self)
+        scoped._scope = SearchScope(root, max_depth, order, max_results)
+        return scoped
+
 
 # Windows-specific strategies
 @dataclass
@@ -141,6 +212,184 @@ class ByAXValue(LocatorStrategy):
     _timeout: Optional[float] = None
 
 
+# Compound strategies
+class CompoundStrategy(LocatorStrategy):
+    """
+    Base class of strategies combining other strategies.
+
+    A compound strategy is compiled into one predicate and evaluated by
+    BaseLocator in a single traversal, on every platform. Parts may be the
+    strategies with a snapshot property, ByState with a state that maps to
+    is_enabled or is_offscreen, and ByAll/ByAny; ByChain is only allowed as
+    the outermost strategy.
+    """
+
+    # Joins the descriptions of the parts into the strategy value
+    _separator = ', '
+    _min_parts = 1
+
+    def __init__(self, *strategies: LocatorStrategy, timeout: Optional[float] = None) -> None:
+        """
+        Combine strategies.
+
+        Args:
+            *strategies: Strategies to combine
+            timeout: Strategy timeout
+        """
+        if len(strategies) < self._min_parts:
+            raise ValueError(f"{type(self).__name__} needs at least {self._min_parts} strategies")
+        self.strategies: Tuple[LocatorStrategy, ...] = strategies
+        description = self._separator.join(
+            f"({part.value})" if isinstance(part, CompoundStrategy) else f"{type(part).__name__}({part.value!r})"
+            for part in strategies
+        )
+        super().__init__(description, timeout)
+
+
+class ByAll(CompoundStrategy):
+    """Find elements matching every strategy"""
+    _separator = ' & '
+
+
+class ByAny(CompoundStrategy):
+    """Find elements matching at least one strategy"""
+    _separator = ' | '
+
+
+class ByChain(CompoundStrategy):
+    """Find elements matching the last strategy below elements matching the previous ones, in order"""
+    _separator = ' >> '
+    _min_parts = 2
+
+
+# Snapshot property answering each strategy; other strategies use the live tree
+SNAPSHOT_PROPERTIES: Dict[type, str] = {
+    ByName: 'name',
+    ByAXTitle: 'name',
+    ByControlType: 'role',
+    ByRole: 'role',
+    ByAXRole: 'role',
+    ByAutomationId: 'automation_id',
+    ByAccessibilityId: 'automation_id',
+    ByAXIdentifier: 'automation_id',
+    ByClassName: 'class_name',
+    ByDescription: 'description',
+    ByAXDescription: 'description',
+}
+
+# Snapshot column holding each cache request property
+_SNAPSHOT_COLUMNS = {prop: column for column, prop in CACHE_PROPERTIES.items()}
+
+# ByState values that compile to a property check
+_STATE_CHECKS: Dict[str, Tuple[str, bool]] = {
+    'enabled': ('is_enabled', True),
+    'sensitive': ('is_enabled', True),
+    'disabled': ('is_enabled', False),
+    'visible': ('is_offscreen', False),
+    'showing': ('is_offscreen', False),
+    'offscreen': ('is_offscreen', True),
+}
+
+# Evaluation order of property checks, cheapest and most selective first:
+# identifiers and names are single reads that match few elements, while
+# states and descriptions match many and cost extra calls on some platforms
+_CHECK_RANK: Dict[str, int] = {
+    'automation_id': 0,
+    'name': 1,
+    'role': 2,
+    'class_name': 3,
+    'is_enabled': 4,
+    'is_offscreen': 5,
+    'description': 6,
+}
+
+# Reads a property of the element being tested
+PropertyReader = Callable[[str], Any]
+
+
+def _snapshot_property(strategy: LocatorStrategy) -> Optional[str]:
+    """Snapshot property answering a strategy, or None"""
+    return next((SNAPSHOT_PROPERTIES[cls] for cls in type(strategy).__mro__ if cls in SNAPSHOT_PROPERTIES), None)
+
+
+class _Check:
+    """Compiled test of one property against an expected value"""
+
+    def __init__(self, prop: str, expected: Union[str, bool]) -> None:
+        self.prop = prop
+        self.expected = expected
+        self.rank = _CHECK_RANK[prop]
+        self.first_property = prop
+
+    def required(self) -> List[Tuple[str, Union[str, bool]]]:
+        """Property values every match must have"""
+        return [(self.prop, self.expected)]
+
+    def __call__(self, read: PropertyReader) -> bool:
+        value = read(self.prop)
+        if value is None:
+            return False
+        if isinstance(self.expected, bool):
+            return bool(value) == self.expected
+        return str(value) == self.expected
+
+
+class _AllOf:
+    """Compiled conjunction; parts are tried cheapest first and stop at the first failure"""
+
+    def __init__(self, parts: Sequence[Any]) -> None:
+        self.parts = sorted(parts, key=lambda part: part.rank)
+        self.rank = sum(part.rank + 1 for part in self.parts)
+        self.first_property = self.parts[0].first_property
+
+    def required(self) -> List[Tuple[str, Union[str, bool]]]:
+        return [item for part in self.parts for item in part.required()]
+
+    def __call__(self, read: PropertyReader) -> bool:
+        return all(part(read) for part in self.parts)
+
+
+class _AnyOf(_AllOf):
+    """Compiled disjunction; parts are tried cheapest first and stop at the first success"""
+
+    def required(self) -> List[Tuple[str, Union[str, bool]]]:
+        return []
+
+    def __call__(self, read: PropertyReader) -> bool:
+        return any(part(read) for part in self.parts)
+
+
+def _compile(strategy: LocatorStrategy) -> Any:
+    """
+    Compile a strategy into a predicate over element properties.
+
+    Raises:
+        ValueError: If the strategy, or a part of it, cannot be compiled
+    """
+    if isinstance(strategy, ByChain):
+        raise ValueError("ByChain can only be the outermost strategy")
+    if isinstance(strategy, ByAny):
+        return _AnyOf([_compile(part) for part in strategy.strategies])
+    if isinstance(strategy, CompoundStrategy):
+        return _AllOf([_compile(part) for part in strategy.strategies])
+    if isinstance(strategy, ByState):
+        check = _STATE_CHECKS.get(strategy.value.lower())
+        if check is None:
+            raise ValueError(f"State cannot be compiled: {strategy.value}")
+        return _Check(*check)
+    prop = _snapshot_property(strategy)
+    if prop is None:
+        raise ValueError(f"{type(strategy).__name__} cannot be compiled")
+    return _Check(CACHE_PROPERTIES[prop], strategy.value)
+
+
+def _compile_steps(strategy: LocatorStrategy) -> List[Any]:
+    """Predicates of the steps of a chain, outermost first; one step for other strategies"""
+    if not isinstance(strategy, ByChain):
+        return [_compile(strategy)]
+    return [step for part in strategy.strategies for step in _compile_steps(part)]
+
+
 class BaseLocator(ILocator):
     """
     Base class that ensures LSP compliance for all locator implementations.
@@ -149,6 +398,9 @@ class BaseLocator(ILocator):
     that all derived classes can be substituted without breaking functionality.
     """
 
+    # Tree snapshot answering queries, set by snapshot()
+    _snapshot: Optional[TreeSnapshot] = None
+
     def __init__(self, backend: IBackendForLocator) -> None:
         """Initialize base locator with LSP compliance"""
         if not backend:
@@ -184,6 +436,257 @@ class BaseLocator(ILocator):
     def logger(self) -> Optional[Any]:
         """Get logger instance"""
         return self._logger
+
+    def snapshot(
+        self,
+        root: Optional[Any] = None,
+        max_depth: Optional[int] = None,
+        max_age: float = DEFAULT_MAX_AGE
+    ) -> TreeSnapshot:
+        """
+        Read the tree once and answer later queries from the copy.
+
+        Strategies with a snapshot property (name, role/control type,
+        automation id, class name, description) are then looked up in the
+        snapshot; it is refreshed first when stale. Other strategies still
+        query the live tree. Only a snapshot of the whole tree (root is the
+        backend root, no max_depth, not truncated) answers unscoped
+        strategies; a partial one only answers scoped searches whose root it
+        contains.
+
+        Args:
+            root: Element to snapshot below; defaults to the backend root
+            max_depth: Deepest level read below root; None reads everything
+            max_age: Seconds before the snapshot is refreshed on use
+
+        Returns:
+            TreeSnapshot: The new snapshot
+        """
+        reader = getattr(self._backend, 'read_tree_node', read_node_attributes)
+        key = getattr(self._backend, 'tree_node_key', node_key)
+        self._snapshot = TreeSnapshot(
+            self._backend.root if root is None else root, reader, max_depth, max_age=max_age, key=key
+        )
+        return self._snapshot
+
+    @property
+    def current_snapshot(self) -> Optional[TreeSnapshot]:
+        """The snapshot answering queries, if any"""
+        return self._snapshot
+
+    def clear_snapshot(self) -> None:
+        """Answer queries from the live tree again"""
+        self._snapshot = None
+
+    def _usable_snapshot(self) -> Optional[TreeSnapshot]:
+        """The snapshot, refreshed if stale, or None if there is none or it is not complete"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if snapshot.is_stale():
+            snapshot.refresh()
+        if not snapshot.complete:
+            # A miss in a depth-limited or truncated copy says nothing about the live tree
+            return None
+        return snapshot
+
+    def _find_in_snapshot(self, strategy: LocatorStrategy, first: bool) -> Optional[List[Any]]:
+        """
+        Elements matching a strategy in the snapshot.
+
+        Returns None, so the live tree is searched, when there is no snapshot,
+        the strategy has no snapshot property, or the snapshot does not cover
+        the whole tree.
+        """
+        prop = _snapshot_property(strategy)
+        if prop is None:
+            return None
+        snapshot = self._usable_snapshot()
+        if snapshot is None or snapshot.index_of(self._backend.root) != 0:
+            return None
+        matches = snapshot.find(prop, strategy.value)
+        return snapshot.elements(matches[:1] if first else matches)
+
+    def _find_compiled(self, strategy: LocatorStrategy, first: bool, use_snapshot: bool = True) -> Optional[List[Any]]:
+        """
+        Elements matching a compound or scoped strategy in one traversal.
+
+        The query is answered from a complete snapshot when the search root is
+        in it, otherwise by walking only the subtree below the root. Returns
+        None for plain strategies without a scope, and for scoped strategies
+        that cannot be compiled, which then search the whole tree.
+        """
+        if isinstance(strategy, ByXPath):
+            return self._find_xpath(strategy, first, use_snapshot)
+        compound = isinstance(strategy, CompoundStrategy)
+        if strategy.scope is None and not compound:
+            return None
+        try:
+            steps = _compile_steps(strategy)
+        except ValueError:
+            if compound:
+                raise
+            if self.logger:
+                self.logger.warning(f"{type(strategy).__name__} does not support search scopes; searching the whole tree")
+            return None
+        scope = strategy.scope or SearchScope()
+        root = self._backend.root if scope.root is None else getattr(scope.root, 'native_element', scope.root)
+        limit = 1 if first else scope.max_results
+
+        snapshot = self._usable_snapshot() if use_snapshot else None
+        if snapshot is not None:
+            index = snapshot.index_of(root)
+            if index is not None:
+                return self._match_snapshot(snapshot, index, steps, scope, limit)
+        return self._walk(root, steps, scope, limit)
+
+    def _find_xpath(self, strategy: "ByXPath", first: bool, use_snapshot: bool = True) -> List[Any]:
+        """
+        Elements selected by an XPath expression below the search root.
+
+        The root (the scope root or the backend root) is the document node of
+        the expression. The query is evaluated on a complete snapshot when the
+        root is in it, otherwise on the live tree, reading children only as steps
+        reach them. Only the root and max_results of a scope apply; depth and
+        order are given by the expression itself.
+        """
+        query = compile_xpath(strategy.value)
+        scope = strategy.scope or SearchScope()
+        root = self._backend.root if scope.root is None else getattr(scope.root, 'native_element', scope.root)
+        limit = 1 if first else scope.max_results
+
+        snapshot = self._usable_snapshot() if use_snapshot else None
+        if snapshot is not None:
+            index = snapshot.index_of(root)
+            if index is not None:
+                return query.evaluate(SnapshotView(snapshot, index), limit)
+        return query.evaluate(LiveView(self._backend, root, query.properties), limit)
+
+    def _live_reader(self, element: Any, values: Dict[str, Any]) -> PropertyReader:
+        """Property reader serving prefetched values and fetching others on first use"""
+        def read(prop: str) -> Any:
+            if prop not in values:
+                try:
+                    fetched = self._backend.prefetch(element, CacheRequest((prop,), 'element'))
+                    values[prop] = fetched[0][1].get(prop) if fetched else None
+                except Exception:
+                    values[prop] = None
+            return values[prop]
+        return read
+
+    def _walk(self, root: Any, steps: List[Any], scope: SearchScope, limit: Optional[int]) -> List[Any]:
+        """
+        Search the live subtree below root, stopping at limit matches.
+
+        Each expanded node costs one backend prefetch returning its children
+        with the first property each step tests; other properties are read
+        only for the children that get that far. A node's chain state (the
+        number of steps matched by its ancestors) is passed to its children.
+        """
+        request = CacheRequest(tuple(step.first_property for step in steps))
+        bfs = scope.order == 'bfs'
+        last = len(steps) - 1
+        pending: Deque[Tuple[Any, int, int, bool]] = deque([(root, 0, 0, False)])
+        matches: List[Any] = []
+        visited = 0
+        # Children are tested as their parent is expanded. Breadth-first
+        # matches are recorded then, since the queue order is the result
+        # order; depth-first matches when popped, so they come in document order
+        while pending and visited < DEFAULT_MAX_NODES:
+            node, depth, state, matched = pending.popleft() if bfs else pending.pop()
+            visited += 1
+            if matched and not bfs:
+                matches.append(node)
+                if limit is not None and len(matches) >= limit:
+                    break
+            if scope.max_depth is not None and depth >= scope.max_depth:
+                continue
+            try:
+                children = self._backend.prefetch(node, request)
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(f"Failed to read children during search: {e}")
+                continue
+            entries = []
+            for child, values in children:
+                child_state, child_matched = state, False
+                if steps[state](self._live_reader(child, dict(values))):
+                    if state == last:
+                        child_matched = True
+                    else:
+                        child_state = state + 1
+                entries.append((child, depth + 1, child_state, child_matched))
+                if bfs and child_matched:
+                    matches.append(child)
+                    if limit is not None and len(matches) >= limit:
+                        return matches
+            pending.extend(entries if bfs else reversed(entries))
+        if pending and visited >= DEFAULT_MAX_NODES and self.logger:
+            self.logger.warning(
+                f"Search stopped after {DEFAULT_MAX_NODES} nodes; {len(pending)} unexpanded nodes were not searched"
+            )
+        return matches
+
+    def _match_snapshot(
+        self,
+        snapshot: TreeSnapshot,
+        root: int,
+        steps: List[Any],
+        scope: SearchScope,
+        limit: Optional[int]
+    ) -> List[Any]:
+        """
+        Search the snapshot below a node.
+
+        Candidates come from the smallest index bucket among the values the
+        last step requires, i.e. the most selective indexed property, or are
+        all nodes of the subtree. Chains are checked by walking up the
+        candidate's parents. Properties the snapshot has no column for are
+        read live.
+        """
+        live: Dict[int, Dict[str, Any]] = {}
+
+        def reader(index: int) -> PropertyReader:
+            def read(prop: str) -> Any:
+                column = _SNAPSHOT_COLUMNS.get(prop)
+                if column is not None:
+                    return snapshot.get(index, column)
+                return self._live_reader(snapshot.element(index), live.setdefault(index, {}))(prop)
+            return read
+
+        start, end = root + 1, int(snapshot.ends[root])
+        candidates: Optional[np.ndarray] = None
+        for prop, expected in steps[-1].required():
+            column = _SNAPSHOT_COLUMNS.get(prop)
+            if column in INDEXED_PROPERTIES:
+                bucket = snapshot.find(column, str(expected))
+                if candidates is None or len(bucket) < len(candidates):
+                    candidates = bucket
+        if candidates is None:
+            candidates = np.arange(start, end, dtype=np.int32)
+        else:
+            candidates = candidates[(candidates >= start) & (candidates < end)]
+        depths = snapshot.depths[candidates] - snapshot.depths[root]
+        if scope.max_depth is not None:
+            candidates, depths = candidates[depths <= scope.max_depth], depths[depths <= scope.max_depth]
+        if scope.order == 'bfs':
+            candidates = candidates[np.argsort(depths, kind='stable')]
+
+        matches: List[Any] = []
+        for index in candidates.tolist():
+            if not steps[-1](reader(index)):
+                continue
+            step = len(steps) - 2
+            parent = snapshot.parent_of(index)
+            while step >= 0 and parent > root:
+                if steps[step](reader(parent)):
+                    step -= 1
+                parent = snapshot.parent_of(parent)
+            if step < 0:
+                matches.append(snapshot.element(index))
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
     
     def find_element(self, strategy: LocatorStrategy) -> Optional[Any]:
         """Find element with validation"""
@@ -192,6 +695,16 @@ class BaseLocator(ILocator):
         
         if not strategy.value:
             raise ValueError("Strategy value cannot be empty")
+
+        return self._find_first(strategy, use_snapshot=True)
+
+    def _find_first(self, strategy: LocatorStrategy, use_snapshot: bool) -> Optional[Any]:
+        """First match of a validated strategy, optionally bypassing the snapshot"""
+        found = self._find_compiled(strategy, first=True, use_snapshot=use_snapshot)
+        if found is None and use_snapshot:
+            found = self._find_in_snapshot(strategy, first=True)
+        if found is not None:
+            return found[0] if found else None
         
         return self._find_element_impl(strategy)
     
@@ -207,6 +720,12 @@ class BaseLocator(ILocator):
         
         if not strategy.value:
             raise ValueError("Strategy value cannot be empty")
+
+        found = self._find_compiled(strategy, first=False)
+        if found is None:
+            found = self._find_in_snapshot(strategy, first=False)
+        if found is not None:
+            return found
         
         elements = self._find_elements_impl(strategy)
         
@@ -223,14 +742,21 @@ class BaseLocator(ILocator):
             raise ValueError("Timeout must be positive")
         
         start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            element = self.find_element(strategy)
-            if element:
-                return element
-            time.sleep(0.1)
-        
-        return None
+        # The first attempt may use the snapshot; once it has missed, re-reading
+        # the whole tree every poll costs more than the live query, so the live
+        # tree is polled and the snapshot refreshed once when the wait ends
+        use_snapshot = True
+        try:
+            while time.time() - start_time < timeout:
+                element = self.find_element(strategy) if use_snapshot else self._find_first(strategy, False)
+                if element:
+                    return element
+                use_snapshot = False
+                time.sleep(0.1)
+            return None
+        finally:
+            if not use_snapshot and self._snapshot is not None:
+                self._snapshot.refresh()
     
     def wait_for_element(self, strategy: LocatorStrategy, timeout: float = 10.0) -> Optional[Any]:
         """Wait for element to appear (alias for find_element_with_timeout)"""
@@ -7,10 +7,11 @@ Dependency Inversion Principle compliance.
 
 from abc import ABC, abstractmethod
 from logging import Logger
-from typing import Optional, List, Any, Protocol, TYPE_CHECKING
+from typing import Optional, List, Any, Dict, Hashable, Protocol, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .base import LocatorStrategy
+    from ..elements.cache_request import CacheRequest
 
 
 class IBackendForLocator(Protocol):
@@ -33,6 +34,22 @@ class IBackendForLocator(Protocol):
     def _find_elements_recursive(self, element: Any, property_name: str, value: str, results: List[Any]) -> None:
         """Find elements recursively by property"""
         ...
+
+    def read_tree_node(self, element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+        """Read the snapshot properties and the children of an element"""
+        ...
+
+    def tree_node_key(self, element: Any) -> Hashable:
+        """Key identifying an element across wrapper objects"""
+        ...
+
+    def get_child_elements(self, element: Any) -> List[Any]:
+        """Get the direct children of an element"""
+        ...
+
+    def prefetch(self, element: Any, request: "CacheRequest") -> List[Tuple[Any, Dict[str, Any]]]:
+        """Read the properties of a cache request for every node in its scope"""
+        ...
     
     def find_element_by_text(self, text: str) -> Optional[Any]:
         """Find element by text"""
@@ -0,0 +1,303 @@
+"""
+Accessibility tree snapshots.
+
+Reading a property of a live AT-SPI, UIA or AX element is an IPC round trip,
+so a locator query that walks the live tree costs one round trip per node and
+property. A snapshot walks the tree once and keeps it in process: nodes are
+numbered in document (preorder) order with parent indices, depths and subtree
+ends in NumPy arrays, properties in one column per property, and hash indexes
+map the values of the common search properties to node numbers. Queries on a
+snapshot are dictionary lookups and never touch the application.
+
+A snapshot is a picture of the tree at one moment; it is refreshed explicitly
+with refresh() or when is_stale() reports it too old or invalidated.
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..elements.cache_request import read_properties
+
+# Properties read for every node, in column order
+PROPERTIES = ('name', 'role', 'automation_id', 'class_name', 'description')
+# Properties with a hash index
+INDEXED_PROPERTIES = ('name', 'role', 'automation_id', 'class_name')
+# Cache request property (see elements.cache_request) holding each snapshot
+# property when it is read from the live tree
+CACHE_PROPERTIES = {
+    'name': 'name',
+    'role': 'role',
+    'automation_id': 'automation_id',
+    'class_name': 'class_name',
+    'description': 'description',
+}
+
+# Nodes read before a walk stops, guarding against cyclic or runaway trees
+DEFAULT_MAX_NODES = 100_000
+# Seconds after which a snapshot reports itself stale
+DEFAULT_MAX_AGE = 1.0
+
+# Reads one node: its properties (missing ones may be omitted) and its children
+NodeReader = Callable[[Any], Tuple[Dict[str, Optional[str]], Sequence[Any]]]
+# Identifies one node: equal keys for wrappers of the same element
+NodeKey = Callable[[Any], Hashable]
+
+
+def node_children(element: Any) -> List[Any]:
+    """Children of an element exposing a children attribute or getChildren()"""
+    children = getattr(element, 'children', None)
+    if children is None and callable(getattr(element, 'getChildren', None)):
+        children = element.getChildren()
+    return list(children) if children else []
+
+
+def node_key(element: Any) -> Hashable:
+    """
+    Generic node key: the UIA runtime id or the AT-SPI bus name and object
+    path when the element has one, otherwise the identity of the wrapper.
+
+    Backends return several wrapper objects for one element, so identity
+    alone does not find a root obtained separately from the tree walk.
+    """
+    try:
+        runtime_id = element.GetRuntimeId()
+        if runtime_id:
+            return ('runtime_id', tuple(runtime_id))
+    except Exception:
+        pass
+    try:
+        path = element.path
+        if isinstance(path, str) and path:
+            return ('path', getattr(element.app, 'bus_name', None), path)
+    except Exception:
+        pass
+    return ('id', id(element))
+
+
+def read_node_attributes(element: Any) -> Tuple[Dict[str, Optional[str]], Sequence[Any]]:
+    """
+    Generic node reader probing common attribute and getter names.
+
+    Used when a backend has no reader of its own; backends override
+    read_tree_node with a reader that knows their element type. It probes
+    the same names as the generic prefetch (elements.cache_request), so a
+    snapshot and a live search of the same element read the same values.
+
+    Args:
+        element: Native element
+
+    Returns:
+        Tuple[Dict[str, Optional[str]], Sequence[Any]]: Properties and children
+    """
+    values = read_properties(element, [CACHE_PROPERTIES[prop] for prop in PROPERTIES])
+    properties = {}
+    for prop in PROPERTIES:
+        value = values[CACHE_PROPERTIES[prop]]
+        properties[prop] = None if value is None else str(value)
+    return properties, node_children(element)
+
+
+class TreeSnapshot:
+    """In-process copy of an accessibility tree with indexed property lookups"""
+
+    def __init__(
+        self,
+        root: Any,
+        reader: NodeReader = read_node_attributes,
+        max_depth: Optional[int] = None,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_age: float = DEFAULT_MAX_AGE,
+        key: NodeKey = node_key
+    ) -> None:
+        """
+        Walk the tree below root once and index it.
+
+        Args:
+            root: Native element the snapshot starts at (node 0)
+            reader: Function reading the properties and children of a node,
+                usually the backend's read_tree_node
+            max_depth: Deepest level read below root; None reads everything
+            max_nodes: Nodes read before the walk stops
+            max_age: Seconds after which is_stale() reports the snapshot stale
+            key: Function identifying a node for index_of, usually the
+                backend's tree_node_key
+        """
+        self.root = root
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_age = max_age
+        self._reader = reader
+        self._key = key
+        self.refresh()
+
+    def refresh(self) -> "TreeSnapshot":
+        """Walk the tree again from the same root and rebuild all indexes"""
+        started = time.perf_counter()
+        elements: List[Any] = []
+        parents: List[int] = []
+        depths: List[int] = []
+        columns: Dict[str, List[Optional[str]]] = {prop: [] for prop in PROPERTIES}
+        self.errors = 0
+        self.truncated = False
+
+        # Preorder walk with an explicit stack; children are pushed reversed so
+        # they are numbered in document order
+        stack: List[Tuple[Any, int, int]] = [(self.root, -1, 0)]
+        while stack:
+            if len(elements) >= self.max_nodes:
+                self.truncated = True
+                break
+            element, parent, depth = stack.pop()
+            try:
+                properties, children = self._reader(element)
+            except Exception:
+                self.errors += 1
+                properties, children = {}, []
+            index = len(elements)
+            elements.append(element)
+            parents.append(parent)
+            depths.append(depth)
+            for prop in PROPERTIES:
+                value = properties.get(prop)
+                columns[prop].append(None if value is None else str(value))
+            if self.max_depth is None or depth < self.max_depth:
+                stack.extend((child, index, depth + 1) for child in reversed(children))
+
+        count = len(elements)
+        self._elements = elements
+        # Elements are kept alive by the snapshot, so id() keys stay unique
+        self._positions: Dict[Hashable, int] = {}
+        for index, element in enumerate(elements):
+            try:
+                position_key = self._key(element)
+            except Exception:
+                position_key = ('id', id(element))
+            self._positions.setdefault(position_key, index)
+        self.parents: NDArray[np.int32] = np.array(parents, dtype=np.int32)
+        self.depths: NDArray[np.int32] = np.array(depths, dtype=np.int32)
+        # In preorder a subtree is the contiguous range [i, ends[i]); sizes are
+        # summed children first, i.e. in reverse document order
+        sizes = np.ones(count, dtype=np.int32)
+        for index in range(count - 1, 0, -1):
+            sizes[parents[index]] += sizes[index]
+        self.ends: NDArray[np.int32] = np.arange(count, dtype=np.int32) + sizes
+        self._columns = columns
+        self._indexes: Dict[str, Dict[str, NDArray[np.int32]]] = {
+            prop: self._build_index(columns[prop]) for prop in INDEXED_PROPERTIES
+        }
+        self.captured_at = time.monotonic()
+        self.capture_time = time.perf_counter() - started
+        self._invalidated = False
+        return self
+
+    @staticmethod
+    def _build_index(column: List[Optional[str]]) -> Dict[str, NDArray[np.int32]]:
+        """Map each value of a column to the ascending node numbers holding it"""
+        buckets: Dict[str, List[int]] = {}
+        for index, value in enumerate(column):
+            if value:
+                buckets.setdefault(value, []).append(index)
+        return {value: np.array(nodes, dtype=np.int32) for value, nodes in buckets.items()}
+
+    @property
+    def age(self) -> float:
+        """Seconds since the tree was read"""
+        return time.monotonic() - self.captured_at
+
+    @property
+    def complete(self) -> bool:
+        """True if every node below the root was read: no depth limit and no truncation"""
+        return self.max_depth is None and not self.truncated
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale, e.g. after input changed the application"""
+        self._invalidated = True
+
+    def is_stale(self, max_age: Optional[float] = None) -> bool:
+        """
+        Check whether the snapshot should be refreshed before use.
+
+        Args:
+            max_age: Maximum age in seconds; defaults to the snapshot's max_age
+
+        Returns:
+            bool: True if the snapshot was invalidated or is older than max_age
+        """
+        return self._invalidated or self.age > (self.max_age if max_age is None else max_age)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def element(self, index: int) -> Any:
+        """Native element of a node"""
+        return self._elements[index]
+
+    def elements(self, indices: Sequence[int]) -> List[Any]:
+        """Native elements of several nodes"""
+        return [self._elements[index] for index in indices]
+
+    def index_of(self, element: Any) -> Optional[int]:
+        """
+        Node number of a native element, or None if it is not in the snapshot.
+
+        Looked up by node key, so another wrapper of a snapshot element (e.g.
+        a root obtained from the backend again) is found as well.
+        """
+        try:
+            position_key = self._key(element)
+        except Exception:
+            position_key = ('id', id(element))
+        return self._positions.get(position_key)
+
+    def get(self, index: int, prop: str) -> Optional[str]:
+        """Value of a property of a node as read at capture time"""
+        return self._columns[prop][index]
+
+    def column(self, prop: str) -> List[Optional[str]]:
+        """All values of a property in document order"""
+        return self._columns[prop]
+
+    def parent_of(self, index: int) -> int:
+        """Parent node number; -1 for the root"""
+        return int(self.parents[index])
+
+    def children_of(self, index: int) -> NDArray[np.int32]:
+        """Node numbers of the direct children of a node"""
+        start, end = index + 1, int(self.ends[index])
+        return start + np.flatnonzero(self.parents[start:end] == index).astype(np.int32)
+
+    def subtree(self, index: int) -> range:
+        """Node numbers of a node and all its descendants"""
+        return range(index, int(self.ends[index]))
+
+    def find(self, prop: str, value: str) -> NDArray[np.int32]:
+        """
+        Node numbers whose property equals a value, in document order.
+
+        Indexed properties are a hash lookup; other properties scan their column.
+
+        Args:
+            prop: One of PROPERTIES
+            value: Exact value
+
+        Returns:
+            NDArray[np.int32]: Matching node numbers
+        """
+        index = self._indexes.get(prop)
+        if index is not None:
+            return index.get(value, np.empty(0, dtype=np.int32))
+        if prop not in self._columns:
+            raise KeyError(f"Unknown snapshot property: {prop}")
+        return np.array([i for i, v in enumerate(self._columns[prop]) if v == value], dtype=np.int32)
+
+    def find_first(self, prop: str, value: str) -> Optional[int]:
+        """First node number in document order whose property equals a value"""
+        matches = self.find(prop, value)
+        return int(matches[0]) if len(matches) else None
+
+    def values(self, prop: str) -> Iterator[str]:
+        """Distinct values of an indexed property"""
+        return iter(self._indexes[prop])
@@ -0,0 +1,669 @@
+"""
+XPath engine for accessibility trees.
+
+Evaluates an XPath 1.0 subset over a TreeSnapshot or the live tree:
+
+- location paths: absolute and relative, ``/`` and ``//``, union with ``|``
+- axes: child, descendant, descendant-or-self, self and parent, with the
+  abbreviations ``*``, ``.`` and ``..``
+- node tests: ``*``, ``node()`` or a role, compared without case, spaces,
+  hyphens and underscores (``PushButton`` matches "push button")
+- predicates: attributes (``@Name``, ``@Role``/``@ControlType``,
+  ``@ClassName``, ``@AutomationId``, ``@Description``), string and number
+  literals, ``= != < <= > >=``, ``and``, ``or``, ``not()``, ``contains()``,
+  ``starts-with()``, ``ends-with()``, ``text()``, ``position()``, ``last()``
+  and positions such as ``[2]``
+
+The search root (usually the desktop) is the document node: ``/Window``
+selects its children and ``//Button`` its descendants; the root itself is
+never a result, and the last step of a path does not count it for positions
+(``/descendant-or-self::*[1]`` is the root's first child). Expressions are compiled once and kept in an LRU cache.
+On a snapshot, descendant steps testing an indexed property are answered
+from the hash indexes; on the live tree, children are only read when a step
+reaches them, and a single-result query stops at the first match.
+"""
+
+import re
+import weakref
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .snapshot import CACHE_PROPERTIES, DEFAULT_MAX_NODES, INDEXED_PROPERTIES, TreeSnapshot
+from ..elements.cache_request import CacheRequest
+
+# Compiled expressions kept by compile_xpath
+XPATH_CACHE_SIZE = 256
+
+AXES = ('child', 'descendant', 'descendant-or-self', 'self', 'parent')
+
+# Attribute names accepted in predicates (lowercase) and the property they read
+ATTRIBUTES: Dict[str, str] = {
+    'name': 'name',
+    'text': 'name',
+    'role': 'role',
+    'controltype': 'role',
+    'localizedcontroltype': 'role',
+    'class': 'class_name',
+    'classname': 'class_name',
+    'class_name': 'class_name',
+    'automationid': 'automation_id',
+    'automation_id': 'automation_id',
+    'id': 'automation_id',
+    'identifier': 'automation_id',
+    'description': 'description',
+    'helptext': 'description',
+}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>\d+(?:\.\d*)?|\.\d+)
+      | (?P<op>//|::|\.\.|!=|<=|>=|[/.@\[\](),|=<>*])
+      | (?P<name>[A-Za-z_][\w.-]*)
+    )""", re.VERBOSE)
+_ROLE_SEPARATORS = re.compile(r"[\s_-]+")
+
+# Evaluates a predicate expression for (view, node, position, size)
+Evaluator = Callable[[Any, Any, int, int], Any]
+
+
+class XPathError(ValueError):
+    """Invalid or unsupported XPath expression"""
+
+
+def normalize_role(role: str) -> str:
+    """Role as compared by node tests: lowercase without spaces, hyphens and underscores"""
+    return _ROLE_SEPARATORS.sub('', role).lower()
+
+
+class _Expr:
+    """Compiled predicate expression"""
+
+    def __init__(
+        self,
+        evaluate: Evaluator,
+        positional: bool = False,
+        equalities: Optional[List[Tuple[str, str]]] = None,
+        number: bool = False
+    ) -> None:
+        self.evaluate = evaluate
+        # Uses position() or last(), so candidates must be counted first
+        self.positional = positional
+        # Property values every match has (attribute = literal conjuncts)
+        self.equalities = equalities or []
+        # Static number, e.g. [2], meaning position() = 2
+        self.number = number
+
+
+class _Step:
+    """One location step: axis, node test and predicates"""
+
+    def __init__(self, axis: str, test: Optional[str], predicates: List[_Expr]) -> None:
+        self.axis = axis
+        self.test = test
+        self.predicates = predicates
+        self.positional = any(predicate.positional for predicate in predicates)
+
+    def is_any_node(self) -> bool:
+        return self.test is None and not self.predicates
+
+    def candidates_hint(self) -> List[Tuple[str, str]]:
+        """Property values every match has, usable as index lookups"""
+        hint = []
+        for predicate in self.predicates:
+            if predicate.positional:
+                break
+            hint.extend(predicate.equalities)
+        return hint
+
+
+def _boolean(value: Any) -> bool:
+    return bool(value) if value is not None else False
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    """XPath comparison; a missing attribute compares false with anything"""
+    if left is None or right is None:
+        return False
+    if op in ('=', '!='):
+        if isinstance(left, bool) or isinstance(right, bool):
+            equal = _boolean(left) == _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            equal = _number(left) == _number(right)
+        else:
+            equal = str(left) == str(right)
+        return equal if op == '=' else not equal
+    a, b = _number(left), _number(right)
+    if a is None or b is None:
+        return False
+    return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b}[op]
+
+
+class _Parser:
+    """Recursive-descent parser producing location paths of _Step"""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if match is None or match.end() == position:
+                if not expression[position:].strip():
+                    break
+                raise XPathError(f"Unexpected character at {position} in {expression!r}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.index = 0
+        self.properties: set = set()
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[Optional[str], Optional[str]]:
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def accept(self, value: str) -> bool:
+        kind, token = self.peek()
+        if token == value and kind in ('op', 'name'):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            raise XPathError(f"Expected {value!r} at token {self.index} in {self.expression!r}")
+
+    # Paths
+    def parse(self) -> List[List[_Step]]:
+        paths = [self.parse_path()]
+        while self.accept('|'):
+            paths.append(self.parse_path())
+        if self.index < len(self.tokens):
+            raise XPathError(f"Unexpected {self.peek()[1]!r} in {self.expression!r}")
+        return paths
+
+    def parse_path(self) -> List[_Step]:
+        steps: List[_Step] = []
+        if self.accept('//'):
+            steps.append(_Step('descendant-or-self', None, []))
+        else:
+            self.accept('/')
+        steps.append(self.parse_step())
+        while True:
+            if self.accept('//'):
+                steps.append(_Step('descendant-or-self', None, []))
+            elif not self.accept('/'):
+                break
+            steps.append(self.parse_step())
+        return self._merge_descendant_steps(steps)
+
+    @staticmethod
+    def _merge_descendant_steps(steps: List[_Step]) -> List[_Step]:
+        """Rewrite //x (descendant-or-self::node()/child::x) as descendant::x unless x is positional"""
+        merged: List[_Step] = []
+        for step in steps:
+            previous = merged[-1] if merged else None
+            if (previous is not None and previous.axis == 'descendant-or-self' and previous.is_any_node()
+                    and step.axis == 'child' and not step.positional):
+                merged[-1] = _Step('descendant', step.test, step.predicates)
+            else:
+                merged.append(step)
+        return merged
+
+    def parse_step(self) -> _Step:
+        if self.accept('.'):
+            return _Step('self', None, [])
+        if self.accept('..'):
+            return _Step('parent', None, [])
+        axis = 'child'
+        kind, token = self.peek()
+        if kind == 'name' and self.peek(1)[1] == '::':
+            if token not in AXES:
+                raise XPathError(f"Unsupported axis {token!r} in {self.expression!r}")
+            axis = token
+            self.index += 2
+        kind, token = self.next()
+        if token == '*' and kind == 'op':
+            test = None
+        elif kind == 'name':
+            if self.accept('('):
+                if token != 'node':
+                    raise XPathError(f"Unsupported node test {token}() in {self.expression!r}")
+                self.expect(')')
+                test = None
+            else:
+                test = normalize_role(token)
+                self.properties.add('role')
+        else:
+            raise XPathError(f"Expected a node test in {self.expression!r}")
+        predicates = []
+        while self.accept('['):
+            predicates.append(self.parse_predicate())
+            self.expect(']')
+        return _Step(axis, test, predicates)
+
+    # Predicate expressions
+    def parse_predicate(self) -> _Expr:
+        expr = self.parse_or()
+        if expr.number:
+            # [n] is short for [position() = n], see _filter
+            expr.positional = True
+        return expr
+
+    def parse_or(self) -> _Expr:
+        parts = [self.parse_and()]
+        while self.accept('or'):
+            parts.append(self.parse_and())
+        if len(parts) == 1:
+            return parts[0]
+        evaluators = [part.evaluate for part in parts]
+        return _Expr(
+            lambda view, node, position, size: any(_boolean(e(view, node, position, size)) for e in evaluators),
+            positional=any(part.positional for part in parts)
+        )
+
+    def parse_and(self) -> _Expr:
+        parts = [self.parse_comparison()]
+        while self.accept('and'):
+            parts.append(self.parse_comparison())
+        if len(parts) == 1:
+            return parts[0]
+        evaluators = [part.evaluate for part in parts]
+        return _Expr(
+            lambda view, node, position, size: all(_boolean(e(view, node, position, size)) for e in evaluators),
+            positional=any(part.positional for part in parts),
+            equalities=[item for part in parts for item in part.equalities]
+        )
+
+    def parse_comparison(self) -> _Expr:
+        left = self.parse_value()
+        kind, token = self.peek()
+        if kind != 'op' or token not in ('=', '!=', '<', '<=', '>', '>='):
+            return left
+        self.index += 1
+        right = self.parse_value()
+        op, l_eval, r_eval = token, left.evaluate, right.evaluate
+        equalities = []
+        if op == '=' and getattr(left, 'attribute', None) and getattr(right, 'literal', None) is not None:
+            equalities = [(left.attribute, right.literal)]
+        return _Expr(
+            lambda view, node, position, size: _compare(op, l_eval(view, node, position, size),
+                                                        r_eval(view, node, position, size)),
+            positional=left.positional or right.positional,
+            equalities=equalities
+        )
+
+    def parse_value(self) -> _Expr:
+        kind, token = self.next()
+        if kind == 'string':
+            literal = token[1:-1]
+            expr = _Expr(lambda view, node, position, size: literal)
+            expr.literal = literal  # type: ignore[attr-defined]
+            return expr
+        if kind == 'number':
+            number = float(token)
+            return _Expr(lambda view, node, position, size: number, number=True)
+        if token == '@' and kind == 'op':
+            kind, name = self.next()
+            if kind != 'name':
+                raise XPathError(f"Expected an attribute name in {self.expression!r}")
+            return self._attribute(name)
+        if token == '(' and kind == 'op':
+            expr = self.parse_or()
+            self.expect(')')
+            return expr
+        if kind == 'name' and self.accept('('):
+            return self.parse_function(token)
+        raise XPathError(f"Unexpected {token!r} in {self.expression!r}")
+
+    def _attribute(self, name: str) -> _Expr:
+        prop = ATTRIBUTES.get(name.lower())
+        if prop is None:
+            raise XPathError(f"Unsupported attribute @{name} in {self.expression!r}")
+        self.properties.add(prop)
+        expr = _Expr(lambda view, node, position, size: view.get(node, prop))
+        expr.attribute = prop  # type: ignore[attr-defined]
+        return expr
+
+    def parse_function(self, name: str) -> _Expr:
+        args: List[_Expr] = []
+        if not self.accept(')'):
+            args.append(self.parse_or())
+            while self.accept(','):
+                args.append(self.parse_or())
+            self.expect(')')
+        arity = {'position': 0, 'last': 0, 'text': 0, 'not': 1, 'contains': 2, 'starts-with': 2, 'ends-with': 2}
+        if name not in arity:
+            raise XPathError(f"Unsupported function {name}() in {self.expression!r}")
+        if len(args) != arity[name]:
+            raise XPathError(f"{name}() takes {arity[name]} arguments in {self.expression!r}")
+        if name == 'position':
+            return _Expr(lambda view, node, position, size: float(position), positional=True, number=True)
+        if name == 'last':
+            return _Expr(lambda view, node, position, size: float(size), positional=True, number=True)
+        if name == 'text':
+            return self._attribute('name')
+        evaluators = [arg.evaluate for arg in args]
+        positional = any(arg.positional for arg in args)
+        if name == 'not':
+            inner = evaluators[0]
+            return _Expr(lambda view, node, position, size: not _boolean(inner(view, node, position, size)),
+                         positional=positional)
+        method = {'contains': str.__contains__, 'starts-with': str.startswith, 'ends-with': str.endswith}[name]
+        haystack, needle = evaluators
+
+        def test(view: Any, node: Any, position: int, size: int) -> bool:
+            value, part = haystack(view, node, position, size), needle(view, node, position, size)
+            return value is not None and part is not None and method(str(value), str(part))
+        return _Expr(test, positional=positional)
+
+
+class XPathQuery:
+    """Compiled XPath expression; evaluate it with a SnapshotView or LiveView"""
+
+    def __init__(self, expression: str) -> None:
+        parser = _Parser(expression)
+        self.expression = expression
+        self.paths = parser.parse()
+        # Properties the query reads, prefetched with children on the live tree
+        self.properties: Tuple[str, ...] = tuple(sorted(parser.properties))
+
+    def evaluate(self, view: Any, limit: Optional[int] = None) -> List[Any]:
+        """
+        Elements selected by the query in document order.
+
+        Args:
+            view: SnapshotView or LiveView to evaluate against
+            limit: Results after which evaluation stops; None for all
+
+        Returns:
+            List[Any]: Native elements
+        """
+        if len(self.paths) == 1:
+            nodes = list(islice(self._stream(view, self.paths[0]), limit))
+        else:
+            nodes = self._sorted(view, chain.from_iterable(self._stream(view, path) for path in self.paths))
+        return [view.element(node) for node in nodes[:limit]]
+
+    def _stream(self, view: Any, steps: List[_Step]) -> Iterator[Any]:
+        """
+        Nodes selected by a path, lazily and in document order without duplicates.
+
+        Descendant steps skip contexts inside the previous context, whose
+        descendants were already produced; child and self steps stream while
+        no context is inside another. Other steps (parent, positional
+        predicates, children of nested contexts) collect and sort their
+        results first.
+        """
+        nodes: Iterator[Any] = iter((view.root,))
+        # No node of the stream is an ancestor of another
+        flat = True
+        for number, step in enumerate(steps, 1):
+            # The document node is a context for inner steps but never selected by the last one
+            last = number == len(steps)
+            if step.positional or step.axis == 'parent' or (step.axis == 'child' and not flat):
+                nodes = iter(self._sorted(view, self._apply(view, nodes, step, last)))
+                flat = flat and step.axis in ('child', 'self')
+            elif step.axis in ('descendant', 'descendant-or-self'):
+                nodes = self._apply(view, self._outermost(view, nodes), step, last)
+                flat = False
+            else:
+                nodes = self._apply(view, nodes, step, last)
+        return nodes
+
+    def _apply(self, view: Any, contexts: Iterable[Any], step: _Step, last: bool) -> Iterator[Any]:
+        return chain.from_iterable(self._step(view, context, step, last) for context in contexts)
+
+    @staticmethod
+    def _outermost(view: Any, contexts: Iterable[Any]) -> Iterator[Any]:
+        """Contexts of a document-order stream that are not inside an earlier one"""
+        outer = None
+        for context in contexts:
+            if outer is None or not view.contains(outer, context):
+                outer = context
+                yield context
+
+    @staticmethod
+    def _sorted(view: Any, nodes: Iterable[Any]) -> List[Any]:
+        """Nodes in document order without duplicates"""
+        unique = {view.order_key(node): node for node in nodes}
+        return [unique[key] for key in sorted(unique)]
+
+    @staticmethod
+    def _step(view: Any, context: Any, step: _Step, last: bool) -> Iterable[Any]:
+        """Nodes selected by one step from one context node; the last step of a path skips the root"""
+        if step.axis == 'child':
+            nodes: Iterable[Any] = view.children(context)
+        elif step.axis == 'descendant':
+            nodes = view.descendants(context, step)
+        elif step.axis == 'descendant-or-self':
+            nodes = chain((context,), view.descendants(context, step))
+        elif step.axis == 'self':
+            nodes = (context,)
+        else:
+            parent = view.parent(context)
+            nodes = () if parent is None else (parent,)
+        if last and step.axis in ('descendant-or-self', 'self', 'parent'):
+            root = view.root
+            nodes = (node for node in nodes if node != root)
+        if step.test is not None:
+            test = step.test
+            nodes = (node for node in nodes if view.role(node) == test)
+        for predicate in step.predicates:
+            nodes = _filter(view, nodes, predicate)
+        return nodes
+
+
+def _filter(view: Any, nodes: Iterable[Any], predicate: _Expr) -> Iterable[Any]:
+    """Apply one predicate; positional predicates count the candidates first"""
+    evaluate = predicate.evaluate
+    if not predicate.positional:
+        return (node for node in nodes if _boolean(evaluate(view, node, 0, 0)))
+    items = list(nodes)
+    size = len(items)
+    selected = []
+    for position, node in enumerate(items, 1):
+        value = evaluate(view, node, position, size)
+        # A number selects the candidate at that position: [2], [last()]
+        if value == position if isinstance(value, float) else _boolean(value):
+            selected.append(node)
+    return selected
+
+
+@lru_cache(maxsize=XPATH_CACHE_SIZE)
+def compile_xpath(expression: str) -> XPathQuery:
+    """
+    Compile an expression, reusing recently compiled ones.
+
+    Raises:
+        XPathError: If the expression is invalid or outside the supported subset
+    """
+    return XPathQuery(expression)
+
+
+class _SnapshotTables:
+    """Lookup tables derived from a snapshot, built on first use"""
+
+    def __init__(self, snapshot: TreeSnapshot) -> None:
+        self.captured_at = snapshot.captured_at
+        self.ends: List[int] = snapshot.ends.tolist()
+        self.roles = [normalize_role(role or '') for role in snapshot.column('role')]
+        children: List[List[int]] = [[] for _ in range(len(snapshot))]
+        for node, parent in enumerate(snapshot.parents.tolist()):
+            if parent >= 0:
+                children[parent].append(node)
+        self.children = children
+        self._snapshot = snapshot
+        self._role_index: Optional[Dict[str, np.ndarray]] = None
+
+    def role_index(self) -> Dict[str, np.ndarray]:
+        """Node numbers by normalized role"""
+        if self._role_index is None:
+            buckets: Dict[str, List[np.ndarray]] = {}
+            for role in self._snapshot.values('role'):
+                buckets.setdefault(normalize_role(role), []).append(self._snapshot.find('role', role))
+            self._role_index = {role: np.sort(np.concatenate(parts)) for role, parts in buckets.items()}
+        return self._role_index
+
+
+# Tables of each snapshot, rebuilt when the snapshot is refreshed
+_tables: "weakref.WeakKeyDictionary[TreeSnapshot, _SnapshotTables]" = weakref.WeakKeyDictionary()
+
+
+def _snapshot_tables(snapshot: TreeSnapshot) -> _SnapshotTables:
+    tables = _tables.get(snapshot)
+    if tables is None or tables.captured_at != snapshot.captured_at:
+        tables = _tables[snapshot] = _SnapshotTables(snapshot)
+    return tables
+
+
+class SnapshotView:
+    """XPath view of a snapshot below one of its nodes; nodes are node numbers"""
+
+    def __init__(self, snapshot: TreeSnapshot, root: int = 0) -> None:
+        self._snapshot = snapshot
+        self._tables = _snapshot_tables(snapshot)
+        self.root = root
+
+    def children(self, node: int) -> List[int]:
+        return self._tables.children[node]
+
+    def descendants(self, node: int, step: Optional[_Step] = None) -> Iterable[int]:
+        """Descendants in document order, from the smallest index bucket the step allows"""
+        start, end = node + 1, self._tables.ends[node]
+        buckets = []
+        if step is not None:
+            for prop, value in step.candidates_hint():
+                # Empty values are not indexed, so @Name='' scans instead
+                if prop in INDEXED_PROPERTIES and value:
+                    buckets.append(self._snapshot.find(prop, value))
+            if step.test is not None:
+                buckets.append(self._tables.role_index().get(step.test, np.empty(0, dtype=np.int32)))
+        if not buckets:
+            return range(start, end)
+        bucket = min(buckets, key=len)
+        return bucket[(bucket >= start) & (bucket < end)].tolist()
+
+    def parent(self, node: int) -> Optional[int]:
+        return None if node == self.root else self._snapshot.parent_of(node)
+
+    def get(self, node: int, prop: str) -> Optional[str]:
+        return self._snapshot.get(node, prop)
+
+    def element(self, node: int) -> Any:
+        return self._snapshot.element(node)
+
+    def role(self, node: int) -> str:
+        return self._tables.roles[node]
+
+    def contains(self, ancestor: int, node: int) -> bool:
+        return ancestor < node < self._tables.ends[ancestor]
+
+    @staticmethod
+    def order_key(node: int) -> int:
+        return node
+
+
+class _LiveNode:
+    """Live element with its position in the tree and the properties read so far"""
+
+    __slots__ = ('element', 'parent', 'key', 'values', 'children')
+
+    def __init__(self, element: Any, parent: Optional["_LiveNode"], key: Tuple[int, ...], values: Dict[str, Any]):
+        self.element = element
+        self.parent = parent
+        # Child indices from the root; tuples sort in document order
+        self.key = key
+        self.values = values
+        self.children: Optional[List["_LiveNode"]] = None
+
+
+class LiveView:
+    """
+    XPath view of the live tree below an element.
+
+    Children are read on first use with one backend prefetch that also
+    returns the properties the query tests, and are kept for the rest of the
+    evaluation; other properties are read per element on first use.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        root: Any,
+        properties: Sequence[str] = (),
+        max_nodes: int = DEFAULT_MAX_NODES
+    ) -> None:
+        self._backend = backend
+        self._request = CacheRequest(tuple(CACHE_PROPERTIES[prop] for prop in properties))
+        self.root = _LiveNode(root, None, (), {})
+        self.max_nodes = max_nodes
+        # Nodes whose children were read
+        self.expanded = 0
+
+    def children(self, node: _LiveNode) -> List[_LiveNode]:
+        if node.children is None:
+            node.children = []
+            if self.expanded < self.max_nodes:
+                self.expanded += 1
+                try:
+                    fetched = self._backend.prefetch(node.element, self._request)
+                except Exception:
+                    fetched = []
+                node.children = [
+                    _LiveNode(element, node, node.key + (index,), dict(values))
+                    for index, (element, values) in enumerate(fetched)
+                ]
+        return node.children
+
+    def descendants(self, node: _LiveNode, step: Optional[_Step] = None) -> Iterator[_LiveNode]:
+        """Descendants in document order, read lazily"""
+        stack = list(reversed(self.children(node)))
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(self.children(current)))
+
+    def parent(self, node: _LiveNode) -> Optional[_LiveNode]:
+        return node.parent
+
+    def get(self, node: _LiveNode, prop: str) -> Optional[str]:
+        key = CACHE_PROPERTIES[prop]
+        if key not in node.values:
+            try:
+                fetched = self._backend.prefetch(node.element, CacheRequest((key,), 'element'))
+                node.values[key] = fetched[0][1].get(key) if fetched else None
+            except Exception:
+                node.values[key] = None
+        value = node.values[key]
+        return None if value is None else str(value)
+
+    @staticmethod
+    def element(node: _LiveNode) -> Any:
+        return node.element
+
+    def role(self, node: _LiveNode) -> str:
+        return normalize_role(self.get(node, 'role') or '')
+
+    @staticmethod
+    def contains(ancestor: _LiveNode, node: _LiveNode) -> bool:
+        return len(node.key) > len(ancestor.key) and node.key[:len(ancestor.key)] == ancestor.key
+
+    @staticmethod
+    def order_key(node: _LiveNode) -> Tuple[int, ...]:
+        return node.key
@@ -193,9 +193,10 @@ class PyUIAutomation:
     def capture_screenshot(self, name: str) -> 'PyUIAutomation':
         """Capture a screenshot and save it with the given name."""
         screenshot = self.session.backend.capture_screenshot()
-        filename = f"{name}_{int(time.time())}.png"
+        filename = f"{name}_{int(time.time())}.{self.session.config.screenshot_format}"
         if screenshot is not None:
-            self.session.utils.save_image(screenshot, filename)
+            # Encoded in the background; close() waits for pending screenshots
+            self.session.screenshot_service.save_screenshot(screenshot, filename)
         print(f"Screenshot saved: {filename}")
         return self
     
@@ -402,6 +403,7 @@ class PyUIAutomation:
     
     def close(self) -> None:
         """Close the application."""
+        self.session.screenshot_service.flush()
         if self.app:
             self.app.terminate()
     
@@ -7,6 +7,13 @@ from .image import (
     find_template, highlight_region, crop_image, preprocess_image,
     create_mask, enhance_image
 )
+from .baseline_cache import BaselineCache
+from .baseline_store import BaselineStore
+from .comparison import available_engines, register_engine
+from .hash_index import PerceptualHashIndex
+from .image_writer import AsyncImageWriter
+from .matching import MATCH_DTYPE, match_template
+from .template_store import TemplateStore
 
 # File utilities
 from .file import (
@@ -40,6 +47,15 @@ __all__ = [
     'preprocess_image',
     'create_mask',
     'enhance_image',
+    'available_engines',
+    'register_engine',
+    'MATCH_DTYPE',
+    'match_template',
+    'TemplateStore',
+    'BaselineCache',
+    'BaselineStore',
+    'PerceptualHashIndex',
+    'AsyncImageWriter',
     
     # File
     'ensure_dir',
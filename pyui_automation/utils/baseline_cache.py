@@ -0,0 +1,223 @@
+"""
+Bounded baseline image cache.
+
+Keeps decoded baseline images in memory in least-recently-used order under a
+byte budget, with an optional on-disk tier of decoded ``.npy`` arrays that are
+reloaded memory-mapped, so re-reading an evicted baseline skips the PNG decode.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+# Default memory budget for decoded baselines
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class BaselineCache:
+    """Thread-safe LRU cache of decoded baseline images with a byte budget"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        disk_dir: Optional[Union[str, Path]] = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached images; the least recently used
+                images are evicted when it is exceeded. 0 disables the memory tier.
+            disk_dir: Directory for decoded ``.npy`` copies of loaded baselines.
+                None disables the disk tier.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, NDArray[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[NDArray[Any]]:
+        """
+        Get a cached image and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[NDArray[Any]]: The image, or None on a miss
+        """
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key: str, image: NDArray[Any]) -> None:
+        """
+        Cache an image, evicting least recently used images over the budget.
+
+        Images larger than the whole budget are not cached.
+
+        Args:
+            key: Cache key
+            image: Image to cache
+        """
+        with self._lock:
+            self._remove(key)
+            if image.nbytes > self.max_bytes:
+                return
+            self._entries[key] = image
+            self.current_bytes += image.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop an image from the memory tier"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all images from the memory tier"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller holds the lock"""
+        image = self._entries.pop(key, None)
+        if image is not None:
+            self.current_bytes -= image.nbytes
+
+    def load(self, key: str, path: Path) -> Optional[NDArray[Any]]:
+        """
+        Get an image, loading it from the disk tier or decoding the file on a miss.
+
+        Args:
+            key: Cache key
+            path: Image file to decode
+
+        Returns:
+            Optional[NDArray[Any]]: The image, or None if the file cannot be decoded
+        """
+        image = self.get(key)
+        if image is not None:
+            return image
+
+        disk_path = self._disk_path(path)
+        if disk_path is not None and disk_path.exists():
+            try:
+                image = np.load(disk_path, mmap_mode="r")
+                with self._lock:
+                    self.disk_hits += 1
+            except (OSError, ValueError):
+                image = None
+
+        if image is None:
+            image = cv2.imread(str(path))
+            if image is None:
+                return None
+            if disk_path is not None:
+                self._save_to_disk(disk_path, image)
+
+        self.put(key, image)
+        return image
+
+    def _disk_path(self, path: Path) -> Optional[Path]:
+        """
+        Disk tier file for an image.
+
+        The name is ``<path digest>-<version digest>.npy``: the path part groups
+        all versions of one baseline, the version part (size and mtime) makes
+        edits miss.
+        """
+        if self.disk_dir is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        resolved = str(path.resolve())
+        path_digest = hashlib.blake2b(resolved.encode(), digest_size=12).hexdigest()
+        version = f"{resolved}|{stat.st_size}|{stat.st_mtime_ns}".encode()
+        version_digest = hashlib.blake2b(version, digest_size=8).hexdigest()
+        return self.disk_dir / f"{path_digest}-{version_digest}.npy"
+
+    def _save_to_disk(self, disk_path: Path, image: NDArray[Any]) -> None:
+        """
+        Atomically write a disk tier file and drop older versions of the same baseline.
+
+        The array is written to a temporary file and renamed into place, so a
+        reader never maps a partially written file.
+        """
+        tmp_name = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=disk_path.parent, prefix=disk_path.stem, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_name = tmp.name
+                np.save(tmp, image)
+            os.replace(tmp_name, disk_path)
+        except OSError:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+            return
+
+        path_digest = disk_path.stem.split("-", 1)[0]
+        for stale in disk_path.parent.glob(f"{path_digest}-*.npy"):
+            if stale != disk_path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    # Still mapped by a reader on platforms that forbid it; retried next save
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, disk_hits, entries, bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_hits': self.disk_hits,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
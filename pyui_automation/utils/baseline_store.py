@@ -0,0 +1,429 @@
+"""
+Content-addressed baseline store.
+
+Baselines are stored as blobs named by a digest of their pixels, so identical
+screens captured under different names are stored once. A JSON manifest maps
+baseline names to blobs together with the shape, dtype and codec needed to
+decode them. Blobs are encoded with one of:
+
+- ``raw``: uncompressed ``.npy``; reading is a memory map with no decode at all
+- ``zstd``: raw pixels compressed with zstandard (needs the ``zstandard`` package)
+- ``webp``: lossless WebP through OpenCV
+- ``png``: PNG through OpenCV
+
+Reading a baseline is a single memory map of its blob plus the decode. Images a
+codec cannot represent (e.g. float data for WebP) are stored as ``raw``. The
+default codec is the best lossless compressor available: ``zstd`` when the
+package is installed, otherwise ``webp`` or, without a WebP encoder, ``png``.
+
+A directory of PNG baselines can be imported with ``migrate_directory``, or from
+the command line::
+
+    python -m pyui_automation.utils.baseline_store SOURCE_DIR STORE_DIR --codec webp
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+BLOB_DIR = "blobs"
+CODECS = ("raw", "zstd", "webp", "png")
+# zstd level 3 is the library default: close to the best ratio at several hundred MB/s
+ZSTD_LEVEL = 3
+
+_EXTENSIONS = {"raw": ".npy", "zstd": ".zst", "webp": ".webp", "png": ".png"}
+# IMWRITE_WEBP_QUALITY above 100 selects lossless WebP
+_ENCODE_PARAMS = {"webp": [cv2.IMWRITE_WEBP_QUALITY, 101], "png": [cv2.IMWRITE_PNG_COMPRESSION, 1]}
+
+
+def available_codecs() -> List[str]:
+    """Get the codecs usable in this environment"""
+    return [codec for codec in CODECS if codec != "zstd" or zstandard is not None]
+
+
+def default_codec() -> str:
+    """Get the default codec: the best lossless compressor available in this environment"""
+    if zstandard is not None:
+        return "zstd"
+    if cv2.haveImageWriter(".webp"):
+        return "webp"
+    return "png"
+
+
+def content_digest(image: NDArray[Any]) -> str:
+    """
+    Digest of an image's pixels, shape and dtype.
+
+    Args:
+        image: Image to hash
+
+    Returns:
+        str: 32-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.dtype.str}|{image.shape}".encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def _codec_for(image: NDArray[Any], codec: str) -> str:
+    """
+    Codec actually used for an image.
+
+    OpenCV codecs only take 8-bit 1/3/4-channel data; anything else is stored
+    raw. 4-channel images never go to WebP, which decodes an opaque image as
+    3 channels and drops the color of fully transparent pixels (GDI captures
+    have alpha 0), so they are stored as PNG instead.
+    """
+    if codec in ("webp", "png"):
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        if image.dtype != np.uint8 or image.ndim not in (2, 3) or channels not in (1, 3, 4):
+            return "raw"
+        if codec == "webp" and channels == 4:
+            return "png"
+    return codec
+
+
+def _imread_flag(shape: Sequence[int]) -> int:
+    """
+    OpenCV read flag reproducing a stored shape.
+
+    3-channel images decode as BGR exactly like cv2.imread does for baselines
+    (IMREAD_COLOR); single-channel images, which WebP encodes as BGR, decode
+    as grayscale. Only 4-channel images need IMREAD_UNCHANGED.
+    """
+    if len(shape) == 2:
+        return cv2.IMREAD_GRAYSCALE
+    if shape[2] == 4:
+        return cv2.IMREAD_UNCHANGED
+    return cv2.IMREAD_COLOR
+
+
+class BaselineStore:
+    """Deduplicating store of baseline images addressed by content digest"""
+
+    def __init__(self, root: Union[str, Path], codec: Optional[str] = None) -> None:
+        """
+        Initialize the store, creating it if needed.
+
+        Args:
+            root: Store directory holding the manifest and the blobs
+            codec: Codec for newly stored baselines (see ``available_codecs``);
+                None uses ``default_codec()``
+
+        Raises:
+            ValueError: If the codec is unknown or not available
+        """
+        if codec is None:
+            codec = default_codec()
+        if codec not in available_codecs():
+            raise ValueError(f"Unknown or unavailable codec: {codec}. Must be one of: {available_codecs()}")
+        self.root = Path(root)
+        self.codec = codec
+        self.manifest_path = self.root / MANIFEST_NAME
+        (self.root / BLOB_DIR).mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._read_manifest()
+        # Open batch() blocks and whether the manifest changed inside them
+        self._batch_depth = 0
+        self._manifest_dirty = False
+        # Blobs a put() is writing or about to reference, with the number of such puts; gc keeps them
+        self._pending_blobs: Dict[Path, int] = {}
+
+    @contextmanager
+    def batch(self) -> Iterator["BaselineStore"]:
+        """
+        Defer manifest writes until the block ends.
+
+        Every put or delete otherwise rewrites the whole manifest; inside a
+        batch it is written once on exit, even when the block raises. Blocks
+        may be nested; the outermost one writes.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._manifest_dirty:
+                    self._write_manifest()
+
+    def put(self, name: str, image: NDArray[Any]) -> str:
+        """
+        Store a baseline, writing its blob only if the content is new.
+
+        Args:
+            name: Baseline name
+            image: Baseline image
+
+        Returns:
+            str: Content digest of the image
+        """
+        if image is None or not isinstance(image, np.ndarray) or image.size == 0:
+            raise ValueError("Invalid image data")
+        digest = content_digest(image)
+        codec = _codec_for(image, self.codec)
+        path = self._blob_path(digest, codec)
+        # Claim the blob before checking for it, so a concurrent gc cannot delete
+        # an existing blob between the check and the manifest update
+        with self._lock:
+            self._pending_blobs[path] = self._pending_blobs.get(path, 0) + 1
+        try:
+            if not path.exists():
+                self._write_blob(path, image, codec)
+            with self._lock:
+                self._entries[name] = {
+                    'digest': digest,
+                    'codec': codec,
+                    'shape': list(image.shape),
+                    'dtype': image.dtype.str,
+                }
+                self._write_manifest()
+        finally:
+            with self._lock:
+                self._pending_blobs[path] -= 1
+                if not self._pending_blobs[path]:
+                    del self._pending_blobs[path]
+        return digest
+
+    def get(self, name: str) -> NDArray[Any]:
+        """
+        Read a baseline.
+
+        Args:
+            name: Baseline name
+
+        Returns:
+            NDArray[Any]: The image; read-only and memory-mapped for the raw codec
+
+        Raises:
+            KeyError: If no baseline is stored under this name
+            ValueError: If the blob is missing or cannot be decoded
+        """
+        entry = self._entries[name]
+        path = self._blob_path(entry['digest'], entry['codec'])
+        shape = tuple(entry['shape'])
+        dtype = np.dtype(entry['dtype'])
+        try:
+            if entry['codec'] == "raw":
+                image = np.load(path, mmap_mode="r")
+            else:
+                with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    image = self._decode(data, entry['codec'], shape, dtype)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Failed to read baseline blob for {name}: {e}") from e
+        if image is None or image.shape != shape:
+            raise ValueError(f"Failed to decode baseline blob for {name}")
+        return image
+
+    def digest_of(self, name: str) -> Optional[str]:
+        """Get the content digest of a baseline, or None if it is not stored"""
+        entry = self._entries.get(name)
+        return None if entry is None else entry['digest']
+
+    def delete(self, name: str) -> bool:
+        """
+        Remove a baseline from the manifest; its blob is kept until ``gc``.
+
+        Returns:
+            bool: True if the baseline was stored
+        """
+        with self._lock:
+            if self._entries.pop(name, None) is None:
+                return False
+            self._write_manifest()
+            return True
+
+    def gc(self) -> int:
+        """
+        Delete blobs no baseline refers to.
+
+        Runs under the store lock, so blobs that a concurrent put is writing or
+        has just found are kept, as are its partially written temporary files.
+
+        Returns:
+            int: Number of deleted blobs
+        """
+        removed = 0
+        with self._lock:
+            referenced = {self._blob_path(e['digest'], e['codec']) for e in self._entries.values()}
+            referenced.update(self._pending_blobs)
+            for path in (self.root / BLOB_DIR).rglob("*"):
+                if not path.is_file() or path in referenced:
+                    continue
+                # A put's temporary file is named after its blob: <digest><ext>.<pid>.<thread>.tmp
+                if path.suffix == ".tmp" and path.with_name(".".join(path.name.split(".")[:2])) in referenced:
+                    continue
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def names(self) -> List[str]:
+        """Get the names of all stored baselines"""
+        return sorted(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Dict[str, int]: entries, blobs, logical_bytes (decoded size of all
+            baselines) and stored_bytes (size of the referenced blobs on disk)
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        blobs = {self._blob_path(e['digest'], e['codec']) for e in entries}
+        logical = sum(int(np.prod(e['shape'])) * np.dtype(e['dtype']).itemsize for e in entries)
+        stored = sum(path.stat().st_size for path in blobs if path.exists())
+        return {'entries': len(entries), 'blobs': len(blobs), 'logical_bytes': logical, 'stored_bytes': stored}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        """Blob file of a digest, fanned out over 256 subdirectories"""
+        return self.root / BLOB_DIR / digest[:2] / f"{digest}{_EXTENSIONS[codec]}"
+
+    def _write_blob(self, path: Path, image: NDArray[Any], codec: str) -> None:
+        """Encode an image into a blob; written to a temporary file first so readers never see a partial blob"""
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if codec == "raw":
+            with open(tmp, "wb") as file:
+                np.save(file, np.ascontiguousarray(image))
+        else:
+            if codec == "zstd":
+                payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(np.ascontiguousarray(image).data)
+            else:
+                ok, encoded = cv2.imencode(_EXTENSIONS[codec], image, _ENCODE_PARAMS[codec])
+                if not ok:
+                    raise ValueError(f"Failed to encode baseline as {codec}")
+                payload = encoded.data
+            with open(tmp, "wb") as file:
+                file.write(payload)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _decode(data: mmap.mmap, codec: str, shape: tuple, dtype: np.dtype) -> Optional[NDArray[Any]]:
+        """Decode a mapped blob"""
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("zstandard is not installed")
+            size = int(np.prod(shape)) * dtype.itemsize
+            raw = zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+            return np.frombuffer(raw, dtype=dtype).reshape(shape)
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), _imread_flag(shape))
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest; a missing manifest is an empty store"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Corrupt baseline store manifest: {self.manifest_path}: {e}") from e
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported baseline store manifest version: {manifest.get('version')}")
+        return dict(manifest.get('entries', {}))
+
+    def _write_manifest(self) -> None:
+        """Persist the manifest atomically, or mark it dirty inside a batch; the caller holds the lock"""
+        if self._batch_depth:
+            self._manifest_dirty = True
+            return
+        self._manifest_dirty = False
+        tmp = self.manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self._entries}, file, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+
+def migrate_directory(
+    source: Union[str, Path],
+    store: BaselineStore,
+    extensions: Sequence[str] = (".png",)
+) -> Dict[str, int]:
+    """
+    Import a directory of baseline images into a store.
+
+    Names are paths relative to the directory without the extension
+    (e.g. "dialogs/login"), as in the hash index. Files are decoded as BGR
+    like VisualTester reads PNG baselines, so alpha and grayscale files compare
+    the same after migration. The manifest is written once at the end.
+    Source files are not modified.
+
+    Args:
+        source: Baseline directory
+        store: Target store
+        extensions: Image file extensions to import
+
+    Returns:
+        Dict[str, int]: imported, deduplicated (stored as an existing blob) and failed counts
+    """
+    source = Path(source)
+    extensions = tuple(ext.lower() for ext in extensions)
+    counts = {'imported': 0, 'deduplicated': 0, 'failed': 0}
+    known = {store.digest_of(name) for name in store.names()}
+    with store.batch():
+        for path in sorted(source.rglob("*")):
+            if not path.is_file() or path.suffix.lower() not in extensions:
+                continue
+            image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if image is None:
+                counts['failed'] += 1
+                continue
+            digest = store.put(path.relative_to(source).with_suffix("").as_posix(), image)
+            counts['imported'] += 1
+            if digest in known:
+                counts['deduplicated'] += 1
+            known.add(digest)
+    return counts
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Migrate a directory of PNG baselines into a baseline store")
+    parser.add_argument("source", help="directory with baseline images")
+    parser.add_argument("store", help="store directory (created if needed)")
+    parser.add_argument(
+        "--codec", default=None, choices=CODECS,
+        help="codec for the imported blobs (default: zstd if installed, else lossless webp or png)"
+    )
+    args = parser.parse_args(argv)
+
+    store = BaselineStore(args.store, codec=args.codec)
+    counts = migrate_directory(args.source, store)
+    stats = store.stats()
+    print(
+        f"{counts['imported']} imported, {counts['deduplicated']} deduplicated, {counts['failed']} failed; "
+        f"{stats['blobs']} blobs, {stats['stored_bytes'] / 2**20:.1f} MiB stored "
+        f"for {stats['logical_bytes'] / 2**20:.1f} MiB of pixels"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Image comparison engines.
+
+Each engine maps two equally sized images to a similarity score between 0.0
+(completely different) and 1.0 (identical). Engines are registered by name so
+the algorithm can be chosen through ``AutomationConfig.visual_algorithm``:
+
+- ``mse``: 1 - RMSE / 255 over all channels (alias ``rmse``)
+- ``mae``: 1 - mean absolute grayscale difference / 255
+- ``ssim``: mean structural similarity over a sliding box window
+- ``hash``: share of equal bits of the DCT perceptual hash (alias ``phash``)
+- ``histogram``: correlation of the color histograms
+
+All engines work on uint8/float32 data and never make float64 copies of full frames.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .matching import to_grayscale
+
+ComparisonEngine = Callable[..., float]
+
+# SSIM stabilization constants for 8-bit data (Wang et al., K1=0.01, K2=0.03)
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+# Images above this many pixels are processed in bands when tile_rows is not given;
+# band-sized buffers stay in cache, so this is also faster than one full-frame pass
+SSIM_UNTILED_PIXELS = 1 << 20
+SSIM_TILE_ROWS = 256
+
+_ENGINES: Dict[str, ComparisonEngine] = {}
+
+
+def register_engine(name: str, engine: ComparisonEngine) -> None:
+    """
+    Register a comparison engine.
+
+    Args:
+        name: Algorithm name, as used in AutomationConfig.visual_algorithm
+        engine: Callable taking two images of the same shape (plus optional
+            keyword options) and returning a similarity between 0.0 and 1.0
+    """
+    _ENGINES[name] = engine
+
+
+def get_engine(name: str) -> ComparisonEngine:
+    """
+    Get a registered comparison engine.
+
+    Args:
+        name: Algorithm name
+
+    Returns:
+        ComparisonEngine: The engine
+
+    Raises:
+        ValueError: If no engine is registered under this name
+    """
+    try:
+        return _ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown comparison algorithm: {name}. Must be one of: {available_engines()}") from None
+
+
+def available_engines() -> List[str]:
+    """Get the names of all registered comparison engines"""
+    return sorted(_ENGINES)
+
+
+def compare(img1: NDArray[Any], img2: NDArray[Any], algorithm: str = "mse", **options: Any) -> float:
+    """
+    Compare two images with a registered engine.
+
+    Args:
+        img1: First image
+        img2: Second image
+        algorithm: Engine name
+        **options: Engine-specific options (e.g. ``tile_rows`` for ssim)
+
+    Returns:
+        float: Similarity between 0.0 and 1.0; 0.0 if the shapes differ
+    """
+    engine = get_engine(algorithm)
+    if img1.shape != img2.shape:
+        return 0.0
+    return float(engine(img1, img2, **options))
+
+
+def rmse_similarity_from_diff(diff: NDArray[Any]) -> float:
+    """Similarity from an already computed absolute difference image"""
+    # cv2.norm accumulates in double precision without materializing a float copy
+    rmse = cv2.norm(diff, cv2.NORM_L2) / np.sqrt(diff.size)
+    return float(1.0 - rmse / 255.0)
+
+
+def rmse_similarity(img1: NDArray[Any], img2: NDArray[Any]) -> float:
+    """Similarity from the root mean squared difference over all channels"""
+    return rmse_similarity_from_diff(cv2.absdiff(img1, img2))
+
+
+def mae_similarity(img1: NDArray[Any], img2: NDArray[Any]) -> float:
+    """Similarity from the mean absolute grayscale difference"""
+    diff = cv2.absdiff(to_grayscale(img1), to_grayscale(img2))
+    return float(1.0 - cv2.norm(diff, cv2.NORM_L1) / diff.size / 255.0)
+
+
+def _ssim_map(a: NDArray[np.float32], b: NDArray[np.float32], window: int) -> NDArray[np.float32]:
+    """SSIM map of two float32 grayscale images using box-filtered moments"""
+    ksize = (window, window)
+    mu_a = cv2.boxFilter(a, -1, ksize)
+    mu_b = cv2.boxFilter(b, -1, ksize)
+    var_a = cv2.boxFilter(a * a, -1, ksize)
+    var_b = cv2.boxFilter(b * b, -1, ksize)
+    cov = cv2.boxFilter(a * b, -1, ksize)
+
+    mu_ab = mu_a * mu_b
+    mu_a *= mu_a
+    mu_b *= mu_b
+    var_a -= mu_a
+    var_b -= mu_b
+    cov -= mu_ab
+
+    # numerator: (2 mu_a mu_b + C1)(2 cov + C2)
+    mu_ab *= 2
+    mu_ab += _SSIM_C1
+    cov *= 2
+    cov += _SSIM_C2
+    mu_ab *= cov
+    # denominator: (mu_a^2 + mu_b^2 + C1)(var_a + var_b + C2)
+    mu_a += mu_b
+    mu_a += _SSIM_C1
+    var_a += var_b
+    var_a += _SSIM_C2
+    mu_a *= var_a
+    mu_ab /= mu_a
+    return mu_ab
+
+
+def ssim_similarity(
+    img1: NDArray[Any],
+    img2: NDArray[Any],
+    window: int = 7,
+    tile_rows: Optional[int] = None
+) -> float:
+    """
+    Mean structural similarity (SSIM) of two images.
+
+    Local means and (co)variances come from float32 box filters. Large images
+    are processed in horizontal bands with a halo of window // 2 rows, which
+    bounds memory to a few band-sized buffers and gives exactly the untiled result.
+
+    Args:
+        img1: First image
+        img2: Second image of the same shape
+        window: Side of the square averaging window
+        tile_rows: Rows per band; None picks SSIM_TILE_ROWS for images above
+            SSIM_UNTILED_PIXELS pixels, 0 disables tiling
+
+    Returns:
+        float: Mean SSIM clipped to [0, 1]
+    """
+    gray1 = to_grayscale(img1)
+    gray2 = to_grayscale(img2)
+    height, width = gray1.shape[:2]
+    if tile_rows is None:
+        tile_rows = SSIM_TILE_ROWS if height * width > SSIM_UNTILED_PIXELS else 0
+    if tile_rows <= 0 or tile_rows >= height:
+        tile_rows = height
+
+    halo = window // 2
+    total = 0.0
+    for start in range(0, height, tile_rows):
+        stop = min(height, start + tile_rows)
+        top = max(0, start - halo)
+        bottom = min(height, stop + halo)
+        a = gray1[top:bottom].astype(np.float32)
+        b = gray2[top:bottom].astype(np.float32)
+        ssim_map = _ssim_map(a, b, window)
+        total += float(cv2.sumElems(ssim_map[start - top:stop - top])[0])
+    return float(min(1.0, max(0.0, total / (height * width))))
+
+
+def perceptual_hash(image: NDArray[Any], hash_size: int = 8) -> NDArray[np.bool_]:
+    """
+    DCT perceptual hash of an image.
+
+    Args:
+        image: Input image
+        hash_size: Side of the low-frequency block; the hash has hash_size**2 bits
+
+    Returns:
+        NDArray[np.bool_]: Flat array of hash bits
+    """
+    size = hash_size * 4
+    small = cv2.resize(to_grayscale(image), (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:hash_size, :hash_size].ravel()
+    return low > np.median(low[1:])
+
+
+def phash_similarity(img1: NDArray[Any], img2: NDArray[Any], hash_size: int = 8) -> float:
+    """Share of equal bits of the perceptual hashes"""
+    hash1 = perceptual_hash(img1, hash_size)
+    hash2 = perceptual_hash(img2, hash_size)
+    return float(1.0 - np.count_nonzero(hash1 != hash2) / hash1.size)
+
+
+def histogram_similarity(img1: NDArray[Any], img2: NDArray[Any], bins: int = 8) -> float:
+    """Correlation of the color (or grayscale) histograms, clipped to [0, 1]"""
+    channels = img1.shape[2] if img1.ndim == 3 else 1
+    if channels >= 3:
+        args = ([0, 1, 2], None, [bins] * 3, [0, 256] * 3)
+        img1, img2 = img1[..., :3], img2[..., :3]
+    else:
+        args = ([0], None, [bins * 8], [0, 256])
+    hist1 = cv2.calcHist([np.ascontiguousarray(img1)], *args)
+    hist2 = cv2.calcHist([np.ascontiguousarray(img2)], *args)
+    correlation = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
+    return float(min(1.0, max(0.0, correlation)))
+
+
+register_engine("mse", rmse_similarity)
+register_engine("rmse", rmse_similarity)
+register_engine("mae", mae_similarity)
+register_engine("ssim", ssim_similarity)
+register_engine("hash", phash_similarity)
+register_engine("phash", phash_similarity)
+register_engine("histogram", histogram_similarity)
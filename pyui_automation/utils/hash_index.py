@@ -0,0 +1,442 @@
+"""
+Perceptual-hash index over a baseline directory and an optional baseline store.
+
+Every baseline is reduced to a 64-bit DCT perceptual hash packed into a
+``uint64``, plus a 64-bit checksum of its 1/4-scale thumbnail. The hashes live
+in one array, so nearest-baseline and unchanged-screen queries are a vectorized
+XOR plus popcount over the whole directory. Hashes are persisted in a sidecar
+file next to the baselines and only recomputed for files whose size or
+modification time changed, or, for baselines kept in a BaselineStore, whose
+content digest changed. Added baselines are appended in place and the
+sidecar is rewritten every SIDECAR_BATCH additions or on flush(); entries
+that never reached it are simply rehashed on the next refresh. Per-name
+lookups check the file (or the store digest) first and rehash a baseline
+that was replaced since it was indexed, so a stale fingerprint is never served.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .baseline_store import BaselineStore
+from .comparison import perceptual_hash
+
+SIDECAR_NAME = ".phash_index.npz"
+HASH_BITS = 64
+# Additions after which add() rewrites the sidecar
+SIDECAR_BATCH = 64
+# Both fingerprints are computed from a thumbnail downscaled by this factor
+THUMBNAIL_FACTOR = 4
+
+
+def pack_hash(bits: NDArray[np.bool_]) -> np.uint64:
+    """
+    Pack 64 hash bits into an integer.
+
+    Args:
+        bits: Flat array of 64 booleans, most significant bit first
+
+    Returns:
+        np.uint64: Packed hash
+    """
+    if bits.size != HASH_BITS:
+        raise ValueError(f"Expected {HASH_BITS} hash bits, got {bits.size}")
+    return np.packbits(bits.astype(np.uint8)).view(">u8")[0].astype(np.uint64)
+
+
+def thumbnail(image: NDArray[Any]) -> NDArray[Any]:
+    """Downscale an image by THUMBNAIL_FACTOR (an integer-factor INTER_AREA resize is cheap)"""
+    height, width = image.shape[:2]
+    size = (max(1, width // THUMBNAIL_FACTOR), max(1, height // THUMBNAIL_FACTOR))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def thumbnail_checksum(thumb: NDArray[Any], shape: Tuple[int, ...]) -> np.uint64:
+    """64-bit checksum of a thumbnail and the shape of the image it was made from"""
+    digest = hashlib.blake2b(np.ascontiguousarray(thumb).tobytes(), digest_size=8)
+    digest.update(repr(tuple(shape)).encode())
+    return np.frombuffer(digest.digest(), dtype=np.uint64)[0]
+
+
+def image_hash(image: NDArray[Any]) -> np.uint64:
+    """Packed 64-bit perceptual hash of an image"""
+    return pack_hash(perceptual_hash(thumbnail(image), hash_size=8))
+
+
+def image_fingerprint(image: NDArray[Any]) -> Tuple[np.uint64, np.uint64]:
+    """
+    Perceptual hash and thumbnail checksum of an image.
+
+    Equal perceptual hashes mean the images look alike; an equal checksum as
+    well means they agree down to the 1/4-scale thumbnail.
+
+    Returns:
+        Tuple[np.uint64, np.uint64]: (perceptual hash, thumbnail checksum)
+    """
+    thumb = thumbnail(image)
+    return pack_hash(perceptual_hash(thumb, hash_size=8)), thumbnail_checksum(thumb, image.shape)
+
+
+def hamming_distances(hashes: NDArray[np.uint64], query: Union[int, np.uint64]) -> NDArray[np.uint8]:
+    """
+    Hamming distances between packed hashes and a query hash.
+
+    Args:
+        hashes: Packed hashes
+        query: Packed query hash
+
+    Returns:
+        NDArray[np.uint8]: Number of differing bits per hash
+    """
+    return np.bitwise_count(np.bitwise_xor(hashes, np.uint64(query)))
+
+
+class PerceptualHashIndex:
+    """Packed perceptual hashes of all baselines in a directory and a store"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        extensions: Sequence[str] = (".png",),
+        sidecar_name: str = SIDECAR_NAME,
+        sidecar_batch: int = SIDECAR_BATCH,
+        store: Optional[BaselineStore] = None
+    ) -> None:
+        """
+        Initialize the index and bring it up to date with the directory.
+
+        Args:
+            directory: Baseline directory; names are paths relative to it
+                without the extension (e.g. "dialogs/login")
+            extensions: Image file extensions to index
+            sidecar_name: File name of the persisted index inside the directory
+            sidecar_batch: Additions after which add() rewrites the sidecar
+            store: Baseline store indexed as well; like VisualTester.read_baseline,
+                a baseline in the store takes precedence over a file of the same name
+        """
+        self.directory = Path(directory)
+        self.store = store
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.sidecar_path = self.directory / sidecar_name
+        self.sidecar_batch = max(1, sidecar_batch)
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._checksums = np.empty(0, dtype=np.uint64)
+        self._sizes = np.empty(0, dtype=np.int64)
+        self._mtimes = np.empty(0, dtype=np.int64)
+        # Store digest of each entry; "" for entries read from a file
+        self._digests: List[str] = []
+        # Additions not yet written to the sidecar
+        self._pending = 0
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Re-scan the directory and the store, hashing only new or modified baselines.
+
+        Returns:
+            int: Number of baselines that were (re)hashed
+        """
+        with self._lock:
+            known = self._read_sidecar()
+            names: List[str] = []
+            hashes: List[np.uint64] = []
+            checksums: List[np.uint64] = []
+            sizes: List[int] = []
+            mtimes: List[int] = []
+            digests: List[str] = []
+            rehashed = 0
+
+            def append(name: str, value: Any, checksum: Any, size: int, mtime: int, digest: str) -> None:
+                names.append(name)
+                hashes.append(value)
+                checksums.append(checksum)
+                sizes.append(size)
+                mtimes.append(mtime)
+                digests.append(digest)
+
+            stored = set(self.store.names()) if self.store is not None else set()
+            # A store kept inside the directory must not have its PNG blobs indexed as baselines
+            store_root = self.store.root.resolve() if self.store is not None else None
+            if self.directory.is_dir():
+                for path in sorted(self.directory.rglob("*")):
+                    if not path.is_file() or path.suffix.lower() not in self.extensions:
+                        continue
+                    if store_root is not None and path.resolve().is_relative_to(store_root):
+                        continue
+                    name = path.relative_to(self.directory).with_suffix("").as_posix()
+                    if name in stored:
+                        continue
+                    stat = path.stat()
+                    entry = known.get(name)
+                    if entry is not None and not entry[4] and entry[2:4] == (stat.st_size, stat.st_mtime_ns):
+                        value, checksum = entry[0], entry[1]
+                    else:
+                        image = cv2.imread(str(path))
+                        if image is None:
+                            continue
+                        value, checksum = image_fingerprint(image)
+                        rehashed += 1
+                    append(name, value, checksum, stat.st_size, stat.st_mtime_ns, "")
+            for name in sorted(stored):
+                digest = self.store.digest_of(name)
+                entry = known.get(name)
+                if entry is not None and entry[4] == digest:
+                    value, checksum = entry[0], entry[1]
+                else:
+                    try:
+                        value, checksum = image_fingerprint(self.store.get(name))
+                    except (KeyError, ValueError):
+                        continue
+                    rehashed += 1
+                append(name, value, checksum, -1, -1, digest)
+            self._set_entries(names, hashes, checksums, sizes, mtimes, digests)
+            if rehashed or self._pending or len(known) != len(names):
+                self._write_sidecar()
+            return rehashed
+
+    def add(self, name: str, image: NDArray[Any]) -> np.uint64:
+        """
+        Index a baseline that was just written to the directory or the store.
+
+        Args:
+            name: Baseline name
+            image: Baseline image
+
+        Returns:
+            np.uint64: Packed hash of the image
+        """
+        value, checksum = image_fingerprint(image)
+        self._set_entry(name, value, checksum, *self._version_of(name))
+        return value
+
+    def _set_entry(self, name: str, value: Any, checksum: Any, size: int, mtime: int, digest: str) -> None:
+        """Update or append the entry of a baseline"""
+        with self._lock:
+            position = self._positions.get(name)
+            if position is None:
+                position = len(self._names)
+                if position == len(self._hashes):
+                    self._grow(max(16, 2 * position))
+            self._hashes[position] = value
+            self._checksums[position] = checksum
+            self._sizes[position] = size
+            self._mtimes[position] = mtime
+            if position < len(self._digests):
+                self._digests[position] = digest
+            else:
+                self._digests.append(digest)
+            if position == len(self._names):
+                # Published last, so lock-free readers never see a half-written entry
+                self._positions[name] = position
+                self._names.append(name)
+            self._pending += 1
+            if self._pending >= self.sidecar_batch:
+                self._write_sidecar()
+
+    def flush(self) -> None:
+        """Write additions that have not reached the sidecar yet"""
+        with self._lock:
+            if self._pending:
+                self._write_sidecar()
+
+    def hash_of(self, name: str) -> Optional[np.uint64]:
+        """Get the current hash of a baseline, or None if it is not indexed"""
+        fingerprint = self.fingerprint_of(name)
+        return None if fingerprint is None else fingerprint[0]
+
+    def fingerprint_of(self, name: str) -> Optional[Tuple[np.uint64, np.uint64]]:
+        """
+        Get the (perceptual hash, thumbnail checksum) of a baseline.
+
+        The stored entry is only trusted while the baseline file has the size
+        and modification time it was hashed with, or the store still holds the
+        same digest; a replaced baseline is rehashed first.
+
+        Returns:
+            Optional[Tuple[np.uint64, np.uint64]]: The fingerprint, or None if
+            the baseline is not indexed or no longer exists
+        """
+        position = self._positions.get(name)
+        if position is None:
+            return None
+        version = self._version_of(name)
+        if version == (self._sizes[position], self._mtimes[position], self._digests[position]):
+            return self._hashes[position], self._checksums[position]
+        return self._reindex(name, version)
+
+    def _version_of(self, name: str) -> Tuple[int, int, str]:
+        """(size, mtime, store digest) identifying the current content of a baseline"""
+        if self.store is not None:
+            digest = self.store.digest_of(name)
+            if digest is not None:
+                return -1, -1, digest
+        path = self._path_for(name)
+        if path is None:
+            return -1, -1, ""
+        try:
+            stat = path.stat()
+        except OSError:
+            return -1, -1, ""
+        return stat.st_size, stat.st_mtime_ns, ""
+
+    def _reindex(self, name: str, version: Tuple[int, int, str]) -> Optional[Tuple[np.uint64, np.uint64]]:
+        """Rehash a baseline whose content changed since it was indexed"""
+        size, _, digest = version
+        image = None
+        if digest:
+            try:
+                image = self.store.get(name)
+            except (KeyError, ValueError):
+                image = None
+        elif size >= 0:
+            path = self._path_for(name)
+            image = cv2.imread(str(path)) if path is not None else None
+        if image is None:
+            return None
+        value, checksum = image_fingerprint(image)
+        self._set_entry(name, value, checksum, *version)
+        return value, checksum
+
+    def nearest(
+        self,
+        image: Union[NDArray[Any], int, np.uint64],
+        max_distance: int = 10,
+        limit: Optional[int] = 5
+    ) -> List[Tuple[str, int]]:
+        """
+        Find the baselines that look most like an image.
+
+        Args:
+            image: Image, or its packed hash
+            max_distance: Largest Hamming distance (of 64 bits) to report
+            limit: Maximum number of results; None returns all within the distance
+
+        Returns:
+            List[Tuple[str, int]]: (baseline name, distance) pairs, closest first
+        """
+        query = image if isinstance(image, (int, np.integer)) else image_hash(image)
+        distances = hamming_distances(self._hashes[:len(self._names)], query)
+        candidates = np.flatnonzero(distances <= max_distance)
+        order = candidates[np.argsort(distances[candidates], kind="stable")]
+        if limit is not None:
+            order = order[:limit]
+        return [(self._names[i], int(distances[i])) for i in order]
+
+    def is_unchanged(self, name: str, image: NDArray[Any], max_distance: int = 0) -> bool:
+        """
+        Check whether an image has the same perceptual hash as a baseline.
+
+        Args:
+            name: Baseline name
+            image: Current image
+            max_distance: Largest Hamming distance still treated as unchanged
+
+        Returns:
+            bool: True if the baseline is indexed and within the distance
+        """
+        stored = self.hash_of(name)
+        if stored is None:
+            return False
+        return int(hamming_distances(np.array([stored]), image_hash(image))[0]) <= max_distance
+
+    def names(self) -> List[str]:
+        """Get the names of all indexed baselines"""
+        return list(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._positions
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _path_for(self, name: str) -> Optional[Path]:
+        """Existing baseline file for a name, if any"""
+        for ext in self.extensions:
+            path = self.directory / f"{name}{ext}"
+            if path.is_file():
+                return path
+        return None
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate the entry arrays with room for more baselines; the caller holds the lock"""
+        count = len(self._names)
+        for attribute in ("_hashes", "_checksums", "_sizes", "_mtimes"):
+            current = getattr(self, attribute)
+            grown = np.zeros(capacity, dtype=current.dtype)
+            grown[:count] = current[:count]
+            setattr(self, attribute, grown)
+
+    def _set_entries(
+        self,
+        names: List[str],
+        hashes: List[Any],
+        checksums: List[Any],
+        sizes: List[int],
+        mtimes: List[int],
+        digests: List[str]
+    ) -> None:
+        """Replace all entries; the caller holds the lock"""
+        self._names = names
+        self._positions = {name: i for i, name in enumerate(names)}
+        self._hashes = np.array(hashes, dtype=np.uint64)
+        self._checksums = np.array(checksums, dtype=np.uint64)
+        self._sizes = np.array(sizes, dtype=np.int64)
+        self._mtimes = np.array(mtimes, dtype=np.int64)
+        self._digests = digests
+
+    def _read_sidecar(self) -> Dict[str, Tuple[np.uint64, np.uint64, int, int, str]]:
+        """Load persisted entries keyed by name; a missing or corrupt sidecar is empty"""
+        try:
+            with np.load(self.sidecar_path, allow_pickle=False) as data:
+                names = data["names"]
+                # Sidecars written before store support have no digests: all entries are files
+                digests = data["digests"] if "digests" in data.files else [""] * len(names)
+                columns = zip(names, data["hashes"], data["checksums"], data["sizes"], data["mtimes"], digests)
+                return {
+                    str(name): (value, checksum, int(size), int(mtime), str(digest))
+                    for name, value, checksum, size, mtime, digest in columns
+                }
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return {}
+
+    def _write_sidecar(self) -> None:
+        """Persist entries; write errors only cost rehashing on the next run"""
+        self._pending = 0
+        if not self.directory.is_dir():
+            return
+        count = len(self._names)
+        tmp_name = None
+        try:
+            # Write beside the sidecar and swap it in, so a crash mid-write never
+            # leaves a truncated archive behind
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, prefix=self.sidecar_path.name, suffix=".tmp", delete=False
+            ) as file:
+                tmp_name = file.name
+                np.savez(
+                    file,
+                    names=np.array(self._names, dtype=str),
+                    hashes=self._hashes[:count],
+                    checksums=self._checksums[:count],
+                    sizes=self._sizes[:count],
+                    mtimes=self._mtimes[:count],
+                    digests=np.array(self._digests[:count], dtype=str)
+                )
+            os.replace(tmp_name, self.sidecar_path)
+        except OSError:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
@@ -1,9 +1,16 @@
 import cv2
 import numpy as np
 from numpy.typing import NDArray
-from typing import Tuple, Optional, List, Any
+from typing import Tuple, Optional, List, Any, Union, TYPE_CHECKING
 from pathlib import Path
 
+from .comparison import compare
+from .matching import match_template, nms_boxes, pyramid_match_template, to_grayscale
+from .template_store import preprocess_template
+
+if TYPE_CHECKING:
+    from .template_store import TemplateStore
+
 # Type alias for template matching results: (x, y, confidence_score)
 Match = Tuple[int, int, float]
 
@@ -23,19 +30,21 @@ def load_image(path: Path) -> Optional[NDArray[Any]]:
     except Exception:
         return None
 
-def save_image(image: Any, path: Path) -> bool:
+def save_image(image: Any, path: Path, params: Optional[List[int]] = None) -> bool:
     """
     Save image to file.
 
     Args:
         image (NDArray[Any]): The image data to save.
         path (Path): The file path to save the image to.
+        params (Optional[List[int]]): cv2.imwrite encoding parameters, e.g. from
+            image_writer.encode_params.
 
     Returns:
         bool: True if the image was saved successfully, False otherwise.
     """
     try:
-        return cv2.imwrite(str(path), image)
+        return cv2.imwrite(str(path), image, params or [])
     except Exception:
         return False
 
@@ -71,7 +80,7 @@ def resize_image(image: Any, width: Optional[int] = None, height: Optional[int]
     resized = cv2.resize(image, (width, height))
     return resized
 
-def compare_images(img1: Any, img2: Any, threshold: float = 0.95) -> float:
+def compare_images(img1: Any, img2: Any, threshold: float = 0.95, algorithm: str = "mae") -> float:
     """
     Compare two images for similarity.
 
@@ -79,122 +88,68 @@ def compare_images(img1: Any, img2: Any, threshold: float = 0.95) -> float:
         img1 (NDArray[Any]): The first image to compare.
         img2 (NDArray[Any]): The second image to compare.
         threshold (float, optional): The minimum similarity score required for the comparison to return True. Defaults to 0.95.
+        algorithm (str, optional): Comparison engine name (see ``utils.comparison``). Defaults to "mae",
+            the normalized mean absolute grayscale difference.
 
     Returns:
         float: Similarity score between 0.0 and 1.0, where 1.0 means identical images.
     """
-    if img1.shape != img2.shape:
-        return 0.0
-        
-    # Convert images to grayscale
-    if len(img1.shape) == 3:
-        img1_gray = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        img2_gray = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
-    else:
-        img1_gray = img1
-        img2_gray = img2
-        
-    # Calculate normalized mean absolute difference
-    # Convert to float64 and ensure same shape
-    img1_float = img1_gray.astype(np.float64)
-    img2_float = img2_gray.astype(np.float64)
-    
-    # Ensure same shape
-    if img1_float.shape != img2_float.shape:
-        return 0.0
-    
-    # Ensure both arrays have the same dtype and shape for subtraction
-    if img1_float.dtype != img2_float.dtype:
-        img2_float = img2_float.astype(img1_float.dtype)
-    
-    # Ensure both arrays have the same shape
-    if img1_float.shape != img2_float.shape:
-        img2_float = np.resize(img2_float, img1_float.shape)
-    
-    # Ensure both arrays have the same shape for subtraction
-    if img1_float.shape != img2_float.shape:
-        img2_float = np.resize(img2_float, img1_float.shape)
-    
-    # Ensure both arrays have compatible shapes and types for subtraction
-    if img1_float.shape != img2_float.shape:
-        img2_float = np.resize(img2_float, img1_float.shape)
-    
-    # Use numpy's subtract function for better type compatibility
-    diff = np.subtract(img1_float, img2_float)
-    abs_diff = np.abs(diff).astype(np.float64)
-    try:
-        # Simple mean calculation
-        mse = float(np.sum(abs_diff) / abs_diff.size)
-    except Exception:
-        mse = 0.0
-    similarity = 1.0 - (mse / 255.0)  # Normalize by max pixel value
-    return float(similarity)
-
-def find_template(image: Any, template: Any, threshold: float = 0.8) -> List[Match]:
+    return compare(img1, img2, algorithm)
+
+def find_template(
+    image: Any,
+    template: Union[Any, str],
+    threshold: float = 0.8,
+    pyramid_levels: int = 0,
+    store: Optional["TemplateStore"] = None
+) -> List[Match]:
     """
     Find template in image using template matching.
 
     Args:
         image (NDArray[Any]): The image to search for the template in.
-        template (NDArray[Any]): The template image to search for.
+        template (Union[NDArray[Any], str]): The template image to search for, or the name
+            of a template in ``store`` whose preprocessed form is reused.
         threshold (float, optional): The minimum similarity score required for a match. Defaults to 0.8.
+        pyramid_levels (int, optional): Use a coarse-to-fine search at 1 / 2**pyramid_levels scale
+            that only reports the best few matches. 0 (default) searches exhaustively.
+        store (Optional[TemplateStore], optional): Template store used to resolve template names.
 
     Returns:
         List[Match]: A list of (x, y, score) coordinates where the template was found in the image,
                     where score is the matching confidence value.
+
+    Raises:
+        ValueError: If a template name is given without a store.
+        KeyError: If the store has no template with the given name.
     """
-    # Convert images to grayscale
-    if len(image.shape) == 3:
-        image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    coarse_templates = None
+    if isinstance(template, str):
+        if store is None:
+            raise ValueError("A template store is required to find templates by name")
+        stored = store.get(template)
+        template_gray = stored.gray
+        coarse_templates = stored.levels
     else:
-        image_gray = image
+        template_gray = preprocess_template(template)
+
+    # Normalize the image the same way as the template to improve matching
+    image_gray = cv2.normalize(to_grayscale(image), None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
 
-    if len(template.shape) == 3:
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+    # Extract peaks and suppress overlapping boxes without a per-point Python loop
+    h, w = template_gray.shape[:2]
+    if pyramid_levels > 0:
+        matches = pyramid_match_template(
+            image_gray, template_gray, threshold, pyramid_levels, coarse_templates=coarse_templates
+        )
     else:
-        template_gray = template
+        matches = match_template(image_gray, template_gray, threshold)
 
-    # Normalize images to improve matching
-    image_gray = image_gray.astype(np.float32)
-    normalized_image_gray = np.empty_like(image_gray)
-    cv2.normalize(image_gray, normalized_image_gray, 0, 255, cv2.NORM_MINMAX)
-    image_gray = normalized_image_gray.astype(np.uint8)
-    
-    template_gray = template_gray.astype(np.float32)
-    normalized_template_gray = np.empty_like(template_gray)
-    cv2.normalize(template_gray, normalized_template_gray, 0, 255, cv2.NORM_MINMAX)
-    template_gray = normalized_template_gray.astype(np.uint8)
-
-    # Perform template matching
-    result = cv2.matchTemplate(image_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-    print("\nTemplate matching result:")
-    print("Result shape:", result.shape)
-    print("Max correlation:", np.max(result))
-    print("Min correlation:", np.min(result))
-    
-    # Find locations where matching exceeds threshold
-    locations = np.where(result >= threshold)
-    points = list(zip(*locations[::-1]))  # Convert to (x,y) format
-    print(f"Found {len(points)} points above threshold {threshold}")
-    
-    if not points:
-        return []
-    
-    # Get template dimensions
-    h, w = template.shape[:2]
-    
-    # Convert points to list of matches with scores
-    matches: List[Match] = [(x, y, float(result[y, x])) for x, y in points]
-    
-    # Sort matches by score in descending order
-    matches.sort(key=lambda x: x[2], reverse=True)
-    print(f"Top match score: {matches[0][2]}")
-    
-    # Apply non-maximum suppression
-    filtered_matches = non_max_suppression([(x, y) for x, y, _ in matches], (w, h), 0.5)
-    
     # Return center points of top matches
-    return [(x + w//2, y + h//2, score) for x, y, score in matches if (x, y) in filtered_matches]
+    return [
+        (int(x) + w // 2, int(y) + h // 2, float(score))
+        for x, y, score in zip(matches['x'], matches['y'], matches['score'])
+    ]
 
 def non_max_suppression(
     matches: List[Tuple[int, int]],
@@ -215,26 +170,11 @@ def non_max_suppression(
     if not matches:
         return []
 
-    # Sort matches by x coordinate
-    matches = sorted(matches)
-    result = []
-    
-    # Add first match
-    result.append(matches[0])
-    
-    # Process remaining matches
-    for i in range(1, len(matches)):
-        x, y = matches[i]
-        prev_x, prev_y = result[-1]
-        
-        # Calculate distance between points
-        dist = ((x - prev_x) ** 2 + (y - prev_y) ** 2) ** 0.5
-        
-        # If points are far apart or we're using high threshold
-        if dist > template_shape[0] * 0.5 or overlap_thresh > 0.5:
-            result.append(matches[i])
-            
-    return result
+    # Matches are suppressed in the given order, so earlier matches win
+    xs = np.fromiter((x for x, _ in matches), dtype=np.int64, count=len(matches))
+    ys = np.fromiter((y for _, y in matches), dtype=np.int64, count=len(matches))
+    keep = nms_boxes(xs, ys, template_shape[0], template_shape[1], overlap_thresh)
+    return [matches[i] for i in keep]
 
 def highlight_region(
     image: NDArray[Any],
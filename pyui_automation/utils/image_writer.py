@@ -0,0 +1,186 @@
+"""
+Asynchronous image writer.
+
+Encoding a full-screen PNG takes tens of milliseconds. The writer moves
+encoding and file I/O to a small thread pool (cv2.imwrite releases the GIL),
+so screenshot-heavy tests do not wait for it. The number of images waiting to
+be written is bounded: a producer faster than the encoders blocks in submit()
+instead of queueing frames in memory.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import getLogger
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import cv2
+from numpy.typing import NDArray
+
+from .file import ensure_dir
+from .image import save_image
+
+DEFAULT_WORKERS = 2
+# Images submitted but not yet written before submit() blocks
+DEFAULT_MAX_PENDING = 8
+
+FORMATS = ("png", "jpg", "jpeg", "webp", "bmp")
+
+
+def encode_params(format: str, quality: int) -> List[int]:
+    """
+    OpenCV imwrite parameters for a format and a 0-100 quality.
+
+    Lossy formats use the quality directly. PNG is lossless, so the quality
+    trades file size for encoding speed: 100 is fastest (compression level 0)
+    and 0 smallest (level 9); the default quality of 90 gives OpenCV's default
+    level 1.
+
+    Args:
+        format: File extension without the dot
+        quality: Quality from 0 to 100
+
+    Returns:
+        List[int]: Parameters for cv2.imwrite
+    """
+    if not 0 <= quality <= 100:
+        raise ValueError("quality must be between 0 and 100")
+    format = format.lower()
+    if format == "png":
+        return [cv2.IMWRITE_PNG_COMPRESSION, round(9 * (100 - quality) / 100)]
+    if format in ("jpg", "jpeg"):
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if format == "webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, max(1, quality)]
+    return []
+
+
+class AsyncImageWriter:
+    """Thread pool writing images to files with bounded backlog"""
+
+    def __init__(
+        self,
+        format: str = "png",
+        quality: int = 90,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            format: Format of paths without an extension; paths with one are
+                written in the format of their extension
+            quality: Quality from 0 to 100, see encode_params
+            workers: Number of encoding threads
+            max_pending: Images waiting to be written before submit() blocks
+        """
+        if format.lower() not in FORMATS:
+            raise ValueError(f"Unsupported image format: {format}. Supported: {FORMATS}")
+        encode_params(format, quality)
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be positive")
+        self.format = format.lower()
+        self.quality = quality
+        self.written = 0
+        self.errors = 0
+        self._logger = getLogger(__name__)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-writer")
+
+    def path_for(self, path: Union[str, Path]) -> Path:
+        """Path an image submitted for the given path is written to"""
+        path = Path(path)
+        return path if path.suffix else path.with_suffix(f".{self.format}")
+
+    def submit(self, image: NDArray[Any], path: Union[str, Path], copy: bool = True) -> "Future[bool]":
+        """
+        Queue an image for writing; blocks while max_pending images are waiting.
+
+        Args:
+            image: Image to write
+            path: Destination; the writer's format is appended if it has no extension
+            copy: Copy the image first, so the caller may modify it right away
+
+        Returns:
+            Future[bool]: Resolves to whether the image was written; failures
+            are also logged and counted in errors
+        """
+        if self._closed:
+            raise RuntimeError("Image writer is closed")
+        self._slots.acquire()
+        with self._condition:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._write, image.copy() if copy else image, self.path_for(path))
+        except BaseException:
+            self._finish(False)
+            raise
+
+    def write(self, image: NDArray[Any], path: Union[str, Path]) -> bool:
+        """Write an image synchronously with the writer's format and quality"""
+        return self._encode(image, self.path_for(path))
+
+    @property
+    def pending(self) -> int:
+        """Number of images submitted but not yet written"""
+        return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted image is written.
+
+        Args:
+            timeout: Maximum time to wait in seconds; None waits indefinitely
+
+        Returns:
+            bool: True if nothing is pending anymore
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self) -> None:
+        """Write the pending images and stop the threads"""
+        self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "AsyncImageWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _encode(self, image: NDArray[Any], path: Path) -> bool:
+        """Encode and write one image; failures are logged and counted"""
+        try:
+            ensure_dir(path.parent)
+            if save_image(image, path, encode_params(path.suffix[1:], self.quality)):
+                return True
+            self._logger.error(f"Failed to write image {path}")
+        except Exception as e:
+            self._logger.error(f"Failed to write image {path}: {e}")
+        with self._condition:
+            self.errors += 1
+        return False
+
+    def _write(self, image: NDArray[Any], path: Path) -> bool:
+        """Worker task: write one submitted image and release its slot"""
+        success = False
+        try:
+            success = self._encode(image, path)
+        finally:
+            self._finish(success)
+        return success
+
+    def _finish(self, success: bool) -> None:
+        """Release the backlog slot of a submitted image"""
+        with self._condition:
+            self._pending -= 1
+            if success:
+                self.written += 1
+            self._condition.notify_all()
+        self._slots.release()
@@ -0,0 +1,538 @@
+"""
+Vectorized template matching engine.
+
+Peak extraction and non-maximum suppression run entirely in NumPy/OpenCV, so
+the cost no longer grows with the number of above-threshold pixels of the
+``cv2.matchTemplate`` response.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+# Structured dtype of a match: top-left corner, box size and confidence score
+MATCH_DTYPE = np.dtype([
+    ('x', np.int32),
+    ('y', np.int32),
+    ('width', np.int32),
+    ('height', np.int32),
+    ('score', np.float32),
+])
+
+# Candidate count above which peaks are thinned with a local-maximum filter before NMS
+_DILATE_MIN_CANDIDATES = 1024
+
+# Smallest template side (in pixels) still matched reliably at the coarsest pyramid level
+MIN_PYRAMID_TEMPLATE_SIDE = 8
+
+
+@dataclass
+class TemplateMatchResult:
+    """Matches of one named template and the time spent finding them"""
+    name: str
+    matches: NDArray[Any]
+    elapsed: float
+
+    @property
+    def found(self) -> bool:
+        """Whether the template was found at least once"""
+        return len(self.matches) > 0
+
+    @property
+    def best(self) -> Optional[Tuple[int, int, float]]:
+        """(x, y, score) of the best match, or None if nothing was found"""
+        if not self.found:
+            return None
+        top = self.matches[0]
+        return (int(top['x']), int(top['y']), float(top['score']))
+
+
+def empty_matches() -> NDArray[Any]:
+    """
+    Create an empty match array.
+
+    Returns:
+        NDArray[Any]: A zero-length array with MATCH_DTYPE.
+    """
+    return np.empty(0, dtype=MATCH_DTYPE)
+
+
+def to_grayscale(image: NDArray[Any]) -> NDArray[Any]:
+    """
+    Convert a BGR or BGRA image to grayscale; grayscale input is returned as-is.
+
+    Args:
+        image: Image to convert.
+
+    Returns:
+        NDArray[Any]: Single channel image.
+    """
+    if image.ndim == 3:
+        channels = image.shape[2]
+        if channels == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+        if channels == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if channels == 1:
+            return image[:, :, 0]
+    return image
+
+
+def downscale(image: NDArray[Any], level: int) -> NDArray[Any]:
+    """
+    Downscale an image by 2**level the same way the pyramid search does.
+
+    Args:
+        image: Image to downscale.
+        level: Number of halvings.
+
+    Returns:
+        NDArray[Any]: The downscaled image.
+    """
+    scale = 1 << level
+    h, w = image.shape[:2]
+    return cv2.resize(image, (max(1, w // scale), max(1, h // scale)), interpolation=cv2.INTER_AREA)
+
+
+def extract_peaks(
+    response: NDArray[np.float32],
+    threshold: float,
+    neighborhood: Tuple[int, int] = (3, 3)
+) -> Tuple[NDArray[np.intp], NDArray[np.intp], NDArray[np.float32]]:
+    """
+    Extract local maxima of a template matching response above a threshold.
+
+    A pixel is a peak when it equals the maximum of its neighborhood, which is
+    computed with a single grayscale dilation of the response map.
+
+    Args:
+        response: Result of cv2.matchTemplate (single channel float32).
+        threshold: Minimum response value for a peak.
+        neighborhood: (width, height) of the local-maximum window.
+
+    Returns:
+        Tuple of (xs, ys, scores) arrays sorted by descending score.
+    """
+    kw = max(1, int(neighborhood[0]))
+    kh = max(1, int(neighborhood[1]))
+
+    # NaN never passes the comparison, so flat regions cannot produce peaks
+    candidates = response >= threshold
+    points = cv2.findNonZero(candidates.view(np.uint8))
+    if points is None:
+        empty_idx = np.empty(0, dtype=np.intp)
+        return empty_idx, empty_idx, np.empty(0, dtype=np.float32)
+
+    points = points.reshape(-1, 2)
+    xs = points[:, 0].astype(np.intp)
+    ys = points[:, 1].astype(np.intp)
+    scores = response[ys, xs].astype(np.float32, copy=False)
+
+    # A full-frame dilation only pays off once NMS would have to chew through many points
+    if (kw > 1 or kh > 1) and len(xs) > _DILATE_MIN_CANDIDATES:
+        kernel = np.ones((kh, kw), dtype=np.uint8)
+        dilated = cv2.dilate(response, kernel)
+        is_peak = ~(scores < dilated[ys, xs])
+        xs, ys, scores = xs[is_peak], ys[is_peak], scores[is_peak]
+
+    # Stable sort keeps row-major order between equal scores, so plateaus are deterministic
+    order = np.argsort(-scores, kind='stable')
+    return xs[order], ys[order], scores[order]
+
+
+def nms_boxes(
+    xs: NDArray[Any],
+    ys: NDArray[Any],
+    width: int,
+    height: int,
+    iou_threshold: float = 0.5,
+    max_results: Optional[int] = None
+) -> NDArray[np.intp]:
+    """
+    Greedy IoU-based non-maximum suppression for equally sized boxes.
+
+    Boxes must already be ordered by priority (highest score first). Each step
+    keeps the best remaining box and drops every remaining box whose
+    intersection-over-union with it exceeds the threshold in one vectorized
+    operation.
+
+    Args:
+        xs: X coordinates of the box corners.
+        ys: Y coordinates of the box corners.
+        width: Width of every box.
+        height: Height of every box.
+        iou_threshold: Maximum allowed IoU between kept boxes (0 to 1).
+        max_results: Stop after this many boxes have been kept.
+
+    Returns:
+        NDArray[np.intp]: Indices of the kept boxes, in priority order.
+    """
+    count = len(xs)
+    if count == 0:
+        return np.empty(0, dtype=np.intp)
+
+    x1 = np.asarray(xs, dtype=np.int64)
+    y1 = np.asarray(ys, dtype=np.int64)
+    area = float(width * height)
+    remaining = np.arange(count, dtype=np.intp)
+    keep = []
+
+    while remaining.size:
+        best = remaining[0]
+        keep.append(best)
+        if max_results is not None and len(keep) >= max_results:
+            break
+        rest = remaining[1:]
+        # Boxes share one size, so the overlap is just the clipped offset
+        overlap_w = np.clip(width - np.abs(x1[rest] - x1[best]), 0, None)
+        overlap_h = np.clip(height - np.abs(y1[rest] - y1[best]), 0, None)
+        inter = overlap_w * overlap_h
+        iou = inter / (2.0 * area - inter)
+        remaining = rest[iou <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.intp)
+
+
+def _peak_neighborhood(template_size: Tuple[int, int], iou_threshold: float) -> Tuple[int, int]:
+    """
+    Widest local-maximum window that never drops a match NMS would have kept.
+
+    A peak suppressed by the window lies at most (rx, ry) away from a higher
+    one, so their boxes overlap by at least (tw - rx) * (th - ry). The window is
+    only as wide as keeps that overlap above the IoU threshold; at IoU 1 or for
+    tiny templates it collapses to a single pixel and plain NMS decides alone.
+    """
+    tw, th = template_size
+    if iou_threshold >= 1.0 or tw <= 1 or th <= 1:
+        return 1, 1
+    threshold = max(0.0, iou_threshold)
+    area = float(tw * th)
+
+    def suppressed_anyway(rx: int, ry: int) -> bool:
+        inter = (tw - rx) * (th - ry)
+        return inter / (2.0 * area - inter) > threshold
+
+    # Equal relative shrink on both axes gives IoU > t when 1 - s > sqrt(2t / (1 + t))
+    shrink = 1.0 - np.sqrt(2.0 * threshold / (1.0 + threshold))
+    rx = min(tw - 1, int(shrink * tw))
+    ry = min(th - 1, int(shrink * th))
+    # Integer rounding can still land on the boundary, so step back until it is safe
+    while (rx or ry) and not suppressed_anyway(rx, ry):
+        if rx * th >= ry * tw:
+            rx -= 1
+        else:
+            ry -= 1
+    return 2 * rx + 1, 2 * ry + 1
+
+
+def match_template(
+    image: NDArray[Any],
+    template: NDArray[Any],
+    threshold: float = 0.8,
+    iou_threshold: float = 0.5,
+    max_matches: Optional[int] = None,
+    method: int = cv2.TM_CCOEFF_NORMED,
+    offset: Tuple[int, int] = (0, 0)
+) -> NDArray[Any]:
+    """
+    Find all non-overlapping occurrences of a template in an image.
+
+    The images are passed to cv2.matchTemplate as-is, so callers decide
+    whether to match in color or grayscale.
+
+    Args:
+        image: Image to search in.
+        template: Template image to search for.
+        threshold: Minimum matching score for a match.
+        iou_threshold: Maximum IoU between two reported matches.
+        max_matches: Maximum number of matches to return.
+        method: One of the cv2.TM_*_NORMED methods where higher is better.
+        offset: (x, y) added to every match, e.g. the origin of a captured region.
+
+    Returns:
+        NDArray[Any]: Structured array with MATCH_DTYPE, sorted by descending score.
+    """
+    th, tw = template.shape[:2]
+    ih, iw = image.shape[:2]
+    if th == 0 or tw == 0 or th > ih or tw > iw:
+        return empty_matches()
+
+    response = cv2.matchTemplate(image, template, method)
+    return matches_from_response(response, (tw, th), threshold, iou_threshold, max_matches, offset)
+
+
+def matches_from_response(
+    response: NDArray[np.float32],
+    template_size: Tuple[int, int],
+    threshold: float = 0.8,
+    iou_threshold: float = 0.5,
+    max_matches: Optional[int] = None,
+    offset: Tuple[int, int] = (0, 0)
+) -> NDArray[Any]:
+    """
+    Turn a template matching response map into a structured match array.
+
+    Args:
+        response: Result of cv2.matchTemplate.
+        template_size: Template (width, height).
+        threshold: Minimum matching score for a match.
+        iou_threshold: Maximum IoU between two reported matches.
+        max_matches: Maximum number of matches to return.
+        offset: (x, y) added to every match, for responses computed on a sub-image.
+
+    Returns:
+        NDArray[Any]: Structured array with MATCH_DTYPE, sorted by descending score.
+    """
+    tw, th = template_size
+    neighborhood = _peak_neighborhood(template_size, iou_threshold)
+    xs, ys, scores = extract_peaks(response, threshold, neighborhood)
+    keep = nms_boxes(xs, ys, tw, th, iou_threshold, max_matches)
+
+    matches = np.empty(len(keep), dtype=MATCH_DTYPE)
+    matches['x'] = xs[keep] + offset[0]
+    matches['y'] = ys[keep] + offset[1]
+    matches['width'] = tw
+    matches['height'] = th
+    matches['score'] = scores[keep]
+    return matches
+
+
+def _effective_pyramid_levels(template_size: Tuple[int, int], levels: int) -> int:
+    """Reduce pyramid depth until the downscaled template keeps enough detail to match"""
+    min_side = min(template_size)
+    while levels > 0 and (min_side >> levels) < MIN_PYRAMID_TEMPLATE_SIDE:
+        levels -= 1
+    return levels
+
+
+def _coarse_candidates(
+    response: NDArray[np.float32],
+    template_size: Tuple[int, int],
+    count: int
+) -> List[Tuple[int, int]]:
+    """Pick the best few well-separated peaks of a (small) coarse response map"""
+    tw, th = template_size
+    response = np.nan_to_num(response, nan=-1.0)
+    candidates = []
+    for _ in range(count):
+        _, max_val, _, max_loc = cv2.minMaxLoc(response)
+        if max_val <= -1.0:
+            break
+        x, y = max_loc
+        candidates.append((x, y))
+        # Blank out the neighbourhood so the next peak is a different location
+        response[max(0, y - th // 2):y + th // 2 + 1, max(0, x - tw // 2):x + tw // 2 + 1] = -1.0
+    return candidates
+
+
+def pyramid_match_template(
+    image: NDArray[Any],
+    template: NDArray[Any],
+    threshold: float = 0.8,
+    levels: int = 2,
+    candidates: int = 5,
+    method: int = cv2.TM_CCOEFF_NORMED,
+    coarse_templates: Optional[Dict[int, NDArray[Any]]] = None
+) -> NDArray[Any]:
+    """
+    Coarse-to-fine template search.
+
+    Both images are downscaled by ``2 ** levels`` and matched exhaustively at
+    that size. The best few coarse peaks are then refined with full-resolution
+    matching restricted to a small window around each of them, so the refined
+    location and score are exactly those of the exhaustive search whenever the
+    true best match is among the coarse candidates. The depth is reduced
+    automatically for small templates that would lose their detail.
+
+    Args:
+        image: Image to search in.
+        template: Template image to search for.
+        threshold: Minimum full-resolution matching score for a match.
+        levels: Number of halvings for the coarse pass (2 = 1/4, 3 = 1/8 scale).
+        candidates: Number of coarse peaks refined at full resolution.
+        method: One of the cv2.TM_*_NORMED methods where higher is better.
+        coarse_templates: Precomputed downscaled templates keyed by level, e.g. from a TemplateStore.
+
+    Returns:
+        NDArray[Any]: Structured array with MATCH_DTYPE, sorted by descending score.
+    """
+    th, tw = template.shape[:2]
+    ih, iw = image.shape[:2]
+    if th == 0 or tw == 0 or th > ih or tw > iw:
+        return empty_matches()
+
+    levels = _effective_pyramid_levels((tw, th), levels)
+    if levels == 0:
+        return match_template(image, template, threshold, max_matches=candidates, method=method)
+
+    scale = 1 << levels
+    coarse_image = downscale(image, levels)
+    coarse_template = (coarse_templates or {}).get(levels)
+    if coarse_template is None or coarse_template.ndim != template.ndim:
+        coarse_template = downscale(template, levels)
+    coarse_response = cv2.matchTemplate(coarse_image, coarse_template, method)
+    coarse_size = (coarse_template.shape[1], coarse_template.shape[0])
+
+    # Rounding of both downscaled sizes can shift the coarse peak by up to two coarse pixels
+    radius = 2 * scale
+    xs: List[int] = []
+    ys: List[int] = []
+    scores: List[float] = []
+    for cx, cy in _coarse_candidates(coarse_response, coarse_size, candidates):
+        x0 = max(0, cx * scale - radius)
+        y0 = max(0, cy * scale - radius)
+        x1 = min(iw, cx * scale + radius + tw)
+        y1 = min(ih, cy * scale + radius + th)
+        if x1 - x0 < tw or y1 - y0 < th:
+            continue
+        window = cv2.matchTemplate(image[y0:y1, x0:x1], template, method)
+        _, max_val, _, max_loc = cv2.minMaxLoc(window)
+        if max_val >= threshold:
+            xs.append(x0 + max_loc[0])
+            ys.append(y0 + max_loc[1])
+            scores.append(max_val)
+
+    if not scores:
+        return empty_matches()
+
+    order = np.argsort(-np.asarray(scores, dtype=np.float32), kind='stable')
+    x_arr = np.asarray(xs, dtype=np.intp)[order]
+    y_arr = np.asarray(ys, dtype=np.intp)[order]
+    score_arr = np.asarray(scores, dtype=np.float32)[order]
+    # Neighbouring coarse peaks may refine to the same full-resolution location
+    keep = nms_boxes(x_arr, y_arr, tw, th)
+
+    matches = np.empty(len(keep), dtype=MATCH_DTYPE)
+    matches['x'] = x_arr[keep]
+    matches['y'] = y_arr[keep]
+    matches['width'] = tw
+    matches['height'] = th
+    matches['score'] = score_arr[keep]
+    return matches
+
+
+def match_templates_batch(
+    image: NDArray[Any],
+    templates: Dict[str, NDArray[Any]],
+    threshold: float = 0.8,
+    max_matches: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    offset: Tuple[int, int] = (0, 0)
+) -> Dict[str, TemplateMatchResult]:
+    """
+    Match several templates against one image.
+
+    The image is converted to grayscale once and shared by all templates; the
+    per-template matching runs on a thread pool, which scales because OpenCV
+    releases the GIL inside cv2.matchTemplate.
+
+    Args:
+        image: Image to search in.
+        templates: Template images keyed by name.
+        threshold: Minimum matching score for a match.
+        max_matches: Maximum number of matches to keep per template.
+        max_workers: Thread pool size (defaults to the CPU count).
+        offset: (x, y) added to every match, e.g. the origin of a captured region.
+
+    Returns:
+        Dict[str, TemplateMatchResult]: Results keyed by template name, in input order.
+    """
+    if not templates:
+        return {}
+
+    image_gray = to_grayscale(image)
+
+    def run(name: str, template: NDArray[Any]) -> TemplateMatchResult:
+        start = time.perf_counter()
+        matches = match_template(
+            image_gray, to_grayscale(template), threshold, max_matches=max_matches, offset=offset
+        )
+        return TemplateMatchResult(name, matches, time.perf_counter() - start)
+
+    workers = max_workers or min(len(templates), os.cpu_count() or 1)
+    if workers <= 1 or len(templates) == 1:
+        return {name: run(name, template) for name, template in templates.items()}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="template-match") as executor:
+        futures = {name: executor.submit(run, name, template) for name, template in templates.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def changed_tiles(
+    previous: NDArray[Any],
+    current: NDArray[Any],
+    tile_size: int = 32,
+    tolerance: int = 0
+) -> NDArray[np.bool_]:
+    """
+    Compute which tiles of a frame changed since the previous frame.
+
+    Channels are folded into the row, so no per-channel reduction or grayscale
+    conversion is needed. Rows are reduced through a reshape of whole tile
+    bands, which is several times faster than reduceat on a full frame.
+
+    Args:
+        previous: Previous frame.
+        current: Current frame with the same shape and dtype.
+        tile_size: Tile side in pixels.
+        tolerance: Largest per-channel difference still treated as unchanged.
+
+    Returns:
+        NDArray[np.bool_]: Grid of ceil(height / tile_size) x ceil(width / tile_size)
+            flags, True where any pixel of the tile changed.
+    """
+    diff = cv2.absdiff(previous, current)
+    height, width = diff.shape[:2]
+    channels = diff.shape[2] if diff.ndim == 3 else 1
+    diff = diff.reshape(height, width * channels)
+    bands, remainder = divmod(height, tile_size)
+    band_max = np.empty((bands + (1 if remainder else 0), diff.shape[1]), dtype=diff.dtype)
+    if bands:
+        band_max[:bands] = diff[:bands * tile_size].reshape(bands, tile_size, -1).max(axis=1)
+    if remainder:
+        band_max[bands] = diff[bands * tile_size:].max(axis=0)
+    cols = np.arange(0, width * channels, tile_size * channels)
+    return np.maximum.reduceat(band_max, cols, axis=1) > tolerance
+
+
+def dirty_regions(
+    tiles: NDArray[np.bool_],
+    tile_size: int,
+    template_size: Tuple[int, int],
+    image_size: Tuple[int, int]
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Turn changed tiles into the image regions that must be searched again.
+
+    Each connected group of changed tiles is expanded by the template size, so
+    the region contains every template placement that overlaps a changed pixel.
+    Placements outside all regions see unchanged pixels and keep their score.
+
+    Args:
+        tiles: Changed-tile grid from changed_tiles.
+        tile_size: Tile side in pixels used to build the grid.
+        template_size: Template (width, height).
+        image_size: Image (width, height).
+
+    Returns:
+        List[Tuple[int, int, int, int]]: Regions as (x, y, width, height), clipped to the image.
+    """
+    if not tiles.any():
+        return []
+    tw, th = template_size
+    iw, ih = image_size
+    count, _, stats, _ = cv2.connectedComponentsWithStats(tiles.astype(np.uint8), connectivity=8)
+    regions = []
+    for tx, ty, tcols, trows, _ in stats[1:count]:
+        x0 = max(0, int(tx) * tile_size - tw + 1)
+        y0 = max(0, int(ty) * tile_size - th + 1)
+        x1 = min(iw, int(tx + tcols) * tile_size + tw - 1)
+        y1 = min(ih, int(ty + trows) * tile_size + th - 1)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    return regions
@@ -0,0 +1,241 @@
+"""
+Precompiled template store.
+
+Loads a directory of template images once and keeps the forms used by template
+matching (decoded image, normalized grayscale, optional pyramid levels) in
+memory, so repeated lookups never decode or preprocess a template again.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .matching import downscale, to_grayscale
+
+TEMPLATE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def preprocess_template(image: NDArray[Any]) -> NDArray[np.uint8]:
+    """
+    Convert a template to the normalized grayscale form used for matching.
+
+    Args:
+        image: Template image (BGR, BGRA or grayscale).
+
+    Returns:
+        NDArray[np.uint8]: Grayscale image stretched to the full 0-255 range.
+    """
+    gray = to_grayscale(image)
+    return cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+
+
+@dataclass
+class StoredTemplate:
+    """A template with its precomputed forms"""
+    name: str
+    path: Path
+    fingerprint: str
+    image: NDArray[Any]
+    gray: NDArray[np.uint8]
+    levels: Dict[int, NDArray[np.uint8]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Template (width, height)"""
+        return (int(self.image.shape[1]), int(self.image.shape[0]))
+
+
+class TemplateStore:
+    """Loads template images once and serves their preprocessed forms by name"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        cache_dir: Optional[Union[str, Path]] = None,
+        pyramid_levels: Sequence[int] = (),
+        extensions: Sequence[str] = TEMPLATE_EXTENSIONS
+    ) -> None:
+        """
+        Initialize the store and load every template in the directory.
+
+        Args:
+            directory: Directory with template images; names are paths relative
+                to it without the extension (e.g. "toolbar/save")
+            cache_dir: Directory for persisted ``.npy`` forms, reloaded memory-mapped
+                on the next run. None keeps everything in memory only.
+            pyramid_levels: Pyramid levels (number of halvings) to precompute
+            extensions: Image file extensions to load
+        """
+        self.directory = Path(directory)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.pyramid_levels = tuple(sorted(set(int(level) for level in pyramid_levels if level > 0)))
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self._templates: Dict[str, StoredTemplate] = {}
+        self.load()
+
+    def load(self) -> int:
+        """
+        (Re)load all templates from the directory.
+
+        Returns:
+            int: Number of templates loaded
+        """
+        templates: Dict[str, StoredTemplate] = {}
+        if self.directory.is_dir():
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for path in sorted(self.directory.rglob("*")):
+                if not path.is_file() or path.suffix.lower() not in self.extensions:
+                    continue
+                template = self._load_template(path)
+                if template is not None:
+                    templates[template.name] = template
+        self._templates = templates
+        return len(templates)
+
+    def _load_template(self, path: Path) -> Optional[StoredTemplate]:
+        """Load one template, preferring persisted preprocessed forms; an unreadable file is skipped"""
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        fingerprint = hashlib.blake2b(data, digest_size=16).hexdigest()
+        name = path.relative_to(self.directory).with_suffix("").as_posix()
+
+        forms = self._load_cached_forms(fingerprint)
+        if forms is None:
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                return None
+            gray = preprocess_template(image)
+            forms = {"image": image, "gray": gray}
+            for level in self.pyramid_levels:
+                forms[f"L{level}"] = downscale(gray, level)
+            self._save_cached_forms(fingerprint, forms)
+
+        levels = {level: forms[f"L{level}"] for level in self.pyramid_levels}
+        return StoredTemplate(name, path, fingerprint, forms["image"], forms["gray"], levels)
+
+    def _cache_path(self, fingerprint: str, form: str) -> Path:
+        """Path of a persisted form"""
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{fingerprint}.{form}.npy"
+
+    def _load_cached_forms(self, fingerprint: str) -> Optional[Dict[str, NDArray[Any]]]:
+        """Memory-map persisted forms, or return None if any is missing"""
+        if self.cache_dir is None:
+            return None
+        names = ["image", "gray"] + [f"L{level}" for level in self.pyramid_levels]
+        forms = {}
+        for form in names:
+            cache_path = self._cache_path(fingerprint, form)
+            if not cache_path.exists():
+                return None
+            try:
+                forms[form] = np.load(cache_path, mmap_mode="r")
+            except (OSError, ValueError):
+                return None
+        return forms
+
+    def _save_cached_forms(self, fingerprint: str, forms: Dict[str, NDArray[Any]]) -> None:
+        """
+        Persist preprocessed forms; write errors only cost a decode on the next run.
+
+        Each form is written to a temporary file and renamed into place, so a
+        crash never leaves a truncated form that would be memory-mapped later.
+        """
+        if self.cache_dir is None:
+            return
+        for form, array in forms.items():
+            cache_path = self._cache_path(fingerprint, form)
+            tmp_name = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    dir=self.cache_dir, prefix=cache_path.stem, suffix=".tmp", delete=False
+                ) as tmp:
+                    tmp_name = tmp.name
+                    np.save(tmp, np.ascontiguousarray(array))
+                os.replace(tmp_name, cache_path)
+            except OSError:
+                if tmp_name is not None:
+                    try:
+                        os.unlink(tmp_name)
+                    except OSError:
+                        pass
+
+    def add(self, name: str, image: NDArray[Any]) -> StoredTemplate:
+        """
+        Add an in-memory template to the store.
+
+        Args:
+            name: Template name
+            image: Template image
+
+        Returns:
+            StoredTemplate: The stored template
+        """
+        if image is None or not isinstance(image, np.ndarray) or image.size == 0:
+            raise ValueError("Invalid image data")
+        fingerprint = hashlib.blake2b(np.ascontiguousarray(image).tobytes(), digest_size=16).hexdigest()
+        gray = preprocess_template(image)
+        levels = {level: downscale(gray, level) for level in self.pyramid_levels}
+        template = StoredTemplate(name, self.directory / name, fingerprint, image, gray, levels)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> StoredTemplate:
+        """
+        Get a stored template.
+
+        Args:
+            name: Template name
+
+        Returns:
+            StoredTemplate: The stored template
+
+        Raises:
+            KeyError: If no template with this name was loaded
+        """
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Template not found: {name}") from None
+
+    def image(self, name: str) -> NDArray[Any]:
+        """Get the decoded template image"""
+        return self.get(name).image
+
+    def gray(self, name: str) -> NDArray[np.uint8]:
+        """Get the normalized grayscale template"""
+        return self.get(name).gray
+
+    def level(self, name: str, level: int) -> NDArray[np.uint8]:
+        """Get the grayscale template downscaled by 2**level (computed on demand if not precomputed)"""
+        template = self.get(name)
+        if level not in template.levels:
+            template.levels[level] = downscale(template.gray, level)
+        return template.levels[level]
+
+    def fingerprint(self, name: str) -> str:
+        """Get the content hash of a template"""
+        return self.get(name).fingerprint
+
+    def names(self) -> List[str]:
+        """Get the names of all stored templates"""
+        return list(self._templates)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._templates)
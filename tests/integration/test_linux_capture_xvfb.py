@@ -0,0 +1,100 @@
+"""
+Capture tests against a real X server (e.g. ``xvfb-run -s "-screen 0 640x480x24" pytest ...``)
+"""
+import os
+import sys
+
+import pytest
+import numpy as np
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux" or not os.environ.get("DISPLAY"), reason="needs an X display")
+
+Xlib_display = pytest.importorskip("Xlib.display")
+X = pytest.importorskip("Xlib.X")
+
+from pyui_automation.backends.linux import LinuxBackend, XShmGrabber  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    """LinuxBackend connected to the X display without starting AT-SPI"""
+    backend = object.__new__(LinuxBackend)
+    backend.display = Xlib_display.Display()
+    yield backend
+    backend.display.close()
+
+
+def _fill(display, rect, pixel):
+    """Fill a root window rectangle with a pixel value"""
+    screen = display.screen()
+    gc = screen.root.create_gc(foreground=pixel)
+    screen.root.fill_rectangle(gc, *rect)
+    display.sync()
+    gc.free()
+
+
+class TestXvfbCapture:
+    """Capture from a running X server"""
+
+    def test_capture_region_is_bgr(self, backend):
+        """Test a filled rectangle is captured with the expected BGR value"""
+        # 0xRRGGBB pixel on a 24-bit TrueColor visual
+        _fill(backend.display, (10, 10, 40, 30), 0x204080)
+
+        image = backend.capture_screen_region(10, 10, 40, 30)
+
+        assert image.shape == (30, 40, 3)
+        assert np.all(image == (0x80, 0x40, 0x20))
+
+    def test_view_capture(self, backend):
+        """Test zero-copy views equal the default owned captures"""
+        view = backend.capture_screen_region(0, 0, 64, 64, copy=False)
+        copy = backend.capture_screen_region(0, 0, 64, 64)
+
+        assert copy.flags.c_contiguous
+        assert np.array_equal(view, copy)
+
+
+class TestXvfbSharedMemory:
+    """MIT-SHM capture (Xvfb supports the extension)"""
+
+    @pytest.fixture
+    def grabber(self):
+        grabber = XShmGrabber.create()
+        if grabber is None:
+            pytest.skip("MIT-SHM is not available")
+        yield grabber
+        grabber.close()
+
+    def test_grab_matches_get_image(self, backend, grabber):
+        """Test the shared-memory frame equals a GetImage capture"""
+        _fill(backend.display, (5, 5, 50, 20), 0x00ff00)
+
+        frame = grabber.grab()
+        region = grabber.capture(0, 0, 64, 32)
+
+        assert frame.shape == (grabber.height, grabber.width, 4)
+        assert np.array_equal(region, backend.capture_screen_region(0, 0, 64, 32))
+        assert np.all(region[5:25, 5:55] == (0, 0xff, 0))
+
+    def test_region_capture_is_region_sized(self, backend, grabber):
+        """Test offset regions of several sizes match GetImage, with the full-screen frame untouched in shape"""
+        _fill(backend.display, (100, 60, 30, 20), 0x0000ff)
+
+        for x, y, width, height in ((100, 60, 30, 20), (90, 50, 50, 40), (100, 60, 30, 20)):
+            region = grabber.capture(x, y, width, height)
+            assert region.shape == (height, width, 3)
+            assert np.array_equal(region, backend.capture_screen_region(x, y, width, height))
+        assert np.all(region == (0xff, 0, 0))
+        assert grabber.grab().shape == (grabber.height, grabber.width, 4)
+
+    def test_region_outside_screen(self, grabber):
+        """Test regions beyond the screen are not served from shared memory"""
+        assert grabber.capture(grabber.width - 10, 0, 20, 10) is None
+
+    def test_closed_grabber(self, grabber):
+        """Test a closed grabber refuses to grab"""
+        grabber.close()
+
+        with pytest.raises(RuntimeError):
+            grabber.grab()
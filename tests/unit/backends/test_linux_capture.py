@@ -0,0 +1,161 @@
+"""
+Tests for zero-copy XImage conversion in the Linux backend
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import numpy as np
+
+from pyui_automation.backends import linux
+from pyui_automation.backends.linux import LinuxBackend, XShmGrabber, ximage_to_array
+
+
+def _ximage(width, height, pad=0, seed=0):
+    """Create BGRX pixels and their XImage bytes with optional row padding"""
+    bgrx = np.random.default_rng(seed).integers(0, 255, (height, width, 4), dtype=np.uint8)
+    rows = np.zeros((height, width * 4 + pad), dtype=np.uint8)
+    rows[:, :width * 4] = bgrx.reshape(height, -1)
+    return bgrx, rows.tobytes()
+
+
+class TestXImageToArray:
+    """Test ximage_to_array"""
+
+    def test_bgr_view_without_copy(self):
+        """Test copy=False returns a BGR view of the buffer"""
+        bgrx, data = _ximage(64, 48)
+
+        image = ximage_to_array(data, 64, 48, copy=False)
+
+        assert image.shape == (48, 64, 3)
+        assert np.array_equal(image, bgrx[..., :3])
+        assert np.shares_memory(image, np.frombuffer(data, dtype=np.uint8))
+        assert not image.flags.c_contiguous
+
+    def test_padded_rows(self):
+        """Test rows padded past width * 4 bytes are handled"""
+        bgrx, data = _ximage(30, 10, pad=8)
+
+        assert np.array_equal(ximage_to_array(data, 30, 10), bgrx[..., :3])
+        assert np.array_equal(ximage_to_array(data, 30, 10, copy=False), bgrx[..., :3])
+
+    def test_owned_copy_by_default(self):
+        """Test the default result is an owned, writable array"""
+        bgrx, data = _ximage(16, 16)
+
+        image = ximage_to_array(data, 16, 16)
+        image[0, 0] = 0
+
+        assert image.flags.c_contiguous and image.flags.owndata
+        assert np.array_equal(image[1:], bgrx[1:, :, :3])
+
+    def test_short_buffer(self):
+        """Test buffers below 32 bits per pixel are rejected"""
+        with pytest.raises(ValueError):
+            ximage_to_array(bytes(16 * 16 * 3), 16, 16)
+
+
+class TestCaptureScreenRegion:
+    """Test LinuxBackend.capture_screen_region with a fake X display"""
+
+    def test_capture_uses_ximage_buffer(self, monkeypatch):
+        """Test the captured image wraps the XImage data"""
+        bgrx, data = _ximage(20, 10)
+        backend = object.__new__(LinuxBackend)
+        backend.display = MagicMock()
+        root = backend.display.screen.return_value.root
+        root.get_image.return_value = MagicMock(data=data)
+        monkeypatch.setattr(linux, "X", MagicMock(ZPixmap=2))
+
+        image = backend.capture_screen_region(5, 6, 20, 10)
+        view = backend.capture_screen_region(5, 6, 20, 10, copy=False)
+
+        root.get_image.assert_called_with(5, 6, 20, 10, 2, 0xffffffff)
+        assert np.array_equal(image, bgrx[..., :3])
+        assert image.flags.writeable
+        assert np.shares_memory(view, np.frombuffer(data, dtype=np.uint8))
+        assert backend.capture_screen_region(0, 0, 0, 10) is None
+
+    def test_capture_prefers_shared_memory(self, monkeypatch):
+        """Test regions inside the screen come from the MIT-SHM grabber"""
+        backend = object.__new__(LinuxBackend)
+        backend.display = MagicMock()
+        backend._shm = MagicMock()
+        expected = np.zeros((10, 20, 3), dtype=np.uint8)
+        backend._shm.capture.return_value = expected
+
+        assert backend.capture_screen_region(1, 2, 20, 10) is expected
+        backend._shm.capture.assert_called_once_with(1, 2, 20, 10)
+        backend.display.screen.assert_not_called()
+
+    @pytest.mark.parametrize("failure", [{"return_value": None}, {"side_effect": RuntimeError("XShmGetImage failed")}])
+    def test_capture_falls_back_to_get_image(self, monkeypatch, failure):
+        """Test regions the grabber cannot serve, or fails on, use GetImage"""
+        bgrx, data = _ximage(20, 10)
+        backend = object.__new__(LinuxBackend)
+        backend.display = MagicMock()
+        backend.display.screen.return_value.root.get_image.return_value = MagicMock(data=data)
+        backend._shm = MagicMock()
+        backend._shm.capture.configure_mock(**failure)
+        monkeypatch.setattr(linux, "X", MagicMock(ZPixmap=2))
+
+        assert np.array_equal(backend.capture_screen_region(0, 0, 20, 10), bgrx[..., :3])
+
+
+def _stub_grabber(width=100, height=80):
+    """Create an XShmGrabber over mocked libraries, without an X server"""
+    grabber = XShmGrabber.__new__(XShmGrabber)
+    grabber._lock = threading.RLock()
+    grabber._x11, grabber._xext, grabber._libc = MagicMock(), MagicMock(), MagicMock()
+    grabber._display = MagicMock()
+    grabber._root = 1
+    grabber._image = MagicMock()
+    grabber._region_image = None
+    grabber._region_size = (0, 0)
+    grabber._info = linux._XShmSegmentInfo(shmseg=1, shmid=-1)
+    grabber._create_image = MagicMock()
+    grabber.width, grabber.height = width, height
+    return grabber
+
+
+class TestXShmGrabber:
+    """Test XShmGrabber availability handling"""
+
+    def test_unavailable_without_libraries(self, monkeypatch):
+        """Test no grabber is created when libX11/libXext are missing"""
+        monkeypatch.setattr(linux.ctypes.util, "find_library", lambda name: None)
+
+        assert XShmGrabber.create() is None
+        with pytest.raises(RuntimeError):
+            XShmGrabber()
+
+    def test_unavailable_without_display(self, monkeypatch):
+        """Test no grabber is created when the display cannot be opened"""
+        if not all(linux.ctypes.util.find_library(name) for name in ("X11", "Xext", "c")):
+            pytest.skip("libX11/libXext not installed")
+
+        assert XShmGrabber.create(":1999") is None
+
+    def test_x_error_is_recorded_not_fatal(self):
+        """Test an X error during XShmGetImage becomes a RuntimeError and the handler is restored"""
+        grabber = _stub_grabber()
+        grabber._capture_limits = lambda: (100, 80)
+
+        def failing_get_image(*args):
+            linux._record_x_error(None, None)
+            return 0
+
+        grabber._xext.XShmGetImage.side_effect = failing_get_image
+
+        with pytest.raises(RuntimeError):
+            grabber.capture(0, 0, 10, 10)
+        assert grabber._x11.XSetErrorHandler.call_count == 2
+
+    def test_region_outside_shrunken_screen(self):
+        """Test regions beyond the current root size are refused before any request"""
+        grabber = _stub_grabber()
+        grabber._capture_limits = lambda: (50, 40)
+
+        assert grabber.capture(40, 0, 20, 10) is None
+        grabber._xext.XShmGetImage.assert_not_called()
@@ -6,6 +6,7 @@ import numpy as np
 from pathlib import Path
 
 from pyui_automation.core.visual import VisualMatcher, VisualTester, VisualDifference
+from pyui_automation.utils.baseline_store import BaselineStore
 
 
 @pytest.fixture
@@ -217,4 +218,344 @@ class TestVisualDifference:
         assert diff.location == (9999, 9999)
         assert diff.size == (9999, 9999)
         assert diff.difference_percentage == 100.0
-        assert diff.type == "missing" 
\ No newline at end of file
+        assert diff.type == "missing" 
+
+class TestVisualMatcherMatching:
+    """Test VisualMatcher template search"""
+
+    def test_find_all_elements_suppresses_overlaps(self, mock_native_element):
+        """Test find_all_elements reports one match per template occurrence"""
+        rng = np.random.default_rng(0)
+        template = rng.integers(0, 255, (20, 20, 3), dtype=np.uint8)
+        screen = np.zeros((120, 200, 3), dtype=np.uint8)
+        screen[10:30, 10:30] = template
+        screen[70:90, 150:170] = template
+        mock_native_element.capture_screenshot.return_value = screen
+        matcher = VisualMatcher(mock_native_element)
+
+        matches = matcher.find_all_elements(template, threshold=0.9)
+
+        assert sorted(m["location"] for m in matches) == [(10, 10), (150, 70)]
+        assert all(isinstance(m["confidence"], float) for m in matches)
+
+    def test_find_element_pyramid(self, mock_native_element):
+        """Test coarse-to-fine find_element returns the exhaustive location"""
+        rng = np.random.default_rng(1)
+        screen = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+        screen = np.ascontiguousarray(np.repeat(np.repeat(screen[::4, ::4], 4, 0), 4, 1))
+        template = screen[100:164, 200:264].copy()
+        mock_native_element.capture_screenshot.return_value = screen
+        matcher = VisualMatcher(mock_native_element, similarity_threshold=0.9)
+
+        assert matcher.find_element(template) == (200, 100)
+        assert matcher.find_element(template, pyramid_levels=2) == (200, 100)
+
+    def test_find_templates_batch_captures_once(self, mock_native_element):
+        """Test a batch search captures the screen a single time"""
+        rng = np.random.default_rng(2)
+        screen = rng.integers(0, 255, (100, 100, 3), dtype=np.uint8)
+        mock_native_element.capture_screenshot.return_value = screen
+        matcher = VisualMatcher(mock_native_element, similarity_threshold=0.9)
+        templates = {"a": screen[10:30, 10:30].copy(), "b": screen[60:90, 40:70].copy()}
+
+        results = matcher.find_templates_batch(templates)
+
+        assert mock_native_element.capture_screenshot.call_count == 1
+        assert results["a"].best[:2] == (10, 10)
+        assert results["b"].best[:2] == (40, 60)
+
+    def test_find_element_by_template_name(self, mock_native_element, temp_dir):
+        """Test templates can be passed by name from a template store"""
+        from pyui_automation.utils.template_store import TemplateStore
+
+        rng = np.random.default_rng(3)
+        screen = rng.integers(0, 255, (100, 100, 3), dtype=np.uint8)
+        store = TemplateStore(temp_dir)
+        store.add("icon", screen[20:40, 30:50].copy())
+        mock_native_element.capture_screenshot.return_value = screen
+        matcher = VisualMatcher(mock_native_element, similarity_threshold=0.9, template_store=store)
+
+        assert matcher.find_element("icon") == (30, 20)
+        assert matcher.find_templates_batch(["icon"])["icon"].best[:2] == (30, 20)
+
+    def test_find_element_by_name_without_store(self, mock_native_element):
+        """Test names require a template store"""
+        matcher = VisualMatcher(mock_native_element)
+
+        with pytest.raises(ValueError):
+            matcher.find_element("icon")
+
+    def test_find_element_in_region(self, mock_native_element):
+        """Test a region search captures only the region and returns screen coordinates"""
+        rng = np.random.default_rng(4)
+        screen = rng.integers(0, 255, (200, 300, 3), dtype=np.uint8)
+        template = screen[120:140, 210:230].copy()
+        capture_region = mock_native_element.session.screenshot_service.capture_screen_region
+        capture_region.side_effect = lambda x, y, w, h: screen[y:y + h, x:x + w].copy()
+        matcher = VisualMatcher(mock_native_element, similarity_threshold=0.9)
+
+        assert matcher.find_element(template, roi=(200, 100, 60, 60)) == (210, 120)
+        capture_region.assert_called_once_with(200, 100, 60, 60)
+        mock_native_element.capture_screenshot.assert_not_called()
+
+        matches = matcher.find_all_elements(template, threshold=0.9, roi=(200, 100, 60, 60))
+        assert [m["location"] for m in matches] == [(210, 120)]
+        results = matcher.find_templates_batch({"t": template}, roi=(200, 100, 60, 60))
+        assert results["t"].best[:2] == (210, 120)
+
+    def test_find_element_template_larger_than_region(self, mock_native_element):
+        """Test a region smaller than the template finds nothing"""
+        mock_native_element.session.screenshot_service.capture_screen_region.return_value = np.zeros((10, 10, 3), dtype=np.uint8)
+        matcher = VisualMatcher(mock_native_element)
+
+        assert matcher.find_element(np.zeros((20, 20, 3), dtype=np.uint8), roi=(0, 0, 10, 10)) is None
+
+    def test_wait_for_image_incremental(self, mock_native_element, monkeypatch):
+        """Test incremental waiting finds a template that appears in a later frame"""
+        monkeypatch.setattr("pyui_automation.core.visual.time.sleep", lambda _: None)
+        rng = np.random.default_rng(5)
+        template = rng.integers(0, 255, (20, 20, 3), dtype=np.uint8)
+        static = np.zeros((200, 300, 3), dtype=np.uint8)
+        changed = static.copy()
+        changed[150:170, 40:60] = template
+        mock_native_element.capture_screenshot.side_effect = [static, static.copy(), changed]
+        matcher = VisualMatcher(mock_native_element, similarity_threshold=0.9)
+
+        assert matcher.wait_for_image(template, timeout=5, incremental=True)
+        assert mock_native_element.capture_screenshot.call_count == 3
+
+    def test_wait_for_image_incremental_timeout(self, mock_native_element, monkeypatch):
+        """Test incremental waiting gives up on a static screen"""
+        monkeypatch.setattr("pyui_automation.core.visual.time.sleep", lambda _: None)
+        rng = np.random.default_rng(6)
+        mock_native_element.capture_screenshot.return_value = rng.integers(0, 255, (100, 100, 3), dtype=np.uint8)
+        template = rng.integers(0, 255, (10, 10, 3), dtype=np.uint8)
+        matcher = VisualMatcher(mock_native_element)
+
+        assert not matcher.wait_for_image(template, timeout=0.05, incremental=True)
+
+
+class TestVisualTesterAlgorithms:
+    """Test VisualTester comparison engine selection"""
+
+    def test_default_algorithm(self, temp_dir):
+        """Test the default engine is mse"""
+        assert VisualTester(temp_dir).algorithm == "mse"
+
+    def test_ssim_algorithm(self, temp_dir, sample_image):
+        """Test compare uses the configured engine"""
+        tester = VisualTester(temp_dir, algorithm="ssim")
+
+        assert tester.compare(sample_image, sample_image.copy())['similarity'] == pytest.approx(1.0)
+
+    def test_unknown_algorithm(self, temp_dir):
+        """Test unknown engines are rejected"""
+        with pytest.raises(ValueError):
+            VisualTester(temp_dir, algorithm="unknown")
+        tester = VisualTester(temp_dir)
+        with pytest.raises(ValueError):
+            tester.set_algorithm("unknown")
+
+
+class TestVisualTesterCompare:
+    """Test the buffered VisualTester.compare pipeline"""
+
+    def test_diff_image_only_on_request(self, temp_dir, sample_image):
+        """Test the visualization is built only when asked for"""
+        tester = VisualTester(temp_dir)
+        changed = sample_image.copy()
+        changed[10:30, 10:30] = 255 - changed[10:30, 10:30]
+
+        assert tester.compare(sample_image, changed)['diff_image'] is None
+        diff_image = tester.compare(sample_image, changed, diff_image=True)['diff_image']
+        expected = sample_image.copy()
+        expected[(np.abs(sample_image.astype(int) - changed) > 30).any(axis=2)] = (0, 0, 255)
+        assert np.array_equal(diff_image, expected)
+
+    def test_buffers_reused_per_shape(self, temp_dir, sample_image):
+        """Test buffers are allocated once per image shape"""
+        tester = VisualTester(temp_dir)
+
+        first = tester._comparison_buffers(sample_image.shape, sample_image.dtype)
+        tester.compare(sample_image, sample_image.copy())
+
+        assert tester._comparison_buffers(sample_image.shape, sample_image.dtype)[0] is first[0]
+
+    def test_buffer_shapes_bounded(self, temp_dir):
+        """Test only the most recent shapes keep buffers"""
+        tester = VisualTester(temp_dir)
+        for size in range(10, 10 + tester.MAX_BUFFER_SHAPES + 2):
+            tester._comparison_buffers((size, size, 3), np.uint8)
+
+        assert len(tester._buffers.cache) == tester.MAX_BUFFER_SHAPES
+
+    def test_grayscale_images(self, temp_dir):
+        """Test single-channel images are compared"""
+        tester = VisualTester(temp_dir)
+        image = np.zeros((50, 50), dtype=np.uint8)
+        changed = image.copy()
+        changed[10:20, 10:30] = 200
+
+        result = tester.compare(image, changed)
+
+        assert result['differences'] == [{'location': (0, 0), 'size': (32, 32), 'area': 200.0}]
+
+    def test_difference_regions_are_capped(self, temp_dir):
+        """Test scattered changes produce at most MAX_DIFF_REGIONS regions, largest first"""
+        tester = VisualTester(temp_dir)
+        tester.MAX_DIFF_REGIONS = 5
+        image = np.zeros((160, 640, 3), dtype=np.uint8)
+        changed = image.copy()
+        for i in range(20):
+            row, col = divmod(i, 10)
+            changed[row * 64:row * 64 + 6, col * 64:col * 64 + 5 + i] = 255
+
+        result = tester.compare(image, changed)
+
+        assert len(result['differences']) == 5
+        assert result['regions_dropped'] == 15
+        assert list(result['regions']['pixels']) == [6 * (5 + i) for i in range(19, 14, -1)]
+
+
+class TestVisualTesterVerifyMany:
+    """Test parallel baseline verification"""
+
+    def test_verify_many(self, temp_dir):
+        """Test every item is verified once and a report is written"""
+        tester = VisualTester(temp_dir)
+        rng = np.random.default_rng(0)
+        images = {f"screen{i}": rng.integers(0, 255, (40, 60, 3), dtype=np.uint8) for i in range(6)}
+        for name, image in images.items():
+            tester.capture_baseline(name, image)
+        changed = images["screen3"].copy()
+        changed[:] = 0
+        items = [(name, image if name != "screen3" else changed) for name, image in images.items()]
+        items.append(("missing", images["screen0"]))
+
+        results = list(tester.verify_many(items, workers=3))
+
+        by_name = {result['name']: result for result in results}
+        assert sorted(by_name) == sorted(list(images) + ["missing"])
+        assert all(by_name[name]['match'] for name in images if name != "screen3")
+        assert not by_name["screen3"]['match']
+        assert by_name["missing"]['error'] is not None
+        report = (Path(temp_dir) / "verify_many_report.html").read_text()
+        assert "7 compared, 5 passed, 1 failed, 1 errors" in report
+        assert len((Path(temp_dir) / "verify_many.jsonl").read_text().splitlines()) == 7
+        images = sorted(path.name.split("_", 1)[1] for path in (Path(temp_dir) / "verify_many_images").iterdir())
+        assert images == ["screen3_diff.jpg", "screen3_thumbnail.jpg"]
+
+    def test_verify_many_lazy_items(self, temp_dir):
+        """Test items are consumed lazily and no report is written without a name"""
+        tester = VisualTester(temp_dir)
+        image = np.zeros((20, 20, 3), dtype=np.uint8)
+        tester.capture_baseline("blank", image)
+        consumed = []
+
+        def items():
+            for i in range(20):
+                consumed.append(i)
+                yield "blank", image
+
+        stream = tester.verify_many(items(), workers=2, report_name=None)
+        next(stream)
+
+        assert len(consumed) <= 8
+        assert len(list(stream)) == 19
+        assert not (Path(temp_dir) / "verify_many_report.html").exists()
+
+
+class TestVisualTesterBaselineCache:
+    """Test the bounded baseline cache of VisualTester"""
+
+    def test_cache_budget_and_stats(self, temp_dir):
+        """Test baselines beyond the budget are evicted and re-read from disk"""
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        writer = VisualTester(temp_dir)
+        for name in ("a", "b", "c"):
+            writer.capture_baseline(name, image)
+        tester = VisualTester(temp_dir, cache_bytes=2 * image.nbytes)
+
+        for name in ("a", "b", "c", "a"):
+            assert np.array_equal(tester.read_baseline(name), image)
+
+        stats = tester.cache_stats
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (0, 4, 2)
+        assert stats['bytes'] <= 2 * image.nbytes
+
+    def test_hash_index_tracks_captured_baselines(self, temp_dir):
+        """Test baselines captured after the index was built are found"""
+        rng = np.random.default_rng(8)
+        tester = VisualTester(temp_dir)
+        first = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        tester.capture_baseline("first", first)
+        assert tester.find_similar_baselines(first, max_distance=0) == [("first", 0)]
+
+        second = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        tester.capture_baseline("second", second)
+
+        assert tester.find_similar_baselines(second, max_distance=0) == [("second", 0)]
+        assert tester.is_unchanged("second.png", second)
+
+    def test_verify_tiers(self, temp_dir):
+        """Test verify reports which tier decided the result"""
+        rng = np.random.default_rng(9)
+        tester = VisualTester(temp_dir)
+        image = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        tester.capture_baseline("screen", image)
+        changed = image.copy()
+        changed[5:10, 5:10] = 0
+
+        assert tester.verify("screen", image.copy())['tier'] == 'hash'
+        assert tester.verify("screen", changed)['tier'] == 'full'
+        assert tester.verify("screen", image.copy(), tiered=False)['tier'] == 'full'
+        other = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        result = tester.verify("screen", other)
+        assert result['tier'] == 'full' and not result['match']
+
+    def test_hash_reject_only_with_hash_engine(self, temp_dir):
+        """Test the reject tier only decides when the hash engine could not pass"""
+        rng = np.random.default_rng(9)
+        image = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        other = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        tester = VisualTester(temp_dir, threshold=0.95, algorithm="hash")
+        tester.capture_baseline("screen", image)
+
+        result = tester.verify("screen", other)
+        assert result['tier'] == 'hash' and not result['match']
+        tester.set_similarity_threshold(0.1)
+        assert tester.verify("screen", other)['tier'] == 'full'
+        tester.set_algorithm("mae")
+        tester.set_similarity_threshold(0.95)
+        assert tester.verify("screen", other)['tier'] == 'full'
+
+    def test_baselines_in_store(self, temp_dir):
+        """Test baselines go to the store and PNG baselines are still readable"""
+        legacy = np.full((10, 10, 3), 7, dtype=np.uint8)
+        VisualTester(temp_dir).capture_baseline("legacy", legacy)
+        store = BaselineStore(Path(temp_dir) / "store")
+        tester = VisualTester(temp_dir, store=store)
+        image = np.full((10, 10, 3), 9, dtype=np.uint8)
+
+        tester.capture_baseline("fresh", image)
+
+        assert not (Path(temp_dir) / "fresh.png").exists()
+        assert "fresh" in store
+        assert np.array_equal(VisualTester(temp_dir, store=store).read_baseline("fresh"), image)
+        assert np.array_equal(tester.read_baseline("legacy"), legacy)
+
+    def test_hash_tier_covers_store_baselines(self, temp_dir):
+        """Test store baselines are decided by the hash tier and replacements are seen"""
+        rng = np.random.default_rng(10)
+        store = BaselineStore(Path(temp_dir) / "store", codec="png")
+        tester = VisualTester(temp_dir, store=store)
+        image = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        tester.capture_baseline("screen", image)
+        assert tester.verify("screen", image.copy())['tier'] == 'hash'
+        assert tester.hash_index.names() == ["screen"]
+
+        replaced = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        store.put("screen", replaced)
+        result = tester.verify("screen", image.copy())
+
+        assert result['tier'] == 'full' and not result['match']
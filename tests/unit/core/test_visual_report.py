@@ -0,0 +1,94 @@
+"""
+Tests for the streaming visual report
+"""
+import json
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import numpy as np
+import cv2
+
+from pyui_automation.core.visual_report import StreamingVisualReport
+from pyui_automation.utils.diff_regions import REGION_DTYPE
+
+
+def _result(name, match=True, error=None):
+    """Create a minimal comparison result"""
+    return {'name': name, 'match': match, 'similarity': 1.0 if match else 0.5, 'error': error}
+
+
+class TestStreamingVisualReport:
+    """Test StreamingVisualReport"""
+
+    def test_records_and_index(self, temp_dir):
+        """Test every result becomes a JSON line and the index lists failures first"""
+        with StreamingVisualReport(temp_dir, "suite") as report:
+            report.add(_result("ok"))
+            report.add(_result("broken", match=False))
+            report.add(_result("missing", match=False, error="Baseline image not found"))
+
+        lines = (Path(temp_dir) / "suite.jsonl").read_text().splitlines()
+        assert [json.loads(line)['name'] for line in lines] == ["ok", "broken", "missing"]
+        index = (Path(temp_dir) / "suite_report.html").read_text()
+        assert "3 compared, 1 passed, 1 failed, 1 errors" in index
+        assert index.index("broken") < index.index("ok</td>")
+
+    def test_failure_thumbnails(self, temp_dir):
+        """Test thumbnails of the current image and the difference are written"""
+        current = np.zeros((400, 800, 3), dtype=np.uint8)
+        baseline = current.copy()
+        baseline[100:200, 100:300] = 255
+        regions = np.array([(96, 96, 208, 112, 20000, 1)], dtype=REGION_DTYPE)
+        report = StreamingVisualReport(temp_dir, "suite", thumbnail_width=200)
+        report.add({**_result("dialogs/login", match=False), 'regions': regions}, current, baseline)
+        current[:] = 1  # the caller may reuse its buffers right away
+        report.close()
+
+        record = json.loads((Path(temp_dir) / "suite.jsonl").read_text())
+        assert record['regions'] == [[96, 96, 208, 112]]
+        assert record['thumbnail'] == "suite_images/000001_dialogs_login_thumbnail.jpg"
+        thumbnail = Path(temp_dir) / record['thumbnail']
+        assert thumbnail.exists() and (Path(temp_dir) / record['diff']).exists()
+        assert cv2.imread(str(thumbnail)).shape == (100, 200, 3)
+        assert cv2.imread(str(thumbnail)).max() < 10
+
+    def test_concurrent_add(self, temp_dir):
+        """Test results added from several threads are all written"""
+        report = StreamingVisualReport(temp_dir, "suite", queue_size=2)
+
+        def worker(offset):
+            for i in range(50):
+                report.add(_result(f"screen{offset + i}"))
+
+        threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report.close()
+
+        assert report.counts['compared'] == 200
+        assert len((Path(temp_dir) / "suite.jsonl").read_text().splitlines()) == 200
+
+    def test_add_after_close(self, temp_dir):
+        """Test a closed report rejects results"""
+        report = StreamingVisualReport(temp_dir)
+        assert report.close() == report.close()
+
+        with pytest.raises(RuntimeError):
+            report.add(_result("late"))
+
+    def test_writer_error_is_raised(self, temp_dir):
+        """Test a failing writer thread surfaces its error instead of blocking add() and close()"""
+        report = StreamingVisualReport(temp_dir, "suite", queue_size=1)
+        report._file.close()
+        report._file = MagicMock()
+        report._file.write.side_effect = OSError("No space left on device")
+
+        with pytest.raises(OSError):
+            for index in range(10):
+                report.add(_result(f"screen{index}"))
+        with pytest.raises(OSError):
+            report.close()
@@ -0,0 +1,158 @@
+"""
+Tests for cache requests and prefetched element properties
+"""
+from types import SimpleNamespace
+from typing import List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from pyui_automation.elements import BaseElement, CacheRequest
+from pyui_automation.elements.cache_request import read_properties
+from tests.unit.fake_tree import FakeBackend, UIANode
+
+
+def make_node(name: str, children: Optional[List[UIANode]] = None, enabled: bool = True) -> UIANode:
+    """UIA-style element with an id derived from its name and a fixed bounding rectangle"""
+    return UIANode(name, children=children, automation_id=f"{name}Id", enabled=enabled,
+                   bounds=SimpleNamespace(left=10, top=20, right=110, bottom=50))
+
+
+def make_tree() -> UIANode:
+    return make_node("root", [
+        make_node("ok"),
+        make_node("panel", [make_node("edit", enabled=False)]),
+        make_node("cancel"),
+    ])
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def session(backend):
+    session = Mock()
+    session.backend = backend
+    return session
+
+
+class TestCacheRequest:
+    def test_defaults_cover_all_properties(self):
+        request = CacheRequest()
+        assert 'name' in request.properties
+        assert request.scope == 'children'
+
+    def test_duplicates_are_removed(self):
+        assert CacheRequest(('name', 'name', 'is_enabled')).properties == ('name', 'is_enabled')
+
+    def test_unknown_property_raises(self):
+        with pytest.raises(ValueError):
+            CacheRequest(('name', 'value'))
+
+    def test_unknown_scope_raises(self):
+        with pytest.raises(ValueError):
+            CacheRequest(('name',), scope='descendants')
+
+    def test_with_scope(self):
+        request = CacheRequest(('name',))
+        assert request.with_scope('children') is request
+        assert request.with_scope('subtree') == CacheRequest(('name',), 'subtree')
+
+    def test_with_view(self):
+        request = CacheRequest(('name',), 'subtree')
+        assert request.view == 'control'
+        assert request.with_view('raw') == CacheRequest(('name',), 'subtree', 'raw')
+        assert request.with_view('raw').with_scope('children').view == 'raw'
+        with pytest.raises(ValueError):
+            request.with_view('content')
+
+
+class TestReadProperties:
+    def test_reads_only_requested_properties(self):
+        node = make_node("ok")
+        assert read_properties(node, ('name', 'automation_id')) == {'name': 'ok', 'automation_id': 'okId'}
+        assert node.reads.total() == 2
+
+    def test_rectangle_is_normalized(self):
+        values = read_properties(make_node("ok"), ('bounding_rectangle',))
+        assert values['bounding_rectangle'] == {'x': 10, 'y': 20, 'width': 100, 'height': 30}
+
+    def test_missing_property_is_none(self):
+        assert read_properties(make_node("ok"), ('class_name',)) == {'class_name': None}
+
+
+class TestPrefetch:
+    def test_scopes(self, backend):
+        root = make_tree()
+        request = CacheRequest(('name',))
+        assert [v['name'] for _, v in backend.prefetch(root, request.with_scope('element'))] == ['root']
+        assert [v['name'] for _, v in backend.prefetch(root, request)] == ['ok', 'panel', 'cancel']
+        subtree = backend.prefetch(root, request.with_scope('subtree'))
+        assert [v['name'] for _, v in subtree] == ['root', 'ok', 'panel', 'edit', 'cancel']
+
+
+class TestCachedElement:
+    def test_children_serve_cached_values(self, session, backend):
+        root = make_tree()
+        request = CacheRequest(('name', 'is_enabled', 'bounding_rectangle'))
+        children = BaseElement(root, session).get_children(request)
+        assert backend.prefetches == 1
+        reads = [child.native_element.reads.total() for child in children]
+        assert [child.get_cached('name') for child in children] == ['ok', 'panel', 'cancel']
+        assert all(child.get_cached('is_enabled') for child in children)
+        assert children[0].get_cached('bounding_rectangle') == {'x': 10, 'y': 20, 'width': 100, 'height': 30}
+        assert [child.native_element.reads.total() for child in children] == reads
+
+    def test_regular_accessors_read_live(self, session):
+        """Prefetched values never hide later changes from waits and state checks"""
+        root = make_tree()
+        children = BaseElement(root, session).get_children(CacheRequest(('name', 'is_enabled')))
+        root.children[0]._enabled = False
+        root.children[0]._name = "renamed"
+        assert not children[0].is_enabled()
+        assert children[0].name == "renamed"
+        assert children[0].get_cached('is_enabled') is True
+
+    def test_uncached_property_raises(self, session):
+        children = BaseElement(make_tree(), session).get_children(CacheRequest(('name',)))
+        with pytest.raises(KeyError):
+            children[0].get_cached('is_enabled')
+
+    def test_children_walk_the_raw_view(self, session, backend):
+        BaseElement(make_tree(), session).get_children(CacheRequest(('name',)))
+        assert backend.views == ['raw']
+
+    def test_uncached_properties_are_read_live(self, session):
+        children = BaseElement(make_tree(), session).get_children(CacheRequest(('name',)))
+        reads = children[0].native_element.reads.total()
+        assert children[0].automation_id == 'okId'
+        assert children[0].native_element.reads.total() > reads
+
+    def test_search_prefetches_searched_property(self, session, backend):
+        root = make_tree()
+        child = BaseElement(root, session).find_child_by_name("cancel")
+        assert child.native_element is root.children[2]
+        assert backend.prefetches == 1
+        assert [node.reads.total() for node in root.children] == [1, 1, 1]
+        assert child.cached_properties == {'name': 'cancel'}
+
+    def test_find_enabled_children(self, session):
+        panel = make_tree().children[1]
+        assert BaseElement(panel, session).find_enabled_children() == []
+
+    def test_found_children_poll_live_state(self, session):
+        root = make_tree()
+        enabled = BaseElement(root, session).find_enabled_children()
+        root.children[0]._enabled = False
+        assert not enabled[0].is_enabled()
+
+    def test_build_and_clear_cache(self, session):
+        node = make_node("ok", enabled=False)
+        element = BaseElement(node, session).build_cache(CacheRequest(('name', 'is_enabled')))
+        assert element.cached_properties == {'name': 'ok', 'is_enabled': False}
+        assert element.get_cached('name') == 'ok' and not element.get_cached('is_enabled')
+        assert node.reads.total() == 2
+        element.clear_cache()
+        assert element.cached_properties == {}
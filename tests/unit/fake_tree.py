@@ -0,0 +1,96 @@
+"""
+Fake accessibility trees shared by the locator and element tests
+"""
+from collections import Counter
+from typing import Any, List, Optional
+
+from pyui_automation.backends.base_backend import BaseBackend
+from pyui_automation.locators.snapshot import read_node_attributes
+
+
+class FakeNode:
+    """
+    Fake native element exposing the attribute names the generic readers probe.
+
+    Every property read is counted per node in ``reads`` and over all nodes in
+    ``FakeNode.total_reads``. Tests change a node through the underscored
+    attributes, which are not counted.
+    """
+
+    total_reads: Counter = Counter()
+
+    def __init__(self, name: str, role: Optional[str] = None, children: Optional[List["FakeNode"]] = None,
+                 automation_id: Optional[str] = None, class_name: Optional[str] = None,
+                 description: Optional[str] = None, enabled: bool = True, bounds: Any = None):
+        self._name = name
+        self._role = role
+        self._automation_id = automation_id
+        self._class_name = class_name
+        self._description = description
+        self._enabled = enabled
+        self._bounds = bounds
+        self.children = children or []
+        self.runtime_id: Optional[tuple] = None
+        self.reads: Counter = Counter()
+
+    def _read(self, prop: str, value: Any) -> Any:
+        self.reads[prop] += 1
+        FakeNode.total_reads[prop] += 1
+        return value
+
+    name = property(lambda self: self._read('name', self._name))
+    control_type = property(lambda self: self._read('control_type', self._role))
+    automation_id = property(lambda self: self._read('automation_id', self._automation_id))
+    class_name = property(lambda self: self._read('class_name', self._class_name))
+    description = property(lambda self: self._read('description', self._description))
+    is_enabled = property(lambda self: self._read('is_enabled', self._enabled))
+    bounding_rectangle = property(lambda self: self._read('bounding_rectangle', self._bounds))
+
+    def GetRuntimeId(self) -> Optional[tuple]:
+        return self.runtime_id
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._name})"
+
+
+class UIANode(FakeNode):
+    """Fake element that also exposes the UIA ``Current*`` properties, which element wrappers read first"""
+
+    CurrentName = property(lambda self: self._read('name', self._name))
+    CurrentAutomationId = property(lambda self: self._read('automation_id', self._automation_id))
+    CurrentIsEnabled = property(lambda self: self._read('is_enabled', self._enabled))
+    CurrentBoundingRectangle = property(lambda self: self._read('bounding_rectangle', self._bounds))
+
+
+class FakeBackend:
+    """Backend with the generic tree walk and prefetch, recording what it reads"""
+
+    logger = None
+    get_child_elements = BaseBackend.get_child_elements
+
+    def __init__(self, root: Optional[FakeNode] = None):
+        self.root = root
+        self.prefetches = 0
+        # Tree view of every prefetch and names of the nodes whose children were prefetched
+        self.views: List[str] = []
+        self.expanded: List[str] = []
+        self.live_searches = 0
+
+    def prefetch(self, element, request):
+        self.prefetches += 1
+        self.views.append(request.view)
+        if request.scope == 'children':
+            self.expanded.append(element._name)
+        return BaseBackend.prefetch(self, element, request)
+
+    def read_tree_node(self, element):
+        return read_node_attributes(element)
+
+    def _find_element_recursive(self, element, property_name, value):
+        self.live_searches += 1
+        return None
+
+
+def names(nodes) -> List[Optional[str]]:
+    """Names of nodes, without counting reads"""
+    return [node._name for node in nodes]
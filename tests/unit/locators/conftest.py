@@ -0,0 +1,18 @@
+"""
+Shared fixtures for the locator tests
+"""
+import pytest
+
+from tests.unit.fake_tree import FakeBackend, FakeNode
+
+
+@pytest.fixture
+def tree(request):
+    """Fresh tree from the test module's make_tree(), with read counts reset"""
+    FakeNode.total_reads.clear()
+    return request.module.make_tree()
+
+
+@pytest.fixture
+def backend(tree):
+    return FakeBackend(tree)
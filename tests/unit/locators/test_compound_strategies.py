@@ -0,0 +1,118 @@
+"""
+Tests for compound locator strategies evaluated in one traversal
+"""
+import pytest
+
+from pyui_automation.locators import (
+    ByAll, ByAny, ByAutomationId, ByChain, ByName, ByPath, ByRole, ByState, LinuxLocator, MacOSLocator
+)
+from tests.unit.fake_tree import FakeBackend, FakeNode, names
+
+
+def make_tree() -> FakeNode:
+    """
+    desktop
+      editor (frame)
+        toolbar (tool bar)
+          save (button)
+          ok (button, disabled)
+      dialog (frame, id=saveDialog)
+        body (panel)
+          ok (button)
+        cancel (button)
+    """
+    return FakeNode("desktop", "desktop frame", [
+        FakeNode("editor", "frame", [
+            FakeNode("toolbar", "tool bar", [
+                FakeNode("save", "button"),
+                FakeNode("ok", "button", enabled=False),
+            ]),
+        ]),
+        FakeNode("dialog", "frame", [
+            FakeNode("body", "panel", [FakeNode("ok", "button")]),
+            FakeNode("cancel", "button"),
+        ], automation_id="saveDialog"),
+    ])
+
+
+@pytest.fixture
+def locator(backend):
+    return LinuxLocator(backend)
+
+
+class TestCompoundStrategies:
+    """Test ByAll, ByAny and ByChain on the live tree"""
+
+    def test_values_describe_the_parts(self):
+        strategy = ByChain(ByName("dialog"), ByAll(ByRole("button"), ByState("enabled")))
+        assert strategy.value == "ByName('dialog') >> (ByRole('button') & ByState('enabled'))"
+
+    def test_invalid_compositions(self, locator):
+        with pytest.raises(ValueError):
+            ByChain(ByName("ok"))
+        with pytest.raises(ValueError):
+            locator.find_element(ByAll(ByName("ok"), ByPath("0:1")))
+        with pytest.raises(ValueError):
+            locator.find_element(ByAny(ByName("ok"), ByChain(ByName("a"), ByName("b"))))
+
+    def test_all(self, locator):
+        found = locator.find_elements(ByAll(ByName("ok"), ByRole("button"), ByState("enabled")))
+
+        assert len(found) == 1 and found[0] is locator.backend.root.children[1].children[0].children[0]
+        assert names(locator.find_elements(ByAll(ByRole("button"), ByState("disabled")))) == ["ok"]
+
+    def test_any(self, locator):
+        found = locator.find_elements(ByAny(ByName("cancel"), ByName("save"), ByAutomationId("saveDialog")))
+
+        assert names(found) == ["save", "dialog", "cancel"]
+
+    def test_chain(self, locator, tree):
+        found = locator.find_elements(ByChain(ByRole("frame"), ByName("body"), ByName("ok")))
+        assert found == [tree.children[1].children[0].children[0]]
+        assert names(locator.find_elements(ByChain(ByName("editor"), ByRole("button")))) == ["save", "ok"]
+        assert locator.find_elements(ByChain(ByName("body"), ByName("cancel"))) == []
+
+    def test_single_traversal(self, locator):
+        locator.find_elements(ByAll(ByName("ok"), ByRole("button"), ByState("enabled")))
+
+        # One prefetch per expanded node: desktop and the 8 nodes below it
+        reads = FakeNode.total_reads
+        assert locator.backend.prefetches - reads['control_type'] - reads['is_enabled'] == 9
+
+    def test_cheapest_check_short_circuits(self, locator):
+        locator.find_elements(ByAll(ByState("enabled"), ByRole("button"), ByName("ok")))
+
+        assert FakeNode.total_reads['name'] == 8
+        assert FakeNode.total_reads['control_type'] == 2
+        assert FakeNode.total_reads['is_enabled'] == 2
+
+    def test_scoped_bfs_first_match(self, locator, tree):
+        dialog = tree.children[1]
+        found = locator.find_element(ByAny(ByName("ok"), ByName("cancel")).within(dialog, order='bfs'))
+
+        assert found is dialog.children[1]
+
+    def test_other_locators(self, tree):
+        assert names(MacOSLocator(FakeBackend(tree)).find_elements(ByAll(ByName("ok"), ByState("disabled")))) == ["ok"]
+
+
+class TestCompoundSnapshot:
+    """Test compound strategies answered from a snapshot"""
+
+    def test_snapshot_answers_without_reading_the_tree(self, locator, tree):
+        locator.snapshot()
+        FakeNode.total_reads.clear()
+        locator.backend.prefetches = 0
+
+        found = locator.find_elements(ByChain(ByName("dialog"), ByAll(ByRole("button"), ByName("ok"))))
+
+        assert found == [tree.children[1].children[0].children[0]]
+        assert locator.backend.prefetches == 0
+        assert names(locator.find_elements(ByAny(ByName("save"), ByName("cancel")))) == ["save", "cancel"]
+
+    def test_state_is_read_live_for_candidates(self, locator):
+        locator.snapshot()
+        locator.backend.prefetches = 0
+
+        assert names(locator.find_elements(ByAll(ByName("ok"), ByState("disabled")))) == ["ok"]
+        assert locator.backend.prefetches == 2
@@ -0,0 +1,131 @@
+"""
+Tests for scoped, depth-limited and breadth-first locator searches
+"""
+import pytest
+
+from pyui_automation.locators import ByName, ByRole, ByState, LinuxLocator, SearchScope, WindowsLocator
+from tests.unit.fake_tree import FakeNode
+
+
+def make_tree() -> FakeNode:
+    """
+    desktop
+      editor (frame)
+        toolbar
+          save (button)
+          ok (button)
+      dialog (frame)
+        body
+          content
+            ok (button)
+        ok (button)
+    """
+    return FakeNode("desktop", "desktop frame", [
+        FakeNode("editor", "frame", [
+            FakeNode("toolbar", "tool bar", [FakeNode("save", "button"), FakeNode("ok", "button")]),
+        ]),
+        FakeNode("dialog", "frame", [
+            FakeNode("body", "panel", [FakeNode("content", "panel", [FakeNode("ok", "button")])]),
+            FakeNode("ok", "button"),
+        ]),
+    ])
+
+
+def path(node: FakeNode, tree: FakeNode) -> str:
+    """Names from the root to a node"""
+    def walk(current, trail):
+        if current is node:
+            return trail
+        for child in current.children:
+            found = walk(child, trail + [child.name])
+            if found:
+                return found
+        return None
+    return "/".join(walk(tree, []))
+
+
+class TestSearchScope:
+    """Test scoped searches on the live tree"""
+
+    def test_scope_validation(self):
+        with pytest.raises(ValueError):
+            SearchScope(order='random')
+        with pytest.raises(ValueError):
+            SearchScope(max_depth=0)
+
+    def test_within_copies_the_strategy(self):
+        strategy = ByName("ok")
+        scoped = strategy.within(max_depth=2)
+        assert strategy.scope is None
+        assert scoped.value == "ok" and scoped.scope == SearchScope(max_depth=2)
+
+    def test_only_the_scope_subtree_is_read(self, tree, backend):
+        dialog = tree.children[1]
+        found = LinuxLocator(backend).find_element(ByName("ok").within(dialog))
+
+        assert path(found, tree) == "dialog/body/content/ok"
+        assert "editor" not in backend.expanded and "toolbar" not in backend.expanded
+
+    def test_breadth_first_finds_nearest_match(self, tree, backend):
+        dialog = tree.children[1]
+        found = LinuxLocator(backend).find_element(ByName("ok").within(dialog, order='bfs'))
+
+        assert path(found, tree) == "dialog/ok"
+        assert backend.expanded == ["dialog"]
+
+    def test_max_depth(self, tree, backend):
+        locator = WindowsLocator(backend)
+        dialog = tree.children[1]
+
+        assert [path(n, tree) for n in locator.find_elements(ByName("ok").within(dialog, max_depth=2))] == ["dialog/ok"]
+        assert locator.find_element(ByName("ok").within(max_depth=1)) is None
+
+    def test_find_elements_in_document_order_and_limit(self, tree, backend):
+        locator = LinuxLocator(backend)
+
+        assert [path(n, tree) for n in locator.find_elements(ByName("ok").within())] == [
+            "editor/toolbar/ok", "dialog/body/content/ok", "dialog/ok"
+        ]
+        assert len(locator.find_elements(ByRole("button").within(max_results=2))) == 2
+
+    def test_element_wrappers_are_accepted_as_root(self, tree, backend, mocker):
+        wrapper = mocker.Mock(native_element=tree.children[0])
+        found = LinuxLocator(backend).find_element(ByName("ok").within(wrapper))
+
+        assert path(found, tree) == "editor/toolbar/ok"
+
+    def test_node_limit_is_logged(self, backend, mocker):
+        mocker.patch("pyui_automation.locators.base.DEFAULT_MAX_NODES", 2)
+        backend.logger = mocker.Mock()
+        locator = LinuxLocator(backend)
+
+        assert locator.find_element(ByName("ok").within()) is None
+        backend.logger.warning.assert_called_once()
+
+    def test_unscoped_strategies_search_live(self, backend):
+        locator = LinuxLocator(backend)
+
+        assert locator.find_element(ByState("focused").within(max_depth=1)) is None
+        assert backend.live_searches == 1
+
+
+class TestSnapshotScope:
+    """Test scoped searches answered from a snapshot"""
+
+    def test_scope_restricts_snapshot_matches(self, tree, backend):
+        locator = LinuxLocator(backend)
+        locator.snapshot()
+        dialog = tree.children[1]
+
+        assert path(locator.find_element(ByName("ok").within(dialog)), tree) == "dialog/body/content/ok"
+        assert path(locator.find_element(ByName("ok").within(dialog, order='bfs')), tree) == "dialog/ok"
+        assert locator.find_elements(ByName("ok").within(tree.children[0], max_depth=1)) == []
+        assert backend.expanded == []
+
+    def test_root_outside_snapshot_walks_live(self, tree, backend):
+        locator = LinuxLocator(backend)
+        locator.snapshot(root=tree.children[0])
+        dialog = tree.children[1]
+
+        assert path(locator.find_element(ByName("ok").within(dialog, order='bfs')), tree) == "dialog/ok"
+        assert backend.expanded == ["dialog"]
@@ -0,0 +1,227 @@
+"""
+Tests for accessibility tree snapshots and snapshot-backed locator queries
+"""
+from pyui_automation.locators import ByClassName, ByName, ByRole, ByState, LinuxLocator, TreeSnapshot
+from pyui_automation.locators.snapshot import node_key
+from tests.unit.fake_tree import FakeNode
+
+
+def reader(node: FakeNode):
+    return {
+        'name': node.name,
+        'role': node.control_type,
+        'automation_id': node.automation_id,
+        'class_name': node.class_name,
+        'description': node.description,
+    }, node.children
+
+
+def make_tree() -> FakeNode:
+    """
+    desktop
+      app (frame)
+        ok (button, id=okButton)
+        panel
+          ok (button, class=QPushButton)
+          edit (text)
+      other (frame)
+    """
+    return FakeNode("desktop", "desktop frame", [
+        FakeNode("app", "frame", [
+            FakeNode("ok", "button", automation_id="okButton"),
+            FakeNode("panel", "panel", [
+                FakeNode("ok", "button", class_name="QPushButton"),
+                FakeNode("edit", "text"),
+            ]),
+        ]),
+        FakeNode("other", "frame"),
+    ])
+
+
+class TestTreeSnapshot:
+    """Test TreeSnapshot class"""
+
+    def test_structure_in_document_order(self):
+        """Test nodes are numbered in preorder with parents, depths and subtree ends"""
+        snapshot = TreeSnapshot(make_tree(), reader)
+
+        assert len(snapshot) == 7
+        assert snapshot.column('name') == ["desktop", "app", "ok", "panel", "ok", "edit", "other"]
+        assert snapshot.parents.tolist() == [-1, 0, 1, 1, 3, 3, 0]
+        assert snapshot.depths.tolist() == [0, 1, 2, 2, 3, 3, 1]
+        assert list(snapshot.subtree(1)) == [1, 2, 3, 4, 5]
+        assert snapshot.children_of(0).tolist() == [1, 6]
+        assert snapshot.children_of(3).tolist() == [4, 5]
+        assert snapshot.parent_of(4) == 3
+
+    def test_indexed_lookups(self):
+        """Test hash index lookups on name, role, automation id and class"""
+        snapshot = TreeSnapshot(make_tree(), reader)
+
+        assert snapshot.find('name', 'ok').tolist() == [2, 4]
+        assert snapshot.find('role', 'frame').tolist() == [1, 6]
+        assert snapshot.find_first('automation_id', 'okButton') == 2
+        assert snapshot.find_first('class_name', 'QPushButton') == 4
+        assert snapshot.find('name', 'missing').size == 0
+        assert snapshot.find('description', 'none').size == 0
+        assert snapshot.element(5).name == "edit"
+        assert sorted(snapshot.values('role')) == ["button", "desktop frame", "frame", "panel", "text"]
+
+    def test_queries_do_not_read_the_tree(self):
+        """Test every node is read once per capture and queries read nothing"""
+        FakeNode.total_reads.clear()
+        snapshot = TreeSnapshot(make_tree(), reader)
+        for _ in range(10):
+            snapshot.find('name', 'edit')
+
+        assert FakeNode.total_reads['name'] == 7
+        snapshot.refresh()
+        assert FakeNode.total_reads['name'] == 14
+
+    def test_max_depth_and_max_nodes(self):
+        """Test the walk stops at max_depth and max_nodes"""
+        assert snapshot_names(TreeSnapshot(make_tree(), reader, max_depth=1)) == ["desktop", "app", "other"]
+        truncated = TreeSnapshot(make_tree(), reader, max_nodes=3)
+        assert truncated.truncated
+        assert snapshot_names(truncated) == ["desktop", "app", "ok"]
+        assert truncated.ends.tolist() == [3, 3, 3]
+
+    def test_reader_errors_keep_the_node(self):
+        """Test a node whose properties cannot be read is kept without children"""
+        def failing(node: FakeNode):
+            if node.name == "panel":
+                raise RuntimeError("stale accessible")
+            return reader(node)
+
+        snapshot = TreeSnapshot(make_tree(), failing)
+
+        assert snapshot.errors == 1
+        assert snapshot.get(3, 'name') is None
+        assert snapshot_names(snapshot) == ["desktop", "app", "ok", None, "other"]
+
+    def test_staleness(self, mocker):
+        """Test snapshots become stale with age or invalidation"""
+        clock = mocker.patch("pyui_automation.locators.snapshot.time.monotonic", return_value=10.0)
+        snapshot = TreeSnapshot(make_tree(), reader, max_age=1.0)
+
+        assert not snapshot.is_stale()
+        clock.return_value = 11.5
+        assert snapshot.is_stale()
+        assert not snapshot.is_stale(max_age=5.0)
+        snapshot.refresh()
+        assert not snapshot.is_stale()
+        snapshot.invalidate()
+        assert snapshot.is_stale()
+
+    def test_index_of_separate_wrapper(self):
+        """Test elements are found by runtime id, not by wrapper identity"""
+        tree = make_tree()
+        snapshot = TreeSnapshot(with_runtime_ids(make_tree()), reader)
+
+        assert snapshot.index_of(with_runtime_ids(make_tree()).children[0].children[1]) == 3
+        assert snapshot.index_of(snapshot.element(5)) == 5
+        assert snapshot.index_of(tree) is None
+        assert TreeSnapshot(tree, reader).index_of(tree.children[1]) == 6
+
+    def test_generic_reader(self):
+        """Test the default reader probes common attribute names"""
+        snapshot = TreeSnapshot(make_tree())
+
+        assert snapshot.find('automation_id', 'okButton').tolist() == [2]
+        assert len(snapshot) == 7
+
+
+def with_runtime_ids(root: FakeNode) -> FakeNode:
+    """Number the nodes in document order, as UIA runtime ids of one tree"""
+    stack = [root]
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        node.runtime_id = (42, count)
+        stack.extend(reversed(node.children))
+    return root
+
+
+def snapshot_names(snapshot: TreeSnapshot) -> list:
+    return snapshot.column('name')
+
+
+class TestLocatorSnapshot:
+    """Test locator queries answered from a snapshot"""
+
+    def _locator(self, mocker):
+        backend = mocker.Mock()
+        backend.root = make_tree()
+        backend.read_tree_node.side_effect = reader
+        backend._find_element_recursive.return_value = "live"
+        return LinuxLocator(backend), backend
+
+    def test_supported_strategies_use_snapshot(self, mocker):
+        """Test indexed strategies are answered without walking the live tree"""
+        locator, backend = self._locator(mocker)
+        snapshot = locator.snapshot()
+
+        assert locator.find_element(ByName("edit")).name == "edit"
+        assert [node.control_type for node in locator.find_elements(ByRole("button"))] == ["button", "button"]
+        assert locator.find_element(ByClassName("QPushButton")) is snapshot.element(4)
+        assert locator.find_element(ByName("missing")) is None
+        backend._find_element_recursive.assert_not_called()
+
+    def test_scope_root_obtained_separately(self, mocker):
+        """Test a scope root wrapper obtained again is found in the snapshot"""
+        locator, backend = self._locator(mocker)
+        with_runtime_ids(backend.root)
+        backend.tree_node_key.side_effect = node_key
+        snapshot = locator.snapshot()
+        reads = FakeNode.total_reads.total()
+        panel = with_runtime_ids(make_tree()).children[0].children[1]
+
+        assert locator.find_element(ByName("ok").within(panel)) is snapshot.element(4)
+        assert FakeNode.total_reads.total() == reads
+
+    def test_other_strategies_use_live_tree(self, mocker):
+        """Test strategies without a snapshot column still query the backend"""
+        locator, backend = self._locator(mocker)
+        locator.snapshot()
+
+        assert locator.find_element(ByState("focused")) == "live"
+        locator.clear_snapshot()
+        assert locator.find_element(ByName("edit")) == "live"
+
+    def test_stale_snapshot_is_refreshed(self, mocker):
+        """Test an invalidated snapshot is re-read before the next query"""
+        locator, backend = self._locator(mocker)
+        snapshot = locator.snapshot()
+        backend.root.children[0].children.append(FakeNode("late", "dialog"))
+
+        assert locator.find_element(ByName("late")) is None
+        snapshot.invalidate()
+        assert locator.find_element(ByName("late")).control_type == "dialog"
+        assert snapshot.find('name', 'late').tolist() == [6]
+
+    def test_partial_snapshot_misses_search_live(self, mocker):
+        """Test rooted, depth-limited and truncated snapshots do not answer unscoped misses"""
+        locator, backend = self._locator(mocker)
+        backend.tree_node_key.side_effect = node_key
+
+        for options in ({'root': backend.root.children[0]}, {'max_depth': 1}):
+            locator.snapshot(**options)
+            assert locator.find_element(ByName("edit")) == "live"
+        locator.snapshot().max_nodes = 3
+        locator.current_snapshot.refresh()
+        assert locator.current_snapshot.truncated
+        assert locator.find_element(ByName("edit")) == "live"
+
+    def test_wait_polls_live_tree(self, mocker):
+        """Test a wait polls the live tree after a snapshot miss and refreshes the snapshot once"""
+        locator, backend = self._locator(mocker)
+        backend.tree_node_key.side_effect = node_key
+        snapshot = locator.snapshot()
+        backend._find_element_recursive.side_effect = [None, None, "live"]
+        refresh = mocker.spy(snapshot, "refresh")
+        mocker.patch("pyui_automation.locators.base.time.sleep")
+
+        assert locator.find_element_with_timeout(ByName("late"), timeout=5.0) == "live"
+        assert backend._find_element_recursive.call_count == 3
+        assert refresh.call_count == 1
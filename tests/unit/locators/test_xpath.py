@@ -0,0 +1,185 @@
+"""
+Tests for the XPath engine on snapshots and the live tree
+"""
+import pytest
+
+from pyui_automation.locators import (
+    ByXPath, LinuxLocator, MacOSLocator, WindowsLocator, XPathError, compile_xpath
+)
+from pyui_automation.locators.snapshot import TreeSnapshot, read_node_attributes
+from pyui_automation.locators.xpath import LiveView, SnapshotView
+from tests.unit.fake_tree import FakeBackend, FakeNode, names
+
+
+def make_tree() -> FakeNode:
+    """
+    desktop
+      editor (frame, class=EditorWindow)
+        toolbar (tool bar)
+          save (push button, id=saveButton)
+          ok (push button)
+      dialog (frame, id=saveDialog)
+        body (panel)
+          ok (push button)
+          file name (text)
+        cancel (push button)
+    """
+    return FakeNode("desktop", "desktop frame", [
+        FakeNode("editor", "frame", [
+            FakeNode("toolbar", "tool bar", [
+                FakeNode("save", "push button", automation_id="saveButton"),
+                FakeNode("ok", "push button"),
+            ]),
+        ], class_name="EditorWindow"),
+        FakeNode("dialog", "frame", [
+            FakeNode("body", "panel", [FakeNode("ok", "push button"), FakeNode("file name", "text")]),
+            FakeNode("cancel", "push button"),
+        ], automation_id="saveDialog"),
+    ])
+
+
+QUERIES = [
+    ("//PushButton", ["save", "ok", "ok", "cancel"]),
+    ("//push_button[@Name='ok']", ["ok", "ok"]),
+    ("/Frame", ["editor", "dialog"]),
+    ("/frame/*", ["toolbar", "body", "cancel"]),
+    ("/*/*/*[2]", ["ok", "file name"]),
+    ("//*[@AutomationId='saveDialog']//PushButton", ["ok", "cancel"]),
+    ("//Frame[@ClassName='EditorWindow']//*[last()]", ["toolbar", "ok"]),
+    ("//PushButton[last()]", ["ok", "ok", "cancel"]),
+    ("//PushButton[contains(@Name, 'a')]", ["save", "cancel"]),
+    ("//*[starts-with(@Name, 'file') or ends-with(text(), 'bar')]", ["toolbar", "file name"]),
+    ("//Frame[not(@AutomationId)]", ["editor"]),
+    ("//PushButton[@Name != 'ok'][position() = 2]", []),
+    ("//Panel/PushButton[1]", ["ok"]),
+    ("//Text/../PushButton", ["ok"]),
+    ("//ToolBar/child::*[@id='saveButton'] | //Panel/self::*", ["save", "body"]),
+    ("//Dialog", []),
+    ("//*/..", ["editor", "toolbar", "dialog", "body"]),
+    ("/descendant-or-self::*[1]", ["editor"]),
+    ("/.", []),
+]
+
+
+class TestCompile:
+    """Test parsing and the compile cache"""
+
+    def test_compiled_queries_are_reused(self):
+        assert compile_xpath("//Button[@Name='ok']") is compile_xpath("//Button[@Name='ok']")
+
+    def test_properties_read_by_the_query(self):
+        assert compile_xpath("//Button[@Name='ok' and @id='x']").properties == ('automation_id', 'name', 'role')
+
+    @pytest.mark.parametrize("expression", [
+        "", "//", "//Button[", "//Button[@Name='ok'", "//Button[@Value='1']", "following::Button",
+        "//Button[count(.)]", "//Button[contains(@Name)]", "//Button]", "//Button#",
+    ])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(XPathError):
+            compile_xpath(expression)
+
+    def test_error_is_a_value_error(self):
+        assert issubclass(XPathError, ValueError)
+
+
+class TestEvaluation:
+    """Test the same queries on a snapshot and on the live tree"""
+
+    @pytest.mark.parametrize("expression,expected", QUERIES)
+    def test_snapshot_and_live_agree(self, tree, backend, expression, expected):
+        query = compile_xpath(expression)
+        snapshot = TreeSnapshot(tree, read_node_attributes)
+
+        assert names(query.evaluate(SnapshotView(snapshot))) == expected
+        assert names(query.evaluate(LiveView(backend, tree, query.properties))) == expected
+
+    def test_root_is_not_selected(self, tree):
+        snapshot = TreeSnapshot(tree, read_node_attributes)
+
+        assert compile_xpath("//DesktopFrame").evaluate(SnapshotView(snapshot)) == []
+        assert compile_xpath("/..").evaluate(SnapshotView(snapshot)) == []
+
+    def test_snapshot_view_below_a_node(self, tree):
+        snapshot = TreeSnapshot(tree, read_node_attributes)
+        view = SnapshotView(snapshot, snapshot.index_of(tree.children[1]))
+
+        assert names(compile_xpath("//PushButton").evaluate(view)) == ["ok", "cancel"]
+        assert names(compile_xpath("/*").evaluate(view)) == ["body", "cancel"]
+
+    def test_empty_literal_matches_empty_values(self):
+        """Test @Name='' is not answered from the value index, which leaves out empty values"""
+        tree = FakeNode("desktop", "desktop frame", [FakeNode("", "separator"), FakeNode("ok", "push button")])
+        query = compile_xpath("//*[@Name='']")
+
+        assert names(query.evaluate(SnapshotView(TreeSnapshot(tree, read_node_attributes)))) == [""]
+        assert names(query.evaluate(LiveView(FakeBackend(tree), tree, query.properties))) == [""]
+
+    def test_generic_readers_probe_the_same_role(self):
+        """Test a node exposing only a role attribute has that role on the snapshot and live"""
+        tree = FakeNode("desktop", "desktop frame", [FakeNode("ok", None), FakeNode("cancel", None)])
+        tree.children[0].role = "push button"
+        query = compile_xpath("//PushButton")
+
+        assert names(query.evaluate(SnapshotView(TreeSnapshot(tree, read_node_attributes)))) == ["ok"]
+        assert names(query.evaluate(LiveView(FakeBackend(tree), tree, query.properties))) == ["ok"]
+
+    def test_limit(self, tree, backend):
+        query = compile_xpath("//PushButton | //Frame")
+
+        assert names(query.evaluate(LiveView(backend, tree, query.properties), limit=3)) == ["editor", "save", "ok"]
+
+
+class TestLazyExpansion:
+    """Test that the live tree is only read as far as the query needs"""
+
+    def test_first_match_stops_reading(self, tree, backend):
+        query = compile_xpath("//PushButton[@Name='save']")
+
+        assert names(query.evaluate(LiveView(backend, tree, query.properties), limit=1)) == ["save"]
+        assert backend.expanded == ["desktop", "editor", "toolbar"]
+
+    def test_intermediate_steps_are_streamed(self, tree, backend):
+        query = compile_xpath("//Frame//PushButton")
+
+        assert names(query.evaluate(LiveView(backend, tree, query.properties), limit=1)) == ["save"]
+        assert backend.expanded == ["desktop", "editor", "toolbar"]
+
+    def test_child_steps_expand_only_matching_branches(self, tree, backend):
+        query = compile_xpath("/Frame[@AutomationId='saveDialog']/Panel/*")
+
+        assert names(query.evaluate(LiveView(backend, tree, query.properties))) == ["ok", "file name"]
+        assert backend.expanded == ["desktop", "dialog", "body"]
+
+    def test_max_nodes(self, tree, backend):
+        view = LiveView(backend, tree, ('name',), max_nodes=1)
+
+        assert names(compile_xpath("//*").evaluate(view)) == ["editor", "dialog"]
+
+
+class TestLocators:
+    """Test ByXPath through the locators"""
+
+    @pytest.mark.parametrize("locator_class", [WindowsLocator, LinuxLocator, MacOSLocator])
+    def test_every_locator_evaluates_xpath(self, tree, backend, locator_class):
+        locator = locator_class(backend)
+
+        assert locator.find_element(ByXPath("//PushButton[@Name='ok']")) is tree.children[0].children[0].children[1]
+        assert names(locator.find_elements(ByXPath("//Frame/*"))) == ["toolbar", "body", "cancel"]
+        with pytest.raises(XPathError):
+            locator.find_element(ByXPath("//Button["))
+
+    def test_snapshot_answers_without_reading_the_tree(self, tree, backend):
+        locator = LinuxLocator(backend)
+        locator.snapshot()
+
+        assert names(locator.find_elements(ByXPath("//Panel/PushButton | //ToolBar/*[1]"))) == ["save", "ok"]
+        assert backend.expanded == []
+
+    def test_scope_root_is_the_document_node(self, tree, backend):
+        locator = LinuxLocator(backend)
+        dialog = tree.children[1]
+
+        assert names(locator.find_elements(ByXPath("/*").within(dialog))) == ["body", "cancel"]
+        assert backend.expanded == ["dialog"]
+        assert len(locator.find_elements(ByXPath("//*").within(max_results=2))) == 2
+        assert names(locator.find_elements(ByXPath("//*/..").within(dialog))) == ["body"]
@@ -0,0 +1,208 @@
+"""
+Tests for the frame grabber and its use by the screenshot service
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pyui_automation.core.services.frame_grabber import FrameGrabber
+from pyui_automation.core.services.screenshot_service import ScreenshotService
+
+
+class _Screen:
+    """Fake capture function returning numbered frames"""
+
+    def __init__(self, shape=(20, 30, 3)):
+        self.shape = shape
+        self.calls = 0
+
+    def __call__(self) -> np.ndarray:
+        self.calls += 1
+        return np.full(self.shape, self.calls % 256, dtype=np.uint8)
+
+
+def _fill(grabber: FrameGrabber, screen: _Screen, count: int) -> None:
+    """Store frames synchronously with increasing timestamps"""
+    for index in range(count):
+        grabber._store(screen(), index + 0.5, float(index + 1))
+
+
+class TestFrameGrabber:
+    """Test FrameGrabber class"""
+
+    def test_latest_frame(self):
+        """Test the newest frame is returned as a copy by default"""
+        grabber = FrameGrabber(_Screen(), ring_size=4)
+        assert grabber.latest_frame() is None
+
+        _fill(grabber, _Screen(), 3)
+        frame = grabber.latest_frame()
+
+        assert frame.seq == 3
+        assert frame.timestamp == 3.0
+        assert frame.started == 2.5
+        assert (frame.image == 3).all()
+        frame.image[:] = 0
+        assert (grabber.latest_frame(copy=False).image == 3).all()
+
+    def test_ring_is_bounded(self):
+        """Test old frames are overwritten and memory stays at ring_size frames"""
+        screen = _Screen()
+        grabber = FrameGrabber(screen, ring_size=4)
+        _fill(grabber, screen, 10)
+
+        frames = grabber.frames_since(0)
+
+        assert [frame.seq for frame in frames] == [7, 8, 9, 10]
+        assert [int(frame.image[0, 0, 0]) for frame in frames] == [7, 8, 9, 10]
+        assert grabber.memory_bytes == 4 * 20 * 30 * 3
+        assert [frame.seq for frame in grabber.frames_since(8)] == [9, 10]
+
+    def test_frame_at(self):
+        """Test lookup of the frame visible at a moment"""
+        screen = _Screen()
+        grabber = FrameGrabber(screen, ring_size=4)
+        _fill(grabber, screen, 6)
+
+        assert grabber.frame_at(4.5).seq == 4
+        assert grabber.frame_at(100.0).seq == 6
+        # Frames 1 and 2 were overwritten
+        assert grabber.frame_at(2.5) is None
+
+    def test_resolution_change_reallocates(self):
+        """Test a new frame size replaces the ring"""
+        screen = _Screen()
+        grabber = FrameGrabber(screen, ring_size=4)
+        _fill(grabber, screen, 3)
+        screen.shape = (10, 10, 3)
+        _fill(grabber, screen, 1)
+
+        assert [frame.seq for frame in grabber.frames_since(0)] == [4]
+        assert grabber.memory_bytes == 4 * 10 * 10 * 3
+
+    def test_no_frame_while_ring_is_reallocated(self, monkeypatch):
+        """Test readers get no frame between a resize and the first frame of the new size"""
+        screen = _Screen()
+        grabber = FrameGrabber(screen, ring_size=4)
+        _fill(grabber, screen, 3)
+        seen = []
+
+        def copyto(buffer, image):
+            seen.append((grabber.latest_frame(), grabber.wait_for_frame(0, timeout=0)))
+            buffer[...] = image
+
+        monkeypatch.setattr("pyui_automation.core.services.frame_grabber.np.copyto", copyto)
+        screen.shape = (10, 10, 3)
+        _fill(grabber, screen, 1)
+
+        assert seen == [(None, None)]
+        assert grabber.latest_frame().image.shape == (10, 10, 3)
+
+    def test_invalid_arguments(self):
+        """Test fps and ring size are validated"""
+        with pytest.raises(ValueError):
+            FrameGrabber(_Screen(), fps=0)
+        with pytest.raises(ValueError):
+            FrameGrabber(_Screen(), ring_size=1)
+
+    def test_background_capture(self):
+        """Test the thread captures frames until stopped"""
+        screen = _Screen()
+        with FrameGrabber(screen, fps=200) as grabber:
+            first = grabber.wait_for_frame(0, timeout=2.0)
+            assert first is not None
+            second = grabber.wait_for_frame(first.seq, timeout=2.0)
+            assert second.seq > first.seq
+            assert grabber.running
+        assert not grabber.running
+        seq = grabber.seq
+        time.sleep(0.02)
+        assert grabber.seq == seq
+        assert grabber.wait_for_frame(seq, timeout=0.01) is None
+
+    def test_capture_errors_are_counted(self):
+        """Test a failing capture does not stop the loop"""
+        def capture():
+            raise RuntimeError("no display")
+
+        with FrameGrabber(capture, fps=200) as grabber:
+            deadline = time.monotonic() + 2.0
+            while grabber.errors < 2 and time.monotonic() < deadline:
+                time.sleep(0.005)
+        assert grabber.errors >= 2
+        assert grabber.latest_frame() is None
+
+
+class TestScreenshotServiceGrabber:
+    """Test ScreenshotService captures served by the frame grabber"""
+
+    def _service(self, mocker):
+        backend = mocker.Mock()
+        screen = np.arange(20 * 30 * 3, dtype=np.uint8).reshape(20, 30, 3)
+        backend.capture_screenshot.return_value = screen
+        backend.capture_screen_region.return_value = np.zeros((2, 2, 3), dtype=np.uint8)
+        return ScreenshotService(backend, mocker.Mock(), cache_ttl=0), backend, screen
+
+    def test_captures_without_grabber_use_backend(self, mocker):
+        """Test the backend is used when no grabber runs"""
+        service, backend, screen = self._service(mocker)
+
+        np.testing.assert_array_equal(service.take_screenshot(), screen)
+        service.capture_screen_region(1, 2, 2, 2)
+
+        backend.capture_screen_region.assert_called_once_with(1, 2, 2, 2)
+        assert service.frame_grabber is None
+
+    def test_regions_are_sliced_from_grabbed_frame(self, mocker):
+        """Test regions inside the frame come from the grabber"""
+        service, backend, screen = self._service(mocker)
+        service.start_frame_grabber(fps=200)
+        try:
+            region = service.capture_screen_region(5, 3, 4, 2)
+            screenshot = service.take_screenshot()
+        finally:
+            service.stop_frame_grabber()
+
+        np.testing.assert_array_equal(region, screen[3:5, 5:9])
+        np.testing.assert_array_equal(screenshot, screen)
+        backend.capture_screen_region.assert_not_called()
+        assert service.frame_grabber is None
+
+    def test_frame_started_before_invalidation_is_not_served(self, mocker):
+        """Test a frame whose capture was under way at invalidation is skipped"""
+        service, backend, _ = self._service(mocker)
+        capturing, release = threading.Event(), threading.Event()
+        before = np.zeros((20, 30, 3), dtype=np.uint8)
+        after = np.ones((20, 30, 3), dtype=np.uint8)
+
+        def capture():
+            if not capturing.is_set():
+                capturing.set()
+                release.wait(2.0)
+                return before
+            return after
+
+        backend.capture_screenshot.side_effect = capture
+        service.start_frame_grabber(fps=200)
+        try:
+            assert capturing.wait(2.0)
+            service.invalidate_cache()
+            release.set()
+            screenshot = service.take_screenshot()
+        finally:
+            service.stop_frame_grabber()
+
+        np.testing.assert_array_equal(screenshot, after)
+
+    def test_region_outside_frame_uses_backend(self, mocker):
+        """Test regions not covered by the frame fall back to the backend"""
+        service, backend, _ = self._service(mocker)
+        service.start_frame_grabber(fps=200)
+        try:
+            service.capture_screen_region(25, 0, 10, 10)
+        finally:
+            service.stop_frame_grabber()
+
+        backend.capture_screen_region.assert_called_once_with(25, 0, 10, 10)
@@ -0,0 +1,141 @@
+"""
+Tests for the screenshot service capture cache
+"""
+import numpy as np
+
+from pyui_automation.core.services.input_service import InputService
+from pyui_automation.core.services.screenshot_service import ScreenshotService
+
+
+def _service(mocker, cache_ttl: float = 60.0):
+    """Create a service whose backend returns a fresh numbered screen per capture"""
+    backend = mocker.Mock()
+    screens = (np.full((20, 30, 3), index, dtype=np.uint8) for index in range(1, 100))
+    backend.capture_screenshot.side_effect = lambda: next(screens)
+    backend.capture_screen_region.side_effect = lambda x, y, w, h: np.zeros((h, w, 3), dtype=np.uint8)
+    return ScreenshotService(backend, mocker.Mock(), cache_ttl=cache_ttl), backend
+
+
+class TestScreenshotCache:
+    """Test sharing of full-screen captures between capture requests"""
+
+    def test_screenshots_share_one_capture(self, mocker):
+        """Test repeated screenshots within the TTL capture once and return copies"""
+        service, backend = _service(mocker)
+
+        first = service.take_screenshot()
+        first[:] = 0
+        second = service.take_screenshot()
+
+        assert backend.capture_screenshot.call_count == 1
+        assert (second == 1).all()
+
+    def test_regions_are_sliced_from_cached_frame(self, mocker):
+        """Test regions and element captures inside a cached frame need no capture"""
+        service, backend = _service(mocker)
+        element = mocker.Mock()
+        element.rect = {'x': 2, 'y': 3, 'width': 4, 'height': 5}
+        screen = service.take_screenshot()
+
+        region = service.capture_screen_region(10, 5, 6, 4)
+        element_image = service.capture_element_screenshot(element)
+
+        np.testing.assert_array_equal(region, screen[5:9, 10:16])
+        assert element_image.shape == (5, 4, 3)
+        backend.capture_screen_region.assert_not_called()
+
+    def test_region_outside_frame_uses_backend(self, mocker):
+        """Test regions not covered by the cached frame are captured"""
+        service, backend = _service(mocker)
+        service.take_screenshot()
+
+        service.capture_screen_region(25, 0, 10, 10)
+
+        backend.capture_screen_region.assert_called_once_with(25, 0, 10, 10)
+
+    def test_region_without_cached_frame_uses_backend(self, mocker):
+        """Test region captures do not populate the cache"""
+        service, backend = _service(mocker)
+
+        service.capture_screen_region(0, 0, 2, 2)
+        service.capture_screen_region(0, 0, 2, 2)
+
+        assert backend.capture_screen_region.call_count == 2
+        backend.capture_screenshot.assert_not_called()
+
+    def test_expired_frame_is_recaptured(self, mocker):
+        """Test frames older than the TTL are not served"""
+        service, backend = _service(mocker, cache_ttl=0.05)
+        clock = mocker.patch("pyui_automation.core.services.screenshot_service.time.monotonic", return_value=100.0)
+        service.take_screenshot()
+        clock.return_value = 100.2
+
+        assert (service.take_screenshot() == 2).all()
+        assert backend.capture_screenshot.call_count == 2
+
+    def test_zero_ttl_disables_cache(self, mocker):
+        """Test every screenshot is captured when the cache is disabled"""
+        service, backend = _service(mocker, cache_ttl=0)
+
+        service.take_screenshot()
+        service.take_screenshot()
+
+        assert backend.capture_screenshot.call_count == 2
+
+    def test_input_invalidates_cache(self, mocker):
+        """Test input actions drop the cached frame"""
+        service, backend = _service(mocker)
+        session = mocker.Mock()
+        session.screenshot_service = service
+        input_service = InputService(session)
+        service.take_screenshot()
+
+        input_service.mouse_click(5, 5)
+        screen = service.take_screenshot()
+
+        assert backend.capture_screenshot.call_count == 2
+        assert (screen == 2).all()
+
+    def test_failed_input_invalidates_cache(self, mocker):
+        """Test partly delivered input also drops the cached frame"""
+        service, backend = _service(mocker)
+        session = mocker.Mock()
+        session.screenshot_service = service
+        session.backend.type_text.side_effect = RuntimeError("lost focus")
+        input_service = InputService(session)
+        service.take_screenshot()
+
+        try:
+            input_service.type_text("abc")
+        except RuntimeError:
+            pass
+        service.take_screenshot()
+
+        assert backend.capture_screenshot.call_count == 2
+
+
+class TestScreenshotSaving:
+    """Test background saving of screenshots"""
+
+    def test_save_is_written_by_flush(self, mocker, tmp_path):
+        """Test saved screenshots use the configured format and are written by flush"""
+        backend = mocker.Mock()
+        service = ScreenshotService(backend, mocker.Mock(), image_format="jpg", image_quality=80)
+        image = np.full((20, 30, 3), 100, dtype=np.uint8)
+
+        service.save_screenshot(image, tmp_path / "shot")
+        image[:] = 0
+
+        assert service.flush(timeout=5.0)
+        assert (tmp_path / "shot.jpg").exists()
+        service.close()
+
+    def test_take_screenshot_with_save_path(self, mocker, tmp_path):
+        """Test take_screenshot queues the saved copy and close writes it"""
+        service, _ = _service(mocker)
+
+        service.take_screenshot(tmp_path / "screen.png")
+        service.close()
+
+        assert (tmp_path / "screen.png").exists()
+        assert service.flush()
@@ -0,0 +1,67 @@
+"""
+Tests for visual testing service
+"""
+import numpy as np
+
+from pyui_automation.core.services.visual_testing_service import VisualTestingService
+
+
+def _screen(seed: int = 0) -> np.ndarray:
+    """Create a random BGR screenshot"""
+    return np.random.default_rng(seed).integers(0, 255, (60, 80, 3), dtype=np.uint8)
+
+
+class TestVisualTestingService:
+    """Test VisualTestingService class"""
+
+    def test_capture_and_verify_baseline(self, mocker, temp_dir):
+        """Test a captured baseline verifies through the hash tier"""
+        session = mocker.Mock()
+        session.config.visual_algorithm = "mse"
+        screen = _screen()
+        session.screenshot_service.take_screenshot.return_value = screen
+        service = VisualTestingService(session)
+        service.init_visual_testing(temp_dir)
+
+        assert service.capture_baseline("main")
+        compare = mocker.spy(service._visual_tester, "compare")
+
+        assert service.verify_visual("main") == (True, 1.0)
+        assert compare.call_count == 0
+
+    def test_verify_falls_back_to_full_comparison(self, mocker, temp_dir):
+        """Test small changes are decided by the pixel comparison"""
+        session = mocker.Mock()
+        session.config.visual_algorithm = "mse"
+        screen = _screen()
+        session.screenshot_service.take_screenshot.return_value = screen
+        service = VisualTestingService(session)
+        service.init_visual_testing(temp_dir)
+        service.capture_baseline("main")
+        changed = screen.copy()
+        changed[0, 0] ^= 0xFF
+        session.screenshot_service.take_screenshot.return_value = changed
+        compare = mocker.spy(service._visual_tester, "compare")
+
+        is_match, similarity = service.verify_visual("main")
+
+        assert compare.call_count == 1
+        assert is_match
+        assert 0.9 < similarity < 1.0
+        assert service.verify_visual("main", tiered=False) == (is_match, similarity)
+
+    def test_verify_rejects_different_screen_by_hash(self, mocker, temp_dir):
+        """Test a completely different screen fails without a full comparison under the hash engine"""
+        session = mocker.Mock()
+        session.config.visual_algorithm = "hash"
+        session.screenshot_service.take_screenshot.return_value = _screen(0)
+        service = VisualTestingService(session)
+        service.init_visual_testing(temp_dir)
+        service.capture_baseline("main")
+        session.screenshot_service.take_screenshot.return_value = _screen(1)
+        compare = mocker.spy(service._visual_tester, "compare")
+
+        is_match, _ = service.verify_visual("main")
+
+        assert not is_match
+        assert compare.call_count == 0
@@ -0,0 +1,102 @@
+"""
+Tests for the bounded baseline cache
+"""
+import os
+import pytest
+import numpy as np
+import cv2
+from pathlib import Path
+
+from pyui_automation.utils.baseline_cache import BaselineCache
+
+
+def _image(value: int, size: int = 10) -> np.ndarray:
+    """Create a BGR image of size x size pixels (300 bytes for size 10)"""
+    return np.full((size, size, 3), value, dtype=np.uint8)
+
+
+class TestBaselineCache:
+    """Tests for BaselineCache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted"""
+        cache = BaselineCache(max_bytes=10_000)
+        cache.put("a", _image(1))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries'], stats['bytes']) == (1, 1, 1, 300)
+
+    def test_lru_eviction_within_budget(self):
+        """Test the least recently used image is evicted over the budget"""
+        cache = BaselineCache(max_bytes=900)
+        for key in "abc":
+            cache.put(key, _image(1))
+        cache.get("a")
+        cache.put("d", _image(2))
+
+        assert "b" not in cache
+        assert all(key in cache for key in "acd")
+        assert cache.stats()['evictions'] == 1
+        assert cache.current_bytes == 900
+
+    def test_oversized_image_not_cached(self):
+        """Test images larger than the budget are never cached"""
+        cache = BaselineCache(max_bytes=100)
+        cache.put("big", _image(1))
+
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+    def test_replace_and_invalidate(self):
+        """Test replacing and invalidating keep the byte count exact"""
+        cache = BaselineCache(max_bytes=10_000)
+        cache.put("a", _image(1))
+        cache.put("a", _image(2, size=20))
+        assert cache.current_bytes == 1200
+
+        cache.invalidate("a")
+        assert cache.current_bytes == 0
+
+    def test_negative_budget(self):
+        """Test a negative budget is rejected"""
+        with pytest.raises(ValueError):
+            BaselineCache(max_bytes=-1)
+
+    def test_disk_tier_skips_decode(self, temp_dir, monkeypatch):
+        """Test evicted baselines are reloaded memory-mapped from the disk tier"""
+        image_path = Path(temp_dir) / "base.png"
+        cv2.imwrite(str(image_path), _image(7))
+        cache = BaselineCache(max_bytes=10_000, disk_dir=Path(temp_dir) / "decoded")
+
+        first = cache.load("base", image_path)
+        cache.clear()
+        monkeypatch.setattr(cv2, "imread", lambda *args: pytest.fail("decoded again"))
+        second = cache.load("base", image_path)
+
+        assert np.array_equal(first, second)
+        assert isinstance(second, np.memmap)
+        assert cache.stats()['disk_hits'] == 1
+
+    def test_disk_tier_replaces_older_versions(self, temp_dir):
+        """Test re-capturing a baseline leaves one disk tier file and no temporaries"""
+        image_path = Path(temp_dir) / "base.png"
+        disk_dir = Path(temp_dir) / "decoded"
+        cache = BaselineCache(max_bytes=10_000, disk_dir=disk_dir)
+
+        for value in (1, 2, 3):
+            cv2.imwrite(str(image_path), _image(value))
+            os.utime(image_path, ns=(value * 10**9, value * 10**9))
+            cache.clear()
+            latest = cache.load("base", image_path)
+
+        assert [p.suffix for p in disk_dir.iterdir()] == [".npy"]
+        assert latest[0, 0, 0] == 3
+
+    def test_load_undecodable_file(self, temp_dir):
+        """Test files that cannot be decoded return None"""
+        path = Path(temp_dir) / "broken.png"
+        path.write_bytes(b"not an image")
+
+        assert BaselineCache().load("broken", path) is None
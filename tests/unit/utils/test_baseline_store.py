@@ -0,0 +1,254 @@
+"""
+Tests for the content-addressed baseline store
+"""
+import json
+
+import pytest
+import numpy as np
+import cv2
+
+from pyui_automation.utils import baseline_store
+from pyui_automation.utils.baseline_store import BaselineStore, available_codecs, default_codec, migrate_directory
+
+
+def _image(seed: int, shape=(40, 60, 3)) -> np.ndarray:
+    """Create a random image"""
+    return np.random.default_rng(seed).integers(0, 255, shape, dtype=np.uint8)
+
+
+class TestBaselineStore:
+    """Tests for BaselineStore"""
+
+    @pytest.mark.parametrize("codec", available_codecs())
+    def test_round_trip_is_lossless(self, tmp_path, codec):
+        """Test every codec returns the stored pixels unchanged"""
+        store = BaselineStore(tmp_path, codec=codec)
+        color, gray = _image(1), _image(2, shape=(40, 60))
+        store.put("color", color)
+        store.put("gray", gray)
+
+        reopened = BaselineStore(tmp_path, codec=codec)
+        assert np.array_equal(reopened.get("color"), color)
+        assert np.array_equal(reopened.get("gray"), gray)
+
+    def test_identical_images_share_a_blob(self, tmp_path):
+        """Test identical content is stored once"""
+        store = BaselineStore(tmp_path)
+        image = _image(3)
+        first = store.put("dialogs/a", image)
+        second = store.put("dialogs/b", image.copy())
+
+        assert first == second
+        stats = store.stats()
+        assert (stats['entries'], stats['blobs']) == (2, 1)
+        assert stats['logical_bytes'] == 2 * image.nbytes
+
+    def test_raw_blobs_are_memory_mapped(self, tmp_path):
+        """Test raw baselines are read without a copy"""
+        store = BaselineStore(tmp_path, codec="raw")
+        store.put("a", _image(4))
+
+        assert isinstance(store.get("a"), np.memmap)
+
+    def test_unsupported_data_falls_back_to_raw(self, tmp_path):
+        """Test images WebP cannot encode are stored raw"""
+        store = BaselineStore(tmp_path, codec="webp")
+        image = np.random.default_rng(5).random((10, 10, 3)).astype(np.float32)
+        store.put("float", image)
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest['entries']['float']['codec'] == "raw"
+        assert np.array_equal(store.get("float"), image)
+
+    def test_delete_and_gc(self, tmp_path):
+        """Test blobs are collected once no name refers to them"""
+        store = BaselineStore(tmp_path)
+        store.put("a", _image(6))
+        store.put("b", _image(6))
+        store.put("c", _image(7))
+
+        assert store.delete("a")
+        assert not store.delete("a")
+        assert store.gc() == 0
+        store.delete("b")
+        assert store.gc() == 1
+        assert store.names() == ["c"]
+        with pytest.raises(KeyError):
+            store.get("a")
+
+    def test_gc_keeps_blob_of_put_in_progress(self, tmp_path, monkeypatch):
+        """Test gc running between a put's blob write and manifest update keeps the blob"""
+        store = BaselineStore(tmp_path)
+        original_write = store._write_blob
+        collected = []
+
+        def write_then_gc(path, image, codec):
+            original_write(path, image, codec)
+            collected.append(store.gc())
+
+        monkeypatch.setattr(store, "_write_blob", write_then_gc)
+        image = _image(8)
+        store.put("a", image)
+
+        assert collected == [0]
+        assert np.array_equal(store.get("a"), image)
+
+    def test_gc_keeps_existing_blob_found_by_put(self, tmp_path, monkeypatch):
+        """Test gc cannot delete an orphaned blob that a put has just found and reuses"""
+        store = BaselineStore(tmp_path)
+        image = _image(9)
+        store.put("a", image)
+        store.delete("a")
+        blob = next((tmp_path / baseline_store.BLOB_DIR).rglob("*.*"))
+        original_exists = type(blob).exists
+        collected = []
+
+        def exists_then_gc(path):
+            found = original_exists(path)
+            if path == blob:
+                collected.append(store.gc())
+            return found
+
+        monkeypatch.setattr(type(blob), "exists", exists_then_gc)
+        store.put("b", image)
+        monkeypatch.undo()
+
+        assert collected == [0]
+        assert np.array_equal(store.get("b"), image)
+
+    def test_missing_blob_raises_value_error(self, tmp_path):
+        """Test a manifest entry without its blob is reported"""
+        store = BaselineStore(tmp_path)
+        store.put("a", _image(8))
+        for path in (tmp_path / "blobs").rglob("*"):
+            if path.is_file():
+                path.unlink()
+
+        with pytest.raises(ValueError):
+            store.get("a")
+
+    def test_default_codec_compresses(self, tmp_path):
+        """Test the default codec is lossless and stores screens smaller than raw"""
+        # Flat panels like a real screen; random noise would not compress at all
+        screen = np.full((200, 300, 3), 240, dtype=np.uint8)
+        screen[20:80, 30:270] = (200, 120, 40)
+        screen[100:110, 30:200] = 0
+        default = BaselineStore(tmp_path / "default")
+        raw = BaselineStore(tmp_path / "raw", codec="raw")
+        default.put("screen", screen)
+        raw.put("screen", screen)
+
+        assert default.codec == default_codec() != "raw"
+        assert default.stats()['stored_bytes'] < raw.stats()['stored_bytes']
+        assert np.array_equal(default.get("screen"), screen)
+
+    @pytest.mark.parametrize("alpha", [255, 0])
+    def test_default_codec_keeps_bgra(self, tmp_path, alpha):
+        """Test 4-channel baselines, opaque or with GDI's zero alpha, round-trip unchanged"""
+        image = _image(10, shape=(40, 60, 4))
+        image[..., 3] = alpha
+        store = BaselineStore(tmp_path)
+        store.put("bgra", image)
+
+        assert np.array_equal(BaselineStore(tmp_path).get("bgra"), image)
+
+    def test_webp_stores_bgra_as_png(self, tmp_path):
+        """Test 4-channel images bypass WebP"""
+        store = BaselineStore(tmp_path, codec="webp")
+        image = _image(11, shape=(20, 30, 4))
+        image[..., 3] = 0
+        store.put("bgra", image)
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest['entries']['bgra']['codec'] == "png"
+        assert np.array_equal(store.get("bgra"), image)
+
+    def test_unknown_codec(self, tmp_path):
+        """Test an unknown codec is rejected"""
+        with pytest.raises(ValueError):
+            BaselineStore(tmp_path, codec="jpeg")
+
+    def test_zstd_requires_package(self, tmp_path, monkeypatch):
+        """Test zstd is unavailable without the zstandard package"""
+        monkeypatch.setattr(baseline_store, "zstandard", None)
+
+        assert "zstd" not in available_codecs()
+        with pytest.raises(ValueError):
+            BaselineStore(tmp_path, codec="zstd")
+
+
+class TestMigrateDirectory:
+    """Tests for migrate_directory"""
+
+    def test_migrates_png_layout(self, tmp_path):
+        """Test PNG baselines are imported under their relative names"""
+        source = tmp_path / "baselines"
+        (source / "dialogs").mkdir(parents=True)
+        image = _image(9)
+        cv2.imwrite(str(source / "main.png"), image)
+        cv2.imwrite(str(source / "dialogs" / "login.png"), image)
+        cv2.imwrite(str(source / "dialogs" / "other.png"), _image(10))
+        (source / "broken.png").write_bytes(b"not an image")
+
+        store = BaselineStore(tmp_path / "store", codec="webp")
+        counts = migrate_directory(source, store)
+
+        assert counts == {'imported': 3, 'deduplicated': 1, 'failed': 1}
+        assert store.names() == ["dialogs/login", "dialogs/other", "main"]
+        assert np.array_equal(store.get("dialogs/login"), image)
+        assert store.stats()['blobs'] == 2
+
+    def test_alpha_and_grayscale_files_compare_as_before(self, tmp_path):
+        """Test migrated baselines decode as BGR like the PNG files they replace"""
+        from pyui_automation.core.visual import VisualTester
+
+        source = tmp_path / "baselines"
+        source.mkdir()
+        color = _image(11)
+        cv2.imwrite(str(source / "alpha.png"), cv2.cvtColor(color, cv2.COLOR_BGR2BGRA))
+        cv2.imwrite(str(source / "gray.png"), _image(12, shape=(40, 60)))
+        legacy = VisualTester(source)
+        expected = {name: legacy.compare_with_baseline(name, cv2.imread(str(source / f"{name}.png")))
+                    for name in ("alpha", "gray")}
+
+        store = BaselineStore(tmp_path / "store", codec="png")
+        migrate_directory(source, store)
+        migrated = VisualTester(tmp_path / "empty", store=store)
+
+        for name in ("alpha", "gray"):
+            assert store.get(name).shape == (40, 60, 3)
+            assert migrated.compare_with_baseline(name, cv2.imread(str(source / f"{name}.png"))) == expected[name]
+
+    def test_manifest_written_once(self, tmp_path, monkeypatch):
+        """Test migration writes the manifest once instead of once per file"""
+        source = tmp_path / "baselines"
+        source.mkdir()
+        for i in range(4):
+            cv2.imwrite(str(source / f"s{i}.png"), _image(20 + i))
+        store = BaselineStore(tmp_path / "store")
+        writes = []
+        original = store._write_manifest
+        monkeypatch.setattr(store, "_write_manifest", lambda: writes.append(store._batch_depth) or original())
+
+        migrate_directory(source, store)
+
+        assert json.loads((tmp_path / "store" / "manifest.json").read_text())['entries'].keys() == {
+            "s0", "s1", "s2", "s3"
+        }
+        assert writes.count(0) == 1
+
+
+class TestBatch:
+    """Tests for BaselineStore.batch"""
+
+    def test_batch_defers_manifest(self, tmp_path):
+        """Test puts inside a batch reach the manifest when the block ends"""
+        store = BaselineStore(tmp_path)
+        with store.batch():
+            store.put("a", _image(30))
+            with store.batch():
+                store.put("b", _image(31))
+            assert not (tmp_path / "manifest.json").exists()
+            assert store.names() == ["a", "b"]
+
+        assert sorted(BaselineStore(tmp_path).names()) == ["a", "b"]
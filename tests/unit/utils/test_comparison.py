@@ -0,0 +1,91 @@
+"""
+Tests for the image comparison engines
+"""
+import pytest
+import numpy as np
+import cv2
+
+from pyui_automation.utils.comparison import (
+    available_engines, compare, get_engine, register_engine, ssim_similarity,
+    perceptual_hash
+)
+
+
+def _screen(width: int = 320, height: int = 240, seed: int = 0) -> np.ndarray:
+    """Create a smooth BGR screen-like image"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 3)
+
+
+class TestRegistry:
+    """Tests for the engine registry"""
+
+    def test_builtin_engines(self):
+        """Test the built-in engines are registered"""
+        assert {"mse", "mae", "ssim", "hash", "histogram"} <= set(available_engines())
+
+    def test_unknown_engine(self):
+        """Test an unknown algorithm raises ValueError"""
+        with pytest.raises(ValueError):
+            get_engine("unknown")
+
+    def test_register_engine(self):
+        """Test custom engines can be registered and used"""
+        register_engine("always_half", lambda img1, img2: 0.5)
+
+        assert compare(np.zeros((4, 4)), np.zeros((4, 4)), "always_half") == 0.5
+
+    def test_different_shapes(self):
+        """Test images of different shapes have zero similarity"""
+        assert compare(np.zeros((10, 10, 3), np.uint8), np.zeros((10, 12, 3), np.uint8), "ssim") == 0.0
+
+
+class TestEngines:
+    """Tests for the individual engines"""
+
+    @pytest.mark.parametrize("algorithm", ["mse", "mae", "ssim", "hash", "histogram"])
+    def test_identical_images(self, algorithm):
+        """Test identical images have similarity 1.0"""
+        image = _screen()
+
+        assert compare(image, image.copy(), algorithm) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("algorithm", ["mse", "mae", "ssim", "hash"])
+    def test_changed_images(self, algorithm):
+        """Test a large change lowers similarity"""
+        image = _screen()
+        changed = image.copy()
+        changed[40:200, 60:260] = 255
+
+        assert 0.0 <= compare(image, changed, algorithm) < 0.95
+
+    def test_mse_matches_rmse_formula(self):
+        """Test the mse engine keeps the 1 - RMSE / 255 definition"""
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        changed = np.full((10, 10, 3), 51, dtype=np.uint8)
+
+        assert compare(image, changed, "mse") == pytest.approx(0.8)
+
+    def test_ssim_tiled_equals_untiled(self):
+        """Test banded SSIM gives the untiled result"""
+        image = _screen(seed=1)
+        changed = image.copy()
+        changed[100:130, 100:180] = 0
+
+        untiled = ssim_similarity(image, changed, tile_rows=0)
+
+        assert ssim_similarity(image, changed, tile_rows=50) == pytest.approx(untiled, abs=1e-6)
+        assert ssim_similarity(image, changed, tile_rows=7) == pytest.approx(untiled, abs=1e-6)
+
+    def test_ssim_ignores_brightness_shift_more_than_mse(self):
+        """Test SSIM is less sensitive to a uniform brightness shift than structure loss"""
+        image = _screen(seed=2)
+        brighter = cv2.add(image, 20)
+        blurred = cv2.GaussianBlur(image, (0, 0), 4)
+
+        assert ssim_similarity(image, brighter) > ssim_similarity(image, blurred)
+
+    def test_perceptual_hash_size(self):
+        """Test the hash has hash_size**2 bits"""
+        assert perceptual_hash(_screen(), hash_size=8).shape == (64,)
@@ -0,0 +1,63 @@
+"""
+Tests for tiled difference-region analysis
+"""
+import pytest
+import numpy as np
+
+from pyui_automation.utils.diff_regions import REGION_DTYPE, find_diff_regions, tile_energy
+
+
+class TestTileEnergy:
+    """Tests for tile_energy"""
+
+    def test_counts_match_reference(self):
+        """Test per-tile counts equal a direct sum, including partial edge tiles"""
+        mask = np.random.default_rng(0).random((70, 90)) < 0.2
+
+        energy = tile_energy(mask, tile_size=16)
+
+        assert energy.shape == (5, 6)
+        expected = [[mask[y:y + 16, x:x + 16].sum() for x in range(0, 90, 16)] for y in range(0, 70, 16)]
+        assert np.array_equal(energy, expected)
+
+    def test_rejects_non_mask_dtype(self):
+        """Test only boolean and uint8 masks are accepted"""
+        with pytest.raises(ValueError):
+            tile_energy(np.zeros((8, 8), dtype=np.float32))
+
+
+class TestFindDiffRegions:
+    """Tests for find_diff_regions"""
+
+    def test_adjacent_tiles_merge(self):
+        """Test changes spanning several tiles form one tile-aligned region"""
+        mask = np.zeros((64, 96), dtype=np.uint8)
+        mask[10:40, 20:50] = 1
+        mask[60:64, 90:96] = 1
+
+        found = find_diff_regions(mask, tile_size=16)
+
+        assert found.regions.dtype == REGION_DTYPE
+        assert found.regions[['x', 'y', 'width', 'height', 'pixels', 'tiles']].tolist() == [
+            (16, 0, 48, 48, 900, 9),
+            (80, 48, 16, 16, 24, 1),
+        ]
+        assert found.changed_pixels == 924
+
+    def test_min_pixels_and_cap(self):
+        """Test small regions are discarded and the count is capped"""
+        mask = np.zeros((32, 320), dtype=bool)
+        for i in range(10):
+            mask[0:2, i * 32:i * 32 + i + 1] = True
+
+        found = find_diff_regions(mask, tile_size=16, min_pixels=4, max_regions=3)
+
+        assert list(found.regions['pixels']) == [20, 18, 16]
+        assert found.dropped == 6
+
+    def test_clean_mask(self):
+        """Test an unchanged frame has no regions"""
+        found = find_diff_regions(np.zeros((40, 40), dtype=np.uint8))
+
+        assert len(found) == 0
+        assert found.changed_pixels == 0
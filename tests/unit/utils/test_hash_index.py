@@ -0,0 +1,155 @@
+"""
+Tests for the perceptual-hash index
+"""
+import numpy as np
+import cv2
+import os
+from pathlib import Path
+
+from pyui_automation.utils.baseline_store import BaselineStore
+from pyui_automation.utils.hash_index import (
+    PerceptualHashIndex, hamming_distances, image_hash, pack_hash
+)
+
+
+def _screen(seed: int, width: int = 160, height: int = 120) -> np.ndarray:
+    """Create a smooth BGR screen-like image"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 5)
+
+
+def _write(directory: Path, name: str, image: np.ndarray) -> None:
+    """Write a baseline image"""
+    path = directory / f"{name}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(path), image)
+
+
+class TestPacking:
+    """Tests for hash packing and distances"""
+
+    def test_pack_hash_bit_order(self):
+        """Test the first bit is the most significant"""
+        bits = np.zeros(64, dtype=bool)
+        bits[0] = True
+        bits[63] = True
+
+        assert pack_hash(bits) == np.uint64((1 << 63) | 1)
+
+    def test_hamming_distances(self):
+        """Test popcount distances against a query"""
+        hashes = np.array([0, 1, 0b111, (1 << 64) - 1], dtype=np.uint64)
+
+        assert list(hamming_distances(hashes, 0)) == [0, 1, 3, 64]
+
+
+class TestPerceptualHashIndex:
+    """Tests for PerceptualHashIndex"""
+
+    def test_nearest_and_unchanged(self, temp_dir):
+        """Test lookups find the baseline a screenshot was taken from"""
+        directory = Path(temp_dir)
+        screens = {f"dialogs/screen{i}": _screen(i) for i in range(5)}
+        for name, image in screens.items():
+            _write(directory, name, image)
+        index = PerceptualHashIndex(directory)
+        noisy = cv2.add(screens["dialogs/screen3"], 3)
+
+        assert len(index) == 5
+        assert index.nearest(noisy, max_distance=6, limit=1)[0][0] == "dialogs/screen3"
+        assert index.is_unchanged("dialogs/screen2", screens["dialogs/screen2"])
+        assert not index.is_unchanged("dialogs/screen2", screens["dialogs/screen4"])
+        assert not index.is_unchanged("missing", screens["dialogs/screen2"])
+
+    def test_sidecar_reused(self, temp_dir, monkeypatch):
+        """Test unchanged baselines are not decoded again on the next run"""
+        directory = Path(temp_dir)
+        _write(directory, "a", _screen(0))
+        _write(directory, "b", _screen(1))
+        first = PerceptualHashIndex(directory)
+        assert (directory / ".phash_index.npz").exists()
+
+        _write(directory, "c", _screen(2))
+        decoded = []
+        original_imread = cv2.imread
+        monkeypatch.setattr(cv2, "imread", lambda path, *args: decoded.append(path) or original_imread(path, *args))
+        second = PerceptualHashIndex(directory)
+
+        assert [Path(path).name for path in decoded] == ["c.png"]
+        assert second.hash_of("a") == first.hash_of("a")
+        assert sorted(second.names()) == ["a", "b", "c"]
+
+    def test_truncated_sidecar_rehashes(self, temp_dir):
+        """Test a sidecar cut short by a crash is ignored and rewritten"""
+        directory = Path(temp_dir)
+        _write(directory, "a", _screen(0))
+        _write(directory, "b", _screen(1))
+        first = PerceptualHashIndex(directory)
+        sidecar = directory / ".phash_index.npz"
+        sidecar.write_bytes(sidecar.read_bytes()[:100])
+
+        second = PerceptualHashIndex(directory)
+
+        assert sorted(second.names()) == ["a", "b"]
+        assert second.hash_of("a") == first.hash_of("a")
+        assert sorted(second._read_sidecar()) == ["a", "b"]
+        assert not list(directory.glob("*.tmp"))
+
+    def test_add(self, temp_dir):
+        """Test added baselines are searchable immediately"""
+        directory = Path(temp_dir)
+        index = PerceptualHashIndex(directory)
+        image = _screen(7)
+        _write(directory, "new", image)
+
+        value = index.add("new", image)
+
+        assert value == image_hash(image)
+        assert index.nearest(image, max_distance=0) == [("new", 0)]
+
+    def test_add_batches_sidecar_writes(self, temp_dir, monkeypatch):
+        """Test additions are appended in place and persisted in batches"""
+        directory = Path(temp_dir)
+        index = PerceptualHashIndex(directory, sidecar_batch=3)
+        writes = []
+        original_write = index._write_sidecar
+        monkeypatch.setattr(index, "_write_sidecar", lambda: writes.append(len(index)) or original_write())
+        images = [_screen(i, 64, 48) for i in range(4)]
+        for i, image in enumerate(images):
+            _write(directory, f"b{i}", image)
+            index.add(f"b{i}", image)
+
+        assert writes == [3]
+        assert [index.hash_of(f"b{i}") for i in range(4)] == [image_hash(image) for image in images]
+        index.flush()
+        assert writes == [3, 4]
+        assert sorted(PerceptualHashIndex(directory).names()) == ["b0", "b1", "b2", "b3"]
+
+    def test_replaced_file_is_rehashed(self, temp_dir):
+        """Test a baseline replaced on disk is not served with its old fingerprint"""
+        directory = Path(temp_dir)
+        old, new = _screen(10), _screen(11)
+        _write(directory, "screen", old)
+        index = PerceptualHashIndex(directory)
+        _write(directory, "screen", new)
+        os.utime(directory / "screen.png", ns=(1, 1))
+
+        assert index.hash_of("screen") == image_hash(new)
+        assert not index.is_unchanged("screen", old)
+
+    def test_store_baselines_indexed(self, temp_dir):
+        """Test store baselines are indexed, take precedence over files and track their digest"""
+        directory = Path(temp_dir)
+        store = BaselineStore(directory / "store")
+        file_image, stored_image, replaced = _screen(12), _screen(13), _screen(14)
+        _write(directory, "screen", file_image)
+        store.put("screen", stored_image)
+        store.put("dialogs/login", stored_image)
+        index = PerceptualHashIndex(directory, store=store)
+
+        assert sorted(index.names()) == ["dialogs/login", "screen"]
+        assert index.hash_of("screen") == image_hash(stored_image)
+        store.put("screen", replaced)
+        assert index.hash_of("screen") == image_hash(replaced)
+        assert sorted(PerceptualHashIndex(directory, store=store).names()) == ["dialogs/login", "screen"]
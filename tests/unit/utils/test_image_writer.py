@@ -0,0 +1,110 @@
+"""
+Tests for the asynchronous image writer
+"""
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from pyui_automation.utils import image_writer
+from pyui_automation.utils.image_writer import AsyncImageWriter, encode_params
+
+
+def _image(value: int = 0) -> np.ndarray:
+    return np.full((40, 60, 3), value, dtype=np.uint8)
+
+
+class TestEncodeParams:
+    """Test encode_params function"""
+
+    def test_png_quality_selects_compression(self):
+        """Test PNG quality maps to compression levels from 9 to 0"""
+        assert encode_params("png", 0) == [cv2.IMWRITE_PNG_COMPRESSION, 9]
+        assert encode_params("png", 90) == [cv2.IMWRITE_PNG_COMPRESSION, 1]
+        assert encode_params("PNG", 100) == [cv2.IMWRITE_PNG_COMPRESSION, 0]
+
+    def test_lossy_formats_use_quality(self):
+        """Test JPEG and WebP quality parameters"""
+        assert encode_params("jpg", 75) == [cv2.IMWRITE_JPEG_QUALITY, 75]
+        assert encode_params("webp", 60) == [cv2.IMWRITE_WEBP_QUALITY, 60]
+        assert encode_params("bmp", 60) == []
+
+    def test_invalid_quality(self):
+        """Test quality outside 0-100 is rejected"""
+        with pytest.raises(ValueError):
+            encode_params("png", 101)
+
+
+class TestAsyncImageWriter:
+    """Test AsyncImageWriter class"""
+
+    def test_submit_and_flush(self, tmp_path):
+        """Test submitted images are written once flushed"""
+        with AsyncImageWriter() as writer:
+            futures = [writer.submit(_image(i), tmp_path / f"shot_{i}.png") for i in range(5)]
+            assert writer.flush(timeout=5.0)
+            assert writer.pending == 0
+        assert all(future.result() for future in futures)
+        assert writer.written == 5
+        assert (cv2.imread(str(tmp_path / "shot_3.png")) == 3).all()
+
+    def test_format_and_directories(self, tmp_path):
+        """Test paths without an extension get the writer's format and parents are created"""
+        with AsyncImageWriter(format="jpg", quality=80) as writer:
+            assert writer.path_for(tmp_path / "shot") == tmp_path / "shot.jpg"
+            assert writer.path_for(tmp_path / "shot.png") == tmp_path / "shot.png"
+            writer.submit(_image(128), tmp_path / "nested" / "shot")
+        assert (tmp_path / "nested" / "shot.jpg").exists()
+
+    def test_submit_copies_image(self, tmp_path):
+        """Test the caller may modify the image right after submit"""
+        image = _image(200)
+        with AsyncImageWriter() as writer:
+            writer.submit(image, tmp_path / "shot.png")
+            image[:] = 0
+        assert (cv2.imread(str(tmp_path / "shot.png")) == 200).all()
+
+    def test_backpressure(self, tmp_path, mocker):
+        """Test submit blocks while max_pending images are waiting"""
+        release = threading.Event()
+        original = image_writer.save_image
+
+        def slow_save(*args):
+            release.wait(5.0)
+            return original(*args)
+
+        mocker.patch.object(image_writer, "save_image", side_effect=slow_save)
+        writer = AsyncImageWriter(workers=1, max_pending=2)
+        writer.submit(_image(), tmp_path / "a.png")
+        writer.submit(_image(), tmp_path / "b.png")
+        blocked = threading.Thread(target=writer.submit, args=(_image(), tmp_path / "c.png"))
+        blocked.start()
+        blocked.join(0.1)
+
+        assert blocked.is_alive()
+        assert writer.pending == 2
+        release.set()
+        blocked.join(5.0)
+        writer.close()
+        assert writer.written == 3
+
+    def test_failures_are_counted(self, tmp_path):
+        """Test a failed write resolves to False and is counted"""
+        with AsyncImageWriter() as writer:
+            future = writer.submit(np.array([]), tmp_path / "empty.png")
+        assert future.result() is False
+        assert writer.errors == 1
+        assert writer.written == 0
+
+    def test_closed_writer_rejects_images(self, tmp_path):
+        """Test submit after close raises"""
+        writer = AsyncImageWriter()
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(_image(), tmp_path / "shot.png")
+
+    def test_invalid_format(self):
+        """Test unsupported formats are rejected"""
+        with pytest.raises(ValueError):
+            AsyncImageWriter(format="gif")
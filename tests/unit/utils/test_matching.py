@@ -0,0 +1,285 @@
+"""
+Tests for the vectorized template matching engine
+"""
+import pytest
+import numpy as np
+import cv2
+
+from pyui_automation.utils.matching import (
+    MATCH_DTYPE, extract_peaks, nms_boxes, match_template, matches_from_response,
+    pyramid_match_template, match_templates_batch, to_grayscale, changed_tiles, dirty_regions
+)
+
+
+def _textured_template(size: int = 20, seed: int = 0) -> np.ndarray:
+    """Create a random grayscale template that matches only itself"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, (size, size), dtype=np.uint8)
+
+
+def _smooth_screen(width: int, height: int, seed: int) -> np.ndarray:
+    """Create a screen-like image with smooth structure at several scales"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (height, width), dtype=np.uint8)
+    return cv2.normalize(cv2.GaussianBlur(noise, (0, 0), 3), None, 0, 255, cv2.NORM_MINMAX)
+
+
+class TestExtractPeaks:
+    """Tests for extract_peaks"""
+
+    def test_no_values_above_threshold(self):
+        """Test extract_peaks returns empty arrays when nothing passes"""
+        response = np.zeros((50, 50), dtype=np.float32)
+
+        xs, ys, scores = extract_peaks(response, 0.5)
+
+        assert len(xs) == len(ys) == len(scores) == 0
+
+    def test_single_local_maximum(self):
+        """Test only the local maximum of a blob is reported"""
+        yy, xx = np.mgrid[0:100, 0:100]
+        response = np.exp(-((xx - 40) ** 2 + (yy - 30) ** 2) / (2 * 20.0 ** 2)).astype(np.float32)
+
+        xs, ys, scores = extract_peaks(response, 0.5, (5, 5))
+
+        assert list(zip(xs, ys)) == [(40, 30)]
+        assert scores[0] == np.float32(1.0)
+
+    def test_sorted_by_score(self):
+        """Test peaks are sorted by descending score"""
+        response = np.zeros((50, 50), dtype=np.float32)
+        response[5, 5] = 0.7
+        response[40, 40] = 0.9
+        response[20, 30] = 0.8
+
+        xs, ys, scores = extract_peaks(response, 0.5)
+
+        assert list(scores) == sorted(scores, reverse=True)
+        assert (xs[0], ys[0]) == (40, 40)
+
+    def test_nan_values_ignored(self):
+        """Test NaN values in the response are never reported"""
+        response = np.full((10, 10), np.nan, dtype=np.float32)
+
+        xs, _, _ = extract_peaks(response, -0.5)
+
+        assert len(xs) == 0
+
+
+class TestNmsBoxes:
+    """Tests for nms_boxes"""
+
+    def test_empty(self):
+        """Test nms_boxes with no boxes"""
+        keep = nms_boxes(np.array([]), np.array([]), 10, 10)
+
+        assert len(keep) == 0
+
+    def test_overlapping_boxes_suppressed(self):
+        """Test boxes overlapping the best one are dropped"""
+        xs = np.array([0, 1, 50])
+        ys = np.array([0, 1, 50])
+
+        keep = nms_boxes(xs, ys, 10, 10, 0.5)
+
+        assert list(keep) == [0, 2]
+
+    def test_adjacent_boxes_kept(self):
+        """Test touching boxes do not suppress each other"""
+        xs = np.array([0, 10, 20])
+        ys = np.array([0, 0, 0])
+
+        keep = nms_boxes(xs, ys, 10, 10, 0.5)
+
+        assert list(keep) == [0, 1, 2]
+
+    def test_max_results(self):
+        """Test suppression stops after max_results boxes"""
+        xs = np.array([0, 100, 200])
+        ys = np.array([0, 0, 0])
+
+        keep = nms_boxes(xs, ys, 10, 10, 0.5, max_results=2)
+
+        assert list(keep) == [0, 1]
+
+
+class TestMatchTemplate:
+    """Tests for match_template"""
+
+    def test_finds_all_occurrences(self):
+        """Test every planted copy of the template is found exactly once"""
+        template = _textured_template()
+        image = np.zeros((200, 300), dtype=np.uint8)
+        positions = [(10, 10), (150, 40), (260, 170)]
+        for x, y in positions:
+            image[y:y + 20, x:x + 20] = template
+
+        matches = match_template(image, template, threshold=0.9)
+
+        assert matches.dtype == MATCH_DTYPE
+        assert sorted(zip(matches['x'].tolist(), matches['y'].tolist())) == sorted(positions)
+        assert np.all(matches['width'] == 20)
+        assert np.all(matches['height'] == 20)
+        assert np.all(matches['score'] > 0.99)
+
+    def test_color_images(self):
+        """Test matching works directly on BGR images"""
+        template = cv2.cvtColor(_textured_template(seed=1), cv2.COLOR_GRAY2BGR)
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        image[30:50, 40:60] = template
+
+        matches = match_template(image, template, threshold=0.9)
+
+        assert len(matches) == 1
+        assert (matches['x'][0], matches['y'][0]) == (40, 30)
+
+    def test_template_larger_than_image(self):
+        """Test an oversized template returns no matches"""
+        image = np.zeros((10, 10), dtype=np.uint8)
+        template = np.zeros((20, 20), dtype=np.uint8)
+
+        matches = match_template(image, template)
+
+        assert len(matches) == 0
+        assert matches.dtype == MATCH_DTYPE
+
+    def test_matches_from_response_offset(self):
+        """Test offsets are added to match coordinates"""
+        response = np.zeros((30, 30), dtype=np.float32)
+        response[5, 7] = 0.9
+
+        matches = matches_from_response(response, (10, 10), 0.8, offset=(100, 200))
+
+        assert (matches['x'][0], matches['y'][0]) == (107, 205)
+
+    def test_strict_iou_keeps_close_matches(self):
+        """Test the peak window narrows with the IoU threshold instead of hiding close matches"""
+        # Enough above-threshold points to take the local-maximum filter path
+        response = np.full((60, 60), 0.81, dtype=np.float32)
+        response[20, 20] = 0.95
+        response[20, 23] = 0.9
+
+        strict = matches_from_response(response, (30, 30), 0.8, iou_threshold=0.9)
+        default = matches_from_response(response, (30, 30), 0.8)
+
+        assert (strict['x'][1], strict['y'][1]) == (23, 20)
+        assert (23, 20) not in zip(default['x'].tolist(), default['y'].tolist())
+
+
+class TestPyramidMatchTemplate:
+    """Tests for pyramid_match_template"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    @pytest.mark.parametrize("levels", [2, 3])
+    def test_same_best_match_as_exhaustive(self, seed, levels):
+        """Test the coarse-to-fine search agrees with the exhaustive search"""
+        screen = _smooth_screen(640, 480, seed)
+        rng = np.random.default_rng(seed)
+        x, y = int(rng.integers(0, 580)), int(rng.integers(0, 420))
+        template = screen[y:y + 48, x:x + 56].copy()
+
+        exhaustive = match_template(screen, template, threshold=0.8)
+        pyramid = pyramid_match_template(screen, template, threshold=0.8, levels=levels)
+
+        assert len(pyramid) > 0
+        assert abs(int(pyramid['x'][0]) - int(exhaustive['x'][0])) <= 1
+        assert abs(int(pyramid['y'][0]) - int(exhaustive['y'][0])) <= 1
+        assert pyramid['score'][0] == pytest.approx(exhaustive['score'][0], abs=0.01)
+
+    def test_not_found(self):
+        """Test a template absent from the screen is not reported"""
+        screen = _smooth_screen(320, 240, 0)
+        template = _textured_template(32, seed=5)
+
+        matches = pyramid_match_template(screen, template, threshold=0.9)
+
+        assert len(matches) == 0
+
+    def test_small_template_falls_back_to_exhaustive(self):
+        """Test templates too small for the pyramid are still found"""
+        template = _textured_template(10)
+        image = np.zeros((100, 100), dtype=np.uint8)
+        image[60:70, 20:30] = template
+
+        matches = pyramid_match_template(image, template, threshold=0.9, levels=3)
+
+        assert (matches['x'][0], matches['y'][0]) == (20, 60)
+
+
+class TestMatchTemplatesBatch:
+    """Tests for match_templates_batch"""
+
+    def test_results_keyed_by_name(self):
+        """Test every template gets a timed result under its name"""
+        screen = np.zeros((200, 200, 3), dtype=np.uint8)
+        templates = {}
+        for i, (x, y) in enumerate([(10, 10), (100, 30), (50, 150)]):
+            template = cv2.cvtColor(_textured_template(seed=i), cv2.COLOR_GRAY2BGR)
+            screen[y:y + 20, x:x + 20] = template
+            templates[f"icon{i}"] = template
+        templates["missing"] = cv2.cvtColor(_textured_template(seed=99), cv2.COLOR_GRAY2BGR)
+
+        results = match_templates_batch(screen, templates, threshold=0.9, max_workers=2)
+
+        assert list(results) == ["icon0", "icon1", "icon2", "missing"]
+        assert results["icon1"].best[:2] == (100, 30)
+        assert results["icon2"].found
+        assert not results["missing"].found
+        assert results["missing"].best is None
+        assert all(result.elapsed >= 0.0 for result in results.values())
+
+    def test_empty_templates(self):
+        """Test an empty batch returns an empty dict"""
+        assert match_templates_batch(np.zeros((10, 10), dtype=np.uint8), {}) == {}
+
+    def test_to_grayscale_bgra(self):
+        """Test BGRA screens are converted to a single channel"""
+        image = np.zeros((10, 10, 4), dtype=np.uint8)
+
+        assert to_grayscale(image).shape == (10, 10)
+
+
+class TestIncrementalDiff:
+    """Tests for changed_tiles and dirty_regions"""
+
+    def test_changed_tiles_marks_only_changed_tiles(self):
+        """Test a single changed pixel marks exactly its tile, including partial edge tiles"""
+        previous = np.zeros((100, 70, 3), dtype=np.uint8)
+        current = previous.copy()
+        current[99, 69, 2] = 1
+
+        tiles = changed_tiles(previous, current, tile_size=32)
+
+        assert tiles.shape == (4, 3)
+        assert [tuple(t) for t in np.argwhere(tiles)] == [(3, 2)]
+
+    def test_changed_tiles_tolerance(self):
+        """Test differences within the tolerance are ignored"""
+        previous = np.zeros((64, 64), dtype=np.uint8)
+        current = previous + 2
+
+        assert not changed_tiles(previous, current, tile_size=32, tolerance=2).any()
+        assert changed_tiles(previous, current, tile_size=32, tolerance=1).all()
+
+    def test_dirty_regions_cover_overlapping_placements(self):
+        """Test every template placement overlapping a change lies inside a region"""
+        previous = _smooth_screen(320, 240, 0)
+        template = _textured_template(24, seed=1)
+        current = previous.copy()
+        current[100:124, 150:174] = template
+
+        tiles = changed_tiles(previous, current, tile_size=16)
+        regions = dirty_regions(tiles, 16, (24, 24), (320, 240))
+
+        assert any(
+            x <= 150 and y <= 100 and 174 <= x + w and 124 <= y + h
+            for x, y, w, h in regions
+        )
+        total = sum(w * h for _, _, w, h in regions)
+        assert total < 320 * 240 // 4
+
+    def test_dirty_regions_static_frame(self):
+        """Test an unchanged frame has nothing to search"""
+        tiles = np.zeros((4, 4), dtype=bool)
+
+        assert dirty_regions(tiles, 32, (10, 10), (128, 128)) == []
@@ -0,0 +1,147 @@
+"""
+Tests for the precompiled template store
+"""
+import pytest
+import numpy as np
+import cv2
+
+from pyui_automation.utils.image import find_template
+from pyui_automation.utils.template_store import TemplateStore, preprocess_template
+
+
+def _write_template(path, seed, size=(20, 30)):
+    """Write a random BGR template image and return it"""
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(path), image)
+    return image
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Create a directory with a few templates"""
+    directory = tmp_path / "templates"
+    _write_template(directory / "save.png", 1)
+    _write_template(directory / "toolbar" / "open.png", 2)
+    (directory / "notes.txt").write_text("not an image")
+    return directory
+
+
+class TestTemplateStore:
+    """Tests for TemplateStore"""
+
+    def test_load_directory(self, template_dir):
+        """Test images are loaded under their relative names"""
+        store = TemplateStore(template_dir)
+
+        assert len(store) == 2
+        assert sorted(store.names()) == ["save", "toolbar/open"]
+        assert "save" in store
+        assert store.image("save").shape == (30, 20, 3)
+
+    def test_gray_is_preprocessed(self, template_dir):
+        """Test the grayscale form is normalized uint8"""
+        store = TemplateStore(template_dir)
+
+        gray = store.gray("save")
+
+        assert gray.dtype == np.uint8
+        assert gray.ndim == 2
+        assert np.array_equal(gray, preprocess_template(store.image("save")))
+
+    def test_fingerprint_is_content_hash(self, template_dir):
+        """Test identical content gives identical fingerprints"""
+        cv2.imwrite(str(template_dir / "copy.png"), cv2.imread(str(template_dir / "save.png")))
+        store = TemplateStore(template_dir)
+
+        assert store.fingerprint("save") == store.fingerprint("copy")
+        assert store.fingerprint("save") != store.fingerprint("toolbar/open")
+
+    def test_pyramid_levels(self, template_dir):
+        """Test requested pyramid levels are precomputed"""
+        store = TemplateStore(template_dir, pyramid_levels=[1, 2])
+
+        assert store.get("save").levels[1].shape == (15, 10)
+        assert store.level("save", 2).shape == (7, 5)
+
+    def test_persisted_forms_are_memory_mapped(self, template_dir, tmp_path):
+        """Test a second store reloads the persisted .npy forms via mmap"""
+        cache_dir = tmp_path / "cache"
+        first = TemplateStore(template_dir, cache_dir=cache_dir)
+        assert list(cache_dir.glob("*.npy"))
+
+        second = TemplateStore(template_dir, cache_dir=cache_dir)
+
+        assert isinstance(second.gray("save"), np.memmap)
+        assert np.array_equal(second.gray("save"), first.gray("save"))
+        assert np.array_equal(second.image("toolbar/open"), first.image("toolbar/open"))
+
+    def test_failed_form_write_leaves_no_partial_file(self, template_dir, tmp_path, monkeypatch):
+        """Test a form write that fails midway leaves neither a truncated form nor a temporary file"""
+        cache_dir = tmp_path / "cache"
+
+        def fail_save(file, array):
+            file.write(b"\x93NUMPY")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(np, "save", fail_save)
+        store = TemplateStore(template_dir, cache_dir=cache_dir)
+        monkeypatch.undo()
+
+        assert len(store) == 2
+        assert list(cache_dir.iterdir()) == []
+        assert np.array_equal(TemplateStore(template_dir, cache_dir=cache_dir).gray("save"), store.gray("save"))
+
+    def test_unreadable_template_is_skipped(self, template_dir, monkeypatch):
+        """Test a template that cannot be read does not stop loading the others"""
+        original_read = type(template_dir).read_bytes
+
+        def read_bytes(path):
+            if path.name == "save.png":
+                raise PermissionError("locked")
+            return original_read(path)
+
+        monkeypatch.setattr(type(template_dir), "read_bytes", read_bytes)
+        store = TemplateStore(template_dir)
+
+        assert store.names() == ["toolbar/open"]
+
+    def test_unknown_template(self, template_dir):
+        """Test unknown names raise KeyError"""
+        store = TemplateStore(template_dir)
+
+        with pytest.raises(KeyError):
+            store.get("missing")
+
+    def test_add_in_memory_template(self, tmp_path):
+        """Test templates can be added without a file"""
+        store = TemplateStore(tmp_path / "empty")
+
+        store.add("icon", np.full((10, 10, 3), 128, dtype=np.uint8))
+
+        assert "icon" in store
+        assert len(store.fingerprint("icon")) == 32
+
+
+class TestFindTemplateByName:
+    """Tests for find_template with stored templates"""
+
+    def test_same_result_as_array(self, template_dir):
+        """Test finding by name matches finding by image"""
+        store = TemplateStore(template_dir, pyramid_levels=[1])
+        template = store.image("toolbar/open")
+        screen = np.zeros((200, 200, 3), dtype=np.uint8)
+        screen[50:80, 120:140] = template
+
+        by_name = find_template(screen, "toolbar/open", threshold=0.9, store=store)
+        by_image = find_template(screen, template, threshold=0.9)
+
+        assert by_name == by_image
+        assert by_name[0][:2] == (130, 65)
+        assert find_template(screen, "toolbar/open", 0.9, pyramid_levels=1, store=store)[0][:2] == (130, 65)
+
+    def test_name_without_store(self):
+        """Test a name without a store is rejected"""
+        with pytest.raises(ValueError):
+            find_template(np.zeros((10, 10), dtype=np.uint8), "save")